@@ -25,6 +25,9 @@ Rôle Architectural :
 import json
 import re
 import ast
+import codecs
+import mmap
+import os
 import yaml
 import inspect
 import threading
@@ -32,10 +35,25 @@ import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Set, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Set, Optional, Tuple
 
 from agentique.base.META_agent import AgentBase
 from agentique.base.config_paths import ROOT_DIR
+from agentique.sous_agents_gouvernes.agent_Memoire.journal_historique import (
+    JournalHistorique,
+)
+# Visiteurs AST (Les Enquêteurs) + moteur d'audit « un parsing, un parcours »
+from agentique.sous_agents_gouvernes.agent_Auditor.moteur_audit import (
+    ContractComplianceVisitor,
+    FunctionHygieneVisitor,
+    MoteurAudit,
+    ShadowComplianceVisitor,
+    StructureVisitor,
+    analyser_securite,
+    analyser_structure,
+    definitions_plates,
+)
 
 # On importe le contrat pour extraire le vocabulaire officiel
 import agentique.base.contrats_interface as contrats
@@ -46,6 +64,8 @@ import agentique.base.contrats_interface as contrats
 ENCODING_REGISTRY_PATH = Path(
     "D:/rag_personnel/agentique/sous_agents_gouvernes/agent_Auditor/auditor_encoding_registry.json"
 )
+TAILLE_BLOC_ENCODAGE = 1024 * 1024  # Validation UTF-8 incrémentale par blocs de 1 Mo
+MOTIF_TRAILING = re.compile(rb"[ \t]\r?$", re.MULTILINE)
 
 
 class TrackedDataclass:
@@ -88,171 +108,6 @@ class TrackedDataclass:
         return object.__getattribute__(self, "_class_name")
 
 
-# =============================================================================
-# VISITEURS AST (Les Enquêteurs)
-# =============================================================================
-
-
-class ContractComplianceVisitor(ast.NodeVisitor):
-    """
-    Vérifie que les instanciations de Dataclasses respectent la définition officielle.
-    Vérifie les champs INVALIDES (intrus) et les champs MANQUANTS (obligatoires).
-    """
-
-    def __init__(self, definitions_contrats: Dict[str, Dict[str, Set[str]]]):
-        # definitions structure: {'NomClasse': {'all': {a,b,c}, 'required': {a,b}}}
-        self.definitions = definitions_contrats
-        self.violations = []
-
-    def visit_Call(self, node):
-        nom_classe = None
-        if isinstance(node.func, ast.Name):
-            nom_classe = node.func.id
-
-        if nom_classe and nom_classe in self.definitions:
-            schema = self.definitions[nom_classe]
-            champs_possibles = schema["all"]
-            champs_obligatoires = schema["required"]
-
-            args_fournis = set()
-
-            # 1. Vérifier les arguments fournis
-            for keyword in node.keywords:
-                arg_name = keyword.arg
-                args_fournis.add(arg_name)
-
-                if arg_name not in champs_possibles:
-                    self.violations.append(
-                        f"⛔ Champ INCONNU '{arg_name}' dans '{nom_classe}' "
-                        f"(Valides : {list(champs_possibles)})"
-                    )
-
-            # 2. Vérifier les arguments manquants
-            # Note : On ne peut vérifier ça que si l'instanciation est purement par mot-clé (keyword)
-            # Si des args positionnels sont utilisés (ex: Class(1, 2)), l'AST est plus dur à mapper.
-            # Mais comme on utilise des dataclasses, les keywords sont la norme.
-            if not node.args:  # Si pas d'arguments positionnels
-                manquants = champs_obligatoires - args_fournis
-                if manquants:
-                    self.violations.append(
-                        f"⚠️ Champ OBLIGATOIRE manquant dans '{nom_classe}' : {list(manquants)}"
-                    )
-
-        self.generic_visit(node)
-
-
-class FunctionHygieneVisitor(ast.NodeVisitor):
-    """
-    Analyse l'hygiène interne des fonctions.
-    [MODIFIE] : Ne vérifie plus la complexité (Refactor suggéré).
-    Vérifie uniquement les variables mortes (Dead Code).
-    """
-
-    def __init__(self):
-        self.violations = []
-
-    def visit_FunctionDef(self, node):
-        """
-        Analyse une fonction spécifique isolément.
-        """
-        # 1. Recensement
-        assigned_vars = set()
-        used_vars = set()
-
-        # On parcourt tout le corps de la fonction
-        for child in ast.walk(node):
-            if isinstance(child, ast.Name):
-                var_name = child.id
-
-                # On ignore les 'self', les imports globaux supposés, et les underscores
-                if var_name == "self" or var_name.startswith("_"):
-                    continue
-
-                if isinstance(child.ctx, ast.Store):
-                    assigned_vars.add(var_name)
-                elif isinstance(child.ctx, ast.Load):
-                    used_vars.add(var_name)
-
-        # 2. Analyse des "Variables Fantômes" (Créées mais jamais lues)
-        # On ne garde que celles qui ont été assignées localement ET jamais lues
-        unused = assigned_vars - used_vars
-
-        # Filtre de sécurité : Parfois une variable est utilisée dans une f-string ou autre
-        # L'AST le voit généralement bien, mais on reste prudent sur les arguments
-        args_names = {arg.arg for arg in node.args.args}
-        unused = unused - args_names
-
-        if unused:
-            self.violations.append(
-                f"⚠️ HYGIÈNE '{node.name}' : Variables mortes -> {list(unused)}"
-            )
-
-        self.generic_visit(node)
-
-
-class ShadowComplianceVisitor(ast.NodeVisitor):
-    """
-    POLICE DE STANDARDISATION :
-    Détecte les dictionnaires manuels qui ressemblent étrangement à des Dataclasses existantes.
-    But : Forcer l'utilisation des objets standards.
-    """
-
-    def __init__(self, definitions_contrats: Dict[str, Set[str]]):
-        self.definitions = definitions_contrats
-        self.violations = []
-
-    def _analyser_dictionnaire(self, node_dict: ast.Dict, contexte: str):
-        """
-        Compare les clés d'un dictionnaire AST avec les définitions officielles.
-        """
-        # 1. Extraire les clés du dictionnaire (seulement les strings constantes)
-        cles_trouvees = set()
-        for key in node_dict.keys:
-            if isinstance(key, ast.Constant) and isinstance(key.value, str):
-                cles_trouvees.add(key.value)
-
-        if not cles_trouvees:
-            return
-
-        # 2. Shadow Matching : Comparer avec chaque contrat officiel
-        for nom_contrat, champs_contrat in self.definitions.items():
-            # On cherche une intersection significative
-            intersection = cles_trouvees.intersection(champs_contrat)
-
-            # CRITÈRE DE DÉTECTION :
-            # Si le dictionnaire contient plus de 50% des champs d'un contrat
-            # OU s'il contient exactement les mêmes champs
-            ratio = len(intersection) / len(champs_contrat) if champs_contrat else 0
-
-            # On ignore les petits dicts génériques (moins de 2 champs matchés) pour éviter le bruit
-            if len(intersection) >= 2 and ratio > 0.6:
-                self.violations.append(
-                    f"🕵️ DETECTÉ dans {contexte} : Utilisation d'un dictionnaire manuel "
-                    f"qui imite le contrat '{nom_contrat}'.\n"
-                    f"   -> Clés suspectes : {list(intersection)}\n"
-                    f"   -> Conseil : Instanciez directement '{nom_contrat}(...)'."
-                )
-
-    def visit_Return(self, node):
-        """Vérifie si on retourne un dictionnaire manuel au lieu d'un objet."""
-        if isinstance(node.value, ast.Dict):
-            self._analyser_dictionnaire(node.value, contexte="return")
-        self.generic_visit(node)
-
-    def visit_Assign(self, node):
-        """Vérifie si on assigne un dictionnaire manuel imitant un objet."""
-        if isinstance(node.value, ast.Dict):
-            # On essaie de récupérer le nom de la variable pour le log
-            nom_var = "variable inconnue"
-            if node.targets and isinstance(node.targets[0], ast.Name):
-                nom_var = node.targets[0].id
-
-            self._analyser_dictionnaire(
-                node.value, contexte=f"assignation de '{nom_var}'"
-            )
-        self.generic_visit(node)
-
-
 class AgentAuditor(AgentBase):
     def __init__(self):
         super().__init__(nom_agent="AgentAuditor")
@@ -294,6 +149,9 @@ class AgentAuditor(AgentBase):
         )
 
         self.vocabulaire_officiel = self._construire_vocabulaire_contrats()
+
+        # Journal historique (chargé à la demande par auditer_coherence_flux)
+        self._journal_historique = None
         self.logger.info(f"🕵️ AgentAuditor prêt via YAML.")
 
     def _collecter_violations_runtime(self) -> List[Dict]:
@@ -551,44 +409,11 @@ class AgentAuditor(AgentBase):
         try:
             content = fichier.read_text(encoding="utf-8", errors="replace")
             alerts = []
-
-            # A. Sanctuaires
-            for zone in self.sanctuaires:
-                if zone in content:
-                    # Détection d'une commande destructive
-                    if re.search(r"\.unlink|\.remove|rmtree", content):
-                        # --- EXCEPTION : ROTATION DE BACKUPS ---
-                        # Si le fichier contient des preuves de logique de sauvegarde (copy + delete)
-                        # On considère l'opération comme une maintenance légitime.
-                        marqueurs_backup = [
-                            "shutil.copy",
-                            "backup",
-                            "rotation",
-                            "archive",
-                            "_old",
-                        ]
-                        # On vérifie si au moins un marqueur est présent dans le fichier
-                        est_rotation_legitime = any(
-                            m in content.lower() for m in marqueurs_backup
-                        )
-
-                        if est_rotation_legitime:
-                            # On ignore l'alerte (ou on pourrait logger un INFO silencieux)
-                            continue
-                        # ---------------------------------------
-
-                        msg = f"Code destructif sur sanctuaire '{zone}' dans {fichier.name}"
-                        alerts.append(f"CRITIQUE: {msg}")
-                        self._signaler_au_gardien(msg, "CRITIQUE")
-
-            # B. Patterns (Reste inchangé)
-            for pat in self.patterns_interdits:
-                if re.search(pat["pattern"], content):
-                    msg = f"{pat['message']} dans {fichier.name}"
-                    niveau = pat.get("gravite", "ALERTE")
-                    alerts.append(f"{niveau}: {msg}")
-                    self._signaler_au_gardien(msg, niveau)
-
+            for niveau, msg in analyser_securite(
+                content, fichier.name, self.sanctuaires, self.patterns_interdits
+            ):
+                alerts.append(f"{niveau}: {msg}")
+                self._signaler_au_gardien(msg, niveau)
             return alerts
         except Exception:
             return []
@@ -616,12 +441,7 @@ class AgentAuditor(AgentBase):
             definitions_riches = self._construire_definitions_contrats()
 
             # 2. ✅ CORRECTIF : On extrait seulement 'all' pour le ShadowVisitor
-            # Le ShadowVisitor ne veut savoir que "quels sont les champs possibles ?"
-            definitions_plates = {
-                nom: infos["all"] for nom, infos in definitions_riches.items()
-            }
-
-            visitor = ShadowComplianceVisitor(definitions_plates)
+            visitor = ShadowComplianceVisitor(definitions_plates(definitions_riches))
             visitor.visit(tree)
 
             return visitor.violations
@@ -638,28 +458,13 @@ class AgentAuditor(AgentBase):
         if "agent_" not in fichier.name:
             return []
 
-        alerts = []
         try:
             code = fichier.read_text(encoding="utf-8")
-            tree = ast.parse(code)
-
-            # Héritage AgentBase
-            has_base = False
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    for base in node.bases:
-                        if isinstance(base, ast.Name) and base.id == "AgentBase":
-                            has_base = True
-            if not has_base:
-                alerts.append("Structure: N'hérite pas de AgentBase")
-
-            # Outils universels
-            if "self.logger" not in code:
-                alerts.append("Structure: Logger non utilisé")
-
+            visitor = StructureVisitor()
+            visitor.visit(ast.parse(code))
+            return analyser_structure(code, visitor.herite_agent_base)
         except Exception:
-            pass
-        return alerts
+            return []
 
     def generer_cartographie(self) -> str:
         """
@@ -799,12 +604,19 @@ class AgentAuditor(AgentBase):
             except Exception as e:
                 self.logger.log_warning(f"Scan Brute impossible: {e}")
 
-        # --- 3. CIBLE B : MÉMOIRE HISTORIQUE (1 Fichier = 1 Interaction) ---
+        # --- 3. CIBLE B : MÉMOIRE HISTORIQUE (1 Entrée d'index = 1 Interaction) ---
         chemin_hist = self.auditor.get_path("historique", nom_agent="memoire")
         nb_fichiers_hist = 0
         if chemin_hist and Path(chemin_hist).exists():
-            # Ici, la règle est stricte : 1 interaction = 1 fichier .json
-            nb_fichiers_hist = len(list(Path(chemin_hist).glob("interaction_*.json")))
+            # Comptage via l'index du journal (+ anciens fichiers non encore migrés)
+            try:
+                if self._journal_historique is None:
+                    self._journal_historique = JournalHistorique(
+                        dossier_historique=chemin_hist
+                    )
+                nb_fichiers_hist = self._journal_historique.compter()
+            except Exception as e:
+                self.logger.log_warning(f"Lecture journal historique impossible: {e}")
 
         # Analyse des écarts avec les seuils dynamiques
         seuil_dynamique = max(min_alerte, total_llm * tolerance)
@@ -841,7 +653,7 @@ class AgentAuditor(AgentBase):
     def auditer_encodage_fichiers(
         self,
         dossiers_a_verifier: Optional[List[str]] = None,
-        max_files: Optional[int] = 500,
+        max_files: Optional[int] = None,
         check_standards: bool = True,
     ) -> Dict[str, Any]:
         """
@@ -852,15 +664,17 @@ class AgentAuditor(AgentBase):
         - Présence d'une nouvelle ligne en fin de fichier (EOF newline).
         - Absence d'espaces en fin de ligne (Trailing whitespace).
 
-        Utilise un registre persistant (cache) pour ne scanner que les fichiers modifiés,
-        garantissant une performance optimale même sur des milliers de fichiers.
+        Utilise un registre persistant (cache, `_fingerprint` mtime + taille) pour ne vérifier
+        que les fichiers modifiés. Les fichiers modifiés sont vérifiés en parallèle (pool de
+        threads) sans jamais être chargés en entier (mmap + décodage UTF-8 incrémental), ce
+        qui permet de couvrir toute la mémoire à chaque passage (`max_fichiers_par_scan`
+        optionnel, illimité par défaut).
         """
 
         violations = []
         fichiers_verifies = 0
         fichiers_skipped = 0
 
-        reg = self._load_encoding_registry()
         now_ts = int(time.time())
 
         if dossiers_a_verifier is None:
@@ -880,13 +694,16 @@ class AgentAuditor(AgentBase):
         dossiers_a_verifier = dossiers_a_verifier or enc_cfg.get(
             "dossiers_a_verifier", []
         )
-        max_files = enc_cfg.get("max_fichiers_par_scan", 500)
-        check_standards = enc_cfg.get("check_standards_vsc", True)
+        max_files = enc_cfg.get("max_fichiers_par_scan", max_files)
+        check_standards = enc_cfg.get("check_standards_vsc", check_standards)
+        nb_threads = enc_cfg.get("threads", min(32, (os.cpu_count() or 1) * 4))
 
         # Utilisation de self.registry_path défini dans __init__
         reg = self._load_encoding_registry()
 
-        # 2. Scanner chaque dossier
+        # 2. Inventaire : fichiers texte modifiés depuis le dernier passage
+        a_verifier = []
+        vus = set()  # reflexive/ contient regles/ et feedback/ : pas de double vérification
         for type_memoire in dossiers_a_verifier:
             chemin = self.auditor.get_path(type_memoire, nom_agent="memoire")
             if not chemin:
@@ -900,126 +717,58 @@ class AgentAuditor(AgentBase):
             if "Archives" in str(dossier):
                 continue
 
-            # 3. Vérifier tous les fichiers texte
             for fichier in dossier.rglob("*"):
-                if max_files is not None and fichiers_verifies >= max_files:
+                if max_files is not None and len(a_verifier) >= max_files:
                     break
-
-                if not fichier.is_file():
-                    continue
-                if not self._is_text_ext(fichier):
+                if not self._is_text_ext(fichier) or not fichier.is_file():
                     continue
 
                 key = str(fichier).replace("\\", "/")
+                if key in vus:
+                    continue
+                vus.add(key)
 
                 try:
                     fp = self._fingerprint(fichier)
-                    prev = reg.get(key)
-
-                    # SKIP si inchangé (mtime + size)
-                    if (
-                        prev
-                        and prev.get("mtime") == fp["mtime"]
-                        and prev.get("size") == fp["size"]
-                    ):
-                        fichiers_skipped += 1
-                        continue
-
-                    # --- UTF-8 rapide (ne lit pas tout) ---
-                    self._quick_utf8_check(fichier)
-
-                    # Si on ne veut pas les standards, on s'arrête ici (très rapide)
-                    if not check_standards:
-                        reg[key] = {
-                            "mtime": fp["mtime"],
-                            "size": fp["size"],
-                            "status": "ok_utf8",
-                            "checked_at": now_ts,
-                        }
-                        fichiers_verifies += 1
-                        continue
-
-                    # --- Standards: lire complet uniquement pour les fichiers CHANGÉS ---
-                    with open(fichier, "r", encoding="utf-8") as f:
-                        contenu = f.read()
-
-                    # newline finale
-                    if contenu and not contenu.endswith("\n"):
-                        violations.append(
-                            {
-                                "fichier": str(fichier),
-                                "type": "NEWLINE_MANQUANTE",
-                                "message": "Fichier ne se termine pas par \\n",
-                            }
-                        )
-
-                    # trailing whitespace (limiter le coût si énorme fichier)
-                    lignes_avec_trailing = []
-                    for i, ligne in enumerate(contenu.splitlines(), 1):
-                        if ligne.endswith((" ", "\t")):
-                            lignes_avec_trailing.append(i)
-                            if len(lignes_avec_trailing) >= 50:  # plafond interne
-                                break
+                except OSError as e:
+                    violations.append(
+                        {"fichier": str(fichier), "type": "ERREUR_LECTURE", "message": str(e)}
+                    )
+                    continue
 
-                    if lignes_avec_trailing:
-                        violations.append(
-                            {
-                                "fichier": str(fichier),
-                                "type": "TRAILING_WHITESPACE",
-                                "message": f"Espaces en fin de ligne: {lignes_avec_trailing[:5]}",
-                            }
-                        )
+                # SKIP si inchangé (mtime + size)
+                prev = reg.get(key)
+                if (
+                    prev
+                    and prev.get("mtime") == fp["mtime"]
+                    and prev.get("size") == fp["size"]
+                ):
+                    fichiers_skipped += 1
+                    continue
+                a_verifier.append((key, fichier, fp))
 
-                    reg[key] = {
-                        "mtime": fp["mtime"],
-                        "size": fp["size"],
-                        "status": "ok_utf8",
-                        "checked_at": now_ts,
-                    }
-                    fichiers_verifies += 1
+        # 3. Vérification en parallèle (I/O bornées, GIL relâché pendant les lectures)
+        def verifier(cible):
+            key, fichier, fp = cible
+            return key, fichier, fp, self._verifier_fichier_texte(fichier, check_standards)
 
-                except UnicodeDecodeError as e:
+        with ThreadPoolExecutor(max_workers=max(1, nb_threads)) as pool:
+            for key, fichier, fp, (statut, constats) in pool.map(verifier, a_verifier):
+                for type_violation, message in constats:
                     violations.append(
-                        {
-                            "fichier": str(fichier),
-                            "type": "ENCODAGE_INVALIDE",
-                            "message": f"Fichier non UTF-8: {str(e)}",
-                        }
+                        {"fichier": str(fichier), "type": type_violation, "message": message}
                     )
+                entree = {
+                    "mtime": fp["mtime"],
+                    "size": fp["size"],
+                    "status": statut,
+                    "checked_at": now_ts,
+                }
+                if statut in ("bad_utf8", "error"):
                     # On enregistre quand même le fingerprint pour éviter de rebloquer
-                    try:
-                        fp = self._fingerprint(fichier)
-                        reg[key] = {
-                            "mtime": fp["mtime"],
-                            "size": fp["size"],
-                            "status": "bad_utf8",
-                            "error": str(e),
-                            "checked_at": now_ts,
-                        }
-                    except Exception:
-                        pass
-                    fichiers_verifies += 1
-
-                except Exception as e:
-                    violations.append(
-                        {
-                            "fichier": str(fichier),
-                            "type": "ERREUR_LECTURE",
-                            "message": str(e),
-                        }
-                    )
-                    try:
-                        fp = self._fingerprint(fichier)
-                        reg[key] = {
-                            "mtime": fp["mtime"],
-                            "size": fp["size"],
-                            "status": "error",
-                            "error": str(e),
-                            "checked_at": now_ts,
-                        }
-                    except Exception:
-                        pass
-                    fichiers_verifies += 1
+                    entree["error"] = constats[0][1]
+                reg[key] = entree
+                fichiers_verifies += 1
 
         self._save_encoding_registry(reg)
 
@@ -1046,6 +795,68 @@ class AgentAuditor(AgentBase):
 
         return rapport
 
+    def _verifier_fichier_texte(
+        self, fichier: Path, check_standards: bool = True
+    ) -> Tuple[str, List[Tuple[str, str]]]:
+        """
+        Vérifie un fichier sans le charger en mémoire.
+
+        - `check_standards` : fichier projeté (mmap), UTF-8 validé par blocs (décodeur
+          incrémental), dernier octet pour la newline finale, regex binaire pour les
+          espaces en fin de ligne (plafond 50 lignes).
+        - Sinon : UTF-8 validé sur un préfixe et un suffixe bornés (très rapide).
+
+        Returns:
+            Tuple[str, List[Tuple[str, str]]]: statut registre ("ok_utf8", "bad_utf8",
+            "error") et constats (type, message).
+        """
+        try:
+            if not check_standards:
+                self._quick_utf8_check(fichier)
+                return "ok_utf8", []
+
+            with open(fichier, "rb") as f:
+                taille = os.fstat(f.fileno()).st_size
+                if taille == 0:
+                    return "ok_utf8", []
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as contenu:
+                    decodeur = codecs.getincrementaldecoder("utf-8")("strict")
+                    for debut in range(0, taille, TAILLE_BLOC_ENCODAGE):
+                        decodeur.decode(
+                            contenu[debut : debut + TAILLE_BLOC_ENCODAGE],
+                            final=debut + TAILLE_BLOC_ENCODAGE >= taille,
+                        )
+
+                    constats = []
+                    # newline finale
+                    if contenu[taille - 1 : taille] != b"\n":
+                        constats.append(
+                            ("NEWLINE_MANQUANTE", "Fichier ne se termine pas par \\n")
+                        )
+
+                    # trailing whitespace (plafond interne, numéros de ligne incrémentaux)
+                    lignes_avec_trailing = []
+                    ligne, position = 1, 0
+                    for trouve in MOTIF_TRAILING.finditer(contenu):
+                        ligne += contenu[position : trouve.start()].count(b"\n")
+                        position = trouve.start()
+                        lignes_avec_trailing.append(ligne)
+                        if len(lignes_avec_trailing) >= 50:
+                            break
+                    if lignes_avec_trailing:
+                        constats.append(
+                            (
+                                "TRAILING_WHITESPACE",
+                                f"Espaces en fin de ligne: {lignes_avec_trailing[:5]}",
+                            )
+                        )
+                    return "ok_utf8", constats
+
+        except UnicodeDecodeError as e:
+            return "bad_utf8", [("ENCODAGE_INVALIDE", f"Fichier non UTF-8: {str(e)}")]
+        except Exception as e:
+            return "error", [("ERREUR_LECTURE", str(e))]
+
     def corriger_encodage_fichier(self, fichier_path: str) -> bool:
         """
         Corrige automatiquement l'encodage d'un fichier:
@@ -1171,13 +982,47 @@ class AgentAuditor(AgentBase):
         }
 
     def _quick_utf8_check(self, fichier: Path, max_bytes: int = 64 * 1024) -> None:
-        # Valide utf-8 rapidement sans lire tout le fichier
-        raw = fichier.read_bytes()[:max_bytes]
-        raw.decode("utf-8")  # strict
+        # Valide utf-8 rapidement sans lire tout le fichier : préfixe + suffixe bornés
+        with open(fichier, "rb") as f:
+            prefixe = f.read(max_bytes)
+            # final=False : un caractère coupé par la borne n'est pas une erreur
+            codecs.getincrementaldecoder("utf-8")("strict").decode(prefixe, final=False)
+
+            taille = os.fstat(f.fileno()).st_size
+            if taille <= max_bytes:
+                return
+            f.seek(max(max_bytes, taille - max_bytes))
+            suffixe = f.read(max_bytes)
+
+        # On saute les octets de continuation (0b10xxxxxx) d'un caractère coupé par la borne
+        debut = 0
+        while debut < min(3, len(suffixe)) and 0x80 <= suffixe[debut] <= 0xBF:
+            debut += 1
+        suffixe[debut:].decode("utf-8")  # strict
 
     # ================================================================
     # POINT D'ENTRÉE GLOBAL
     # ================================================================
+    def _creer_moteur_audit(self) -> MoteurAudit:
+        """Moteur d'audit statique (règles courantes + cache incrémental dans les logs)."""
+        cfg_moteur = self.config.get("configuration", {}).get("moteur_audit", {})
+        chemin_cache = None
+        logs = self.auditor.get_path("logs")
+        if logs and cfg_moteur.get("cache_incremental", True):
+            chemin_cache = Path(logs) / "audit_cache.json"
+
+        regles = {
+            "definitions": self._construire_definitions_contrats(),
+            "sanctuaires": self.sanctuaires,
+            "patterns_interdits": self.patterns_interdits,
+        }
+        return MoteurAudit(
+            regles,
+            chemin_cache=chemin_cache,
+            processus=cfg_moteur.get("processus", 0),
+            seuil_parallele=cfg_moteur.get("seuil_parallele", 8),
+        )
+
     def auditer_systeme(self, mode="sanity_check") -> Dict:
         """
         Point d'entrée de l'Audit Global (The Big Scan).
@@ -1191,6 +1036,10 @@ class AgentAuditor(AgentBase):
         6. **Supervision Flux** : Réconciliation comptable entre le LLM et la Mémoire.
         7. **Analyse Runtime** : Injection des erreurs détectées pendant l'exécution (logs).
 
+        Les étapes 1 à 5 passent par le `MoteurAudit` : chaque fichier est lu et parsé une
+        seule fois, un parcours AST unique alimente tous les visiteurs, seuls les fichiers
+        modifiés depuis le dernier audit sont ré-analysés (`audit_cache.json`), en parallèle.
+
         Génère un rapport JSON complet (`audit_report.json`) et met à jour la cartographie.
 
         Args:
@@ -1233,32 +1082,35 @@ class AgentAuditor(AgentBase):
         # 2. Filtrage (Exclusions locales)
         files = [f for f in files if not any(ex in str(f) for ex in exclusions)]
 
-        # 3. Exécution de l'audit fichier par fichier
+        # 3. Exécution de l'audit : un parsing + un parcours par fichier, fichiers
+        #    inchangés servis par le cache, le reste réparti sur un pool de processus
+        moteur = self._creer_moteur_audit()
+        resultats = moteur.auditer(files)
         for f in files:
-            try:
-                res_fichier = {
-                    "nom": f.name,
-                    "path": str(f.relative_to(root)),
-                    "alertes": [],
-                }
-
-                # Sécurité (Toujours)
-                res_fichier["alertes"].extend(self.auditer_securite_fichier(f))
-                # Structure (Toujours pour les agents)
-                res_fichier["alertes"].extend(self.auditer_conformite_structurelle(f))
-                # Vérification de l'hygiène interne
-                res_fichier["alertes"].extend(self.auditer_hygiene_interne(f))
-                # Vérification des Contrats
-                res_fichier["alertes"].extend(self.auditer_compliance_contrats(f))
+            res_audit = resultats.get(str(f))
+            if res_audit is None:
+                self.logger.log_error(f"Erreur audit fichier {f.name}: illisible")
+                continue
 
-                # Vocabulaire
-                res_fichier["alertes"].extend(self.auditer_standardisation(f))
+            # Les alertes Sécurité sont re-signalées au Gardien, même depuis le cache
+            for msg, niveau in res_audit["signaux"]:
+                self._signaler_au_gardien(msg, niveau)
 
-                if res_fichier["alertes"]:
-                    rapport["fichiers"].append(res_fichier)
+            if res_audit["alertes"]:
+                rapport["fichiers"].append(
+                    {
+                        "nom": f.name,
+                        "path": str(f.relative_to(root)),
+                        "alertes": list(res_audit["alertes"]),
+                    }
+                )
 
-            except Exception as e:
-                self.logger.log_error(f"Erreur audit fichier {f.name}: {e}")
+        stats_moteur = moteur.statistiques
+        self.logger.info(
+            f"⚡ Audit statique : {stats_moteur['audites']} fichier(s) analysé(s), "
+            f"{stats_moteur['depuis_cache']} depuis le cache ({stats_moteur['mode']}, "
+            f"{stats_moteur['duree_s']}s)."
+        )
 
         # ==========================================
         # ✅ AJOUT : AUDIT DE SUPERVISION GLOBAL (Hors de la boucle)
@@ -8,9 +8,10 @@ Objectif : Valider l'analyse statique (AST), la sécurité et la conformité des
 
 import unittest
 import ast
-from unittest.mock import MagicMock, patch, mock_open
+import shutil
+import tempfile
+from unittest.mock import MagicMock, patch
 from pathlib import Path
-from types import SimpleNamespace
 
 # Import de la classe à tester (et des visiteurs internes si besoin d'accès direct)
 try:
@@ -214,19 +215,14 @@ shutil.rmtree('/memoire/persistante/logs_old') # Suppression légitime après ba
 
     def test_audit_encodage_detecte_problemes(self):
         """Vérifie la détection de newline manquante."""
-        # Mock d'un fichier sans newline
-        mock_file = MagicMock(spec=Path)
-        mock_file.is_file.return_value = True
-        mock_file.suffix = ".py"
-        mock_file.stat.return_value = SimpleNamespace(st_mtime=123, st_size=10)
+        dossier = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, dossier, ignore_errors=True)
+        (dossier / "note.md").write_text("pas de retour ligne", encoding="utf-8")
 
         # Simulation : auditor_base renvoie un chemin valide
-        self.auditor.auditor.get_path.return_value = "/fake/dir"
+        self.auditor.auditor.get_path.return_value = str(dossier)
 
         with (
-            patch("pathlib.Path.exists", return_value=True),
-            patch("pathlib.Path.rglob", return_value=[mock_file]),
-            patch("builtins.open", mock_open(read_data="pas de retour ligne")),
             patch.object(self.auditor, "_load_encoding_registry", return_value={}),
             patch.object(self.auditor, "_save_encoding_registry"),
         ):
@@ -238,6 +234,41 @@ shutil.rmtree('/memoire/persistante/logs_old') # Suppression légitime après ba
             self.assertEqual(len(res["violations"]), 1)
             self.assertEqual(res["violations"][0]["type"], "NEWLINE_MANQUANTE")
 
+    def test_audit_encodage_flux_et_registre(self):
+        """Fichiers vérifiés sans lecture complète, en parallèle, puis ignorés si inchangés."""
+        dossier = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, dossier, ignore_errors=True)
+        self.auditor.auditor.get_path.return_value = str(dossier)
+
+        # Octet invalide bien au-delà du préfixe de 64 Ko, au milieu du fichier
+        corps = ("é" * 100_000).encode("utf-8")
+        (dossier / "gros.txt").write_bytes(corps + b"\xff" + corps + b"\n")
+        (dossier / "espaces.md").write_bytes(b"ok\nfin  \r\nsuite\n\t\n")
+        for i in range(20):
+            (dossier / f"propre_{i}.json").write_text("{}\n", encoding="utf-8")
+
+        registre = {}
+        with (
+            patch.object(self.auditor, "_load_encoding_registry", return_value=registre),
+            patch.object(self.auditor, "_save_encoding_registry"),
+        ):
+            res = self.auditor.auditer_encodage_fichiers(dossiers_a_verifier=["test", "test"])
+            types = {Path(v["fichier"]).name: v for v in res["violations"]}
+            self.assertEqual(types["gros.txt"]["type"], "ENCODAGE_INVALIDE")
+            self.assertIn("[2, 4]", types["espaces.md"]["message"])
+            self.assertEqual(res["fichiers_verifies"], 22)  # Dossier en double : vu une fois
+
+            second = self.auditor.auditer_encodage_fichiers(dossiers_a_verifier=["test"])
+            self.assertEqual((second["fichiers_verifies"], second["fichiers_skipped"]), (0, 22))
+
+        # Mode rapide : préfixe + suffixe bornés, caractère coupé par la borne toléré
+        milieu = dossier / "milieu.txt"
+        milieu.write_bytes(corps + b"\xff" + corps)
+        self.auditor._quick_utf8_check(milieu, max_bytes=1001)  # Invalide hors bornes : ignoré
+        milieu.write_bytes(corps + b"\xff")
+        with self.assertRaises(UnicodeDecodeError):
+            self.auditor._quick_utf8_check(milieu, max_bytes=1001)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MoteurAudit - Audit statique « une lecture, un parsing, un parcours » pour AgentAuditor
+
+Avant, chaque contrôle (`auditer_compliance_contrats`, `auditer_hygiene_interne`,
+`auditer_standardisation`, `auditer_conformite_structurelle`, `auditer_securite_fichier`)
+relisait et reparsait le fichier pour son propre `ast.NodeVisitor`, et `auditer_systeme`
+répétait l'opération pour chaque fichier du projet. Ce module :
+1.  **Lecture & Parsing uniques** : un fichier est lu une fois (octets -> texte) et parsé une fois.
+2.  **Parcours combiné** (`ParcoursCombine`) : un seul parcours de l'arbre distribue chaque
+    nœud à tous les visiteurs (`VisiteurAudit.inspecter`, sans récursion propre).
+3.  **Cache incrémental** : les constats sont mémorisés par empreinte SHA-256 du fichier ;
+    seuls les fichiers modifiés sont ré-audités. Le cache est invalidé en bloc si les
+    règles changent (contrats, sanctuaires, patterns, version du moteur).
+4.  **Parallélisme** : les fichiers à ré-auditer sont répartis sur un pool de processus
+    (repli en série si le pool est indisponible ou le lot trop petit).
+
+Les visiteurs restent utilisables seuls (`visitor.visit(tree)`), comme auparavant.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+VERSION_MOTEUR = "1"
+MARQUEURS_BACKUP = ["shutil.copy", "backup", "rotation", "archive", "_old"]
+
+
+# =============================================================================
+# VISITEURS AST (Les Enquêteurs)
+# =============================================================================
+
+
+class VisiteurAudit(ast.NodeVisitor):
+    """
+    Base des enquêteurs : la logique par nœud vit dans `verifier_<TypeNœud>`.
+
+    - Seul : `visit(tree)` parcourt l'arbre et inspecte chaque nœud (ordre préfixe).
+    - Combiné : `ParcoursCombine` appelle `inspecter(node)` une fois par nœud.
+    """
+
+    def inspecter(self, node: ast.AST):
+        methode = getattr(self, f"verifier_{type(node).__name__}", None)
+        if methode is not None:
+            methode(node)
+
+    def visit(self, node: ast.AST):
+        self.inspecter(node)
+        self.generic_visit(node)
+
+
+class ContractComplianceVisitor(VisiteurAudit):
+    """
+    Vérifie que les instanciations de Dataclasses respectent la définition officielle.
+    Vérifie les champs INVALIDES (intrus) et les champs MANQUANTS (obligatoires).
+    """
+
+    def __init__(self, definitions_contrats: Dict[str, Dict[str, Set[str]]]):
+        # definitions structure: {'NomClasse': {'all': {a,b,c}, 'required': {a,b}}}
+        self.definitions = definitions_contrats
+        self.violations = []
+
+    def verifier_Call(self, node):
+        nom_classe = None
+        if isinstance(node.func, ast.Name):
+            nom_classe = node.func.id
+
+        if nom_classe and nom_classe in self.definitions:
+            schema = self.definitions[nom_classe]
+            champs_possibles = schema["all"]
+            champs_obligatoires = schema["required"]
+
+            args_fournis = set()
+
+            # 1. Vérifier les arguments fournis
+            for keyword in node.keywords:
+                arg_name = keyword.arg
+                args_fournis.add(arg_name)
+
+                if arg_name not in champs_possibles:
+                    self.violations.append(
+                        f"⛔ Champ INCONNU '{arg_name}' dans '{nom_classe}' "
+                        f"(Valides : {list(champs_possibles)})"
+                    )
+
+            # 2. Vérifier les arguments manquants
+            # Note : On ne peut vérifier ça que si l'instanciation est purement par mot-clé (keyword)
+            # Si des args positionnels sont utilisés (ex: Class(1, 2)), l'AST est plus dur à mapper.
+            # Mais comme on utilise des dataclasses, les keywords sont la norme.
+            if not node.args:  # Si pas d'arguments positionnels
+                manquants = champs_obligatoires - args_fournis
+                if manquants:
+                    self.violations.append(
+                        f"⚠️ Champ OBLIGATOIRE manquant dans '{nom_classe}' : {list(manquants)}"
+                    )
+
+
+class FunctionHygieneVisitor(VisiteurAudit):
+    """
+    Analyse l'hygiène interne des fonctions.
+    [MODIFIE] : Ne vérifie plus la complexité (Refactor suggéré).
+    Vérifie uniquement les variables mortes (Dead Code).
+    """
+
+    def __init__(self):
+        self.violations = []
+
+    def verifier_FunctionDef(self, node):
+        """
+        Analyse une fonction spécifique isolément.
+        """
+        # 1. Recensement
+        assigned_vars = set()
+        used_vars = set()
+
+        # On parcourt tout le corps de la fonction
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name):
+                var_name = child.id
+
+                # On ignore les 'self', les imports globaux supposés, et les underscores
+                if var_name == "self" or var_name.startswith("_"):
+                    continue
+
+                if isinstance(child.ctx, ast.Store):
+                    assigned_vars.add(var_name)
+                elif isinstance(child.ctx, ast.Load):
+                    used_vars.add(var_name)
+
+        # 2. Analyse des "Variables Fantômes" (Créées mais jamais lues)
+        # On ne garde que celles qui ont été assignées localement ET jamais lues
+        unused = assigned_vars - used_vars
+
+        # Filtre de sécurité : Parfois une variable est utilisée dans une f-string ou autre
+        # L'AST le voit généralement bien, mais on reste prudent sur les arguments
+        args_names = {arg.arg for arg in node.args.args}
+        unused = unused - args_names
+
+        if unused:
+            self.violations.append(
+                f"⚠️ HYGIÈNE '{node.name}' : Variables mortes -> {list(unused)}"
+            )
+
+
+class ShadowComplianceVisitor(VisiteurAudit):
+    """
+    POLICE DE STANDARDISATION :
+    Détecte les dictionnaires manuels qui ressemblent étrangement à des Dataclasses existantes.
+    But : Forcer l'utilisation des objets standards.
+    """
+
+    def __init__(self, definitions_contrats: Dict[str, Set[str]]):
+        self.definitions = definitions_contrats
+        self.violations = []
+
+    def _analyser_dictionnaire(self, node_dict: ast.Dict, contexte: str):
+        """
+        Compare les clés d'un dictionnaire AST avec les définitions officielles.
+        """
+        # 1. Extraire les clés du dictionnaire (seulement les strings constantes)
+        cles_trouvees = set()
+        for key in node_dict.keys:
+            if isinstance(key, ast.Constant) and isinstance(key.value, str):
+                cles_trouvees.add(key.value)
+
+        if not cles_trouvees:
+            return
+
+        # 2. Shadow Matching : Comparer avec chaque contrat officiel
+        for nom_contrat, champs_contrat in self.definitions.items():
+            # On cherche une intersection significative
+            intersection = cles_trouvees.intersection(champs_contrat)
+
+            # CRITÈRE DE DÉTECTION :
+            # Si le dictionnaire contient plus de 50% des champs d'un contrat
+            # OU s'il contient exactement les mêmes champs
+            ratio = len(intersection) / len(champs_contrat) if champs_contrat else 0
+
+            # On ignore les petits dicts génériques (moins de 2 champs matchés) pour éviter le bruit
+            if len(intersection) >= 2 and ratio > 0.6:
+                self.violations.append(
+                    f"🕵️ DETECTÉ dans {contexte} : Utilisation d'un dictionnaire manuel "
+                    f"qui imite le contrat '{nom_contrat}'.\n"
+                    f"   -> Clés suspectes : {list(intersection)}\n"
+                    f"   -> Conseil : Instanciez directement '{nom_contrat}(...)'."
+                )
+
+    def verifier_Return(self, node):
+        """Vérifie si on retourne un dictionnaire manuel au lieu d'un objet."""
+        if isinstance(node.value, ast.Dict):
+            self._analyser_dictionnaire(node.value, contexte="return")
+
+    def verifier_Assign(self, node):
+        """Vérifie si on assigne un dictionnaire manuel imitant un objet."""
+        if isinstance(node.value, ast.Dict):
+            # On essaie de récupérer le nom de la variable pour le log
+            nom_var = "variable inconnue"
+            if node.targets and isinstance(node.targets[0], ast.Name):
+                nom_var = node.targets[0].id
+
+            self._analyser_dictionnaire(
+                node.value, contexte=f"assignation de '{nom_var}'"
+            )
+
+
+class StructureVisitor(VisiteurAudit):
+    """Repère l'héritage d'AgentBase (conformité structurelle des fichiers agent_*)."""
+
+    def __init__(self):
+        self.herite_agent_base = False
+
+    def verifier_ClassDef(self, node):
+        for base in node.bases:
+            if isinstance(base, ast.Name) and base.id == "AgentBase":
+                self.herite_agent_base = True
+
+
+class ParcoursCombine:
+    """Un seul parcours préfixe de l'arbre, chaque nœud distribué à tous les visiteurs."""
+
+    def __init__(self, visiteurs: Iterable[VisiteurAudit]):
+        self.visiteurs = list(visiteurs)
+
+    def parcourir(self, tree: ast.AST):
+        pile = [tree]
+        while pile:
+            node = pile.pop()
+            for visiteur in self.visiteurs:
+                visiteur.inspecter(node)
+            pile.extend(reversed(list(ast.iter_child_nodes(node))))
+
+
+# =============================================================================
+# CONTRÔLES TEXTUELS (Sécurité, Structure)
+# =============================================================================
+
+
+def analyser_securite(
+    contenu: str, nom_fichier: str, sanctuaires: List[str], patterns_interdits: List[Dict]
+) -> List[Tuple[str, str]]:
+    """
+    Sanctuaires + patterns interdits sur le texte brut.
+
+    Returns:
+        List[Tuple[str, str]]: (niveau, message) ; l'appelant formate et signale au Gardien.
+    """
+    constats = []
+
+    # A. Sanctuaires
+    for zone in sanctuaires:
+        if zone in contenu:
+            # Détection d'une commande destructive
+            if re.search(r"\.unlink|\.remove|rmtree", contenu):
+                # --- EXCEPTION : ROTATION DE BACKUPS ---
+                # Si le fichier contient des preuves de logique de sauvegarde (copy + delete)
+                # On considère l'opération comme une maintenance légitime.
+                if any(m in contenu.lower() for m in MARQUEURS_BACKUP):
+                    continue
+                constats.append(
+                    ("CRITIQUE", f"Code destructif sur sanctuaire '{zone}' dans {nom_fichier}")
+                )
+
+    # B. Patterns
+    for pat in patterns_interdits:
+        if re.search(pat["pattern"], contenu):
+            constats.append((pat.get("gravite", "ALERTE"), f"{pat['message']} dans {nom_fichier}"))
+
+    return constats
+
+
+def analyser_structure(code: str, herite_agent_base: bool) -> List[str]:
+    """Héritage AgentBase + usage du logger (fichiers agent_* uniquement)."""
+    alerts = []
+    if not herite_agent_base:
+        alerts.append("Structure: N'hérite pas de AgentBase")
+    # Outils universels
+    if "self.logger" not in code:
+        alerts.append("Structure: Logger non utilisé")
+    return alerts
+
+
+def definitions_plates(definitions: Dict[str, Dict[str, Set[str]]]) -> Dict[str, Set[str]]:
+    """Le ShadowVisitor ne veut savoir que « quels sont les champs possibles ? »."""
+    return {nom: infos["all"] for nom, infos in definitions.items()}
+
+
+# =============================================================================
+# AUDIT D'UN FICHIER (Lecture + Parsing uniques)
+# =============================================================================
+
+
+def auditer_source(nom_fichier: str, octets: bytes, regles: Dict) -> Dict:
+    """
+    Exécute tous les contrôles sur un fichier Python déjà lu.
+
+    Args:
+        nom_fichier (str): Nom court (messages, détection des fichiers agent_*).
+        octets (bytes): Contenu brut du fichier.
+        regles (Dict): {"definitions", "sanctuaires", "patterns_interdits"}.
+
+    Returns:
+        Dict: {"alertes": [...], "signaux": [[message, niveau], ...]} dans l'ordre historique
+        (Sécurité, Structure, Hygiène, Contrats, Standardisation).
+    """
+    alertes, signaux = [], []
+
+    # Sécurité : texte tolérant (comme avant, errors="replace")
+    for niveau, message in analyser_securite(
+        octets.decode("utf-8", errors="replace"),
+        nom_fichier,
+        regles.get("sanctuaires", []),
+        regles.get("patterns_interdits", []),
+    ):
+        alertes.append(f"{niveau}: {message}")
+        signaux.append([message, niveau])
+
+    # Contrôles AST : un seul parsing, un seul parcours
+    est_agent = "agent_" in nom_fichier
+    try:
+        code = octets.decode("utf-8")
+        tree = ast.parse(code)
+    except Exception as e:
+        alertes.extend(
+            [f"Erreur AST Hygiène : {e}", f"Erreur AST Compliance : {e}", f"Erreur Standardisation : {e}"]
+        )
+        return {"alertes": alertes, "signaux": signaux}
+
+    definitions = regles.get("definitions", {})
+    structure = StructureVisitor()
+    hygiene = FunctionHygieneVisitor()
+    contrats = ContractComplianceVisitor(definitions)
+    shadow = ShadowComplianceVisitor(definitions_plates(definitions))
+    ParcoursCombine([structure, hygiene, contrats, shadow]).parcourir(tree)
+
+    if est_agent:
+        alertes.extend(analyser_structure(code, structure.herite_agent_base))
+    alertes.extend(hygiene.violations)
+    alertes.extend(contrats.violations)
+    alertes.extend(shadow.violations)
+    return {"alertes": alertes, "signaux": signaux}
+
+
+def empreinte_regles(regles: Dict) -> str:
+    """Signature des règles : toute évolution invalide le cache entier."""
+    definitions = {
+        nom: {cle: sorted(champs) for cle, champs in infos.items()}
+        for nom, infos in regles.get("definitions", {}).items()
+    }
+    canon = json.dumps(
+        {
+            "version": VERSION_MOTEUR,
+            "definitions": definitions,
+            "sanctuaires": regles.get("sanctuaires", []),
+            "patterns_interdits": regles.get("patterns_interdits", []),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canon.encode("utf-8")).hexdigest()
+
+
+# --- Travailleurs du pool (fonctions de module : picklables sous spawn/Windows) ---
+
+_REGLES_PROCESSUS: Dict = {}
+
+
+def _initialiser_processus(regles: Dict):
+    global _REGLES_PROCESSUS
+    _REGLES_PROCESSUS = regles
+
+
+def _auditer_chemin(chemin: str, regles: Optional[Dict] = None) -> Tuple[str, str, Dict]:
+    """Lit, hache et audite un fichier ; l'empreinte retournée est celle du contenu audité."""
+    octets = Path(chemin).read_bytes()
+    empreinte = hashlib.sha256(octets).hexdigest()
+    resultat = auditer_source(Path(chemin).name, octets, regles if regles is not None else _REGLES_PROCESSUS)
+    return chemin, empreinte, resultat
+
+
+# =============================================================================
+# MOTEUR (Cache incrémental + Pool de processus)
+# =============================================================================
+
+
+class MoteurAudit:
+    """
+    Orchestre l'audit d'un ensemble de fichiers Python.
+
+    Attributes:
+        regles (Dict): Définitions des contrats, sanctuaires et patterns interdits.
+        chemin_cache (Path | None): Fichier JSON des constats par empreinte (None = pas de cache).
+        processus (int): Taille du pool (0 = nombre de CPU).
+        seuil_parallele (int): En deçà de ce nombre de fichiers à ré-auditer, exécution en série.
+        statistiques (Dict): Bilan du dernier `auditer` (audites, depuis_cache, mode, duree_s).
+    """
+
+    def __init__(
+        self,
+        regles: Dict,
+        chemin_cache: Optional[Path] = None,
+        processus: int = 0,
+        seuil_parallele: int = 8,
+    ):
+        self.regles = regles
+        self.chemin_cache = Path(chemin_cache) if chemin_cache else None
+        self.processus = processus or os.cpu_count() or 1
+        self.seuil_parallele = seuil_parallele
+        self.signature = empreinte_regles(regles)
+        self.statistiques: Dict = {}
+
+    def auditer(self, fichiers: Iterable[Path]) -> Dict[str, Dict]:
+        """
+        Audite les fichiers (ré-audit limité aux fichiers modifiés).
+
+        Returns:
+            Dict[str, Dict]: {str(chemin): {"alertes": [...], "signaux": [...]}}. Un fichier
+            illisible est absent du résultat.
+        """
+        debut = time.perf_counter()
+        cache = self._charger_cache()
+        resultats, a_auditer = {}, []
+
+        for fichier in fichiers:
+            chemin = str(fichier)
+            entree = cache.get(chemin)
+            if entree:
+                try:
+                    if hashlib.sha256(Path(chemin).read_bytes()).hexdigest() == entree["empreinte"]:
+                        resultats[chemin] = entree["resultat"]
+                        continue
+                except OSError:
+                    continue
+            a_auditer.append(chemin)
+
+        mode = "serie"
+        if len(a_auditer) >= self.seuil_parallele and self.processus > 1:
+            try:
+                audites = self._auditer_en_parallele(a_auditer)
+                mode = "parallele"
+            except Exception:
+                audites = None  # Pool indisponible (sandbox, spawn) : repli en série
+            if audites is None:
+                audites = self._auditer_en_serie(a_auditer)
+        else:
+            audites = self._auditer_en_serie(a_auditer)
+
+        audites = [audit for audit in audites if audit[1]]  # Fichiers devenus illisibles
+        for chemin, empreinte, resultat in audites:
+            resultats[chemin] = resultat
+            cache[chemin] = {"empreinte": empreinte, "resultat": resultat}
+
+        if a_auditer:
+            self._sauvegarder_cache(cache)
+
+        self.statistiques = {
+            "fichiers": len(resultats),
+            "audites": len(audites),
+            "depuis_cache": len(resultats) - len(audites),
+            "mode": mode,
+            "duree_s": round(time.perf_counter() - debut, 3),
+        }
+        return resultats
+
+    def _auditer_en_serie(self, chemins: List[str]) -> List[Tuple[str, str, Dict]]:
+        audites = []
+        for chemin in chemins:
+            try:
+                audites.append(_auditer_chemin(chemin, self.regles))
+            except OSError:
+                pass
+        return audites
+
+    def _auditer_en_parallele(self, chemins: List[str]) -> List[Tuple[str, str, Dict]]:
+        taille = max(1, len(chemins) // (self.processus * 4))
+        with ProcessPoolExecutor(
+            max_workers=self.processus,
+            initializer=_initialiser_processus,
+            initargs=(self.regles,),
+        ) as pool:
+            return list(pool.map(_auditer_chemin_tolerant, chemins, chunksize=taille))
+
+    # ------------------------------------------------------------------
+    # Persistance du cache
+    # ------------------------------------------------------------------
+
+    def _charger_cache(self) -> Dict[str, Dict]:
+        if not self.chemin_cache or not self.chemin_cache.exists():
+            return {}
+        try:
+            data = json.loads(self.chemin_cache.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if data.get("signature_regles") != self.signature:
+            return {}  # Règles modifiées : tout est à ré-auditer
+        return {c: e for c, e in data.get("fichiers", {}).items() if Path(c).exists()}
+
+    def _sauvegarder_cache(self, cache: Dict[str, Dict]):
+        if not self.chemin_cache:
+            return
+        data = {"signature_regles": self.signature, "fichiers": cache}
+        temporaire = self.chemin_cache.with_suffix(".tmp")
+        try:
+            self.chemin_cache.parent.mkdir(parents=True, exist_ok=True)
+            temporaire.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            temporaire.replace(self.chemin_cache)
+        except OSError:
+            pass
+
+
+def _auditer_chemin_tolerant(chemin: str):
+    try:
+        return _auditer_chemin(chemin)
+    except OSError:
+        return chemin, "", {"alertes": [], "signaux": []}
+
+
+__all__ = [
+    "ContractComplianceVisitor",
+    "FunctionHygieneVisitor",
+    "MoteurAudit",
+    "ParcoursCombine",
+    "ShadowComplianceVisitor",
+    "StructureVisitor",
+    "VisiteurAudit",
+    "analyser_securite",
+    "analyser_structure",
+    "auditer_source",
+    "definitions_plates",
+]
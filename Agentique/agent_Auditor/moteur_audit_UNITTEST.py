@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: Moteur d'audit statique
+Cible : agentique/sous_agents_gouvernes/agent_Auditor/moteur_audit.py
+Objectif : Valider l'équivalence parcours combiné / visiteurs isolés, le cache
+incrémental par empreinte (et son invalidation par les règles) et le mode parallèle.
+"""
+
+import unittest
+import ast
+import shutil
+import tempfile
+from pathlib import Path
+
+from agentique.sous_agents_gouvernes.agent_Auditor.moteur_audit import (
+    ContractComplianceVisitor,
+    FunctionHygieneVisitor,
+    MoteurAudit,
+    ShadowComplianceVisitor,
+    auditer_source,
+)
+
+DEFINITIONS = {"Souvenir": {"all": {"contenu", "titre", "score"}, "required": {"contenu", "titre"}}}
+REGLES = {
+    "definitions": DEFINITIONS,
+    "sanctuaires": ["memoire/brute"],
+    "patterns_interdits": [{"pattern": "shutil\\.rmtree", "message": "Suppression interdite", "gravite": "CRITIQUE"}],
+}
+
+CODE_AGENT = '''
+class AgentTest(AgentBase):
+    def executer(self):
+        morte = 1
+        souvenir = Souvenir(contenu="x", auteur="moi")
+        faux = {"contenu": "x", "titre": "y"}
+        return souvenir, faux
+
+    def nettoyer(self):
+        shutil.rmtree("memoire/brute/tmp")
+'''
+
+
+class TestMoteurAudit(unittest.TestCase):
+    def setUp(self):
+        self.dossier = Path(tempfile.mkdtemp())
+        self.fichier = self.dossier / "agent_Test.py"
+        self.fichier.write_text(CODE_AGENT, encoding="utf-8")
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def test_parcours_combine_equivalent_aux_visiteurs_isoles(self):
+        resultat = auditer_source("agent_Test.py", CODE_AGENT.encode("utf-8"), REGLES)
+
+        tree = ast.parse(CODE_AGENT)
+        attendues = []
+        for visiteur in (
+            FunctionHygieneVisitor(),
+            ContractComplianceVisitor(DEFINITIONS),
+            ShadowComplianceVisitor({"Souvenir": {"contenu", "titre", "score"}}),
+        ):
+            visiteur.visit(tree)
+            attendues.extend(visiteur.violations)
+
+        securite = [a for a in resultat["alertes"] if a.startswith("CRITIQUE")]
+        self.assertEqual(len(securite), 2)  # Sanctuaire + pattern
+        self.assertEqual(resultat["signaux"][0][1], "CRITIQUE")
+        self.assertIn("Structure: Logger non utilisé", resultat["alertes"])
+        self.assertNotIn("Structure: N'hérite pas de AgentBase", resultat["alertes"])
+        self.assertEqual(resultat["alertes"][len(securite) + 1 :], attendues)
+        self.assertEqual(len(attendues), 4)  # Variable morte + champ inconnu + champ manquant + shadow
+
+    def test_erreur_de_syntaxe(self):
+        resultat = auditer_source("module.py", b"def casse(:\n", REGLES)
+        self.assertTrue(resultat["alertes"][0].startswith("Erreur AST Hygiène"))
+
+    def test_cache_incremental(self):
+        autre = self.dossier / "outil.py"
+        autre.write_text("x = 1\n", encoding="utf-8")
+        chemin_cache = self.dossier / "cache" / "audit_cache.json"
+        fichiers = [self.fichier, autre]
+
+        premier = MoteurAudit(REGLES, chemin_cache, seuil_parallele=100).auditer(fichiers)
+        moteur = MoteurAudit(REGLES, chemin_cache, seuil_parallele=100)
+        self.assertEqual(moteur.auditer(fichiers), premier)
+        self.assertEqual((moteur.statistiques["audites"], moteur.statistiques["depuis_cache"]), (0, 2))
+
+        autre.write_text("def f():\n    inutile = 2\n", encoding="utf-8")
+        resultats = moteur.auditer(fichiers)
+        self.assertEqual(moteur.statistiques["audites"], 1)
+        self.assertIn("inutile", resultats[str(autre)]["alertes"][0])
+
+        regles = dict(REGLES, sanctuaires=[])  # Règles modifiées : tout est ré-audité
+        moteur = MoteurAudit(regles, chemin_cache, seuil_parallele=100)
+        moteur.auditer(fichiers)
+        self.assertEqual(moteur.statistiques["audites"], 2)
+
+    def test_parallele_identique_a_la_serie(self):
+        fichiers = []
+        for i in range(6):
+            chemin = self.dossier / f"module_{i}.py"
+            chemin.write_text(f"def f{i}():\n    v{i} = {i}\n", encoding="utf-8")
+            fichiers.append(chemin)
+
+        serie = MoteurAudit(REGLES, processus=1).auditer(fichiers)
+        moteur = MoteurAudit(REGLES, processus=2, seuil_parallele=2)
+        self.assertEqual(moteur.auditer(fichiers), serie)
+        self.assertIn(moteur.statistiques["mode"], ("parallele", "serie"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,7 +15,6 @@ Rôle Architectural :
 """
 
 import json
-import yaml
 from pathlib import Path
 from typing import List, Dict, Optional, Any
 import faiss
@@ -28,6 +27,8 @@ from .code_extractor_manager import CodeExtractorManager
 from .outils.moteur_vecteur_code import MoteurVecteurCode
 from agentique.base.contrats_interface import ContexteCode, Souvenir
 from agentique.base.META_agent import AgentBase
+from agentique.base.demarrage import charger_yaml
+from agentique.base.cache_resultats import signaler_ecriture
 
 
 class AgentCode(AgentBase):
@@ -242,6 +243,7 @@ class AgentCode(AgentBase):
         est synchronisée avec la réalité du disque.
         1. Lance le worker d'indexation (MoteurVecteurCode).
         2. Recharge les structures de données en RAM (Architecture, FAISS).
+        3. Incrémente la version du magasin "code" (invalide les résultats en cache).
         """
         self.logger.info("🔄 AgentCode : Rafraîchissement index demandé...")
         try:
@@ -250,6 +252,7 @@ class AgentCode(AgentBase):
 
             # 2. Recharger la RAM (Hot Reload)
             self._charger_index_en_memoire()
+            signaler_ecriture("code")
 
             self.logger.info("✅ AgentCode : Index mis à jour et rechargé.")
             return True
@@ -298,8 +301,7 @@ class AgentCode(AgentBase):
         if path_config:
             file_path = Path(path_config) / "config_recherche_code.yaml"
             if file_path.exists():
-                with open(file_path, "r", encoding="utf-8") as f:
-                    return yaml.safe_load(f).get("configuration", {})
+                return charger_yaml(file_path).get("configuration", {})
         return {}
 
     def _charger_index_en_memoire(self):
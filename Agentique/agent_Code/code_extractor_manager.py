@@ -10,7 +10,6 @@ Responsabilités :
 """
 
 import json
-import yaml
 import re
 import ast
 import hashlib
@@ -22,6 +21,7 @@ from agentique.base.META_agent import AgentBase
 
 # On importe les contrats pour référence, même si on sort des dicts pour le JSON
 from agentique.base.contrats_interface import ContexteCode, ArtefactCode, AnalyseContenu
+from agentique.base.demarrage import charger_yaml
 from dataclasses import asdict
 
 
@@ -73,8 +73,7 @@ class CodeExtractorManager(AgentBase):
             fichier = Path(path_conf) / "config_code.yaml"
 
             if fichier.exists():
-                with open(fichier, "r", encoding="utf-8") as f:
-                    return yaml.safe_load(f).get("configuration", {})
+                return charger_yaml(fichier).get("configuration", {})
             return {}
         except Exception as e:
             print(f"Erreur chargement config autonome: {e}")
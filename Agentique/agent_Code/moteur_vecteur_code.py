@@ -26,13 +26,13 @@ import sys
 import json
 import os
 import ast
-import yaml
 import shutil
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from dataclasses import asdict
 from agentique.base.META_agent import AgentBase
 from agentique.base.contrats_interface import ContexteCode
+from agentique.base.demarrage import charger_yaml
 import faiss
 from sentence_transformers import SentenceTransformer
 
@@ -88,8 +88,7 @@ class MoteurVecteurCode(AgentBase):
             file_path = self.path_config_dir / "config_recherchecode.yaml"
             if file_path.exists():
                 try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        return yaml.safe_load(f).get("configuration", {})
+                    return charger_yaml(file_path).get("configuration", {})
                 except Exception:
                     pass
         return {}  # Fallback
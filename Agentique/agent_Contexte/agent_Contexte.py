@@ -50,7 +50,7 @@ Configuration (YAML):
 import re
 import json
 import os
-import yaml
+from dataclasses import replace
 from pathlib import Path
 from typing import Dict, List
 from agentique.base.META_agent import AgentBase
@@ -63,6 +63,8 @@ from agentique.base.contrats_interface import (
     DocumentationTechnique,
     FichierReadme,
 )
+from agentique.base.demarrage import charger_yaml
+from agentique.base.cache_resultats import CacheResultats
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -101,6 +103,13 @@ class AgentContexte(AgentBase):
 
         self.historique_conversation: List[str] = []
 
+        # 3. Cache versionné du contexte trié (règles, READMEs, souvenirs jugés)
+        self.cache_resultats = CacheResultats.depuis_config(
+            "contexte",
+            self.config.get("cache_resultats"),
+            magasins=("vectoriel", "regles", "readme"),
+        )
+
         self.logger.info(
             f"✅ AgentContexte chargé. (IDs: {len(self.regles_symboliques_map)}, Tags: {len(self.triggers_categories)})"
         )
@@ -122,8 +131,7 @@ class AgentContexte(AgentBase):
         if not p.exists():
             raise FileNotFoundError(f"❌ Configuration critique manquante : {p}")
 
-        with open(p, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+        data = charger_yaml(p) or {}
 
         return data.get("configuration", {})
 
@@ -199,8 +207,36 @@ class AgentContexte(AgentBase):
             - Seuils configurables: seuil_pertinence_juge, max_elements_contexte
             - Fallbacks systématiques si aucun résultat (Règle/Doc/Mémoire par défaut)
             - Validation du format de sortie via auditor
+            - Cache versionné : un hit (même prompt normalisé, intention, candidats RAG et
+              versions des magasins) est rendu sans règles/READMEs/Juge ; l'historique
+              reste celui de la session courante.
         """
         prompt = resultat_intention.prompt
+        candidats = tuple(
+            (s.titre, round(float(s.score or 0.0), 6))
+            for s in resultat_recherche.souvenirs_bruts
+        )
+        jeton = self.cache_resultats.jeton()
+        en_cache = self.cache_resultats.obtenir(prompt, resultat_intention, candidats)
+        if en_cache is not None:
+            en_cache.historique = self.get_historique_chat()
+            en_cache.intention_detectee = resultat_intention
+            return en_cache
+
+        resultat = self._trier_contexte(resultat_intention, resultat_recherche)
+        # L'historique est l'état vivant de la session : jamais figé dans le cache
+        self.cache_resultats.stocker(
+            prompt, resultat_intention, replace(resultat, historique=[]), jeton, candidats
+        )
+        return resultat
+
+    def _trier_contexte(
+        self,
+        resultat_intention: ResultatIntention,
+        resultat_recherche: ResultatRecherche,
+    ) -> ResultatContexte:
+        """Pipeline de tri sans cache (règles -> READMEs -> Juge -> fallbacks)."""
+        prompt = resultat_intention.prompt
         souvenirs_bruts = resultat_recherche.souvenirs_bruts
 
         self.logger.info(f"Tri intelligent de {len(souvenirs_bruts)} souvenirs...")
@@ -330,14 +366,14 @@ class AgentContexte(AgentBase):
                     ids_deja_charges.add(r_obj.titre)
                 continue
 
-            # Évaluation Juge
-            item.score = self.agent_juge.calculer_pertinence_semantique(
+            # Évaluation Juge (sur une copie : les scores RAG d'entrée forment la clé du cache)
+            score = self.agent_juge.calculer_pertinence_semantique(
                 prompt,
                 item.contenu,
                 item.titre,
                 [{"sujet": resultat_intention.sujet.value}],
             )
-            contexte_evalue.append(item)
+            contexte_evalue.append(replace(item, score=score))
 
         contexte_evalue.sort(key=lambda x: x.score, reverse=True)
         contexte_utile = [
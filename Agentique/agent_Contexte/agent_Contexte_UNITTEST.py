@@ -11,6 +11,7 @@ from unittest.mock import MagicMock, ANY
 from typing import List
 
 from agentique.sous_agents_gouvernes.agent_Contexte.agent_Contexte import AgentContexte
+from agentique.base.cache_resultats import CacheResultats, signaler_ecriture
 from agentique.base.contrats_interface import (
     ResultatIntention,
     ResultatRecherche,
@@ -47,8 +48,14 @@ class TestAgentContexte(unittest.TestCase):
             self.agent.agent_recherche = self.mock_recherche
             self.agent.agent_juge = self.mock_juge
             self.agent.historique_conversation = []
+            self.agent.cache_resultats = CacheResultats(
+                "contexte", magasins=("vectoriel", "regles", "readme")
+            )
             # On initialise les composants de base hérités de MetaAgent
             super(AgentContexte, self.agent).__init__(nom_agent="AgentContexte")
+            # La métaclasse n'est pas passée par __new__ : injection manuelle
+            self.agent.logger = MagicMock()
+            self.agent.auditor = MagicMock()
 
         # 3. Injection d'une CONFIGURATION DE TEST (Contrôle total)
         self.agent.config = {
@@ -218,6 +225,38 @@ class TestAgentContexte(unittest.TestCase):
         # On vérifie que ce sont bien les DERNIERS messages
         self.assertIn("AI 9", histo[-1])
 
+    def test_cache_versionne(self):
+        """
+        SCÉNARIO 5 : Cache du contexte trié.
+        Un second appel identique ne sollicite ni la Recherche ni le Juge, garde l'historique
+        vivant ; une écriture de règle rend l'entrée périmée.
+        """
+        self.agent.cache_resultats = CacheResultats(
+            "contexte", magasins=("vectoriel", "regles", "readme")
+        )
+        self.mock_recherche.rechercher_regles.return_value = []
+        self.mock_recherche.rechercher_regles_semantiques.return_value = []
+        self.mock_recherche.rechercher_readme.return_value = []
+        self.mock_juge.calculer_pertinence_semantique.return_value = 1.0
+        entree_rag = ResultatRecherche(
+            souvenirs_bruts=[Souvenir(contenu="Memory", titre="M1", type="txt", score=0.5)],
+            nb_fichiers_scannes=1,
+            temps_recherche=0.1,
+        )
+
+        premier = self.agent.recuperer_contexte_intelligent(self.intention_base, entree_rag)
+        premier.regles_actives.insert(0, Regle(contenu="Alerte", titre="PROTOCOLE"))
+        self.agent.mettre_a_jour_historique("User X", "AI X")
+
+        second = self.agent.recuperer_contexte_intelligent(self.intention_base, entree_rag)
+        self.assertEqual(self.mock_juge.calculer_pertinence_semantique.call_count, 1)
+        self.assertNotIn("PROTOCOLE", [r.titre for r in second.regles_actives])
+        self.assertEqual(second.historique[-1], "AI X")
+
+        signaler_ecriture("regles")
+        self.agent.recuperer_contexte_intelligent(self.intention_base, entree_rag)
+        self.assertEqual(self.mock_juge.calculer_pertinence_semantique.call_count, 2)
+
 
 if __name__ == "__main__":
     unittest.main()
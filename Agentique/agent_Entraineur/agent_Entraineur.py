@@ -7,8 +7,11 @@ Module responsable de l'évolution cognitive du système via l'entraînement de
 Ce module implémente le pipeline "Offline Training" :
 1.  **Ingestion** : Fusionne les datasets générés automatiquement (AutoDatasetBuilder) et les corrections manuelles.
 2.  **Transformation** : Convertit les prompts textuels en embeddings vectoriels via SBERT (Sentence-BERT).
-3.  **Entraînement** : Optimise trois têtes de classification (ClassifierHead) indépendantes pour prédire
-    le Sujet, l'Action et la Catégorie d'une interaction.
+    Les embeddings sont calculés une seule fois, par gros lots, et conservés dans un cache disque
+    (matrice `.npy` mappée en mémoire, indexée par hash du prompt) : seules les nouvelles lignes
+    du dataset sont encodées d'un entraînement à l'autre.
+3.  **Entraînement** : Optimise conjointement trois têtes de classification (ClassifierHead) pour prédire
+    le Sujet, l'Action et la Catégorie d'une interaction (une seule passe sur la matrice par époque).
 4.  **Validation** : Évalue la performance du modèle sur un jeu de test pour garantir la non-régression.
 
 Architecture ML :
@@ -17,21 +20,34 @@ Architecture ML :
     et efficace avec peu de données (Few-Shot Learning).
 """
 
+import hashlib
 import json
-import yaml
+import os
 import torch
 import torch.nn as nn
-from torch.utils.data import Dataset, DataLoader
+from torch.utils.data import Dataset, DataLoader, BatchSampler, RandomSampler, SequentialSampler
 from sentence_transformers import SentenceTransformer
 from sklearn.model_selection import train_test_split
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any, Tuple
 from datetime import datetime
 import numpy as np
 import unicodedata
 
 from agentique.base.META_agent import AgentBase
 from agentique.base.config_paths import ROOT_DIR
+from agentique.base.demarrage import charger_yaml
+from agentique.sous_agents_gouvernes.agent_Entraineur.index_prompts import (
+    IndexPrompts,
+    NOM_INDEX,
+)
+from agentique.sous_agents_gouvernes.agent_Entraineur.registre_tetes import (
+    RegistreTetes,
+    est_holdout,
+)
+
+AXES = ("sujet", "action", "categorie")
+IGNORE = -100  # Cible ignorée par CrossEntropyLoss (label absent du registre)
 
 # ============================================================================
 # CLASSES UTILITAIRES (Interne à l'entraîneur)
@@ -51,48 +67,191 @@ class ClassifierHead(nn.Module):
     par le moteur d'inférence (IntentionDetector) pour que les poids chargés soient compatibles.
     """
 
-    def __init__(self, emb_dim: int, nb_labels: int):
+    def __init__(self, emb_dim: int, hidden_dim: int = 256, nb_labels: int = 2):
         super().__init__()
         self.net = nn.Sequential(
-            nn.Linear(emb_dim, 256), nn.ReLU(), nn.Linear(256, nb_labels)
+            nn.Linear(emb_dim, hidden_dim), nn.ReLU(), nn.Linear(hidden_dim, nb_labels)
         )
 
     def forward(self, x):
         return self.net(x)
 
 
+class TetesConjointes(nn.Module):
+    """
+    Les trois ClassifierHead (une par axe) branchées sur le même embedding.
+
+    Entraînement multi-tâche : un seul forward par lot, perte = somme des CrossEntropy.
+    Chaque tête reste une ClassifierHead autonome : son state_dict est sauvegardé
+    tel quel dans `classifier_<axe>.pth` (format attendu par l'IntentionDetector).
+    """
+
+    def __init__(self, emb_dim: int, hidden_dim: int, nb_labels: Dict[str, int]):
+        super().__init__()
+        self.tetes = nn.ModuleDict(
+            {axe: ClassifierHead(emb_dim, hidden_dim, n) for axe, n in nb_labels.items()}
+        )
+
+    def forward(self, x) -> Dict[str, torch.Tensor]:
+        return {axe: tete(x) for axe, tete in self.tetes.items()}
+
+
+class CacheEmbeddings:
+    """
+    Cache disque des embeddings SBERT.
+
+    - **Matrice** : `embeddings_cache.npy` (float32, N x dim), ouverte en `mmap_mode="r"` :
+      la RAM ne contient que les lots en cours d'utilisation.
+    - **Index** : `embeddings_cache_index.json`, SHA-1 du prompt -> numéro de ligne,
+      accompagné du modèle SBERT ayant produit les vecteurs (changement de modèle = cache invalidé).
+    - **Ajout incrémental** : seuls les prompts absents de l'index sont encodés, par lots,
+      et écrits en fin de matrice. Écriture dans un fichier temporaire puis `os.replace`
+      (matrice d'abord, index ensuite) : un arrêt brutal ne laisse jamais un index incohérent.
+    """
+
+    NOM_MATRICE = "embeddings_cache.npy"
+    NOM_INDEX = "embeddings_cache_index.json"
+
+    def __init__(self, dossier: Path, modele: str, taille_lot: int = 256):
+        self.dossier = Path(dossier)
+        self.modele = str(modele)
+        self.taille_lot = max(1, int(taille_lot))
+        self.chemin_matrice = self.dossier / self.NOM_MATRICE
+        self.chemin_index = self.dossier / self.NOM_INDEX
+        self.index: Dict[str, int] = {}
+        self._n_lignes = 0  # Lignes valides de la matrice sur disque
+        self._reservations: Dict[str, Tuple[int, str]] = {}  # cle -> (ligne réservée, prompt)
+        self._charger_index()
+
+    @staticmethod
+    def cle(prompt: str) -> str:
+        return hashlib.sha1(prompt.encode("utf-8")).hexdigest()
+
+    def _charger_index(self):
+        if not (self.chemin_index.exists() and self.chemin_matrice.exists()):
+            return
+        try:
+            meta = json.loads(self.chemin_index.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        if meta.get("modele") != self.modele:
+            return  # Vecteurs d'un autre modèle : inutilisables
+        lignes = meta.get("lignes", {})
+        matrice = self.matrice()
+        # Lignes orphelines possibles (arrêt entre matrice et index) : ignorées, jamais réutilisées
+        if matrice is not None and all(l < matrice.shape[0] for l in lignes.values()):
+            self.index = lignes
+            self._n_lignes = matrice.shape[0]
+
+    def matrice(self) -> Optional[np.ndarray]:
+        """Matrice mappée en lecture seule (None si le cache est vide)."""
+        if not self.chemin_matrice.exists():
+            return None
+        return np.load(self.chemin_matrice, mmap_mode="r")
+
+    def reserver(self, prompt: str) -> int:
+        """
+        Numéro de ligne du prompt dans la matrice.
+        Un prompt absent reçoit une ligne réservée en fin de matrice (écrite par `materialiser`) :
+        le dataset peut être parcouru en flux, seuls les nouveaux prompts restent en mémoire.
+        """
+        cle = self.cle(prompt)
+        ligne = self.index.get(cle)
+        if ligne is None:
+            reservation = self._reservations.get(cle)
+            if reservation is None:
+                reservation = (self._n_lignes + len(self._reservations), prompt)
+                self._reservations[cle] = reservation
+            ligne = reservation[0]
+        return ligne
+
+    def materialiser(self, encoder: Callable[[List[str]], np.ndarray]) -> Optional[np.ndarray]:
+        """Encode les prompts réservés, les ajoute à la matrice et retourne la matrice mappée."""
+        if self._reservations:
+            self._ajouter(encoder)
+        return self.matrice()
+
+    def lignes(
+        self, prompts: List[str], encoder: Callable[[List[str]], np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Garantit la présence de chaque prompt dans le cache.
+
+        Returns:
+            (matrice mappée, numéros de ligne alignés sur `prompts`)
+        """
+        lignes = np.fromiter((self.reserver(p) for p in prompts), dtype=np.int64, count=len(prompts))
+        return self.materialiser(encoder), lignes
+
+    def _ajouter(self, encoder: Callable[[List[str]], np.ndarray]):
+        cles = list(self._reservations)
+        textes = [self._reservations[c][1] for c in cles]
+
+        # Premier lot encodé avant tout : il donne la dimension des vecteurs
+        premier = np.asarray(encoder(textes[: self.taille_lot]), dtype=np.float32)
+        dim = premier.shape[1]
+
+        ancienne = self.matrice() if self._n_lignes else None
+        if ancienne is not None and ancienne.shape[1] != dim:
+            raise ValueError(
+                f"Dimension SBERT changée ({ancienne.shape[1]} -> {dim}) : supprimer {self.dossier}"
+            )
+        n_anciens = self._n_lignes
+
+        self.dossier.mkdir(parents=True, exist_ok=True)
+        tmp = self.dossier / f"{self.NOM_MATRICE}.tmp"
+        sortie = np.lib.format.open_memmap(
+            tmp, mode="w+", dtype=np.float32, shape=(n_anciens + len(textes), dim)
+        )
+        # Recopie par blocs : la RAM reste bornée quelle que soit la taille du cache
+        bloc = 65536
+        for debut in range(0, n_anciens, bloc):
+            fin = min(debut + bloc, n_anciens)
+            sortie[debut:fin] = ancienne[debut:fin]
+
+        sortie[n_anciens : n_anciens + len(premier)] = premier
+        for debut in range(len(premier), len(textes), self.taille_lot):
+            lot = np.asarray(encoder(textes[debut : debut + self.taille_lot]), dtype=np.float32)
+            sortie[n_anciens + debut : n_anciens + debut + len(lot)] = lot
+
+        sortie.flush()
+        del sortie, ancienne  # Libère les mappings (requis par os.replace sous Windows)
+        os.replace(tmp, self.chemin_matrice)
+
+        for cle in cles:
+            self.index[cle] = self._reservations[cle][0]
+        self._n_lignes = n_anciens + len(cles)
+        self._reservations.clear()
+        tmp_index = self.dossier / f"{self.NOM_INDEX}.tmp"
+        tmp_index.write_text(
+            json.dumps({"modele": self.modele, "dim": dim, "lignes": self.index}), encoding="utf-8"
+        )
+        os.replace(tmp_index, self.chemin_index)
+
+
 class IntentDataset(Dataset):
     """
-    Wrapper PyTorch pour le chargement efficace des données.
+    Vue PyTorch sur le cache d'embeddings.
 
     Responsabilités :
-    1. **Encodage Lazy** : Convertit le texte en vecteur via SBERT au moment de l'accès (getItem),
-       permettant de gérer des datasets plus grands que la RAM GPU si nécessaire (bien que plus lent).
-    2. **Mapping Label** : Convertit les étiquettes textuelles ("CODER") en indices numériques (3)
-       pour le calcul de la perte.
+    1. **Lecture par lot** : `__getitem__` reçoit une liste d'indices (BatchSampler) et lit les lignes
+       correspondantes de la matrice mappée en une seule opération, sans aucun appel à SBERT.
+    2. **Cibles multi-axes** : Un vecteur d'indices par exemple (un par axe) ; `IGNORE` lorsque
+       le label est absent du registre, pour que la perte de cet axe ne soit pas faussée.
     """
 
-    def __init__(self, data, sbert_model, axe, label_map):
-        self.data = data
-        self.sbert = sbert_model
-        self.axe = axe
-        self.label_map = label_map  # Dict {label: id}
+    def __init__(self, matrice: np.ndarray, lignes: np.ndarray, cibles: torch.Tensor):
+        self.matrice = matrice
+        self.lignes = lignes
+        self.cibles = cibles  # LongTensor (N, nb_axes)
 
     def __len__(self):
-        return len(self.data)
+        return len(self.lignes)
 
     def __getitem__(self, idx):
-        obj = self.data[idx]
-        text = obj["prompt"]
-        label_raw = obj[self.axe]
-
-        # Mapping sécurisé
-        y = self.label_map.get(label_raw, 0)
-
-        # Encodage à la volée (pour économiser la RAM, un peu plus lent)
-        # ou pré-calculé. Ici à la volée pour simplicité.
-        emb = self.sbert.encode(text, normalize_embeddings=True)
-        return torch.tensor(emb, dtype=torch.float32), torch.tensor(y)
+        idx = np.sort(np.atleast_1d(np.asarray(idx)))  # Lecture séquentielle dans le mmap
+        x = torch.from_numpy(np.ascontiguousarray(self.matrice[self.lignes[idx]], dtype=np.float32))
+        return x, self.cibles[torch.from_numpy(idx)]
 
 
 # ============================================================================
@@ -111,7 +270,8 @@ class AgentEntraineur(AgentBase):
         d'optimisation PyTorch et sauvegarde les poids du modèle (.pth) uniquement si la précision est satisfaisante.
 
         Attributes:
-            sbert (SentenceTransformer): Modèle de fondation chargé pour générer les embeddings à la volée.
+            sbert (SentenceTransformer): Modèle de fondation chargé pour générer les embeddings.
+            cache_embeddings (CacheEmbeddings): Embeddings déjà calculés (clé : hash du prompt).
             label_map_json (Dict): Registre officiel des classes (Sujet/Action/Catégorie) assurant la cohérence avec l'AgentJuge.
         """
         # 1. Chargement de SA propre config (pas celle du MiniLLM)
@@ -123,6 +283,16 @@ class AgentEntraineur(AgentBase):
         self.dataset_files = [
             self.data_dir / f for f in cfg_chemins.get("datasets", [])
         ]
+        self.output_dir = Path(cfg_chemins.get("output_models") or self.data_dir)
+        # Versions publiées pour l'IntentionDetector (qui valide et active à chaud)
+        self.registre = RegistreTetes(self.output_dir / "registre")
+        cfg_registre = self.config.get("registre", {})
+        self.fraction_holdout = float(cfg_registre.get("fraction_holdout", 0.02))
+        self.holdout_max = int(cfg_registre.get("holdout_max", 500))
+        # Index de déduplication partagé avec l'AutoDatasetBuilder
+        self.index_prompts = IndexPrompts(
+            cfg_chemins.get("index_prompts") or self.data_dir / "dataset" / NOM_INDEX
+        )
 
         # 3. Initialisation SBERT via YAML
         cfg_sbert = self.config.get("sbert", {})
@@ -131,15 +301,31 @@ class AgentEntraineur(AgentBase):
             cfg_sbert.get("model_path"), device=self.device
         )
 
-        # 4. Chargement Label Map via YAML
+        # 4. Cache d'embeddings (un par modèle SBERT)
+        cfg_train = self.config.get("entrainement", {})
+        self.cache_embeddings = CacheEmbeddings(
+            cfg_chemins.get("cache_embeddings") or self.data_dir / "cache_embeddings",
+            modele=cfg_sbert.get("model_path"),
+            taille_lot=cfg_train.get("batch_size_encodage", 256),
+        )
+
+        # 5. Chargement Label Map via YAML
         path_labels = cfg_chemins.get("registre_labels")
         with open(path_labels, "r", encoding="utf-8") as f:
             self.label_map_json = json.load(f)
 
         self.logger.info(
-            f"✅ AgentEntraineur prêt sur {self.device}. Modèle base: {self.config_sbert['base_model_path']}"
+            f"✅ AgentEntraineur prêt sur {self.device}. Modèle base: {cfg_sbert.get('model_path')} "
+            f"| Cache embeddings: {len(self.cache_embeddings.index)} prompts"
         )
 
+    def _charger_config(self) -> Dict:
+        """Charge la section `configuration` du YAML de l'AgentEntraineur."""
+        path_config = self.auditor.get_path("config")
+        if not path_config or not Path(path_config).exists():
+            raise FileNotFoundError(f"❌ Configuration critique manquante : {path_config}")
+        return (charger_yaml(path_config) or {}).get("configuration", {})
+
     def _charger_config_sbert(self) -> Dict:
         """Charge la config depuis le fichier de configuration du moteur MiniLLM (qui contient la section Sbert)"""
         path_config = self.auditor.get_path(
@@ -149,66 +335,33 @@ class AgentEntraineur(AgentBase):
             # Fallback chemin en dur si l'auditor n'est pas encore sync
             path_config = r"D:\rag_personnel\agentique\sous_agents_gouvernes\agent_Parole\moteurs\config_moteur_mini_llm.yaml"
 
-        with open(path_config, "r", encoding="utf-8") as f:
-            full_cfg = yaml.safe_load(f)
+        full_cfg = charger_yaml(path_config)
         return full_cfg["models"]["SbertClassifier"]
 
     # =========================================================================
     # LOGIQUE DE PRÉPARATION DES DONNÉES
     # =========================================================================
 
-    def _fusionner_datasets(self) -> List[Dict]:
+    def _iterer_dataset(self, shard: Optional[Tuple[int, int]] = None) -> Iterator[Dict]:
         """
-        Agrégateur de connaissances (Data Lake).
+        Agrégateur de connaissances (Data Lake), en flux.
 
-        Combine les données provenant de multiples sources (JSONL) pour constituer le
-        corpus d'entraînement unifié. Applique une déduplication stricte basée sur
-        le prompt exact pour éviter le sur-apprentissage (Overfitting) sur des phrases répétées.
+        Parcourt ligne à ligne les sources (JSONL) du corpus d'entraînement unifié. La déduplication
+        (prompt normalisé, première occurrence gagnante) est déléguée à l'IndexPrompts persistant,
+        partagé avec l'AutoDatasetBuilder : aucun ensemble de prompts n'est gardé en mémoire.
 
-        Gère la robustesse face aux fichiers corrompus ou aux lignes mal formées.
+        Gère la robustesse face aux fichiers manquants ou aux lignes mal formées.
 
-        Returns:
-            List[Dict]: Dataset propre et normalisé prêt pour l'encodage.
-        """
-        data_combines = []
-        seen_prompts = set()  # Dédoublonnage simple sur le prompt exact
+        Args:
+            shard: (k, n) pour ne parcourir que le k-ième des n shards du corpus.
 
+        Yields:
+            Dict: Exemple unique prêt pour l'encodage.
+        """
         for file_path in self.dataset_files:
             if not file_path.exists():
                 self.logger.log_warning(f"Fichier dataset manquant : {file_path}")
-                continue
-
-            self.logger.info(f"📂 Chargement {file_path.name}...")
-            try:
-                lines = file_path.read_text(encoding="utf-8").splitlines()
-                for line in lines:
-                    if not line.strip():
-                        continue
-                    try:
-                        obj = json.loads(line)
-                        prompt = obj.get("prompt")
-
-                        # Validation minimale
-                        if not prompt or prompt in seen_prompts:
-                            continue
-                        if len(prompt) < 5:
-                            continue
-
-                        # Normalisation des labels (Gestion Majuscules/Minuscules)
-                        # On s'assure que 'sujet' correspond à une valeur du JSON Map
-                        # (Logique simplifiée ici, supposant que le AutoDatasetBuilder a fait le job)
-
-                        data_combines.append(obj)
-                        seen_prompts.add(prompt)
-                    except:
-                        continue
-            except Exception as e:
-                self.logger.log_error(f"Erreur lecture {file_path.name}: {e}")
-
-        self.logger.info(
-            f"📊 Dataset fusionné : {len(data_combines)} exemples uniques."
-        )
-        return data_combines
+        return self.index_prompts.iterer_dataset(self.dataset_files, shard=shard)
 
     def _preparer_mapping_labels(self, axe: str) -> Dict[str, int]:
         """Crée le mapping Label -> ID basé sur le fichier de config JSON."""
@@ -219,84 +372,175 @@ class AgentEntraineur(AgentBase):
         valeurs = list(self.label_map_json[cle_json].values())
         return {lbl: i for i, lbl in enumerate(valeurs)}
 
+
+    def _encoder_lot(self, textes: List[str]) -> np.ndarray:
+        """Encodage SBERT d'un lot de prompts (appelé uniquement pour les prompts absents du cache)."""
+        return self.sbert.encode(
+            textes,
+            batch_size=self.config.get("entrainement", {}).get("batch_size_sbert", 64),
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+
+    def _preparer_donnees(
+        self, flux: Iterable[Dict], axes: List[str], taille_bloc: int = 4096
+    ) -> Tuple[Optional[np.ndarray], np.ndarray, torch.Tensor, Dict[str, int]]:
+        """
+        Consomme le flux d'exemples en une passe.
+
+        Seuls sont conservés, par exemple, un numéro de ligne du cache d'embeddings et les indices
+        de labels (IGNORE si inconnu du registre) ; les nouveaux prompts sont ensuite encodés par lots.
+        Les exemples du holdout (sélection par empreinte) ne sont jamais appris : ils sont écrits
+        dans le registre pour la validation des nouvelles versions par l'IntentionDetector.
+
+        Returns:
+            (matrice mappée, lignes (N,), cibles LongTensor (N, nb_axes), nb_labels par axe)
+        """
+        mappings = {axe: self._preparer_mapping_labels(axe) for axe in axes}
+        blocs_lignes, blocs_cibles = [], []
+        lignes_bloc, cibles_bloc = [], []
+        holdout = []
+
+        def fermer_bloc():
+            if lignes_bloc:
+                blocs_lignes.append(np.asarray(lignes_bloc, dtype=np.int64))
+                blocs_cibles.append(np.asarray(cibles_bloc, dtype=np.int64).reshape(-1, len(axes)))
+                lignes_bloc.clear()
+                cibles_bloc.clear()
+
+        for obj in flux:
+            if est_holdout(obj["prompt"], self.fraction_holdout):
+                if len(holdout) < self.holdout_max:
+                    holdout.append(obj)
+                continue
+            lignes_bloc.append(self.cache_embeddings.reserver(obj["prompt"]))
+            cibles_bloc.append([mappings[axe].get(obj.get(axe), IGNORE) for axe in axes])
+            if len(lignes_bloc) >= taille_bloc:
+                fermer_bloc()
+        fermer_bloc()
+
+        lignes = np.concatenate(blocs_lignes) if blocs_lignes else np.empty(0, dtype=np.int64)
+        cibles = (
+            torch.from_numpy(np.concatenate(blocs_cibles))
+            if blocs_cibles
+            else torch.empty((0, len(axes)), dtype=torch.long)
+        )
+
+        if holdout:
+            self.registre.ecrire_holdout(holdout)
+
+        nb_avant = len(self.cache_embeddings.index)
+        matrice = self.cache_embeddings.materialiser(self._encoder_lot) if len(lignes) else None
+        self.logger.info(
+            f"📊 Dataset : {len(lignes)} exemples uniques (+{len(holdout)} holdout) | Embeddings : "
+            f"{len(self.cache_embeddings.index) - nb_avant} encodés, le reste servi par le cache."
+        )
+        return matrice, lignes, cibles, {axe: len(m) for axe, m in mappings.items()}
+
     # =========================================================================
     # BOUCLE D'ENTRAÎNEMENT
     # =========================================================================
 
-    def entrainer_sur_disque(self, epochs: int = 8, learning_rate: float = 1e-4):
+    def entrainer_sur_disque(
+        self,
+        epochs: Optional[int] = None,
+        learning_rate: Optional[float] = None,
+        shard: Optional[Tuple[int, int]] = None,
+    ):
         """
         Lance la séquence d'entraînement complète (Pipeline End-to-End).
 
-        Orchestre l'entraînement séquentiel des 3 axes de classification (Sujet, Action, Catégorie).
-        Pour chaque axe :
-        1. Prépare le mapping Label -> ID spécifique.
-        2. Lance la boucle d'optimisation (_entrainer_axe).
-        3. Sauvegarde le modèle si succès.
+        1. Parcourt les datasets en flux (dédupliqués par l'IndexPrompts).
+        2. Complète le cache d'embeddings (seuls les nouveaux prompts sont encodés).
+        3. Entraîne conjointement les 3 têtes (Sujet, Action, Catégorie) sur la matrice cachée.
+        4. Publie une nouvelle version (une tête par axe) dans le registre, au statut `candidate`.
+
+        Args:
+            epochs / learning_rate: Surcharges ponctuelles des valeurs du YAML.
+            shard: (k, n) pour n'entraîner que sur un shard du corpus.
 
         Cette méthode est bloquante et intensive en calcul (CPU/GPU).
         """
         self.logger.info("🚀 Démarrage de la session d'entraînement...")
-        data = self._fusionner_datasets()
+        axes = list(self.config.get("entrainement", {}).get("axes", AXES))
+        matrice, lignes, cibles, nb_labels = self._preparer_donnees(
+            self._iterer_dataset(shard), axes
+        )
 
-        if len(data) < 10:
+        if len(lignes) < 10:
             self.logger.log_error(
                 "Dataset trop petit pour entraînement (<10). Annulation."
             )
             return False
 
-        # Entraînement séquentiel pour les 3 axes
-        resultats = {}
-        for axe in ["sujet", "action", "categorie"]:
-            acc = self._entrainer_axe(axe, data, epochs, learning_rate)
-            resultats[axe] = acc
+        resultats = self._entrainer_conjoint(
+            matrice, lignes, cibles, nb_labels, epochs, learning_rate
+        )
 
         self.logger.info(f"🎉 Entraînement terminé. Précision: {resultats}")
         return True
 
-    def _entrainer_axe(self, axe: str, data: List[Dict]) -> float:
+    def _entrainer_conjoint(
+        self,
+        matrice: np.ndarray,
+        lignes: np.ndarray,
+        cibles: torch.Tensor,
+        nb_labels: Dict[str, int],
+        epochs: Optional[int] = None,
+        learning_rate: Optional[float] = None,
+    ) -> Dict[str, float]:
         """
-        Boucle d'optimisation PyTorch pour un classifieur spécifique (Single Task Learning).
+        Boucle d'optimisation PyTorch multi-tâche (les 3 axes dans la même passe).
 
-        Implémente le cycle standard : Forward Pass -> Loss Calculation (CrossEntropy) -> Backward Pass -> Optimizer Step.
-        Inclut une phase de validation à chaque époque pour monitorer la généralisation et prévenir le sur-apprentissage.
+        Implémente le cycle standard : Forward Pass -> Loss (somme des CrossEntropy par axe)
+        -> Backward Pass -> Optimizer Step. Les lots sont lus directement dans la matrice
+        d'embeddings mappée : SBERT n'est jamais appelé pendant les époques.
+        Une phase de validation par époque mesure la précision de chaque axe.
 
         Args:
-            axe (str): La dimension à apprendre ("sujet", "action" ou "categorie").
-            data (List[Dict]): Le dataset complet.
+            matrice, lignes, cibles, nb_labels: Sortie de `_preparer_donnees`.
 
         Returns:
-            float: La meilleure précision (Accuracy) atteinte sur le jeu de validation.
+            Dict[str, float]: La meilleure précision (Accuracy) de validation par axe.
         """
-
-        # Récupération des hyperparamètres depuis le YAML uniquement
+        # Récupération des hyperparamètres depuis le YAML
         cfg_train = self.config.get("entrainement", {})
-        # Extraction des vérités depuis le YAML
-        epochs = cfg_train.get("epochs", 8)
-        lr = cfg_train.get("learning_rate", 1e-4)
-        hidden_dim = cfg_train.get("hidden_dim", 256)  # Maintenant exploitée
-
-        mapping = self._preparer_mapping_labels(axe)
-        nb_labels = len(mapping)
+        axes = list(nb_labels)
+        epochs = epochs or cfg_train.get("epochs", 8)
+        lr = learning_rate or cfg_train.get("learning_rate", 1e-4)
+        hidden_dim = cfg_train.get("hidden_dim", 256)
 
         self.logger.info(
-            f"💪 Entraînement axe '{axe.upper()}' ({nb_labels} classes)..."
+            "💪 Entraînement conjoint : "
+            + ", ".join(f"{axe.upper()} ({n} classes)" for axe, n in nb_labels.items())
         )
 
-        # Split Train/Val
-        train_data, val_data = train_test_split(data, test_size=0.15, random_state=42)
-
-        ds_train = IntentDataset(train_data, self.sbert, axe, mapping)
-        ds_val = IntentDataset(val_data, self.sbert, axe, mapping)
-
-        dl_train = DataLoader(ds_train, batch_size=32, shuffle=True)
-        dl_val = DataLoader(ds_val, batch_size=64)
+        # Split Train/Val (sur les positions du dataset)
+        positions = np.arange(len(lignes))
+        pos_train, pos_val = train_test_split(
+            positions, test_size=cfg_train.get("test_size_ratio", 0.15), random_state=42
+        )
+        ds_train = IntentDataset(matrice, lignes[pos_train], cibles[torch.from_numpy(pos_train)])
+        ds_val = IntentDataset(matrice, lignes[pos_val], cibles[torch.from_numpy(pos_val)])
+
+        # BatchSampler : un __getitem__ par lot (lecture groupée dans le mmap), batch_size=None
+        dl_train = DataLoader(
+            ds_train,
+            sampler=BatchSampler(RandomSampler(ds_train), cfg_train.get("batch_size_train", 32), False),
+            batch_size=None,
+        )
+        dl_val = DataLoader(
+            ds_val,
+            sampler=BatchSampler(SequentialSampler(ds_val), cfg_train.get("batch_size_val", 64), False),
+            batch_size=None,
+        )
 
-        emb_dim = self.sbert.get_sentence_embedding_dimension()
-        model = ClassifierHead(emb_dim, hidden_dim, nb_labels).to(self.device)
+        model = TetesConjointes(matrice.shape[1], hidden_dim, nb_labels).to(self.device)
         opt = torch.optim.Adam(model.parameters(), lr=lr)
-        loss_fn = nn.CrossEntropyLoss()
+        loss_fn = nn.CrossEntropyLoss(ignore_index=IGNORE)
 
-        best_acc = 0.0
+        best_acc = {axe: 0.0 for axe in axes}
 
         for epoch in range(epochs):
             model.train()
@@ -304,34 +548,52 @@ class AgentEntraineur(AgentBase):
             for x, y in dl_train:
                 x, y = x.to(self.device), y.to(self.device)
                 opt.zero_grad()
-                pred = model(x)
-                loss = loss_fn(pred, y)
+                sorties = model(x)
+                pertes = [
+                    loss_fn(sorties[axe], y[:, j])
+                    for j, axe in enumerate(axes)
+                    if (y[:, j] != IGNORE).any()
+                ]
+                if not pertes:
+                    continue
+                loss = torch.stack(pertes).sum()
                 loss.backward()
                 opt.step()
                 train_losses.append(loss.item())
 
             # Validation
             model.eval()
-            correct = 0
-            total = 0
+            correct = {axe: 0 for axe in axes}
+            total = {axe: 0 for axe in axes}
             with torch.no_grad():
                 for x, y in dl_val:
                     x, y = x.to(self.device), y.to(self.device)
-                    pred = model(x).argmax(dim=1)
-                    correct += (pred == y).sum().item()
-                    total += len(y)
-
-            acc = correct / total if total > 0 else 0
+                    sorties = model(x)
+                    for j, axe in enumerate(axes):
+                        valides = y[:, j] != IGNORE
+                        pred = sorties[axe].argmax(dim=1)
+                        correct[axe] += ((pred == y[:, j]) & valides).sum().item()
+                        total[axe] += valides.sum().item()
+
+            acc = {axe: correct[axe] / total[axe] if total[axe] else 0.0 for axe in axes}
             self.logger.info(
-                f"   Epoch {epoch + 1}/{epochs} | Loss: {np.mean(train_losses):.4f} | Acc: {acc:.4f}"
+                f"   Epoch {epoch + 1}/{epochs} | Loss: {np.mean(train_losses) if train_losses else 0:.4f} | "
+                + " | ".join(f"{axe}: {a:.4f}" for axe, a in acc.items())
             )
 
-            best_acc = max(best_acc, acc)
-
-        # Sauvegarde
-        save_path = self.output_dir / f"classifier_{axe}.pth"
-        torch.save(model.state_dict(), save_path)
-        self.logger.info(f"💾 Modèle '{axe}' sauvegardé -> {save_path.name}")
+            best_acc = {axe: max(best_acc[axe], acc[axe]) for axe in axes}
+
+        # Publication : une tête par axe (state_dict `net.*` compatible IntentionDetector)
+        version, dossier = self.registre.preparer_version()
+        for axe in axes:
+            torch.save(model.tetes[axe].cpu().state_dict(), dossier / f"classifier_{axe}.pth")
+        self.registre.publier(
+            version,
+            dossier,
+            self.label_map_json,
+            {"precision": best_acc, "exemples": int(len(lignes)), "epochs": epochs},
+        )
+        self.logger.info(f"💾 Version '{version}' publiée (candidate) -> {self.registre.dossier}")
 
         return best_acc
 
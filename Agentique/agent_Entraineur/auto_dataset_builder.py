@@ -12,10 +12,19 @@ Stratégie "Data-Centric AI" :
     Plutôt que d'améliorer le modèle (SBERT), on améliore d'abord la donnée qui le nourrit.
     Le module applique des règles heuristiques strictes pour éliminer le bruit, les commandes système
     et les hallucinations potentielles.
+
+Écriture :
+    Les lignes passent par un fichier ouvert une fois en ajout avec tampon ; chaque prompt est
+    dédupliqué (forme normalisée) contre l'IndexPrompts partagé avec l'AgentEntraineur.
+    L'index n'est mis à jour qu'après l'écriture effective des lignes (`vider()`), déclenchée
+    au plus tard `DELAI_VIDAGE_S` après la première ligne en attente (ou à `TAILLE_TAMPON` lignes) :
+    une ligne acceptée n'attend jamais l'arrêt du processus pour atteindre le disque.
 """
 
+import atexit
 import json
 import re
+import threading
 from pathlib import Path
 from datetime import datetime
 from agentique.base.META_agent import AgentBase
@@ -26,6 +35,12 @@ from agentique.base.contrats_interface import (
     ResultatIntention,
     CustomJSONEncoder,
 )  # ✅ AJOUT Encoder
+from agentique.sous_agents_gouvernes.agent_Entraineur.index_prompts import (
+    IndexPrompts,
+    NOM_INDEX,
+    cle_source,
+    empreinte,
+)
 
 
 class AutoDatasetBuilder(AgentBase):
@@ -40,6 +55,7 @@ class AutoDatasetBuilder(AgentBase):
 
         Attributes:
             dataset_path (Path): Chemin physique du fichier JSONL accumulant les connaissances.
+            index_prompts (IndexPrompts): Empreintes des prompts déjà présents dans le dataset.
             MIN_CHARS, MIN_WORDS (int): Seuils minimaux de richesse sémantique.
         """
 
@@ -49,6 +65,18 @@ class AutoDatasetBuilder(AgentBase):
         )
         self.dataset_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Index de déduplication partagé + écrivain tamponné
+        self.index_prompts = IndexPrompts(self.dataset_path.parent / NOM_INDEX)
+        self.TAILLE_TAMPON = 32  # Lignes avant écriture effective + mise à jour de l'index
+        self.DELAI_VIDAGE_S = 1.0  # Délai max d'une ligne en attente avant écriture effective
+        self._verrou_ecriture = threading.Lock()
+        self._minuteur: Optional[threading.Timer] = None
+        self._source = cle_source(self.dataset_path)
+        self._fichier = None
+        self._en_attente = []  # (empreinte, source, position) écrits mais pas encore indexés
+        self._empreintes_en_attente = set()
+        atexit.register(self.vider)
+
         # --- CRITÈRES DE QUALITÉ ---
         self.MIN_CHARS = 10  # Ex: "C'est quoi?" (11 chars) est limite mais ok
         self.MIN_WORDS = 3  # Ex: "Analyse ce fichier" (3 mots)
@@ -146,7 +174,8 @@ class AutoDatasetBuilder(AgentBase):
         2. **Filtrage** : Appel à _est_qualifie. Si rejeté, logge l'info et arrête.
         3. **Troncature** : Coupe les textes trop longs (> 2000 chars) pour respecter la fenêtre de contexte SBERT.
         4. **Extraction** : Crée un objet `ResultatIntention` propre.
-        5. **Persistance** : Ajoute la ligne JSONL au fichier dataset (Append-Only).
+        5. **Déduplication** : Ignore un prompt dont la forme normalisée est déjà dans l'index.
+        6. **Persistance** : Ajoute la ligne JSONL au tampon du fichier dataset (Append-Only).
 
         Args:
             interaction (Interaction): L'objet source contenant prompt et intention.
@@ -180,11 +209,28 @@ class AutoDatasetBuilder(AgentBase):
                 categorie=interaction.intention.categorie,
             )
 
-            # 5. Écriture Append (JSONL)
-            with open(self.dataset_path, "a", encoding="utf-8") as f:
+            # 5. Déduplication (forme normalisée)
+            cle = empreinte(prompt_clean)
+            with self._verrou_ecriture:
+                if cle in self._empreintes_en_attente or self.index_prompts.contient(cle):
+                    self.logger.info(f"♻️ Doublon ignoré : {prompt_clean[:30]}...")
+                    return False
+
+                # 6. Écriture Append (JSONL, fichier ouvert une fois, tamponné)
                 # ✅ AJOUT cls=CustomJSONEncoder pour transformer les Enums en strings
-                json.dump(nouvelle_donnee, f, ensure_ascii=False, cls=CustomJSONEncoder)
-                f.write("\n")
+                ligne = json.dumps(nouvelle_donnee, ensure_ascii=False, cls=CustomJSONEncoder) + "\n"
+                if self._fichier is None:
+                    self._fichier = open(self.dataset_path, "ab", buffering=64 * 1024)
+                self._en_attente.append((cle, self._source, self._fichier.tell()))
+                self._empreintes_en_attente.add(cle)
+                self._fichier.write(ligne.encode("utf-8"))
+
+                if len(self._en_attente) >= self.TAILLE_TAMPON:
+                    self._vider_sans_verrou()
+                elif self._minuteur is None:
+                    self._minuteur = threading.Timer(self.DELAI_VIDAGE_S, self.vider)
+                    self._minuteur.daemon = True
+                    self._minuteur.start()
 
             self.logger.info(f"📈 Dataset enrichi (+1) : {prompt_clean[:30]}...")
             return True
@@ -192,3 +238,22 @@ class AutoDatasetBuilder(AgentBase):
         except Exception as e:
             self.logger.log_error(f"Erreur ajout dataset : {e}")
             return False
+
+    def vider(self):
+        """Écrit les lignes tamponnées sur disque, puis les enregistre dans l'index."""
+        with self._verrou_ecriture:
+            self._vider_sans_verrou()
+
+    def _vider_sans_verrou(self):
+        if self._minuteur is not None:
+            self._minuteur.cancel()  # Sans effet si c'est le minuteur lui-même qui vide
+            self._minuteur = None
+        if self._fichier is None or not self._en_attente:
+            return
+        try:
+            self._fichier.flush()
+            self.index_prompts.enregistrer(self._en_attente)
+            self._en_attente.clear()
+            self._empreintes_en_attente.clear()
+        except Exception as e:
+            self.logger.log_error(f"Erreur écriture dataset : {e}")
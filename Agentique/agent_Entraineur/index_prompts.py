@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndexPrompts - Index persistant des prompts du dataset d'intentions
+Source de vérité unique pour la déduplication, partagée par l'AutoDatasetBuilder (écriture)
+et l'AgentEntraineur (lecture en flux).
+
+1.  **Normalisation** : NFKC + casse + espaces (`normaliser_prompt`) : "Code  Python" et
+    "code python" sont le même exemple.
+2.  **Empreinte** : BLAKE2b 64 bits du prompt normalisé (entier SQLite, clé primaire).
+3.  **Occurrence canonique** : Chaque empreinte pointe vers (chemin absolu du fichier source,
+    position en octets) de sa première occurrence. Une ligne n'est retenue que si elle EST l'occurrence canonique :
+    la déduplication ne demande plus aucun ensemble en mémoire, quelle que soit la taille du dataset.
+4.  **Flux par shards** : `iterer_dataset(fichiers, shard=(k, n))` lit les JSONL ligne à ligne et ne
+    produit que les exemples dont l'empreinte tombe dans le shard k (doublons toujours dans le même shard).
+5.  **Signature des sources** : (taille, mtime, BLAKE2b du contenu lu). Un fichier dont le contenu
+    déjà indexé a changé (réécrit, ligne insérée en tête...) est purgé puis ré-indexé ; un simple
+    ajout en fin de fichier conserve les positions connues.
+
+Stockage : SQLite (WAL) ; lecteurs et écrivains de processus différents cohabitent.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+NOM_INDEX = "index_prompts.sqlite"
+TAILLE_BLOC_SIGNATURE = 1024 * 1024
+
+
+def normaliser_prompt(texte: str) -> str:
+    """Forme canonique d'un prompt pour la déduplication."""
+    texte = unicodedata.normalize("NFKC", texte or "")
+    return re.sub(r"\s+", " ", texte).strip().casefold()
+
+
+def empreinte(texte: str) -> int:
+    """Empreinte 64 bits signée (stockable telle quelle en INTEGER SQLite)."""
+    digest = hashlib.blake2b(normaliser_prompt(texte).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def cle_source(fichier: Union[str, Path]) -> str:
+    """Clé d'un fichier source : chemin absolu (deux `batch.jsonl` de dossiers différents sont distincts)."""
+    return str(Path(fichier).resolve())
+
+
+def _signature_prefixe(fichier: Path, taille: int) -> Optional[str]:
+    """BLAKE2b des `taille` premiers octets (None si le fichier est plus court)."""
+    signature = hashlib.blake2b(digest_size=16)
+    restant = taille
+    with open(fichier, "rb") as f:
+        while restant > 0:
+            bloc = f.read(min(TAILLE_BLOC_SIGNATURE, restant))
+            if not bloc:
+                return None
+            signature.update(bloc)
+            restant -= len(bloc)
+    return signature.hexdigest()
+
+
+class IndexPrompts:
+    """
+    Index empreinte -> occurrence canonique (source, position).
+
+    Attributes:
+        chemin (Path): Fichier SQLite.
+    """
+
+    def __init__(self, chemin: Union[str, Path]):
+        self.chemin = Path(chemin)
+        self.chemin.parent.mkdir(parents=True, exist_ok=True)
+        self._verrou = threading.Lock()
+        self._cnx = sqlite3.connect(str(self.chemin), timeout=30, check_same_thread=False)
+        self._cnx.execute("PRAGMA journal_mode=WAL")
+        self._cnx.execute("PRAGMA synchronous=NORMAL")
+        self._cnx.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS prompts (
+                empreinte INTEGER PRIMARY KEY,
+                source TEXT NOT NULL,
+                position INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            """
+        )
+        colonnes = {r[1] for r in self._cnx.execute("PRAGMA table_info(sources)")}
+        if colonnes and "signature" not in colonnes:
+            # Ancien format (clé = nom de fichier, taille seule) : signatures recalculées au prochain passage
+            self._cnx.execute("DROP TABLE sources")
+        self._cnx.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sources (
+                chemin TEXT PRIMARY KEY,
+                taille INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                signature TEXT NOT NULL
+            )
+            """
+        )
+        self._cnx.commit()
+
+    # ------------------------------------------------------------------
+    # Accès unitaire (AutoDatasetBuilder)
+    # ------------------------------------------------------------------
+
+    def contient(self, cle: int) -> bool:
+        with self._verrou:
+            return (
+                self._cnx.execute("SELECT 1 FROM prompts WHERE empreinte = ?", (cle,)).fetchone()
+                is not None
+            )
+
+    def enregistrer(self, entrees: Iterable[Tuple[int, str, int]]) -> int:
+        """Ajoute (empreinte, source, position) ; ignore les empreintes déjà connues. Retourne le nombre ajouté."""
+        with self._verrou:
+            avant = self._cnx.total_changes
+            self._cnx.executemany(
+                "INSERT OR IGNORE INTO prompts (empreinte, source, position) VALUES (?, ?, ?)",
+                entrees,
+            )
+            self._cnx.commit()
+            return self._cnx.total_changes - avant
+
+    def __len__(self) -> int:
+        with self._verrou:
+            return self._cnx.execute("SELECT COUNT(*) FROM prompts").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Lecture en flux (AgentEntraineur)
+    # ------------------------------------------------------------------
+
+    def iterer_dataset(
+        self,
+        fichiers: Iterable[Union[str, Path]],
+        shard: Optional[Tuple[int, int]] = None,
+        longueur_min: int = 5,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Générateur des exemples uniques (ordre des fichiers, première occurrence gagnante).
+
+        Les lignes inconnues de l'index (fichiers manuels, anciennes données) y sont enregistrées
+        au passage. Un fichier dont la partie déjà lue a changé depuis le passage précédent
+        (signature différente) a ses positions purgées puis ré-indexées.
+
+        Args:
+            fichiers: Fichiers JSONL, dans l'ordre de priorité.
+            shard: (k, n) pour ne produire que le k-ième des n shards (partition par empreinte).
+            longueur_min: Longueur minimale du prompt brut.
+        """
+        fichiers = [Path(f) for f in fichiers]
+        actives = {cle_source(f) for f in fichiers}
+
+        for fichier in fichiers:
+            if not fichier.exists():
+                continue
+            source = cle_source(fichier)
+            etat = fichier.stat()
+            self._verifier_source(fichier, source, etat.st_size, etat.st_mtime_ns)
+
+            signature = hashlib.blake2b(digest_size=16)
+            with open(fichier, "rb") as f:
+                position = 0
+                for n, brute in enumerate(f, 1):
+                    debut, position = position, position + len(brute)
+                    signature.update(brute)
+                    if n % 10000 == 0:
+                        with self._verrou:
+                            self._cnx.commit()
+                    if not brute.strip():
+                        continue
+                    try:
+                        obj = json.loads(brute)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue
+                    prompt = obj.get("prompt") if isinstance(obj, dict) else None
+                    if not prompt or len(prompt) < longueur_min:
+                        continue
+
+                    cle = empreinte(prompt)
+                    if shard is not None and cle % shard[1] != shard[0]:
+                        continue
+                    if self._est_canonique(cle, source, debut, actives):
+                        yield obj
+
+            with self._verrou:
+                self._cnx.execute(
+                    "INSERT OR REPLACE INTO sources (chemin, taille, mtime_ns, signature) VALUES (?, ?, ?, ?)",
+                    (source, position, etat.st_mtime_ns, signature.hexdigest()),
+                )
+                self._cnx.commit()
+
+    def _est_canonique(self, cle: int, source: str, position: int, actives: set) -> bool:
+        with self._verrou:
+            ligne = self._cnx.execute(
+                "SELECT source, position FROM prompts WHERE empreinte = ?", (cle,)
+            ).fetchone()
+            if ligne is None or ligne[0] not in actives:
+                # Inconnue, ou dont l'occurrence canonique vit dans un fichier retiré du corpus
+                self._cnx.execute(
+                    "INSERT OR REPLACE INTO prompts (empreinte, source, position) VALUES (?, ?, ?)",
+                    (cle, source, position),
+                )
+                return True
+            return ligne[0] == source and ligne[1] == position
+
+    def _verifier_source(self, fichier: Path, source: str, taille: int, mtime_ns: int):
+        """Purge les positions de `source` si le contenu lu au passage précédent a changé."""
+        with self._verrou:
+            ligne = self._cnx.execute(
+                "SELECT taille, mtime_ns, signature FROM sources WHERE chemin = ?", (source,)
+            ).fetchone()
+        if ligne is None or (taille, mtime_ns) == (ligne[0], ligne[1]):
+            return
+        # Taille ou date changée : un ajout en fin garde le préfixe déjà indexé intact
+        if taille >= ligne[0] and _signature_prefixe(fichier, ligne[0]) == ligne[2]:
+            return
+        with self._verrou:
+            self._cnx.execute("DELETE FROM prompts WHERE source = ?", (source,))
+            self._cnx.execute("DELETE FROM sources WHERE chemin = ?", (source,))
+            self._cnx.commit()
+
+    def fermer(self):
+        with self._verrou:
+            self._cnx.commit()
+            self._cnx.close()
+
+
+__all__ = ["IndexPrompts", "normaliser_prompt", "empreinte", "cle_source", "NOM_INDEX"]
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: IndexPrompts
+Cible : agentique/sous_agents_gouvernes/agent_Entraineur/index_prompts.py
+Objectif : Valider la déduplication persistante (prompts normalisés), la lecture en flux par shards
+et la cohérence avec l'écriture tamponnée de l'AutoDatasetBuilder.
+"""
+
+import unittest
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from agentique.sous_agents_gouvernes.agent_Entraineur.index_prompts import (
+    IndexPrompts,
+    cle_source,
+    empreinte,
+    normaliser_prompt,
+)
+
+
+class TestIndexPrompts(unittest.TestCase):
+    def setUp(self):
+        self.dossier = Path(tempfile.mkdtemp())
+        self.index = IndexPrompts(self.dossier / "index.sqlite")
+        self.base = self.dossier / "base.jsonl"
+        self.batch = self.dossier / "batch.jsonl"
+
+    def tearDown(self):
+        self.index.fermer()
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def _ecrire(self, fichier, prompts, mode="w"):
+        with open(fichier, mode, encoding="utf-8", newline="\n") as f:
+            for p in prompts:
+                f.write(json.dumps({"prompt": p, "sujet": "SUJET.CODE"}) + "\n")
+
+    def test_normalisation(self):
+        self.assertEqual(normaliser_prompt("  Code\t PYTHON \n"), "code python")
+        self.assertEqual(empreinte("Code python"), empreinte("code  PYTHON"))
+        self.assertNotEqual(empreinte("code python"), empreinte("code java"))
+
+    def test_premiere_occurrence_gagnante_et_stable(self):
+        self._ecrire(self.base, ["Bonjour à tous", "Explique les décorateurs"])
+        self._ecrire(self.batch, ["explique  les DÉCORATEURS", "Nouveau prompt ici"])
+
+        premiers = [o["prompt"] for o in self.index.iterer_dataset([self.base, self.batch])]
+        self.assertEqual(premiers, ["Bonjour à tous", "Explique les décorateurs", "Nouveau prompt ici"])
+
+        # Relecture et ajout en fin de fichier : mêmes occurrences canoniques + la nouvelle ligne
+        self._ecrire(self.batch, ["Encore un prompt"], mode="a")
+        seconds = [o["prompt"] for o in self.index.iterer_dataset([self.base, self.batch])]
+        self.assertEqual(seconds, premiers + ["Encore un prompt"])
+        self.assertEqual(len(self.index), 4)
+
+    def test_ligne_inseree_en_tete_reindexe_la_source(self):
+        self._ecrire(self.batch, ["Premier prompt ici", "Second prompt ici"])
+        list(self.index.iterer_dataset([self.batch]))
+
+        # Même fichier, plus long, mais les positions connues ne désignent plus les mêmes lignes
+        self._ecrire(self.batch, ["Tout nouveau en tête", "Premier prompt ici", "Second prompt ici"])
+        prompts = [o["prompt"] for o in self.index.iterer_dataset([self.batch])]
+        self.assertEqual(prompts, ["Tout nouveau en tête", "Premier prompt ici", "Second prompt ici"])
+
+        # Ajout en fin : préfixe intact, rien n'est purgé
+        self._ecrire(self.batch, ["Troisième prompt ici"], mode="a")
+        prompts = [o["prompt"] for o in self.index.iterer_dataset([self.batch])]
+        self.assertEqual(len(prompts), 4)
+        self.assertEqual(len(self.index), 4)
+
+    def test_sources_distinctes_par_chemin(self):
+        autre = self.dossier / "autre" / self.batch.name
+        autre.parent.mkdir()
+        self._ecrire(self.batch, ["Prompt du premier dossier"])
+        self._ecrire(autre, ["Prompt du second dossier"])
+
+        for _ in range(2):
+            prompts = [o["prompt"] for o in self.index.iterer_dataset([self.batch, autre])]
+            self.assertEqual(prompts, ["Prompt du premier dossier", "Prompt du second dossier"])
+
+    def test_shards_partitionnent_le_corpus(self):
+        prompts = [f"prompt numéro {i}" for i in range(60)]
+        self._ecrire(self.base, prompts + prompts[:10])  # Doublons dans le même fichier
+
+        shards = [
+            [o["prompt"] for o in self.index.iterer_dataset([self.base], shard=(k, 3))]
+            for k in range(3)
+        ]
+        self.assertEqual(sorted(p for s in shards for p in s), sorted(prompts))
+        self.assertTrue(all(shards))
+
+    def test_index_partage_avec_ecrivain(self):
+        # Simule l'AutoDatasetBuilder : lignes écrites puis enregistrées avec leur position
+        entrees = []
+        with open(self.batch, "ab") as f:
+            for p in ["Prompt du builder un", "Prompt du builder deux"]:
+                entrees.append((empreinte(p), cle_source(self.batch), f.tell()))
+                f.write((json.dumps({"prompt": p}) + "\n").encode("utf-8"))
+        self.assertEqual(self.index.enregistrer(entrees), 2)
+        self.assertEqual(self.index.enregistrer(entrees[:1]), 0)
+        self.assertTrue(self.index.contient(empreinte("prompt du BUILDER un")))
+
+        self._ecrire(self.base, ["Prompt du builder deux"])  # Doublon d'une ligne déjà indexée
+        prompts = [o["prompt"] for o in self.index.iterer_dataset([self.base, self.batch])]
+        self.assertEqual(prompts, ["Prompt du builder un", "Prompt du builder deux"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RegistreTetes - Registre versionné des têtes de classification d'intention
+Contrat d'échange entre l'AgentEntraineur (publie) et l'IntentionDetector (valide, active, revient en arrière).
+
+Arborescence (sous le dossier des classifieurs) :
+    registre/
+        registre.json        -> version active, historique des activations, métadonnées par version
+        holdout.jsonl        -> exemples jamais vus à l'entraînement (sélection par empreinte du prompt)
+        v0001/               -> classifier_{sujet,action,categorie}.pth + label_map.json
+        v0002/ ...
+
+Cycle de vie d'une version :
+    candidate (publiée par l'entraîneur) -> active (validée sur le holdout par le détecteur)
+                                          -> rejetee (régression sur le holdout)
+                                          -> depassee (une version plus récente a été activée)
+    active -> retiree (retour arrière vers l'activation précédente)
+
+L'historique des activations commence par VERSION_INITIALE (fichiers classifier_*.pth hors
+registre) : la première version activée peut donc revenir en arrière.
+
+Toutes les écritures passent par un fichier/dossier temporaire puis un renommage atomique :
+un lecteur (autre processus) ne voit jamais une version ou un registre à moitié écrit.
+Les modifications de registre.json (lecture-modification-écriture) sont sérialisées entre
+processus (entraîneur / détecteur) par un verrou de fichier `registre.json.lock`.
+"""
+
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from agentique.sous_agents_gouvernes.agent_Entraineur.index_prompts import empreinte
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+AXES = ("sujet", "action", "categorie")
+VERSION_INITIALE = "initiale"  # Fichiers classifier_*.pth historiques (hors registre)
+
+
+def est_holdout(prompt: str, fraction: float) -> bool:
+    """Sélection déterministe (empreinte du prompt normalisé) : stable d'un entraînement à l'autre."""
+    return ((empreinte(prompt) >> 16) % 10000) < int(fraction * 10000)
+
+
+def _numero(version: Optional[str]) -> int:
+    """Numéro d'une version `vNNNN` (0 pour VERSION_INITIALE ou aucune)."""
+    return int(version[1:]) if version and version[1:].isdigit() else 0
+
+
+@contextmanager
+def _verrou_fichier(chemin: Path):
+    """Verrou exclusif inter-processus, bloquant, libéré à la sortie du bloc."""
+    with open(chemin, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK abandonne après ~10 s : on réessaie
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class RegistreTetes:
+    """
+    Registre de versions sur disque.
+
+    Attributes:
+        dossier (Path): Racine du registre.
+    """
+
+    NOM_REGISTRE = "registre.json"
+    NOM_HOLDOUT = "holdout.jsonl"
+
+    def __init__(self, dossier: Union[str, Path]):
+        self.dossier = Path(dossier)
+        self.chemin_registre = self.dossier / self.NOM_REGISTRE
+        self.chemin_holdout = self.dossier / self.NOM_HOLDOUT
+        self.chemin_verrou = self.dossier / f"{self.NOM_REGISTRE}.lock"
+        self._verrou = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def lire(self) -> Dict[str, Any]:
+        try:
+            reg = json.loads(self.chemin_registre.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {"active": None, "historique": [], "versions": {}}
+        historique = reg.setdefault("historique", [])
+        if historique and historique[0] != VERSION_INITIALE:
+            historique.insert(0, VERSION_INITIALE)  # Registres écrits avant l'amorçage
+        return reg
+
+    def active(self) -> Optional[str]:
+        return self.lire().get("active")
+
+    def statut(self, version: str) -> Optional[str]:
+        return self.lire()["versions"].get(version, {}).get("statut")
+
+    def derniere_candidate(self) -> Optional[str]:
+        """Candidate la plus récente, si elle est plus récente que la version active."""
+        reg = self.lire()
+        candidates = [
+            v for v, meta in reg["versions"].items()
+            if meta.get("statut") == "candidate" and _numero(v) > _numero(reg.get("active"))
+        ]
+        return max(candidates, key=_numero) if candidates else None
+
+    def precedente(self) -> Optional[str]:
+        """Version active avant l'actuelle (cible d'un retour arrière, éventuellement VERSION_INITIALE)."""
+        historique = self.lire().get("historique", [])
+        return historique[-2] if len(historique) >= 2 else None
+
+    def chemins(self, version: str) -> Dict[str, Path]:
+        dossier = self.dossier / version
+        return {axe: dossier / f"classifier_{axe}.pth" for axe in AXES}
+
+    def label_map(self, version: str) -> Optional[Dict[str, Dict[str, str]]]:
+        chemin = self.dossier / version / "label_map.json"
+        if not chemin.exists():
+            return None
+        return json.loads(chemin.read_text(encoding="utf-8"))
+
+    # ------------------------------------------------------------------
+    # Publication (AgentEntraineur)
+    # ------------------------------------------------------------------
+
+    def preparer_version(self) -> Tuple[str, Path]:
+        """Réserve le numéro suivant ; les fichiers sont écrits dans un dossier temporaire."""
+        with self._verrou:
+            self.dossier.mkdir(parents=True, exist_ok=True)
+            existants = [
+                int(p.name[1:]) for p in self.dossier.glob("v[0-9]*") if p.name[1:].isdigit()
+            ]
+            version = f"v{max(existants, default=0) + 1:04d}"
+            tmp = self.dossier / f".{version}.tmp"
+            shutil.rmtree(tmp, ignore_errors=True)
+            tmp.mkdir(parents=True)
+            return version, tmp
+
+    def publier(
+        self,
+        version: str,
+        dossier_tmp: Path,
+        label_map: Dict[str, Dict[str, str]],
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> Path:
+        """Rend la version visible (renommage atomique) avec le statut `candidate`."""
+        (dossier_tmp / "label_map.json").write_text(
+            json.dumps(label_map, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        final = self.dossier / version
+        os.replace(dossier_tmp, final)
+        self._modifier(
+            lambda reg: reg["versions"].__setitem__(
+                version, {"statut": "candidate", "publiee_le": datetime.now().isoformat(), **(meta or {})}
+            )
+        )
+        return final
+
+    def ecrire_holdout(self, exemples: Iterable[Dict[str, Any]]):
+        self.dossier.mkdir(parents=True, exist_ok=True)
+        tmp = self.dossier / f"{self.NOM_HOLDOUT}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for ex in exemples:
+                f.write(json.dumps({k: ex.get(k) for k in ("prompt", *AXES)}, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.chemin_holdout)
+
+    def lire_holdout(self) -> List[Dict[str, Any]]:
+        if not self.chemin_holdout.exists():
+            return []
+        exemples = []
+        with open(self.chemin_holdout, "r", encoding="utf-8") as f:
+            for ligne in f:
+                try:
+                    exemples.append(json.loads(ligne))
+                except json.JSONDecodeError:
+                    continue
+        return exemples
+
+    # ------------------------------------------------------------------
+    # Décisions (IntentionDetector)
+    # ------------------------------------------------------------------
+
+    def activer(self, version: str, **infos):
+        def maj(reg):
+            for v, meta in reg["versions"].items():
+                if v == version:
+                    continue
+                if meta.get("statut") == "active":
+                    meta["statut"] = "remplacee"
+                elif meta.get("statut") == "candidate" and _numero(v) < _numero(version):
+                    meta["statut"] = "depassee"
+            reg["versions"].setdefault(version, {}).update(
+                statut="active", activee_le=datetime.now().isoformat(), **infos
+            )
+            reg["active"] = version
+            if not reg["historique"]:
+                reg["historique"].append(VERSION_INITIALE)
+            reg["historique"].append(version)
+
+        self._modifier(maj)
+
+    def rejeter(self, version: str, **infos):
+        self._modifier(
+            lambda reg: reg["versions"].setdefault(version, {}).update(statut="rejetee", **infos)
+        )
+
+    def retour_arriere(self) -> Optional[str]:
+        """Retire la version active ; la précédente redevient active. Retourne la nouvelle version active."""
+        resultat = {}
+
+        def maj(reg):
+            historique = reg["historique"]
+            if len(historique) < 2:
+                return
+            retiree = historique.pop()
+            reg["versions"].setdefault(retiree, {})["statut"] = "retiree"
+            resultat["active"] = historique[-1]
+            if historique[-1] == VERSION_INITIALE:
+                reg["active"] = None  # Retour aux fichiers historiques
+            else:
+                reg["active"] = historique[-1]
+                reg["versions"].setdefault(historique[-1], {})["statut"] = "active"
+
+        self._modifier(maj)
+        return resultat.get("active")
+
+    def _modifier(self, maj):
+        """Lecture-modification-écriture sous verrou de thread ET de fichier (autres processus)."""
+        self.dossier.mkdir(parents=True, exist_ok=True)
+        with self._verrou, _verrou_fichier(self.chemin_verrou):
+            reg = self.lire()
+            maj(reg)
+            tmp = self.dossier / f"{self.NOM_REGISTRE}.tmp"
+            tmp.write_text(json.dumps(reg, ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(tmp, self.chemin_registre)
+
+
+__all__ = ["RegistreTetes", "est_holdout", "AXES", "VERSION_INITIALE"]
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: RegistreTetes
+Cible : agentique/sous_agents_gouvernes/agent_Entraineur/registre_tetes.py
+Objectif : Valider le cycle publication -> activation / rejet -> retour arrière, et le holdout.
+"""
+
+import unittest
+import json
+import multiprocessing
+import shutil
+import tempfile
+from pathlib import Path
+
+from agentique.sous_agents_gouvernes.agent_Entraineur.registre_tetes import (
+    RegistreTetes,
+    VERSION_INITIALE,
+    est_holdout,
+)
+
+
+def _modifier_en_boucle(dossier: str, prefixe: str, nb: int):
+    """Processus concurrent : lecture-modification-écriture répétée du même registre."""
+    registre = RegistreTetes(dossier)
+    for i in range(nb):
+        registre.rejeter(f"{prefixe}{i}")
+
+
+class TestRegistreTetes(unittest.TestCase):
+    def setUp(self):
+        self.dossier = Path(tempfile.mkdtemp())
+        self.registre = RegistreTetes(self.dossier / "registre")
+        self.label_map = {"Sujet": {"0": "SUJET.CODE"}}
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def _publier(self):
+        version, tmp = self.registre.preparer_version()
+        for chemin in self.registre.chemins(version).values():
+            (tmp / chemin.name).write_bytes(b"poids")
+        self.registre.publier(version, tmp, self.label_map, {"precision": {"sujet": 0.9}})
+        return version
+
+    def test_publication_atomique_et_numerotation(self):
+        v1, v2 = self._publier(), self._publier()
+        self.assertEqual((v1, v2), ("v0001", "v0002"))
+        self.assertEqual(self.registre.derniere_candidate(), "v0002")
+        self.assertTrue(all(p.exists() for p in self.registre.chemins(v2).values()))
+        self.assertEqual(self.registre.label_map(v2), self.label_map)
+        self.assertFalse(list(self.registre.dossier.glob(".*.tmp")))
+
+    def test_activation_rejet_et_retour_arriere(self):
+        v1 = self._publier()
+        self.registre.activer(v1)
+        v2 = self._publier()
+        self.registre.activer(v2, holdout={"sujet": 0.91})
+        v3 = self._publier()
+        self.registre.rejeter(v3, holdout={"sujet": 0.5})
+
+        self.assertEqual(self.registre.active(), v2)
+        self.assertIsNone(self.registre.derniere_candidate())
+        self.assertEqual(self.registre.statut(v1), "remplacee")
+        self.assertEqual(self.registre.precedente(), v1)
+
+        self.assertEqual(self.registre.retour_arriere(), v1)
+        self.assertEqual(self.registre.active(), v1)
+        self.assertEqual(self.registre.statut(v2), "retiree")
+
+        # La première version activée revient aux fichiers historiques
+        self.assertEqual(self.registre.precedente(), VERSION_INITIALE)
+        self.assertEqual(self.registre.retour_arriere(), VERSION_INITIALE)
+        self.assertIsNone(self.registre.active())
+        self.assertEqual(self.registre.statut(v1), "retiree")
+        self.assertIsNone(self.registre.retour_arriere())  # Plus rien avant l'initiale
+
+    def test_registre_sans_version_initiale(self):
+        # Registre écrit avant l'amorçage de l'historique
+        self.registre.dossier.mkdir(parents=True)
+        self.registre.chemin_registre.write_text(
+            json.dumps({"active": "v0001", "historique": ["v0001"], "versions": {"v0001": {"statut": "active"}}}),
+            encoding="utf-8",
+        )
+        self.assertEqual(self.registre.precedente(), VERSION_INITIALE)
+        self.assertEqual(self.registre.retour_arriere(), VERSION_INITIALE)
+        self.assertIsNone(self.registre.active())
+
+    def test_candidates_depassees(self):
+        v1, v2, v3 = self._publier(), self._publier(), self._publier()
+        self.registre.activer(v3)
+        self.assertEqual((self.registre.statut(v1), self.registre.statut(v2)), ("depassee", "depassee"))
+        self.assertIsNone(self.registre.derniere_candidate())
+
+        # Une candidate plus ancienne que l'active (ex: publiée par un entraînement lent) est ignorée
+        self.registre._modifier(lambda reg: reg["versions"][v2].update(statut="candidate"))
+        self.assertIsNone(self.registre.derniere_candidate())
+        v4 = self._publier()
+        self.assertEqual(self.registre.derniere_candidate(), v4)
+
+    def test_modifications_concurrentes_entre_processus(self):
+        processus = [
+            multiprocessing.Process(target=_modifier_en_boucle, args=(str(self.registre.dossier), p, 25))
+            for p in ("a", "b", "c")
+        ]
+        for p in processus:
+            p.start()
+        for p in processus:
+            p.join(60)
+        self.assertTrue(all(p.exitcode == 0 for p in processus))
+        self.assertEqual(len(self.registre.lire()["versions"]), 75)  # Aucune écriture perdue
+
+    def test_holdout(self):
+        prompts = [f"prompt de test {i}" for i in range(2000)]
+        choisis = [p for p in prompts if est_holdout(p, 0.05)]
+        self.assertTrue(40 < len(choisis) < 170)
+        self.assertEqual(choisis, [p for p in prompts if est_holdout(p, 0.05)])  # Déterministe
+        self.assertTrue(est_holdout("Prompt de  TEST 1", 1.0))
+        self.assertFalse(any(est_holdout(p, 0.0) for p in prompts))
+
+        self.registre.ecrire_holdout([{"prompt": "p", "sujet": "SUJET.CODE", "autre": 1}])
+        self.assertEqual(
+            self.registre.lire_holdout(),
+            [{"prompt": "p", "sujet": "SUJET.CODE", "action": None, "categorie": None}],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,7 +15,6 @@ Rôle Architectural :
 
 import logging
 import json
-import yaml
 import re
 from typing import Dict, List, Any
 from datetime import datetime
@@ -23,6 +22,7 @@ from collections import deque
 from pathlib import Path
 from agentique.base.META_agent import AgentBase
 from agentique.base.contrats_interface import ResultatJuge
+from agentique.base.demarrage import charger_yaml
 from agentique.sous_agents_gouvernes.agent_Parole.moteurs.moteur_mini_llm import (
     MoteurMiniLLM,
 )  # <--- IMPORTANT
@@ -96,8 +96,7 @@ class AgentJuge(AgentBase):
             return {}
 
         try:
-            with open(p, "r", encoding="utf-8") as f:
-                cfg_brute = yaml.safe_load(f) or {}
+            cfg_brute = charger_yaml(p) or {}
             return cfg_brute.get("configuration", {}) or {}
         except Exception as e:
             self.logger.log_error(
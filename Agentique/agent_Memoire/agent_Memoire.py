@@ -6,7 +6,7 @@ Module responsable de l'écriture, de la sauvegarde et de l'indexation de toutes
 
 Ce module implémente une stratégie de persistance en couches (Layered Persistence Strategy) :
 1.  **Couche Brute (Safety Layer) :** Journalisation append-only (JSONL) pour garantir qu'aucune donnée n'est perdue en cas de crash.
-2.  **Couche Transactionnelle (Short-Term) :** Fichiers JSON individuels représentant l'état immédiat de la conversation.
+2.  **Couche Transactionnelle (Short-Term) :** Journal segmenté append-only (JournalHistorique) représentant l'état immédiat de la conversation.
 3.  **Couche Sémantique (Long-Term) :** Vectorisation des interactions pour le RAG (Narratif) et des règles (Législatif).
 4.  **Couche Indexée (Search) :** Mise à jour temps réel de l'index inversé (Whoosh) pour la recherche par mots-clés.
 
@@ -19,18 +19,22 @@ Architecture "Twin-Engine" :
 import json
 import os
 from pathlib import Path
-import yaml
 from datetime import datetime
 from dataclasses import asdict, is_dataclass
 from typing import Dict, Any, List, Optional, Union, TYPE_CHECKING
 from agentique.base.META_agent import AgentBase
 from agentique.base.contrats_interface import (
-    CustomJSONEncoder,
     Interaction,
     ArtefactCode,
     AnalyseContenu,
 )
+from agentique.base.demarrage import charger_yaml
+from agentique.base.cache_resultats import signaler_ecriture
 from agentique.sous_agents_gouvernes.agent_Memoire.moteur_vecteur import MoteurVectoriel
+from agentique.sous_agents_gouvernes.agent_Memoire.journal_historique import (
+    JournalHistorique,
+)
+from agentique.sous_agents_gouvernes.agent_Memoire.wal_brute import EcrivainWALBrute
 
 # ✅ AJOUT : Imports conditionnels pour l'Intellisense
 if TYPE_CHECKING:
@@ -67,8 +71,7 @@ class AgentMemoire(AgentBase):
         # --- Chargement de la configuration ---
         config_path_str = self.auditor.get_path("config")
         if config_path_str and Path(config_path_str).exists():
-            with open(config_path_str, "r", encoding="utf-8") as f:
-                config_brute = yaml.safe_load(f)
+            config_brute = charger_yaml(config_path_str)
             self.config = config_brute.get("configuration", {})
         else:
             self.config = {}
@@ -95,13 +98,30 @@ class AgentMemoire(AgentBase):
             self.logger.info(
                 f"⚖️ Initialisation Moteur Vectoriel LÉGISLATIF : {path_index_regles}"
             )
-            self.moteur_regles = MoteurVectoriel(chemin_index=path_index_regles)
+            self.moteur_regles = MoteurVectoriel(
+                chemin_index=path_index_regles, magasin="regles"
+            )
         else:
             self.logger.log_warning(
                 "⚠️ Chemin 'regles' introuvable. Le moteur législatif est désactivé."
             )
             self.moteur_regles = None
 
+        # 3. JOURNAL HISTORIQUE (Segments append-only + Index primaire)
+        config_journal = self.config.get("journal_historique", {})
+        self.journal_historique = JournalHistorique(
+            dossier_historique=self.auditor.get_path("historique"),
+            config=config_journal,
+        )
+        if config_journal.get("compaction_au_demarrage", True):
+            self.journal_historique.lancer_compaction_async()
+
+        # 4. WAL BRUTE (Validation groupée : un fsync par fenêtre de commit)
+        self.wal_brute = EcrivainWALBrute(
+            dossier_brute=self.auditor.get_path("brute"),
+            config=self.config.get("wal_brute", {}),
+        )
+
     # ================================================================
     # 1. SAUVEGARDE BRUTE (BACKUP SÉCURITÉ)
     # ================================================================
@@ -117,8 +137,9 @@ class AgentMemoire(AgentBase):
         Exécute une journalisation de type "Write-Ahead Log" (WAL) pour la sécurité des données.
 
         Cette méthode est critique : elle capture l'interaction brute avant tout traitement complexe.
-        Elle utilise un mode "Append-Only" avec `os.fsync` pour garantir l'atomicité et la durabilité
-        de l'écriture, même en cas d'arrêt brutal du système.
+        L'écriture est déléguée à l'EcrivainWALBrute (Group Commit) : l'appel ne retourne qu'une
+        fois l'enregistrement couvert par un `os.fsync`, partagé avec les écritures concurrentes
+        de la même fenêtre de commit.
 
         Polymorphisme :
             Accepte soit un objet `Interaction` structuré, soit des données brutes (str),
@@ -128,19 +149,7 @@ class AgentMemoire(AgentBase):
             bool: True si l'écriture physique est confirmée.
         """
         try:
-            # 1. Récupérer le dossier d’écriture
-            dossier_path = self.auditor.get_path("brute")
-            if not dossier_path:
-                return False
-            dossier = Path(dossier_path)
-            if not dossier.exists():
-                dossier.mkdir(parents=True, exist_ok=True)
-
-            # 2. Nom du fichier journalier
-            date_str = datetime.now().strftime("%Y-%m-%d")
-            log_path = dossier / f"interactions_{date_str}.jsonl"
-
-            # 3. Préparer les données à sauvegarder
+            # 1. Préparer les données à sauvegarder
             data_to_save = {}
 
             # CAS A : On a reçu un objet Interaction complet (Nouveau standard)
@@ -164,16 +173,11 @@ class AgentMemoire(AgentBase):
                 self.logger.log_warning(f"Format brute inconnu: {type(donnee_entree)}")
                 return False
 
-            # 4. Écriture Append (Atomicité via os.fsync)
-            with open(log_path, "a", encoding="utf-8") as f:
-                json_line = json.dumps(
-                    data_to_save, ensure_ascii=False, cls=CustomJSONEncoder
-                )
-                f.write(json_line + "\n")
-                f.flush()
-                os.fsync(f.fileno())
+            # 2. Écriture Append groupée (bloque jusqu'au fsync du lot)
+            if not self.wal_brute.ecrire(data_to_save):
+                return False
 
-            self.logger.log_thought(f"🔒 Backup brut sécurisé : {log_path.name}")
+            self.logger.log_thought("🔒 Backup brut sécurisé (WAL)")
             return True
 
         except Exception as e:
@@ -188,7 +192,7 @@ class AgentMemoire(AgentBase):
         Orchestre le pipeline d'ingestion complet d'une interaction (Hot Path).
 
         Processus en 4 étapes synchrones :
-        1. **Persistance Disque** : Écriture d'un fichier JSON atomique dans 'historique/'.
+        1. **Persistance Disque** : Ajout d'une ligne au journal segmenté de 'historique/'.
         2. **Validation** : Vérification stricte du schéma de données via Auditor.
         3. **Vectorisation** : Injection immédiate dans le Moteur Narratif pour disponibilité RAG instantanée.
         4. **Indexation** : Mise à jour de l'index Whoosh pour la recherche par mots-clés.
@@ -202,11 +206,7 @@ class AgentMemoire(AgentBase):
             bool: Succès global de la chaîne de mémorisation.
         """
         try:
-            # --- 1. Préparation du nom de fichier ---
-            ts = interaction_element.meta.timestamp
-            timestamp_clean = ts.replace(":", "").replace("-", "").replace(".", "")
-
-            # Extraction sécurisée des tags (via Intention)
+            # --- 1. Extraction sécurisée des tags (via Intention) ---
             if interaction_element.intention:
                 sujet_val = interaction_element.intention.sujet.value
                 action_val = interaction_element.intention.action.value
@@ -216,41 +216,21 @@ class AgentMemoire(AgentBase):
                 action_val = "inconnue"
                 categorie_val = "inconnue"
 
-            # Nettoyage
-            s_clean = sujet_val.lower().replace(" ", "")
-            a_clean = action_val.lower().replace(" ", "")
-            c_clean = categorie_val.lower().replace(" ", "")
-
-            nom_fichier = (
-                f"interaction_{s_clean}_{a_clean}_{c_clean}_{timestamp_clean}.json"
-            )
-
-            chemin_historique = self.auditor.get_path("historique")
-            if not chemin_historique:
-                self.logger.log_error("Chemin 'historique' introuvable")
-                return False
-
-            chemin_fichier = Path(chemin_historique) / nom_fichier
-
             # 🛡️👁️‍🗨️🛡️   # VALIDATION FORMAT SORTIE
             self.auditor.valider_format_sortie(interaction_element)
 
-            # --- 2. Écriture du Fichier JSON (La source pour le résumé différé) ---
+            # --- 2. Ajout au Journal (La source pour le résumé différé) ---
             try:
-                with open(chemin_fichier, "w", encoding="utf-8") as f:
-                    json.dump(
-                        asdict(interaction_element),
-                        f,
-                        ensure_ascii=False,
-                        indent=2,
-                        cls=CustomJSONEncoder,
-                    )
-                    f.write("\n")
+                entree = self.journal_historique.ajouter(asdict(interaction_element))
             except Exception as e:
-                self.logger.log_error(f"Erreur écriture fichier historique: {e}")
+                self.logger.log_error(f"Erreur écriture journal historique: {e}")
                 return False
 
-            self.logger.log_thought(f"📜 Interaction mémorisée (Tampon): {nom_fichier}")
+            # Localisateur stable (segment#id) : remplace l'ancien chemin de fichier
+            chemin_fichier = self.journal_historique.reference(entree)
+            self.logger.log_thought(
+                f"📜 Interaction mémorisée (Journal): {entree['segment']} @ {entree['offset']}"
+            )
 
             # --- 3. Vectorisation IMMÉDIATE (Pour le court terme) ---
             # NOTE : On garde la vectorisation immédiate de l'échange brut pour que la mémoire
@@ -261,7 +241,7 @@ class AgentMemoire(AgentBase):
                         f"{interaction_element.prompt}\n{interaction_element.reponse}"
                     )
                     meta = {
-                        "fichier": str(chemin_fichier),
+                        "fichier": chemin_fichier,
                         "timestamp": interaction_element.meta.timestamp,
                         "session_id": interaction_element.meta.session_id,
                         "type": "historique_brut",  # Différent du "golden_path" futur
@@ -279,7 +259,9 @@ class AgentMemoire(AgentBase):
                         sujet=sujet_val,
                         action=action_val,
                         categorie=categorie_val,
-                        nouveau_fichier=str(chemin_fichier),
+                        session_id=interaction_element.meta.session_id,
+                        message_turn=interaction_element.meta.message_turn,
+                        nouveau_fichier=chemin_fichier,
                     )
                 except Exception as e:
                     self.logger.log_warning(f"Echec Whoosh: {e}")
@@ -535,6 +517,13 @@ class AgentMemoire(AgentBase):
                 else:
                     f.write(str(contenu))
 
+            # 4. Invalidation des résultats RAG en cache (règles lues sur disque,
+            #    résumés persistants substitués aux logs bruts)
+            if type_memoire == "regles":
+                signaler_ecriture("regles")
+            elif type_memoire == "persistante":
+                signaler_ecriture("vectoriel")
+
             self.logger.info(
                 f"💾 Mémoire sauvegardée ({type_memoire}) : {full_path.name}"
             )
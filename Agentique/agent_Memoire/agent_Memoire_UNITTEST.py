@@ -52,6 +52,18 @@ class TestAgentMemoire(unittest.TestCase):
         self.mock_agent_recherche = MagicMock()
         self.agent.agent_recherche = self.mock_agent_recherche
 
+        # 4b. Mock du Journal Historique (Segments append-only)
+        self.mock_journal = MagicMock()
+        self.mock_journal.ajouter.return_value = {
+            "id": "id_test",
+            "segment": "seg_20250101_000.jsonl",
+            "offset": 0,
+        }
+        self.mock_journal.reference.return_value = (
+            "/fake/path/historique/journal/seg_20250101_000.jsonl#id_test"
+        )
+        self.agent.journal_historique = self.mock_journal
+
         # 5. Configuration par défaut
         self.agent.config = {
             "artefacts_code": {
@@ -67,28 +79,29 @@ class TestAgentMemoire(unittest.TestCase):
     # 1. TEST SAUVEGARDE BRUTE (Sécurité WAL)
     # =========================================================================
 
-    @patch("os.fsync")  # On vérifie l'atomicité
-    def test_sauvegarder_interaction_brute_atomicite(self, mock_fsync):
+    def test_sauvegarder_interaction_brute_atomicite(self):
         """
-        Vérifie que la sauvegarde brute force bien l'écriture disque (fsync)
-        pour éviter la perte de données en cas de crash.
+        Vérifie que la sauvegarde brute passe par le WAL (Group Commit) et attend
+        sa confirmation de durabilité (le fsync lui-même est testé dans wal_brute_UNITTEST).
         """
         # Données factices
         interaction_txt = "User: Hello"
+        self.agent.wal_brute = MagicMock()
+        self.agent.wal_brute.ecrire.return_value = True
 
-        # Mock de l'ouverture fichier
-        m = mock_open()
-        with patch("builtins.open", m):
-            with patch("pathlib.Path.exists", return_value=True):
-                res = self.agent.sauvegarder_interaction_brute(
-                    interaction_txt, contenu="Hello"
-                )
+        res = self.agent.sauvegarder_interaction_brute(interaction_txt, contenu="Hello")
 
         # Assertions
         self.assertTrue(res)
-        handle = m()
-        handle.flush.assert_called()  # Doit flusher le buffer Python
-        mock_fsync.assert_called()  # Doit forcer l'OS à écrire sur le disque
+        donnees = self.agent.wal_brute.ecrire.call_args[0][0]
+        self.assertEqual(donnees["role"], interaction_txt)
+        self.assertEqual(donnees["contenu"], "Hello")
+
+        # Échec de durabilité -> False (pas d'acquittement mensonger)
+        self.agent.wal_brute.ecrire.return_value = False
+        self.assertFalse(
+            self.agent.sauvegarder_interaction_brute(interaction_txt, contenu="Hello")
+        )
 
     # =========================================================================
     # 2. TEST MEMORISATION ACTIVE (Hot Path)
@@ -129,6 +142,10 @@ class TestAgentMemoire(unittest.TestCase):
         # 1. Validation Auditor
         self.agent.auditor.valider_format_sortie.assert_called_with(interaction)
 
+        # 1b. Persistance dans le journal (plus de fichier JSON individuel)
+        self.mock_journal.ajouter.assert_called_once()
+        m_open.assert_not_called()
+
         # 2. Vectorisation Immédiate (Moteur Narratif)
         self.mock_moteur_narratif.ajouter_fragment.assert_called()
         args_vec, _ = self.mock_moteur_narratif.ajouter_fragment.call_args
@@ -138,6 +155,9 @@ class TestAgentMemoire(unittest.TestCase):
         self.mock_agent_recherche.update_index.assert_called()
         _, kwargs_idx = self.mock_agent_recherche.update_index.call_args
         self.assertEqual(kwargs_idx["sujet"], "code")  # Vérification nettoyage
+        self.assertEqual(
+            kwargs_idx["nouveau_fichier"], self.mock_journal.reference.return_value
+        )
 
     # =========================================================================
     # 3. TEST FILTRAGE CODE (Anti-Pollution)
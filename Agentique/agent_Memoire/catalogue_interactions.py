@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CatalogueInteractions - Catalogue analytique matérialisé de l'historique (SQLite)
+Module d'infrastructure adossé au JournalHistorique.
+
+Les analyses taxonomiques (`rechercher_par_classification`, `statistiques_semantiques`,
+`exporter_donnees_semantiques`) relisaient le contenu des interactions puis agrégeaient en
+Python. Ce catalogue (SQLite, bibliothèque standard) matérialise UNE ligne par interaction :
+1.  **Table `interactions`** : id, timestamp, jour, sujet, action, categorie, session,
+    tour, score du juge, longueur, consolidation. Index sur (timestamp) et (axe, timestamp).
+2.  **Table `tags_interaction`** : une ligne par (interaction, tag normalisé) -> filtre indexé.
+3.  **Rollups journaliers** (`rollup_jour`, `rollup_tags_jour`) : compteurs par jour et par
+    combinaison Sujet/Action/Catégorie (resp. par tag), maintenus par triggers SQLite à
+    chaque insertion, mise à jour ou suppression : le tableau de bord ne balaye plus rien.
+
+Alimentation incrémentale : `JournalHistorique.ajouter` (donc `memoriser_interaction`),
+la migration legacy et la resynchronisation du consolidateur (`synchroniser_catalogue`).
+Le contenu (prompt/réponse) reste dans le journal : le catalogue ne stocke que des métadonnées.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+NOM_CATALOGUE = "catalogue.sqlite3"
+AXES = ("sujet", "action", "categorie")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS interactions (
+    id TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL DEFAULT '',
+    jour TEXT NOT NULL DEFAULT '',
+    sujet TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    action TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    categorie TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    tags TEXT NOT NULL DEFAULT '[]',
+    session_id TEXT,
+    message_turn INTEGER,
+    score_juge REAL NOT NULL DEFAULT 0,
+    longueur INTEGER NOT NULL DEFAULT 0,
+    fichier TEXT,
+    consolide INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_interactions_ts ON interactions(timestamp);
+CREATE INDEX IF NOT EXISTS idx_interactions_sujet ON interactions(sujet, timestamp);
+CREATE INDEX IF NOT EXISTS idx_interactions_action ON interactions(action, timestamp);
+CREATE INDEX IF NOT EXISTS idx_interactions_categorie ON interactions(categorie, timestamp);
+CREATE INDEX IF NOT EXISTS idx_interactions_session ON interactions(session_id, message_turn);
+
+CREATE TABLE IF NOT EXISTS tags_interaction (
+    id TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    jour TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (id, tag)
+);
+CREATE INDEX IF NOT EXISTS idx_tags_tag ON tags_interaction(tag, jour);
+
+CREATE TABLE IF NOT EXISTS rollup_jour (
+    jour TEXT NOT NULL,
+    sujet TEXT NOT NULL,
+    action TEXT NOT NULL,
+    categorie TEXT NOT NULL,
+    nb INTEGER NOT NULL DEFAULT 0,
+    somme_score REAL NOT NULL DEFAULT 0,
+    somme_longueur INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (jour, sujet, action, categorie)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_tags_jour (
+    jour TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    nb INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (jour, tag)
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_interactions_insert AFTER INSERT ON interactions BEGIN
+    INSERT INTO rollup_jour (jour, sujet, action, categorie, nb, somme_score, somme_longueur)
+    VALUES (NEW.jour, NEW.sujet, NEW.action, NEW.categorie, 1, NEW.score_juge, NEW.longueur)
+    ON CONFLICT (jour, sujet, action, categorie) DO UPDATE SET
+        nb = nb + 1,
+        somme_score = somme_score + excluded.somme_score,
+        somme_longueur = somme_longueur + excluded.somme_longueur;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_interactions_delete AFTER DELETE ON interactions BEGIN
+    UPDATE rollup_jour SET
+        nb = nb - 1,
+        somme_score = somme_score - OLD.score_juge,
+        somme_longueur = somme_longueur - OLD.longueur
+    WHERE jour = OLD.jour AND sujet = OLD.sujet AND action = OLD.action AND categorie = OLD.categorie;
+    DELETE FROM rollup_jour
+    WHERE jour = OLD.jour AND sujet = OLD.sujet AND action = OLD.action AND categorie = OLD.categorie
+        AND nb <= 0;
+    DELETE FROM tags_interaction WHERE id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_interactions_update
+AFTER UPDATE OF jour, sujet, action, categorie, score_juge, longueur ON interactions BEGIN
+    UPDATE rollup_jour SET
+        nb = nb - 1,
+        somme_score = somme_score - OLD.score_juge,
+        somme_longueur = somme_longueur - OLD.longueur
+    WHERE jour = OLD.jour AND sujet = OLD.sujet AND action = OLD.action AND categorie = OLD.categorie;
+    DELETE FROM rollup_jour
+    WHERE jour = OLD.jour AND sujet = OLD.sujet AND action = OLD.action AND categorie = OLD.categorie
+        AND nb <= 0;
+    INSERT INTO rollup_jour (jour, sujet, action, categorie, nb, somme_score, somme_longueur)
+    VALUES (NEW.jour, NEW.sujet, NEW.action, NEW.categorie, 1, NEW.score_juge, NEW.longueur)
+    ON CONFLICT (jour, sujet, action, categorie) DO UPDATE SET
+        nb = nb + 1,
+        somme_score = somme_score + excluded.somme_score,
+        somme_longueur = somme_longueur + excluded.somme_longueur;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tags_insert AFTER INSERT ON tags_interaction BEGIN
+    INSERT INTO rollup_tags_jour (jour, tag, nb) VALUES (NEW.jour, NEW.tag, 1)
+    ON CONFLICT (jour, tag) DO UPDATE SET nb = nb + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tags_delete AFTER DELETE ON tags_interaction BEGIN
+    UPDATE rollup_tags_jour SET nb = nb - 1 WHERE jour = OLD.jour AND tag = OLD.tag;
+    DELETE FROM rollup_tags_jour WHERE jour = OLD.jour AND tag = OLD.tag AND nb <= 0;
+END;
+"""
+
+
+def _valeur(val: Any) -> str:
+    return str(getattr(val, "value", val) or "")
+
+
+def _jour(timestamp: str) -> str:
+    """'AAAA-MM-JJ' depuis un timestamp ISO ('' si illisible)."""
+    try:
+        return datetime.fromisoformat(str(timestamp).replace("Z", "+00:00")).strftime("%Y-%m-%d")
+    except (TypeError, ValueError):
+        return ""
+
+
+def ligne_catalogue(entree: Dict[str, Any], donnees: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Projette une interaction (entrée d'index + données `asdict(Interaction)`) en ligne de catalogue.
+
+    Tags : `classification.tags` (ancien format) ou `intention.tags`. Score : `meta.score_qualite`.
+    Longueur : `meta.len_contenu`, sinon longueur prompt + réponse.
+    """
+    meta = donnees.get("meta") or {}
+    taxonomie = donnees.get("classification") or donnees.get("intention") or {}
+    if not isinstance(taxonomie, dict):
+        taxonomie = {}
+
+    tags = taxonomie.get("tags") or []
+    if isinstance(tags, str):
+        tags = [tags]
+
+    timestamp = str(entree.get("timestamp") or meta.get("timestamp") or donnees.get("timestamp") or "")
+    longueur = meta.get("len_contenu") or (
+        len(str(donnees.get("prompt") or "")) + len(str(donnees.get("reponse") or ""))
+    )
+    try:
+        score = float(meta.get("score_qualite") or 0.0)
+    except (TypeError, ValueError):
+        score = 0.0
+
+    return {
+        "id": str(entree["id"]),
+        "timestamp": timestamp,
+        "jour": _jour(timestamp),
+        "sujet": entree.get("sujet") or _valeur(taxonomie.get("sujet")),
+        "action": entree.get("action") or _valeur(taxonomie.get("action")),
+        "categorie": entree.get("categorie") or _valeur(taxonomie.get("categorie")),
+        "tags": [str(t) for t in tags if str(t).strip()],
+        "session_id": entree.get("session_id") or meta.get("session_id"),
+        "message_turn": entree.get("message_turn") or meta.get("message_turn"),
+        "score_juge": score,
+        "longueur": int(longueur or 0),
+        "fichier": entree.get("fichier"),
+    }
+
+
+class CatalogueInteractions:
+    """
+    Catalogue SQLite (mode WAL) partagé par toutes les instances du JournalHistorique.
+
+    Attributes:
+        chemin (Path): Fichier SQLite (à côté de l'index du journal).
+    """
+
+    def __init__(self, chemin: Path):
+        self.chemin = Path(chemin)
+        self.chemin.parent.mkdir(parents=True, exist_ok=True)
+        self._verrou = threading.Lock()
+        self._connexion = sqlite3.connect(
+            str(self.chemin), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._connexion.row_factory = sqlite3.Row
+        with self._verrou:
+            self._connexion.execute("PRAGMA journal_mode=WAL")
+            self._connexion.execute("PRAGMA synchronous=NORMAL")
+            self._connexion.executescript(_SCHEMA)
+
+    def fermer(self):
+        with self._verrou:
+            self._connexion.close()
+
+    # =========================================================================
+    # ✍️ ÉCRITURE
+    # =========================================================================
+
+    def enregistrer(self, entree: Dict[str, Any], donnees: Dict[str, Any]):
+        """Ajoute (ou remplace) une interaction."""
+        self.enregistrer_lot([ligne_catalogue(entree, donnees)])
+
+    def enregistrer_lot(self, lignes: Iterable[Dict[str, Any]]) -> int:
+        """Upsert transactionnel d'un lot de lignes (`ligne_catalogue`). Retourne le nombre écrit."""
+        lignes = list(lignes)
+        if not lignes:
+            return 0
+        with self._verrou:
+            curseur = self._connexion.cursor()
+            curseur.execute("BEGIN IMMEDIATE")
+            try:
+                for ligne in lignes:
+                    self._upsert(curseur, ligne)
+                curseur.execute("COMMIT")
+            except Exception:
+                curseur.execute("ROLLBACK")
+                raise
+        return len(lignes)
+
+    @staticmethod
+    def _upsert(curseur: sqlite3.Cursor, ligne: Dict[str, Any]):
+        curseur.execute(
+            """
+            INSERT INTO interactions (id, timestamp, jour, sujet, action, categorie, tags,
+                                      session_id, message_turn, score_juge, longueur, fichier)
+            VALUES (:id, :timestamp, :jour, :sujet, :action, :categorie, :tags,
+                    :session_id, :message_turn, :score_juge, :longueur, :fichier)
+            ON CONFLICT (id) DO UPDATE SET
+                timestamp = excluded.timestamp, jour = excluded.jour,
+                sujet = excluded.sujet, action = excluded.action, categorie = excluded.categorie,
+                tags = excluded.tags, session_id = excluded.session_id,
+                message_turn = excluded.message_turn, score_juge = excluded.score_juge,
+                longueur = excluded.longueur, fichier = excluded.fichier
+            """,
+            dict(ligne, tags=json.dumps(ligne["tags"], ensure_ascii=False)),
+        )
+        curseur.execute("DELETE FROM tags_interaction WHERE id = ?", (ligne["id"],))
+        curseur.executemany(
+            "INSERT OR IGNORE INTO tags_interaction (id, tag, jour) VALUES (?, ?, ?)",
+            [(ligne["id"], tag.lower(), ligne["jour"]) for tag in ligne["tags"]],
+        )
+
+    def marquer_consolidee(self, interaction_id: str) -> bool:
+        """Le consolidateur a produit le résumé de cette interaction."""
+        with self._verrou:
+            curseur = self._connexion.execute(
+                "UPDATE interactions SET consolide = 1 WHERE id = ?", (interaction_id,)
+            )
+            return curseur.rowcount > 0
+
+    def supprimer(self, ids: Iterable[str]) -> int:
+        ids = list(ids)
+        with self._verrou:
+            curseur = self._connexion.executemany(
+                "DELETE FROM interactions WHERE id = ?", [(i,) for i in ids]
+            )
+            return curseur.rowcount
+
+    # =========================================================================
+    # 🔎 REQUÊTES INDEXÉES
+    # =========================================================================
+
+    def ids(self) -> set:
+        with self._verrou:
+            return {r[0] for r in self._connexion.execute("SELECT id FROM interactions")}
+
+    def compter(self) -> int:
+        with self._verrou:
+            return self._connexion.execute("SELECT COUNT(*) FROM interactions").fetchone()[0]
+
+    def rechercher(
+        self,
+        sujet: Optional[str] = None,
+        action: Optional[str] = None,
+        categorie: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        depuis: Optional[datetime] = None,
+        jusqua: Optional[datetime] = None,
+        limite: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Lignes filtrées par taxonomie / tags (au moins un) / fenêtre, timestamp décroissant."""
+        clauses, params = self._filtres(sujet, action, categorie, tags, depuis, jusqua)
+        sql = f"SELECT * FROM interactions i {clauses} ORDER BY i.timestamp DESC"
+        if limite is not None:
+            sql += " LIMIT ?"
+            params.append(int(limite))
+        with self._verrou:
+            lignes = self._connexion.execute(sql, params).fetchall()
+        return [dict(r, tags=json.loads(r["tags"] or "[]")) for r in lignes]
+
+    @staticmethod
+    def _filtres(sujet, action, categorie, tags, depuis, jusqua) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        for colonne, valeur in zip(AXES, (sujet, action, categorie)):
+            if valeur:
+                clauses.append(f"i.{colonne} = ?")
+                params.append(_valeur(valeur))
+        if depuis:
+            clauses.append("i.timestamp >= ?")
+            params.append(depuis.isoformat())
+        if jusqua:
+            clauses.append("i.timestamp < ?")
+            params.append(jusqua.isoformat())
+        if tags:
+            marqueurs = ", ".join("?" for _ in tags)
+            clauses.append(
+                f"EXISTS (SELECT 1 FROM tags_interaction t WHERE t.id = i.id AND t.tag IN ({marqueurs}))"
+            )
+            params.extend(t.lower() for t in tags)
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def statistiques(self, depuis: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Agrégats du tableau de bord depuis les rollups journaliers.
+
+        Les jours entiers de la fenêtre sont lus dans `rollup_jour` / `rollup_tags_jour` ;
+        seul le premier jour (partiel) est complété par une requête indexée sur le timestamp.
+
+        Returns:
+            Dict: total, par_sujet, par_action, par_categorie, combinaisons_frequentes,
+            tags_frequents, evolution_temporelle (jour -> nb), score_moyen, longueur_moyenne.
+        """
+        jour_depuis = depuis.strftime("%Y-%m-%d") if depuis else ""
+        with self._verrou:
+            combinaisons = self._connexion.execute(
+                """
+                SELECT jour, sujet, action, categorie, nb, somme_score, somme_longueur
+                FROM rollup_jour WHERE jour > ?
+                """,
+                (jour_depuis,),
+            ).fetchall()
+            tags = self._connexion.execute(
+                "SELECT tag, SUM(nb) FROM rollup_tags_jour WHERE jour > ? GROUP BY tag",
+                (jour_depuis,),
+            ).fetchall()
+            if depuis:
+                # Premier jour partiel (et timestamps sans date exploitable exclus comme avant)
+                combinaisons += self._connexion.execute(
+                    """
+                    SELECT jour, sujet, action, categorie, COUNT(*), SUM(score_juge), SUM(longueur)
+                    FROM interactions WHERE jour = ? AND timestamp >= ?
+                    GROUP BY jour, sujet, action, categorie
+                    """,
+                    (jour_depuis, depuis.isoformat()),
+                ).fetchall()
+                tags += self._connexion.execute(
+                    """
+                    SELECT t.tag, COUNT(*) FROM tags_interaction t JOIN interactions i ON i.id = t.id
+                    WHERE t.jour = ? AND i.timestamp >= ? GROUP BY t.tag
+                    """,
+                    (jour_depuis, depuis.isoformat()),
+                ).fetchall()
+            else:
+                combinaisons += self._connexion.execute(
+                    """
+                    SELECT jour, sujet, action, categorie, nb, somme_score, somme_longueur
+                    FROM rollup_jour WHERE jour = ''
+                    """
+                ).fetchall()
+                tags += self._connexion.execute(
+                    "SELECT tag, SUM(nb) FROM rollup_tags_jour WHERE jour = '' GROUP BY tag"
+                ).fetchall()
+
+        stats = {
+            "total": 0,
+            "par_sujet": {},
+            "par_action": {},
+            "par_categorie": {},
+            "combinaisons_frequentes": {},
+            "tags_frequents": {},
+            "evolution_temporelle": {},
+        }
+        somme_score = somme_longueur = 0.0
+        for jour, sujet, action, categorie, nb, score, longueur in combinaisons:
+            stats["total"] += nb
+            somme_score += score or 0.0
+            somme_longueur += longueur or 0
+            for cle, valeur in (("par_sujet", sujet), ("par_action", action), ("par_categorie", categorie)):
+                stats[cle][valeur] = stats[cle].get(valeur, 0) + nb
+            combo = f"{sujet}/{action}/{categorie}"
+            stats["combinaisons_frequentes"][combo] = stats["combinaisons_frequentes"].get(combo, 0) + nb
+            if jour:
+                stats["evolution_temporelle"][jour] = stats["evolution_temporelle"].get(jour, 0) + nb
+        for tag, nb in tags:
+            stats["tags_frequents"][tag] = stats["tags_frequents"].get(tag, 0) + nb
+
+        for cle in ("par_sujet", "par_action", "par_categorie", "combinaisons_frequentes", "tags_frequents"):
+            stats[cle] = dict(sorted(stats[cle].items(), key=lambda x: x[1], reverse=True))
+        stats["evolution_temporelle"] = dict(sorted(stats["evolution_temporelle"].items()))
+        stats["score_moyen"] = round(somme_score / stats["total"], 4) if stats["total"] else 0.0
+        stats["longueur_moyenne"] = round(somme_longueur / stats["total"], 1) if stats["total"] else 0.0
+        return stats
+
+
+__all__ = ["CatalogueInteractions", "NOM_CATALOGUE", "ligne_catalogue"]
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: Catalogue analytique des interactions
+Cible : agentique/sous_agents_gouvernes/agent_Memoire/catalogue_interactions.py
+Objectif : Valider la projection des interactions, les requêtes indexées (taxonomie, tags,
+fenêtre), la cohérence des rollups journaliers et l'alimentation par le JournalHistorique.
+"""
+
+import unittest
+import shutil
+import tempfile
+from datetime import datetime
+from unittest.mock import MagicMock
+from pathlib import Path
+
+from agentique.sous_agents_gouvernes.agent_Memoire.catalogue_interactions import (
+    CatalogueInteractions,
+    ligne_catalogue,
+)
+from agentique.sous_agents_gouvernes.agent_Memoire.journal_historique import (
+    JournalHistorique,
+)
+
+
+def _interaction(i: int, sujet: str = "Script", jour: str = "2025-01-15", tags=None) -> dict:
+    """Dictionnaire au format asdict(Interaction)."""
+    return {
+        "prompt": f"Question {i}",
+        "reponse": f"Réponse {i}",
+        "intention": {"sujet": sujet, "action": "Coder", "categorie": "Agent", "tags": tags or []},
+        "contexte_memoire": [],
+        "meta": {
+            "id": f"id_{i}",
+            "timestamp": f"{jour}T10:00:{i:02d}",
+            "session_id": "S1",
+            "message_turn": i,
+            "score_qualite": 0.5,
+        },
+    }
+
+
+def _ligne(i: int, **kwargs) -> dict:
+    donnees = _interaction(i, **kwargs)
+    return ligne_catalogue({"id": donnees["meta"]["id"]}, donnees)
+
+
+class TestCatalogueInteractions(unittest.TestCase):
+    def setUp(self):
+        self.dossier = Path(tempfile.mkdtemp())
+        self.catalogue = CatalogueInteractions(self.dossier / "catalogue.sqlite3")
+
+    def tearDown(self):
+        self.catalogue.fermer()
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def test_projection(self):
+        ligne = _ligne(3, tags=["FAISS"])
+        self.assertEqual((ligne["jour"], ligne["sujet"], ligne["tags"]), ("2025-01-15", "Script", ["FAISS"]))
+        self.assertEqual(ligne["longueur"], len("Question 3") + len("Réponse 3"))
+        self.assertEqual(ligne["score_juge"], 0.5)
+
+    def test_requetes_indexees(self):
+        self.catalogue.enregistrer_lot(
+            [
+                _ligne(1, jour="2025-01-14", tags=["faiss"]),
+                _ligne(2, sujet="SecondMind", jour="2025-01-15"),
+                _ligne(3, jour="2025-01-16", tags=["Whoosh", "FAISS"]),
+            ]
+        )
+
+        self.assertEqual([r["id"] for r in self.catalogue.rechercher(sujet="script")], ["id_3", "id_1"])
+        self.assertEqual([r["id"] for r in self.catalogue.rechercher(tags=["FAISS"], limite=1)], ["id_3"])
+        depuis = datetime(2025, 1, 15)
+        self.assertEqual(len(self.catalogue.rechercher(depuis=depuis)), 2)
+
+    def test_rollups_coherents(self):
+        """Les rollups suivent insertions, mises à jour (re-classification) et suppressions."""
+        self.catalogue.enregistrer_lot([_ligne(i, tags=["faiss"]) for i in range(1, 4)])
+        self.catalogue.enregistrer_lot([_ligne(4, jour="2025-01-16")])
+        self.catalogue.enregistrer_lot([_ligne(1, sujet="SecondMind")])  # Re-classification
+        self.catalogue.supprimer(["id_2"])
+
+        stats = self.catalogue.statistiques()
+        self.assertEqual(stats["total"], 3)
+        self.assertEqual(stats["par_sujet"], {"Script": 2, "SecondMind": 1})
+        self.assertEqual(stats["tags_frequents"], {"faiss": 1})  # id_1 re-classé sans tag, id_2 supprimé
+        self.assertEqual(stats["evolution_temporelle"], {"2025-01-15": 2, "2025-01-16": 1})
+        self.assertEqual(stats["score_moyen"], 0.5)
+
+        # Fenêtre : jour de coupure partiel (id_1 à 10:00:01 exclu) + jours entiers suivants
+        stats = self.catalogue.statistiques(depuis=datetime(2025, 1, 15, 10, 0, 2))
+        self.assertEqual(stats["total"], 2)
+        self.assertEqual(stats["combinaisons_frequentes"], {"Script/Coder/Agent": 2})
+
+    def test_alimentation_par_le_journal(self):
+        journal = JournalHistorique.__new__(JournalHistorique)
+        journal.logger = MagicMock()
+        journal._initialiser_stockage(self.dossier / "historique", {})
+        try:
+            journal.ajouter(_interaction(1, tags=["faiss"]))
+            self.assertEqual(journal.catalogue.compter(), 1)
+
+            # Interaction écrite catalogue désactivé (autre instance) : rattrapée par la synchro
+            journal.catalogue, catalogue = None, journal.catalogue
+            journal.ajouter(_interaction(2))
+            journal.catalogue = catalogue
+            self.assertEqual(journal.synchroniser_catalogue(), 1)
+            self.assertEqual(journal.synchroniser_catalogue(), 0)
+
+            self.assertTrue(catalogue.marquer_consolidee("id_2"))
+            self.assertEqual(catalogue.rechercher(tags=["FAISS"])[0]["session_id"], "S1")
+        finally:
+            journal.catalogue.fermer()
+            journal.fermer()
+
+
+if __name__ == "__main__":
+    unittest.main()
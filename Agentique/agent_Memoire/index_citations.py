@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndexCitations - Index n-grammes (trigrammes) pour la recherche de citations exactes
+Module d'infrastructure adossé au JournalHistorique.
+
+Whoosh tokenise le champ `content` sans positions : il ne sait pas prouver une citation
+verbatim (ponctuation, casse, espaces). `rechercher_citation_exacte` balayait donc tout le
+journal. Cet index (SQLite FTS5, tokenizer `trigram`, bibliothèque standard) résout une phrase
+en candidats sans lire l'historique :
+1.  **Postings trigrammes** : chaque prompt/réponse est découpé en trigrammes sensibles à la
+    casse ; une phrase de N >= 3 caractères n'est candidate que là où ses N-2 trigrammes
+    apparaissent consécutivement (FTS5 stocke les positions, compressées par varint).
+2.  **Sans contenu** (`content=''`) : le texte reste dans le journal, l'index ne garde que
+    les postings. Une table `documents` relie le rowid FTS à l'ID d'interaction ; une
+    réindexation ré-attribue le rowid, l'ancien devient orphelin et est ignoré.
+3.  **Preuve** : les candidats sont relus (accès direct) et validés par sous-chaîne ;
+    `occurrences` donne les offsets de chaque correspondance.
+
+Alimentation incrémentale par `JournalHistorique.ajouter` (donc `memoriser_interaction`).
+Une phrase de moins de 3 caractères n'est pas indexable : `candidats` retourne None.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+NOM_INDEX_CITATIONS = "citations.sqlite3"
+TAILLE_NGRAMME = 3
+CHAMPS = ("prompt", "reponse")
+
+_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS postings USING fts5(
+    prompt, reponse, content='', tokenize='trigram case_sensitive 1'
+);
+CREATE TABLE IF NOT EXISTS documents (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE
+);
+"""
+
+
+def occurrences(phrase: str, texte: str) -> List[int]:
+    """Offsets (caractères) de toutes les occurrences de `phrase` dans `texte`, chevauchements inclus."""
+    positions, debut = [], texte.find(phrase)
+    while phrase and debut != -1:
+        positions.append(debut)
+        debut = texte.find(phrase, debut + 1)
+    return positions
+
+
+class IndexCitations:
+    """
+    Index trigrammes positionnel des prompts/réponses de l'historique.
+
+    Attributes:
+        chemin (Path): Fichier SQLite (à côté de l'index du journal).
+    """
+
+    def __init__(self, chemin: Path):
+        self.chemin = Path(chemin)
+        self.chemin.parent.mkdir(parents=True, exist_ok=True)
+        self._verrou = threading.Lock()
+        self._connexion = sqlite3.connect(
+            str(self.chemin), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        with self._verrou:
+            self._connexion.execute("PRAGMA journal_mode=WAL")
+            self._connexion.execute("PRAGMA synchronous=NORMAL")
+            # Lève OperationalError si SQLite n'a pas FTS5/trigram (< 3.34) : le journal désactive l'index
+            self._connexion.executescript(_SCHEMA)
+
+    def fermer(self):
+        with self._verrou:
+            self._connexion.close()
+
+    # =========================================================================
+    # ✍️ ÉCRITURE
+    # =========================================================================
+
+    def indexer(self, interaction_id: str, prompt: str, reponse: str):
+        self.indexer_lot([(interaction_id, prompt, reponse)])
+
+    def indexer_lot(self, documents: Iterable[Tuple[str, str, str]]) -> int:
+        """Indexe (ou réindexe) un lot de (id, prompt, réponse) en une transaction."""
+        documents = list(documents)
+        if not documents:
+            return 0
+        with self._verrou:
+            curseur = self._connexion.cursor()
+            curseur.execute("BEGIN IMMEDIATE")
+            try:
+                for interaction_id, prompt, reponse in documents:
+                    curseur.execute("DELETE FROM documents WHERE id = ?", (interaction_id,))
+                    curseur.execute("INSERT INTO documents (id) VALUES (?)", (interaction_id,))
+                    curseur.execute(
+                        "INSERT INTO postings (rowid, prompt, reponse) VALUES (?, ?, ?)",
+                        (curseur.lastrowid, prompt or "", reponse or ""),
+                    )
+                curseur.execute("COMMIT")
+            except Exception:
+                curseur.execute("ROLLBACK")
+                raise
+        return len(documents)
+
+    def optimiser(self):
+        """Fusionne les b-trees FTS5 (à lancer en arrière-plan, ex: compaction)."""
+        with self._verrou:
+            self._connexion.execute("INSERT INTO postings (postings) VALUES ('optimize')")
+
+    # =========================================================================
+    # 🔎 REQUÊTES
+    # =========================================================================
+
+    def ids(self) -> set:
+        with self._verrou:
+            return {r[0] for r in self._connexion.execute("SELECT id FROM documents")}
+
+    def compter(self) -> int:
+        with self._verrou:
+            return self._connexion.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def candidats(self, phrase: str) -> Optional[List[str]]:
+        """
+        IDs des interactions dont le prompt ou la réponse contient (probablement) `phrase`.
+
+        Returns:
+            List[str] (à valider par sous-chaîne), ou None si la phrase est trop courte
+            pour l'index (< 3 caractères) : l'appelant doit balayer le journal.
+        """
+        if len(phrase) < TAILLE_NGRAMME:
+            return None
+        requete = '"' + phrase.replace('"', '""') + '"'
+        with self._verrou:
+            lignes = self._connexion.execute(
+                """
+                SELECT d.id FROM postings p JOIN documents d ON d.rowid = p.rowid
+                WHERE postings MATCH ?
+                """,
+                (requete,),
+            ).fetchall()
+        return [r[0] for r in lignes]
+
+
+def localiser(phrase: str, donnees: Dict) -> Dict[str, List[int]]:
+    """Offsets de `phrase` par champ (`prompt`, `reponse`) ; champs sans occurrence omis."""
+    resultat = {}
+    for champ in CHAMPS:
+        positions = occurrences(phrase, str(donnees.get(champ) or ""))
+        if positions:
+            resultat[champ] = positions
+    return resultat
+
+
+__all__ = ["IndexCitations", "NOM_INDEX_CITATIONS", "localiser", "occurrences"]
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: Index de citations (trigrammes)
+Cible : agentique/sous_agents_gouvernes/agent_Memoire/index_citations.py
+Objectif : Valider les candidats (casse, ponctuation, réindexation), les offsets, et
+l'équivalence de `JournalHistorique.rechercher_citation` avec le balayage brute-force.
+"""
+
+import unittest
+import json
+import shutil
+import tempfile
+from unittest.mock import MagicMock
+from pathlib import Path
+
+from agentique.sous_agents_gouvernes.agent_Memoire.index_citations import (
+    IndexCitations,
+    localiser,
+    occurrences,
+)
+from agentique.sous_agents_gouvernes.agent_Memoire.journal_historique import (
+    JournalHistorique,
+)
+
+PHRASES = ["Il faut « vraiment » tester", "FAISS, puis Whoosh.", "ligne\nsuivante", "Réponse 1"]
+
+
+def _interaction(i: int) -> dict:
+    """Dictionnaire au format asdict(Interaction)."""
+    return {
+        "prompt": f"Question {i} : {PHRASES[i % 2]} ?" if i % 3 else f"Question {i}",
+        "reponse": f"Réponse {i}\n{'ligne' if i % 4 else 'Ligne'}\nsuivante",
+        "intention": {"sujet": "Script", "action": "Coder", "categorie": "Agent"},
+        "meta": {"id": f"id_{i}", "timestamp": f"2025-01-15T10:00:{i:02d}", "session_id": "S1"},
+    }
+
+
+class TestIndexCitations(unittest.TestCase):
+    def setUp(self):
+        self.dossier = Path(tempfile.mkdtemp())
+        self.index = IndexCitations(self.dossier / "citations.sqlite3")
+
+    def tearDown(self):
+        self.index.fermer()
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def test_candidats(self):
+        self.index.indexer_lot(
+            [("a", 'Il a dit "Bonjour, le Monde !"', ""), ("b", "", "bonjour, le monde")]
+        )
+        self.assertEqual(self.index.candidats('"Bonjour, le Monde !"'), ["a"])
+        self.assertEqual(self.index.candidats("bonjour, le"), ["b"])  # Sensible à la casse
+        self.assertEqual(self.index.candidats("absent"), [])
+        self.assertIsNone(self.index.candidats("le"))  # Trop court pour un trigramme
+
+        self.index.indexer("a", "Texte corrigé", "")  # Réindexation : l'ancien rowid est orphelin
+        self.assertEqual(self.index.candidats("Bonjour, le Monde"), [])
+        self.assertEqual(self.index.compter(), 2)
+
+    def test_offsets(self):
+        self.assertEqual(occurrences("aa", "aaa"), [0, 1])
+        self.assertEqual(localiser("abc", {"prompt": "xabc", "reponse": "rien"}), {"prompt": [1]})
+
+
+class TestRechercheCitationJournal(unittest.TestCase):
+    def setUp(self):
+        self.dossier = Path(tempfile.mkdtemp())
+        self.journal = JournalHistorique.__new__(JournalHistorique)
+        self.journal.logger = MagicMock()
+        self.journal._initialiser_stockage(self.dossier, {"catalogue": False})
+        for i in range(40):
+            self.journal.ajouter(_interaction(i))
+
+    def tearDown(self):
+        self.journal.index_citations.fermer()
+        self.journal.fermer()
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def _force_brute(self, phrase: str) -> set:
+        return {
+            e["id"]
+            for e, d in self.journal.iterer()
+            if phrase in d.get("prompt", "") or phrase in d.get("reponse", "")
+        }
+
+    def test_equivalence_avec_le_balayage(self):
+        self.journal.rechercher_sous_chaine = MagicMock(side_effect=AssertionError("balayage"))
+        for phrase in PHRASES:
+            trouves = {e["id"] for e, _, _ in self.journal.rechercher_citation(phrase)}
+            self.assertEqual(trouves, self._force_brute(phrase), phrase)
+            self.assertTrue(trouves, phrase)
+
+        _, donnees, offsets = next(self.journal.rechercher_citation("Réponse 1\n"))
+        self.assertEqual(donnees["reponse"][offsets["reponse"][0] :][:10], "Réponse 1\n")
+
+    def test_index_en_retard_repli_et_rattrapage(self):
+        self.journal.index_citations, index = None, self.journal.index_citations
+        self.journal.ajouter(_interaction(40))
+        self.journal.index_citations = index
+
+        # Index incomplet : balayage exhaustif, puis rattrapage par la compaction
+        trouves = {e["id"] for e, _, _ in self.journal.rechercher_citation("Question 40")}
+        self.assertEqual(trouves, {"id_40"})
+        self.assertEqual(self.journal.synchroniser_index_citations(), 1)
+        self.assertEqual(index.candidats("Question 40"), ["id_40"])
+
+    def test_fichiers_legacy_non_migres(self):
+        (self.dossier / "interaction_leg1.json").write_text(
+            json.dumps(dict(_interaction(1), prompt="Phrase héritée unique", meta={"id": "leg1"})),
+            encoding="utf-8",
+        )
+        balayage = {
+            e["id"]
+            for e, d in self.journal.rechercher_sous_chaine("Phrase héritée")
+            if "Phrase héritée" in d["prompt"]
+        }
+        self.assertEqual(balayage, {"leg1"})
+
+        # Index à jour (le legacy n'y est pas) : le chemin indexé lit aussi les fichiers non migrés
+        self.journal.rechercher_sous_chaine = MagicMock(side_effect=AssertionError("balayage"))
+        trouves = [e["id"] for e, _, _ in self.journal.rechercher_citation("Phrase héritée")]
+        self.assertEqual(trouves, ["leg1"])
+
+        # Après migration (projeté dans l'index), toujours une seule occurrence
+        self.journal.compacter()
+        trouves = [e["id"] for e, _, _ in self.journal.rechercher_citation("Phrase héritée")]
+        self.assertEqual(trouves, ["leg1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
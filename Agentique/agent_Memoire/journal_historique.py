@@ -0,0 +1,874 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JournalHistorique - Stockage Log-Structuré de l'Historique des Interactions
+Module d'infrastructure remplaçant le modèle "1 interaction = 1 fichier JSON" dans 'historique/'.
+
+Ce module implémente un journal segmenté en ajout seul (append-only) :
+1.  **Segments** : Fichiers JSONL (`seg_AAAAMMJJ_NNN.jsonl`), un par jour, avec rotation à N Mo.
+    Chaque ligne est une `Interaction` sérialisée (même dictionnaire que les anciens fichiers).
+2.  **Index Primaire** : `index.jsonl` (une ligne par interaction) donnant, pour chaque ID,
+    le segment, l'offset et la longueur de l'enregistrement + les clés de tri (session, tour, tags).
+    L'index est rechargé incrémentalement (lecture de la queue) : plusieurs instances (Mémoire,
+    Recherche, Processeur, Auditor) voient les nouvelles écritures sans coordination.
+3.  **Lecteur de Compatibilité** : Les anciens fichiers `interaction_*.json` restent lisibles
+    tant qu'ils n'ont pas été migrés.
+4.  **Compaction (Arrière-plan)** : Migre les anciens fichiers dans les segments, fusionne les
+    petits segments clos d'un même mois et réécrit l'index quand il contient trop d'entrées périmées.
+5.  **Catalogue Analytique** : Chaque ajout est aussi projeté dans `catalogue.sqlite3`
+    (une ligne de métadonnées par interaction + rollups journaliers, cf. `CatalogueInteractions`).
+6.  **Index de Citations** : Prompts/réponses indexés en trigrammes dans `citations.sqlite3`
+    (cf. `IndexCitations`) : `rechercher_citation` ne relit que les candidats.
+
+Résultat : les scans (recherche, consolidation, audit) deviennent des lectures séquentielles
+de quelques gros fichiers au lieu de l'ouverture de centaines de milliers de petits JSON.
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+
+from agentique.base.META_agent import AgentBase
+from agentique.base.contrats_interface import CustomJSONEncoder
+from agentique.base.demarrage import charger_yaml
+from agentique.sous_agents_gouvernes.agent_Memoire.catalogue_interactions import (
+    NOM_CATALOGUE,
+    CatalogueInteractions,
+    ligne_catalogue,
+)
+from agentique.sous_agents_gouvernes.agent_Memoire.index_citations import (
+    NOM_INDEX_CITATIONS,
+    IndexCitations,
+    localiser,
+)
+
+# Nommage des segments : seg_20250101_000.jsonl (journalier) / seg_202501_m000.jsonl (fusion mensuelle)
+MOTIF_SEGMENT = re.compile(r"^seg_(\d{6})(\d{2})?_(m?)(\d{3})\.jsonl$")
+NOM_INDEX = "index.jsonl"
+DOSSIER_LEGACY_ARCHIVE = "archive_legacy"
+MOTIF_LEGACY = "interaction_*.json"
+
+
+class JournalHistorique(AgentBase):
+    """
+    Journal segmenté de l'historique conversationnel.
+
+    Unique point d'écriture/lecture de 'historique/'. Les entrées d'index sont des dicts
+    légers (jamais le contenu) : le filtrage (session, date, taxonomie) se fait en RAM
+    avant toute lecture disque.
+
+    Attributes:
+        dossier_historique (Path): Racine 'historique/' (contient aussi les anciens fichiers).
+        dossier_journal (Path): Dossier des segments et de l'index.
+        taille_max_segment (int): Seuil de rotation d'un segment (octets).
+    """
+
+    def __init__(self, dossier_historique: str = None, config: Dict = None):
+        super().__init__(nom_agent="JournalHistorique")
+
+        if config is None:
+            config = self._load_config().get("journal_historique", {})
+
+        dossier = dossier_historique or self.auditor.get_path("historique")
+        if not dossier:
+            raise RuntimeError("❌ JournalHistorique : Chemin 'historique' introuvable.")
+
+        self._initialiser_stockage(Path(dossier), config)
+
+    def _load_config(self) -> Dict:
+        path = self.auditor.get_path("config")
+        if path and Path(path).exists():
+            return (charger_yaml(path) or {}).get("configuration", {})
+        return {}
+
+    def _initialiser_stockage(self, dossier_historique: Path, config: Dict):
+        """Prépare les dossiers, les paramètres et charge l'index existant."""
+        self.dossier_historique = dossier_historique
+        self.dossier_journal = dossier_historique / config.get("dossier", "journal")
+        self.dossier_journal.mkdir(parents=True, exist_ok=True)
+        self.chemin_index = self.dossier_journal / NOM_INDEX
+
+        self.taille_max_segment = int(
+            config.get("taille_max_segment_mo", 64) * 1024 * 1024
+        )
+        self.fsync_ecriture = config.get("fsync_ecriture", False)
+        self.conserver_legacy = config.get("conserver_legacy", True)
+        self.fusion_mensuelle = config.get("fusion_segments_mensuelle", True)
+        self.taille_min_fusion = int(config.get("taille_min_fusion_ko", 4096) * 1024)
+        self.ratio_reecriture_index = config.get("ratio_reecriture_index", 0.3)
+
+        self._verrou = threading.RLock()
+        self._handle_actif = None
+        self._segment_actif: Optional[Path] = None
+        self._thread_compaction: Optional[threading.Thread] = None
+
+        # Index RAM : id -> entrée (ordre d'insertion) + session -> [ids]
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._par_session: Dict[str, List[str]] = {}
+        self._lignes_index = 0
+        self._offset_index = 0
+        self._inode_index = None
+
+        if not self.chemin_index.exists() and any(self._lister_segments()):
+            self.reconstruire_index()
+        self._rafraichir_index()
+
+        self.catalogue: Optional[CatalogueInteractions] = None
+        if config.get("catalogue", True):
+            try:
+                self.catalogue = CatalogueInteractions(self.dossier_journal / NOM_CATALOGUE)
+            except Exception as e:
+                self.logger.log_warning(f"⚠️ Catalogue analytique indisponible : {e}")
+
+        self.index_citations: Optional[IndexCitations] = None
+        if config.get("index_citations", True):
+            try:
+                self.index_citations = IndexCitations(self.dossier_journal / NOM_INDEX_CITATIONS)
+            except Exception as e:
+                self.logger.log_warning(f"⚠️ Index de citations indisponible (FTS5 trigram requis) : {e}")
+
+    # =========================================================================
+    # ✍️ ÉCRITURE
+    # =========================================================================
+
+    def ajouter(self, donnees: Dict[str, Any], legacy: str = None) -> Dict[str, Any]:
+        """
+        Ajoute une interaction (dict issu de `asdict(Interaction)`) au segment du jour.
+
+        L'enregistrement est écrit AVANT sa ligne d'index : un crash entre les deux laisse
+        au pire un enregistrement orphelin (récupérable via `reconstruire_index`), jamais
+        un index pointant dans le vide.
+
+        Returns:
+            Dict: L'entrée d'index créée (id, segment, offset, session_id, ...).
+        """
+        with self._verrou:
+            self._rafraichir_index()
+            entree = self._ecrire_enregistrement(donnees, legacy=legacy)
+            if self.fsync_ecriture:
+                os.fsync(self._handle_actif.fileno())
+            self._ecrire_lignes_index([entree])
+        self._projeter([(entree, donnees)])
+        return entree
+
+    def _projeter(self, paires: List[Tuple[Dict[str, Any], Dict[str, Any]]]):
+        """Met à jour les index secondaires (catalogue analytique, citations)."""
+        self._cataloguer(paires)
+        self._indexer_citations(paires)
+
+    def _cataloguer(self, paires: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> int:
+        """Projette des interactions dans le catalogue (best-effort : le journal fait foi)."""
+        if self.catalogue is None or not paires:
+            return 0
+        try:
+            return self.catalogue.enregistrer_lot(ligne_catalogue(e, d) for e, d in paires)
+        except Exception as e:
+            self.logger.log_warning(f"⚠️ Catalogue analytique non mis à jour : {e}")
+            return 0
+
+    def _indexer_citations(self, paires: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> int:
+        """Indexe les prompts/réponses en trigrammes (best-effort, comme le catalogue)."""
+        if self.index_citations is None or not paires:
+            return 0
+        try:
+            return self.index_citations.indexer_lot(
+                (e["id"], str(d.get("prompt") or ""), str(d.get("reponse") or "")) for e, d in paires
+            )
+        except Exception as e:
+            self.logger.log_warning(f"⚠️ Index de citations non mis à jour : {e}")
+            return 0
+
+    def synchroniser_catalogue(self) -> int:
+        """
+        Rattrape les interactions absentes du catalogue (premier démarrage, écriture
+        concurrente d'une autre instance, échec ponctuel). Ne lit que les manquantes.
+        """
+        if self.catalogue is None:
+            return 0
+        total = self._rattraper(self.catalogue.ids(), self._cataloguer)
+        if total:
+            self.logger.info(f"📊 Catalogue analytique synchronisé : {total} interactions ajoutées.")
+        return total
+
+    def synchroniser_index_citations(self) -> int:
+        """Rattrape les interactions du journal absentes de l'index de citations."""
+        if self.index_citations is None:
+            return 0
+        # Les fichiers legacy restent hors index : `rechercher_citation` les lit directement
+        total = self._rattraper(
+            self.index_citations.ids(), self._indexer_citations, inclure_legacy=False
+        )
+        if total:
+            self.logger.info(f"🔤 Index de citations synchronisé : {total} interactions ajoutées.")
+        return total
+
+    def _rattraper(self, connus: set, projection, inclure_legacy: bool = True, taille_lot: int = 500) -> int:
+        lot, total = [], 0
+        for entree, donnees in self.iterer(exclure_ids=connus, inclure_legacy=inclure_legacy):
+            lot.append((entree, donnees))
+            if len(lot) >= taille_lot:
+                total += projection(lot)
+                lot = []
+        return total + projection(lot)
+
+    def _ecrire_enregistrement(
+        self, donnees: Dict[str, Any], legacy: str = None, jour: str = None
+    ) -> Dict[str, Any]:
+        """Écrit une ligne dans le segment actif et retourne l'entrée d'index (non persistée)."""
+        meta = donnees.get("meta") or {}
+        timestamp = str(meta.get("timestamp") or donnees.get("timestamp") or "")
+        jour = jour or self._jour_depuis_timestamp(timestamp)
+
+        ligne = (
+            json.dumps(donnees, ensure_ascii=False, cls=CustomJSONEncoder) + "\n"
+        ).encode("utf-8")
+
+        handle = self._handle_pour_jour(jour, len(ligne))
+        offset = handle.tell()
+        handle.write(ligne)
+        handle.flush()
+
+        return self._construire_entree(
+            donnees, self._segment_actif.name, offset, len(ligne), legacy
+        )
+
+    def _construire_entree(
+        self,
+        donnees: Dict[str, Any],
+        segment: str,
+        offset: int,
+        longueur: int,
+        legacy: str = None,
+    ) -> Dict[str, Any]:
+        meta = donnees.get("meta") or {}
+        intention = donnees.get("intention") or donnees.get("classification") or {}
+
+        def tag(nom):
+            val = intention.get(nom, "") if isinstance(intention, dict) else ""
+            return str(getattr(val, "value", val) or "")
+
+        entree = {
+            "id": str(
+                meta.get("id") or donnees.get("id") or legacy or f"{segment}:{offset}"
+            ),
+            "session_id": meta.get("session_id") or donnees.get("session_id"),
+            "message_turn": meta.get("message_turn") or donnees.get("message_turn"),
+            "timestamp": str(meta.get("timestamp") or donnees.get("timestamp") or ""),
+            "sujet": tag("sujet"),
+            "action": tag("action"),
+            "categorie": tag("categorie"),
+            "segment": segment,
+            "offset": offset,
+            "longueur": longueur,
+        }
+        if legacy:
+            entree["legacy"] = legacy
+        return entree
+
+    def _handle_pour_jour(self, jour: str, taille_ligne: int):
+        """Retourne le handle du segment actif pour ce jour (rotation si trop gros)."""
+        seg = self._segment_actif
+        if (
+            self._handle_actif is None
+            or seg is None
+            or not seg.name.startswith(f"seg_{jour}_")
+            or seg.stat().st_size + taille_ligne > self.taille_max_segment
+        ):
+            self._fermer_segment_actif()
+            self._segment_actif = self._segment_ecrivable(jour, taille_ligne)
+            self._handle_actif = open(self._segment_actif, "ab")
+        return self._handle_actif
+
+    def _segment_ecrivable(self, jour: str, taille_ligne: int) -> Path:
+        numero = 0
+        while True:
+            candidat = self.dossier_journal / f"seg_{jour}_{numero:03d}.jsonl"
+            if (
+                not candidat.exists()
+                or candidat.stat().st_size + taille_ligne <= self.taille_max_segment
+            ):
+                return candidat
+            numero += 1
+
+    def _fermer_segment_actif(self):
+        if self._handle_actif is not None:
+            try:
+                self._handle_actif.close()
+            except Exception:
+                pass
+        self._handle_actif = None
+        self._segment_actif = None
+
+    def _ecrire_lignes_index(self, entrees: List[Dict[str, Any]]):
+        if not entrees:
+            return
+        bloc = "".join(
+            json.dumps(e, ensure_ascii=False) + "\n" for e in entrees
+        ).encode("utf-8")
+        with open(self.chemin_index, "ab") as f:
+            f.write(bloc)
+            f.flush()
+            if self.fsync_ecriture:
+                os.fsync(f.fileno())
+        # On relit notre propre queue (met à jour offset + RAM de façon uniforme)
+        self._rafraichir_index()
+
+    def fermer(self):
+        """Libère le handle du segment actif (arrêt propre)."""
+        with self._verrou:
+            self._fermer_segment_actif()
+
+    # =========================================================================
+    # 📇 INDEX PRIMAIRE
+    # =========================================================================
+
+    def _rafraichir_index(self):
+        """
+        Lit les nouvelles lignes de l'index depuis le dernier offset connu.
+        Si le fichier a été remplacé (compaction) ou tronqué, rechargement complet.
+        """
+        with self._verrou:
+            try:
+                stat = self.chemin_index.stat()
+            except FileNotFoundError:
+                return
+
+            if stat.st_ino != self._inode_index or stat.st_size < self._offset_index:
+                self._index.clear()
+                self._par_session.clear()
+                self._lignes_index = 0
+                self._offset_index = 0
+                self._inode_index = stat.st_ino
+
+            if stat.st_size == self._offset_index:
+                return
+
+            with open(self.chemin_index, "rb") as f:
+                f.seek(self._offset_index)
+                bloc = f.read()
+
+            # On ne consomme que les lignes complètes (écriture concurrente possible)
+            fin = bloc.rfind(b"\n")
+            if fin == -1:
+                return
+            for ligne in bloc[: fin + 1].splitlines():
+                if not ligne.strip():
+                    continue
+                try:
+                    self._indexer_entree(json.loads(ligne))
+                except Exception:
+                    continue
+            self._offset_index += fin + 1
+
+    def _indexer_entree(self, entree: Dict[str, Any]):
+        self._lignes_index += 1
+        iid = entree["id"]
+        ancienne = self._index.pop(iid, None)
+        if entree.get("supprime"):
+            if ancienne:
+                self._retirer_de_session(ancienne)
+            return
+        if ancienne is None:
+            sid = entree.get("session_id") or "unknown"
+            self._par_session.setdefault(sid, []).append(iid)
+        self._index[iid] = entree
+
+    def _retirer_de_session(self, entree: Dict[str, Any]):
+        sid = entree.get("session_id") or "unknown"
+        ids = self._par_session.get(sid, [])
+        if entree["id"] in ids:
+            ids.remove(entree["id"])
+        if not ids:
+            self._par_session.pop(sid, None)
+
+    def reconstruire_index(self) -> int:
+        """
+        Reconstruit `index.jsonl` en relisant séquentiellement tous les segments.
+        Utilisé si l'index est absent/corrompu (récupère aussi les enregistrements orphelins).
+        """
+        with self._verrou:
+            entrees = []
+            for segment in self._lister_segments():
+                for offset, longueur, donnees in self._lire_segment(segment):
+                    entrees.append(
+                        self._construire_entree(donnees, segment.name, offset, longueur)
+                    )
+            self._reecrire_index(entrees)
+            self.logger.info(f"📇 Index historique reconstruit : {len(entrees)} entrées.")
+            return len(entrees)
+
+    def _reecrire_index(self, entrees: List[Dict[str, Any]]):
+        tmp = self.chemin_index.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for e in entrees:
+                f.write(json.dumps(e, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.chemin_index)
+        self._inode_index = None
+        self._rafraichir_index()
+
+    # =========================================================================
+    # 📖 LECTURE
+    # =========================================================================
+
+    def entrees(self) -> List[Dict[str, Any]]:
+        """Copie des entrées d'index (ordre d'insertion)."""
+        with self._verrou:
+            self._rafraichir_index()
+            return list(self._index.values())
+
+    def entree(self, interaction_id: str) -> Optional[Dict[str, Any]]:
+        """Entrée d'index d'une interaction (None si inconnue ou supprimée)."""
+        with self._verrou:
+            self._rafraichir_index()
+            return self._index.get(interaction_id)
+
+    def compter(self, inclure_legacy: bool = True) -> int:
+        """Nombre d'interactions mémorisées (journal + anciens fichiers non migrés)."""
+        with self._verrou:
+            self._rafraichir_index()
+            total = len(self._index)
+        if inclure_legacy:
+            total += sum(1 for _ in self._lister_legacy())
+        return total
+
+    def entrees_par_session(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Regroupement session -> entrées, calculé uniquement depuis l'index (zéro I/O segment)."""
+        with self._verrou:
+            self._rafraichir_index()
+            return {
+                sid: [self._index[i] for i in ids if i in self._index]
+                for sid, ids in self._par_session.items()
+            }
+
+    def lire(self, entree_ou_id) -> Optional[Dict[str, Any]]:
+        """Lecture aléatoire d'une interaction (seek + read de `longueur` octets)."""
+        entree = entree_ou_id
+        if isinstance(entree_ou_id, str):
+            with self._verrou:
+                self._rafraichir_index()
+                entree = self._index.get(entree_ou_id)
+        if not entree:
+            return None
+        if entree.get("fichier"):
+            return self._lire_legacy(Path(entree["fichier"]))
+
+        for tentative in range(2):
+            try:
+                with open(self.dossier_journal / entree["segment"], "rb") as f:
+                    f.seek(entree["offset"])
+                    return json.loads(f.read(entree["longueur"]))
+            except (FileNotFoundError, ValueError):
+                # Le segment a pu être fusionné entre-temps : on relit l'index
+                if tentative == 0:
+                    with self._verrou:
+                        self._rafraichir_index()
+                        entree = self._index.get(entree["id"], entree)
+        return None
+
+    def derniers(self, limit: int, inclure_legacy: bool = True) -> List[Tuple[Dict, Dict]]:
+        """
+        Retourne les `limit` interactions les plus récentes (par timestamp décroissant),
+        sous forme de paires (entrée, données).
+        """
+        candidats = self.entrees()
+        if inclure_legacy:
+            candidats.extend(self._entrees_legacy())
+        candidats.sort(key=lambda e: e.get("timestamp") or "", reverse=True)
+
+        resultats = []
+        for entree in candidats:
+            if len(resultats) >= limit:
+                break
+            data = self.lire(entree)
+            if data is not None:
+                resultats.append((entree, data))
+        return resultats
+
+    def iterer(
+        self,
+        depuis: Optional[datetime] = None,
+        sujet: str = None,
+        action: str = None,
+        categorie: str = None,
+        exclure_ids: Optional[set] = None,
+        inclure_legacy: bool = True,
+    ) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Parcours séquentiel (segment par segment, offset croissant) des interactions.
+
+        Les filtres sont appliqués sur l'index AVANT lecture : un segment sans entrée
+        retenue n'est jamais ouvert. Les anciens fichiers non migrés sont lus ensuite.
+
+        Yields:
+            Tuple[entrée d'index, données de l'interaction]
+        """
+        depuis_iso = depuis.isoformat() if depuis else None
+
+        def retenue(e: Dict[str, Any]) -> bool:
+            if exclure_ids and (e["id"] in exclure_ids or e.get("legacy") in exclure_ids):
+                return False
+            if depuis_iso and (e.get("timestamp") or "") < depuis_iso:
+                return False
+            if sujet and e.get("sujet", "").lower() != sujet.lower():
+                return False
+            if action and e.get("action", "").lower() != action.lower():
+                return False
+            if categorie and e.get("categorie", "").lower() != categorie.lower():
+                return False
+            return True
+
+        par_segment: Dict[str, List[Dict[str, Any]]] = {}
+        for e in self.entrees():
+            if retenue(e):
+                par_segment.setdefault(e["segment"], []).append(e)
+
+        for nom_segment in sorted(par_segment):
+            voulues = {e["offset"]: e for e in par_segment[nom_segment]}
+            chemin = self.dossier_journal / nom_segment
+            if not chemin.exists():
+                # Segment fusionné pendant le parcours : repli sur la lecture aléatoire
+                for e in voulues.values():
+                    data = self.lire(e)
+                    if data is not None:
+                        yield e, data
+                continue
+            for offset, _, data in self._lire_segment(chemin):
+                e = voulues.get(offset)
+                if e is not None:
+                    yield e, data
+
+        if inclure_legacy:
+            for e, data in self._iterer_legacy():
+                if retenue(e):
+                    yield e, data
+
+    def rechercher_citation(
+        self, phrase: str
+    ) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, List[int]]]]:
+        """
+        Citations exactes de `phrase` dans les prompts/réponses du journal.
+
+        Via l'index de citations (candidats trigrammes relus par accès direct, dans l'ordre
+        des segments), puis les anciens fichiers `interaction_*.json` non encore migrés (hors
+        index : lus en entier, comme dans `rechercher_sous_chaine`) ; repli sur
+        `rechercher_sous_chaine` si l'index est désactivé, en retard sur le journal ou si la
+        phrase est trop courte. Chaque candidat est prouvé par sous-chaîne.
+
+        Yields:
+            Tuple[entrée d'index, données, offsets par champ ({"prompt": [..], "reponse": [..]})]
+        """
+        ids = None
+        if self.index_citations is not None:
+            try:
+                with self._verrou:
+                    self._rafraichir_index()
+                    en_retard = self.index_citations.compter() < len(self._index)
+                if en_retard:
+                    # Historique pas encore rattrapé (compaction en cours) : le balayage reste exhaustif
+                    self.logger.info("🔤 Index de citations incomplet : balayage du journal.")
+                else:
+                    ids = self.index_citations.candidats(phrase)
+            except Exception as e:
+                self.logger.log_warning(f"⚠️ Index de citations illisible, balayage du journal : {e}")
+
+        if ids is None:
+            paires = self.rechercher_sous_chaine(phrase)
+        else:
+            with self._verrou:
+                self._rafraichir_index()
+                entrees = [self._index[i] for i in set(ids) if i in self._index]
+            entrees.sort(key=lambda e: (e["segment"], e["offset"]))
+
+            def paires_indexees():
+                for e in entrees:
+                    yield e, self.lire(e)
+                # Fichiers legacy non migrés : jamais indexés (la migration les projette)
+                yield from self._iterer_legacy()
+
+            paires = paires_indexees()
+
+        for entree, donnees in paires:
+            if donnees is None:
+                continue
+            offsets = localiser(phrase, donnees)
+            if offsets:
+                yield entree, donnees, offsets
+
+    def rechercher_sous_chaine(
+        self, texte: str
+    ) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Balayage séquentiel des segments avec pré-filtre sur les octets bruts :
+        seules les lignes contenant la forme JSON-échappée du texte sont désérialisées.
+        La validation finale (champ exact) reste à la charge de l'appelant.
+        """
+        aiguille = json.dumps(texte, ensure_ascii=False)[1:-1].encode("utf-8")
+        with self._verrou:
+            self._rafraichir_index()
+            vivantes: Dict[str, Dict[int, Dict[str, Any]]] = {}
+            for e in self._index.values():
+                vivantes.setdefault(e["segment"], {})[e["offset"]] = e
+
+        for nom_segment in sorted(vivantes):
+            chemin = self.dossier_journal / nom_segment
+            if not chemin.exists():
+                continue
+            for offset, ligne in self._lire_segment_brut(chemin):
+                if aiguille not in ligne:
+                    continue
+                e = vivantes[nom_segment].get(offset)
+                if e is None:
+                    continue
+                try:
+                    yield e, json.loads(ligne)
+                except ValueError:
+                    continue
+
+        yield from self._iterer_legacy()
+
+    def _lire_segment(self, chemin: Path) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """Lecture séquentielle d'un segment : (offset, longueur, données). Ignore les lignes tronquées."""
+        for offset, ligne in self._lire_segment_brut(chemin):
+            try:
+                yield offset, len(ligne), json.loads(ligne)
+            except ValueError:
+                continue
+
+    def _lire_segment_brut(self, chemin: Path) -> Iterator[Tuple[int, bytes]]:
+        """Lignes complètes d'un segment avec leur offset (la dernière ligne sans \\n est ignorée)."""
+        offset = 0
+        with open(chemin, "rb") as f:
+            for ligne in f:
+                if ligne.endswith(b"\n") and ligne.strip():
+                    yield offset, ligne
+                offset += len(ligne)
+
+    def reference(self, entree: Dict[str, Any]) -> str:
+        """
+        Localisateur stable d'une interaction (remplace l'ancien chemin de fichier dans
+        les métadonnées vectorielles et le champ `path` de Whoosh).
+        """
+        if entree.get("fichier"):
+            return entree["fichier"]
+        return f"{self.dossier_journal / entree['segment']}#{entree['id']}"
+
+    def lister_segments(self) -> List[str]:
+        """Chemins des segments existants (ordre chronologique)."""
+        return [str(p) for p in self._lister_segments()]
+
+    def _lister_segments(self) -> List[Path]:
+        if not self.dossier_journal.exists():
+            return []
+        return sorted(
+            p for p in self.dossier_journal.iterdir() if MOTIF_SEGMENT.match(p.name)
+        )
+
+    # =========================================================================
+    # 🗃️ COMPATIBILITÉ (Anciens fichiers interaction_*.json)
+    # =========================================================================
+
+    def _lister_legacy(self) -> Iterator[Path]:
+        if not self.dossier_historique.exists():
+            return iter(())
+        return self.dossier_historique.glob(MOTIF_LEGACY)
+
+    def _lire_legacy(self, chemin: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(chemin, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _iterer_legacy(self) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        (entrée synthétique, données) pour chaque fichier non encore migré.
+
+        `_migrer_legacy` publie l'index AVANT d'archiver les sources (et laisse en place
+        un fichier impossible à déplacer) : un fichier déjà présent dans l'index est ignoré.
+        """
+        migres = None
+        for chemin in self._lister_legacy():
+            if migres is None:
+                with self._verrou:
+                    self._rafraichir_index()
+                    migres = {e.get("legacy") for e in self._index.values() if e.get("legacy")}
+            if chemin.name in migres:
+                continue
+            data = self._lire_legacy(chemin)
+            if data is None:
+                continue
+            e = self._construire_entree(data, "", 0, 0, legacy=chemin.name)
+            e["fichier"] = str(chemin)
+            if not e["timestamp"]:
+                e["timestamp"] = datetime.fromtimestamp(chemin.stat().st_mtime).isoformat()
+            yield e, data
+
+    def _entrees_legacy(self) -> List[Dict[str, Any]]:
+        return [e for e, _ in self._iterer_legacy()]
+
+    # =========================================================================
+    # 🧹 COMPACTION (Arrière-plan)
+    # =========================================================================
+
+    def lancer_compaction_async(self) -> bool:
+        """Lance `compacter` dans un thread daemon (une seule compaction à la fois)."""
+        if self._thread_compaction and self._thread_compaction.is_alive():
+            return False
+        self._thread_compaction = threading.Thread(
+            target=self._compaction_safe, daemon=True, name="CompactionHistorique"
+        )
+        self._thread_compaction.start()
+        return True
+
+    def _compaction_safe(self):
+        try:
+            self.compacter()
+        except Exception as e:
+            self.logger.log_error(f"❌ Compaction historique échouée : {e}")
+
+    def compacter(self) -> Dict[str, int]:
+        """
+        1. Migre les anciens `interaction_*.json` dans les segments (puis archive/supprime).
+        2. Fusionne les petits segments clos d'un même mois en un segment mensuel.
+        3. Réécrit l'index si la proportion d'entrées périmées dépasse le seuil.
+        4. Rattrape l'index de citations (historique antérieur à l'index) puis l'optimise.
+        """
+        rapport = {
+            "legacy_migres": self._migrer_legacy(),
+            "segments_fusionnes": self._fusionner_segments() if self.fusion_mensuelle else 0,
+            "index_reecrit": 0,
+            "citations_indexees": self.synchroniser_index_citations(),
+        }
+        if rapport["citations_indexees"]:
+            self.index_citations.optimiser()
+        with self._verrou:
+            self._rafraichir_index()
+            perimees = self._lignes_index - len(self._index)
+            if self._lignes_index and perimees / self._lignes_index > self.ratio_reecriture_index:
+                self._reecrire_index(list(self._index.values()))
+                rapport["index_reecrit"] = 1
+
+        self.logger.info(f"🧹 Compaction historique : {rapport}")
+        return rapport
+
+    def _migrer_legacy(self) -> int:
+        # Tri par mtime : approxime l'ordre chronologique (évite d'alterner les segments)
+        fichiers = sorted(self._lister_legacy(), key=lambda p: p.stat().st_mtime)
+        if not fichiers:
+            return 0
+
+        with self._verrou:
+            self._rafraichir_index()
+            deja_migres = {e.get("legacy") for e in self._index.values() if e.get("legacy")}
+            entrees, sources, migrees = [], [], []
+            for chemin in fichiers:
+                if chemin.name in deja_migres:
+                    sources.append(chemin)
+                    continue
+                data = self._lire_legacy(chemin)
+                if data is None:
+                    continue  # Fichier corrompu : on le laisse en place pour l'Auditor
+                jour = None
+                meta = data.get("meta") or {}
+                if not (meta.get("timestamp") or data.get("timestamp")):
+                    jour = datetime.fromtimestamp(chemin.stat().st_mtime).strftime("%Y%m%d")
+                entrees.append(
+                    self._ecrire_enregistrement(data, legacy=chemin.name, jour=jour)
+                )
+                migrees.append((entrees[-1], data))
+                sources.append(chemin)
+
+            # Durabilité des segments AVANT publication dans l'index et retrait des sources
+            if self._handle_actif is not None:
+                os.fsync(self._handle_actif.fileno())
+            self._fermer_segment_actif()
+            self._ecrire_lignes_index(entrees)
+        self._projeter(migrees)
+
+        archive = self.dossier_historique / DOSSIER_LEGACY_ARCHIVE
+        for chemin in sources:
+            try:
+                if self.conserver_legacy:
+                    archive.mkdir(exist_ok=True)
+                    shutil.move(str(chemin), str(archive / chemin.name))
+                else:
+                    chemin.unlink()
+            except Exception as e:
+                self.logger.log_warning(f"⚠️ Retrait legacy impossible {chemin.name}: {e}")
+
+        return len(entrees)
+
+    def _fusionner_segments(self) -> int:
+        """Fusionne les segments journaliers clos (< seuil) d'un même mois passé."""
+        mois_courant = datetime.now().strftime("%Y%m")
+        groupes: Dict[str, List[Path]] = {}
+        for seg in self._lister_segments():
+            m = MOTIF_SEGMENT.match(seg.name)
+            mois, est_mensuel = m.group(1), m.group(3) == "m"
+            if est_mensuel or mois >= mois_courant:
+                continue
+            if seg.stat().st_size < self.taille_min_fusion:
+                groupes.setdefault(mois, []).append(seg)
+
+        total = 0
+        for mois, segments in groupes.items():
+            if len(segments) < 2:
+                continue
+            with self._verrou:
+                self._rafraichir_index()
+                vivantes = {}
+                for e in self._index.values():
+                    vivantes.setdefault(e["segment"], {})[e["offset"]] = e
+
+                cible = self._segment_mensuel(mois)
+                nouvelles = []
+                with open(cible, "ab") as out:
+                    for seg in segments:
+                        for offset, brut in self._lire_segment_brut(seg):
+                            e = vivantes.get(seg.name, {}).get(offset)
+                            if e is None:
+                                continue  # Entrée périmée : on ne la recopie pas
+                            nouvel_offset = out.tell()
+                            out.write(brut)
+                            nouvelles.append(
+                                {**e, "segment": cible.name, "offset": nouvel_offset}
+                            )
+                    out.flush()
+                    os.fsync(out.fileno())
+
+                self._ecrire_lignes_index(nouvelles)
+
+            for seg in segments:
+                try:
+                    seg.unlink()
+                except Exception as e:
+                    self.logger.log_warning(f"⚠️ Segment non supprimé {seg.name}: {e}")
+            total += len(segments)
+        return total
+
+    def _segment_mensuel(self, mois: str) -> Path:
+        numero = 0
+        while True:
+            candidat = self.dossier_journal / f"seg_{mois}_m{numero:03d}.jsonl"
+            if not candidat.exists() or candidat.stat().st_size < self.taille_max_segment:
+                return candidat
+            numero += 1
+
+    # =========================================================================
+    # 🔧 UTILITAIRES
+    # =========================================================================
+
+    @staticmethod
+    def _jour_depuis_timestamp(timestamp: str) -> str:
+        try:
+            return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).strftime("%Y%m%d")
+        except Exception:
+            return datetime.now().strftime("%Y%m%d")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: Journal Historique
+Cible : agentique/sous_agents_gouvernes/agent_Memoire/journal_historique.py
+Objectif : Valider l'ajout segmenté, l'index primaire, la compatibilité legacy et la compaction.
+"""
+
+import unittest
+import json
+import shutil
+import tempfile
+from unittest.mock import MagicMock, patch
+from pathlib import Path
+
+from agentique.sous_agents_gouvernes.agent_Memoire.journal_historique import (
+    JournalHistorique,
+)
+
+
+def _interaction(i: int, session: str = "S1", jour: str = "2025-01-15") -> dict:
+    """Dictionnaire au format asdict(Interaction)."""
+    return {
+        "prompt": f"Question {i}",
+        "reponse": f"Réponse {i}",
+        "system": None,
+        "intention": {"prompt": "p", "sujet": "Script", "action": "Coder", "categorie": "Agent"},
+        "contexte_memoire": [],
+        "meta": {
+            "id": f"id_{session}_{i}",
+            "timestamp": f"{jour}T10:00:{i:02d}",
+            "session_id": session,
+            "message_turn": i,
+        },
+    }
+
+
+class TestJournalHistorique(unittest.TestCase):
+    def setUp(self):
+        """Journal réel sur un dossier temporaire (bypass du __init__ instrumenté)."""
+        self.dossier = Path(tempfile.mkdtemp())
+        self.config = {"taille_min_fusion_ko": 1024}
+        self.journal = self._nouveau_journal()
+
+    def tearDown(self):
+        self.journal.fermer()
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def _nouveau_journal(self) -> JournalHistorique:
+        journal = JournalHistorique.__new__(JournalHistorique)
+        journal.logger = MagicMock()
+        journal._initialiser_stockage(self.dossier, self.config)
+        return journal
+
+    # =========================================================================
+    # 1. ÉCRITURE + INDEX
+    # =========================================================================
+
+    def test_ajouter_et_relire_par_id(self):
+        """Un enregistrement ajouté est relu à l'identique via son offset."""
+        entree = self.journal.ajouter(_interaction(1))
+
+        self.assertEqual(entree["segment"], "seg_20250115_000.jsonl")
+        self.assertEqual(entree["sujet"], "Script")
+        self.assertEqual(self.journal.lire("id_S1_1")["reponse"], "Réponse 1")
+
+    def test_index_visible_depuis_une_autre_instance(self):
+        """Un lecteur déjà ouvert voit les ajouts d'un écrivain (lecture de la queue d'index)."""
+        lecteur = self._nouveau_journal()
+        self.journal.ajouter(_interaction(1))
+        self.journal.ajouter(_interaction(2, session="S2"))
+
+        self.assertEqual(lecteur.compter(), 2)
+        self.assertEqual(sorted(lecteur.entrees_par_session()), ["S1", "S2"])
+
+    def test_derniers_tri_par_timestamp(self):
+        for i in range(5):
+            self.journal.ajouter(_interaction(i))
+
+        ids = [e["id"] for e, _ in self.journal.derniers(2)]
+        self.assertEqual(ids, ["id_S1_4", "id_S1_3"])
+
+    def test_iterer_filtres_et_exclusions(self):
+        self.journal.ajouter(_interaction(1))
+        self.journal.ajouter(_interaction(2, jour="2025-02-01"))
+
+        ids = [e["id"] for e, _ in self.journal.iterer(exclure_ids={"id_S1_1"})]
+        self.assertEqual(ids, ["id_S1_2"])
+        self.assertEqual(len(list(self.journal.iterer(sujet="fichier"))), 0)
+
+    def test_ligne_tronquee_ignoree_et_index_reconstruit(self):
+        """Crash simulé : ligne partielle en fin de segment + index perdu."""
+        self.journal.ajouter(_interaction(1))
+        self.journal.fermer()
+        segment = self.dossier / "journal" / "seg_20250115_000.jsonl"
+        with open(segment, "ab") as f:
+            f.write(b'{"prompt": "coup')
+        (self.dossier / "journal" / "index.jsonl").unlink()
+
+        journal = self._nouveau_journal()
+        self.assertEqual(journal.compter(), 1)
+        self.assertEqual(journal.lire("id_S1_1")["prompt"], "Question 1")
+
+    # =========================================================================
+    # 2. COMPATIBILITÉ + COMPACTION
+    # =========================================================================
+
+    def test_lecture_legacy_puis_migration(self):
+        """Les anciens interaction_*.json sont lus, puis migrés et archivés par la compaction."""
+        legacy = self.dossier / "interaction_script_coder_agent_20240101.json"
+        legacy.write_text(json.dumps(_interaction(7, session="OLD"), indent=2), encoding="utf-8")
+
+        self.assertEqual(self.journal.compter(), 1)
+        self.assertEqual(len(list(self.journal.rechercher_sous_chaine("Question 7"))), 1)
+
+        rapport = self.journal.compacter()
+
+        self.assertEqual(rapport["legacy_migres"], 1)
+        self.assertFalse(legacy.exists())
+        self.assertTrue((self.dossier / "archive_legacy" / legacy.name).exists())
+        self.assertEqual(self.journal.compter(), 1)
+        # L'ancien nom reste utilisable pour les exclusions (état du Processeur)
+        self.assertEqual(len(list(self.journal.iterer(exclure_ids={legacy.name}))), 0)
+
+    def test_legacy_indexe_non_retire_lu_une_fois(self):
+        """Source legacy restée en place après publication dans l'index : pas de doublon."""
+        legacy = self.dossier / "interaction_script_coder_agent_20240101.json"
+        legacy.write_text(json.dumps(_interaction(7, session="OLD"), indent=2), encoding="utf-8")
+        self.journal.conserver_legacy = False
+
+        with patch.object(Path, "unlink", side_effect=PermissionError("verrouillé")):
+            self.assertEqual(self.journal.compacter()["legacy_migres"], 1)
+
+        self.assertTrue(legacy.exists())
+        self.assertEqual(len(list(self.journal.iterer())), 1)
+        self.assertEqual(len(self.journal.derniers(10)), 1)
+        self.assertEqual(len(list(self.journal.rechercher_sous_chaine("Question 7"))), 1)
+
+    def test_fusion_segments_mensuelle(self):
+        for jour in ("2024-03-01", "2024-03-02", "2024-03-03"):
+            self.journal.ajouter(_interaction(1, session=jour, jour=jour))
+
+        rapport = self.journal.compacter()
+
+        self.assertEqual(rapport["segments_fusionnes"], 3)
+        self.assertEqual(
+            [Path(p).name for p in self.journal.lister_segments()],
+            ["seg_202403_m000.jsonl"],
+        )
+        self.assertEqual(self.journal.lire("id_2024-03-02_1")["prompt"], "Question 1")
+
+
+if __name__ == "__main__":
+    unittest.main()
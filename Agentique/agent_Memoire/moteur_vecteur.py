@@ -17,7 +17,6 @@ Rôle Architectural :
 """
 
 import os
-import yaml
 import json
 import numpy as np
 import faiss
@@ -26,6 +25,8 @@ from dataclasses import asdict, is_dataclass
 from sentence_transformers import SentenceTransformer
 from agentique.base.META_agent import AgentBase
 from agentique.base.contrats_interface import CustomJSONEncoder
+from agentique.base.demarrage import charger_yaml
+from agentique.base.cache_resultats import signaler_ecriture
 
 
 class MoteurVectoriel(AgentBase):
@@ -40,10 +41,13 @@ class MoteurVectoriel(AgentBase):
         dim (int): Dimension de l'espace vectoriel (ex: 384 pour all-MiniLM-L6-v2).
         model (SentenceTransformer): Modèle d'embedding chargé en mémoire locale.
         index (faiss.Index): Structure de données optimisée pour la recherche de plus proches voisins (L2).
+        magasin (str): Nom du magasin versionné ("vectoriel" ou "regles") invalidé à chaque ajout
+            (voir `agentique.base.cache_resultats`).
     """
 
-    def __init__(self, chemin_index: str | None = None):
+    def __init__(self, chemin_index: str | None = None, magasin: str = "vectoriel"):
         super().__init__(nom_agent="MoteurVectoriel")
+        self.magasin = magasin
 
         # 1. Chargement Config (Source de Vérité)
         self.config = self._load_config()
@@ -93,8 +97,7 @@ class MoteurVectoriel(AgentBase):
                 path = "config_memoire.yaml"
 
             if os.path.exists(path):
-                with open(path, "r", encoding="utf-8") as f:
-                    return yaml.safe_load(f).get("configuration", {})
+                return charger_yaml(path).get("configuration", {})
         except Exception:
             pass
         return {}
@@ -161,6 +164,8 @@ class MoteurVectoriel(AgentBase):
         3. **Enrichissement** : Injecte le contenu textuel brut dans les métadonnées (Critical Path)
            pour s'assurer que le résultat de recherche contient la donnée lisible, pas juste un ID.
         4. **Commit** : Déclenche une sauvegarde immédiate sur disque.
+        5. **Invalidation** : Incrémente la version du magasin (les résultats RAG en cache
+           qui en dépendent deviennent périmés).
 
         Args:
             texte (str): Le contenu brut à vectoriser.
@@ -187,6 +192,7 @@ class MoteurVectoriel(AgentBase):
         meta.setdefault("len", len(texte))
         self.metadonnees.append(meta)
         self._sauvegarder_index()
+        signaler_ecriture(self.magasin)
 
     def rechercher(self, requete: str, top_k: int = 5) -> list[dict]:
         """
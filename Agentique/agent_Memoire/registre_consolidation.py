@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RegistreConsolidation - Registre de Points de Contrôle du Processeur de Consolidation
+Module de gestion d'état du ProcesseurBrutePersistante (remplace `.traitement_state.json`).
+
+Avant : chaque batch relisait TOUT l'historique et comparait les noms à un set
+`fichiers_historiques_traites` qui grossissait sans fin.
+
+Ici, un registre durable (écriture atomique tmp + fsync + replace) contient :
+1.  **Fichiers** : Une fiche par fichier source (segment du journal ou ancien `interaction_*.json`) :
+    chemin, taille consommée, mtime, sessions rencontrées, dernier timestamp, statut.
+    Le scanner n'ouvre QUE les fichiers nouveaux ou modifiés, et ne lit que la queue
+    (octets ajoutés) des segments append-only.
+2.  **Sessions** : Statut `en_attente` -> `en_cours` -> `consolidee`, références des messages
+    (id, fichier, offset) et liste des messages déjà traités (reprise après crash).
+    Une session consolidée est réduite à un résumé (statut + dernier timestamp) :
+    le registre reste borné par le nombre de sessions, pas par le nombre de messages.
+3.  **Points de contrôle** : chaque message traité est AJOUTÉ à un petit journal
+    (`<registre>.points.jsonl`) au lieu de réécrire tout le registre. Le journal est
+    rejoué au chargement et vidé à chaque `sauvegarder()` (compactage dans le registre).
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from agentique.sous_agents_gouvernes.agent_Memoire.journal_historique import (
+    MOTIF_LEGACY,
+    MOTIF_SEGMENT,
+)
+
+EN_ATTENTE = "en_attente"
+EN_COURS = "en_cours"
+CONSOLIDEE = "consolidee"
+
+
+class RegistreConsolidation:
+    """
+    Registre incrémental des sources de l'historique et de l'avancement par session.
+
+    Attributes:
+        chemin (Path): Fichier JSON du registre.
+        chemin_points (Path): Journal append-only des messages traités depuis la dernière sauvegarde.
+        dossier_historique (Path): Racine 'historique/' (anciens fichiers).
+        dossier_journal (Path): Dossier des segments du JournalHistorique.
+    """
+
+    def __init__(
+        self,
+        chemin_registre: Path,
+        dossier_historique: Path,
+        dossier_journal: Path,
+        journal=None,
+        logger=None,
+        ids_deja_traites: Optional[set] = None,
+    ):
+        self.chemin = Path(chemin_registre)
+        self.chemin_points = self.chemin.with_suffix(".points.jsonl")
+        self.dossier_historique = Path(dossier_historique)
+        self.dossier_journal = Path(dossier_journal)
+        self.journal = journal
+        self.logger = logger
+        # Plusieurs sessions sont consolidées en parallèle : mutations + écriture sérialisées
+        self._verrou = threading.RLock()
+        self._ids_journal: Optional[Dict[Tuple[str, int], str]] = None
+
+        self.donnees = self._charger()
+        self.donnees.setdefault("version", 1)
+        self.donnees.setdefault("dernier_run", None)
+        self.donnees.setdefault("fichiers", {})
+        self.donnees.setdefault("sessions", {})
+        self._rejouer_points()
+
+        # Reprise de l'ancien état (noms de fichiers / IDs déjà consolidés)
+        self._ids_deja_traites = set(ids_deja_traites or ())
+        # Cache RAM : session -> set(ids) (évite les doublons lors des migrations)
+        self._ids_par_session = {
+            sid: {m["id"] for m in s.get("messages", [])}
+            for sid, s in self.donnees["sessions"].items()
+        }
+
+    # =========================================================================
+    # 💾 PERSISTANCE
+    # =========================================================================
+
+    def _charger(self) -> Dict[str, Any]:
+        if self.chemin.exists():
+            try:
+                with open(self.chemin, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except Exception as e:
+                self._log_warning(f"Registre illisible, reconstruction : {e}")
+        return {}
+
+    def sauvegarder(self, dernier_run: bool = False):
+        """Écriture atomique (tmp + fsync + replace) : jamais de registre à moitié écrit."""
+        with self._verrou:
+            if dernier_run:
+                self.donnees["dernier_run"] = datetime.now().isoformat()
+            tmp = self.chemin.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.donnees, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.chemin)
+            # Points de contrôle désormais inclus dans le registre
+            self.chemin_points.unlink(missing_ok=True)
+
+    def _rejouer_points(self):
+        """Réintègre les messages traités notés après la dernière sauvegarde (crash)."""
+        if not self.chemin_points.exists():
+            return
+        with open(self.chemin_points, "r", encoding="utf-8") as f:
+            for ligne in f:
+                try:
+                    point = json.loads(ligne)
+                except ValueError:
+                    continue  # Ligne tronquée par un crash
+                session = self.donnees["sessions"].get(point.get("sid"))
+                if not session or session["statut"] == CONSOLIDEE:
+                    continue
+                if point.get("id") not in session["traitees"]:
+                    session["traitees"].append(point["id"])
+
+    # =========================================================================
+    # 🔎 SCANNER INCRÉMENTAL
+    # =========================================================================
+
+    def scanner(self) -> Dict[str, int]:
+        """
+        Met le registre à jour en n'ouvrant que les fichiers nouveaux ou modifiés.
+
+        - Segment (append-only) : lecture à partir de la dernière taille consommée.
+          Si le fichier a rétréci (remplacé), relecture complète.
+        - Ancien fichier JSON : relu uniquement si sa taille ou son mtime a changé.
+        - Fichiers disparus (fusionnés / migrés) : fiche retirée.
+
+        Returns:
+            Dict: Compteurs (fichiers_ouverts, messages_nouveaux).
+        """
+        with self._verrou:
+            return self._scanner()
+
+    def _scanner(self) -> Dict[str, int]:
+        self._ids_journal = None  # Localisation -> ID, relue une fois par scan si nécessaire
+        fichiers = self.donnees["fichiers"]
+        vus = set()
+        rapport = {"fichiers_ouverts": 0, "messages_nouveaux": 0}
+
+        for chemin, est_segment in self._lister_sources():
+            nom = chemin.relative_to(self.dossier_historique).as_posix()
+            vus.add(nom)
+            try:
+                stat = chemin.stat()
+            except FileNotFoundError:
+                continue
+
+            fiche = fichiers.get(nom)
+            if fiche and fiche["taille"] == stat.st_size and fiche["mtime"] == stat.st_mtime:
+                continue
+
+            if fiche is None or (est_segment and stat.st_size < fiche["taille"]):
+                fiche = {
+                    "chemin": str(chemin),
+                    "taille": 0,
+                    "mtime": 0,
+                    "sessions": [],
+                    "dernier_timestamp": "",
+                    "statut": "scanne",
+                }
+
+            rapport["fichiers_ouverts"] += 1
+            if est_segment:
+                enregistrements, taille = self._lire_queue_segment(chemin, fiche["taille"])
+            else:
+                enregistrements, taille = self._lire_legacy(chemin), stat.st_size
+
+            sessions = set(fiche["sessions"])
+            for offset, data in enregistrements:
+                sid, ts = self._enregistrer_message(nom, offset, data, legacy=not est_segment)
+                if sid is None:
+                    continue
+                rapport["messages_nouveaux"] += 1
+                sessions.add(sid)
+                fiche["dernier_timestamp"] = max(fiche["dernier_timestamp"], ts)
+
+            fiche.update(
+                {"taille": taille, "mtime": stat.st_mtime, "sessions": sorted(sessions)}
+            )
+            fichiers[nom] = fiche
+
+        for nom in [n for n in fichiers if n not in vus]:
+            del fichiers[nom]
+
+        self._finaliser_sessions_deja_traitees()
+        self.sauvegarder()
+        return rapport
+
+    def _lister_sources(self) -> List[Tuple[Path, bool]]:
+        sources = []
+        if self.dossier_journal.exists():
+            sources.extend(
+                (p, True)
+                for p in sorted(self.dossier_journal.iterdir())
+                if MOTIF_SEGMENT.match(p.name)
+            )
+        if self.dossier_historique.exists():
+            sources.extend((p, False) for p in sorted(self.dossier_historique.glob(MOTIF_LEGACY)))
+        return sources
+
+    @staticmethod
+    def _lire_queue_segment(chemin: Path, debut: int) -> Tuple[List[Tuple[int, Dict]], int]:
+        """Lit les lignes complètes à partir de `debut`. Retourne (enregistrements, taille consommée)."""
+        enregistrements = []
+        offset = debut
+        with open(chemin, "rb") as f:
+            f.seek(debut)
+            for ligne in f:
+                if not ligne.endswith(b"\n"):
+                    break  # Écriture en cours : on reprendra ici au prochain scan
+                try:
+                    enregistrements.append((offset, json.loads(ligne)))
+                except ValueError:
+                    pass
+                offset += len(ligne)
+        return enregistrements, offset
+
+    @staticmethod
+    def _lire_legacy(chemin: Path) -> List[Tuple[Optional[int], Dict]]:
+        try:
+            with open(chemin, "r", encoding="utf-8") as f:
+                return [(None, json.load(f))]
+        except Exception:
+            return []
+
+    def _identifiant(self, source: str, offset: Optional[int], data: Dict, legacy: bool) -> str:
+        """
+        ID du message, dérivé comme `JournalHistorique._construire_entree` : meta.id / id,
+        sinon nom du fichier legacy, sinon l'ID de l'index du journal (un legacy migré sans ID
+        garde son nom de fichier), sinon `segment:offset`.
+        """
+        meta = data.get("meta") or {}
+        iid = meta.get("id") or data.get("id")
+        if iid:
+            return str(iid)
+        nom = Path(source).name
+        if legacy:
+            return nom
+        if self.journal is not None:
+            if self._ids_journal is None:
+                self._ids_journal = {
+                    (e["segment"], e["offset"]): e["id"] for e in self.journal.entrees()
+                }
+            iid = self._ids_journal.get((nom, offset))
+            if iid:
+                return iid
+        return f"{nom}:{offset}"
+
+    def _enregistrer_message(
+        self, source: str, offset: Optional[int], data: Dict, legacy: bool
+    ) -> Tuple[Optional[str], str]:
+        meta = data.get("meta") or {}
+        sid = meta.get("session_id") or data.get("session_id") or "unknown"
+        ts = str(meta.get("timestamp") or data.get("timestamp") or "")
+        mid = self._identifiant(source, offset, data, legacy)
+
+        sessions = self.donnees["sessions"]
+        session = sessions.get(sid)
+
+        # Session déjà consolidée : seul un message POSTÉRIEUR la rouvre
+        if session and session["statut"] == CONSOLIDEE:
+            if ts <= session["dernier_timestamp"]:
+                return None, ts
+            session.update({"statut": EN_ATTENTE, "messages": [], "traitees": []})
+            self._ids_par_session[sid] = set()
+
+        if session is None:
+            session = {
+                "statut": EN_ATTENTE,
+                "dernier_timestamp": ts,
+                "messages": [],
+                "traitees": [],
+            }
+            sessions[sid] = session
+            self._ids_par_session[sid] = set()
+
+        ref = {"id": mid, "source": source, "offset": offset, "timestamp": ts}
+        ids = self._ids_par_session.setdefault(sid, set())
+        if mid in ids:
+            # Même message vu ailleurs (migration legacy -> segment, fusion) : on suit la copie
+            for m in session["messages"]:
+                if m["id"] == mid:
+                    m.update(ref)
+            return None, ts
+
+        ids.add(mid)
+        session["messages"].append(ref)
+        session["dernier_timestamp"] = max(session["dernier_timestamp"], ts)
+        nom_legacy = Path(source).name if legacy else None
+        if mid in self._ids_deja_traites or nom_legacy in self._ids_deja_traites:
+            session["traitees"].append(mid)
+        return sid, ts
+
+    def _finaliser_sessions_deja_traitees(self):
+        """Sessions entièrement couvertes par l'ancien état : directement consolidées."""
+        if not self._ids_deja_traites:
+            return
+        for sid, session in self.donnees["sessions"].items():
+            if session["statut"] != CONSOLIDEE and session["messages"] and len(
+                set(session["traitees"])
+            ) >= len(session["messages"]):
+                self.marquer_consolidee(sid, sauvegarder=False)
+
+    # =========================================================================
+    # 📋 SESSIONS
+    # =========================================================================
+
+    def sessions_a_consolider(self, delai) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Sessions non consolidées dont le dernier message date de plus de `delai` (timedelta).
+        Les sessions `en_cours` (crash précédent) passent en premier.
+        Aucune lecture de fichier : tout vient du registre.
+        """
+        maintenant = datetime.now()
+        retenues = []
+        for sid, session in self.donnees["sessions"].items():
+            if session["statut"] == CONSOLIDEE or not session["messages"]:
+                continue
+            try:
+                dernier = datetime.fromisoformat(session["dernier_timestamp"])
+            except Exception:
+                dernier = maintenant
+            if maintenant - dernier > delai:
+                retenues.append((sid, session))
+        retenues.sort(key=lambda x: (x[1]["statut"] != EN_COURS, x[1]["dernier_timestamp"]))
+        return retenues
+
+    def sessions_en_cours(self) -> List[str]:
+        """Sessions interrompues en cours de consolidation (à reprendre)."""
+        return [
+            sid for sid, s in self.donnees["sessions"].items() if s["statut"] == EN_COURS
+        ]
+
+    def charger_messages(self, sid: str) -> Tuple[List[Dict], List[str]]:
+        """
+        Charge (par accès direct) les messages d'une session, triés chronologiquement.
+        Repli sur le JournalHistorique si la source a été fusionnée/migrée entre-temps.
+
+        Returns:
+            Tuple[messages, ids] alignés.
+        """
+        with self._verrou:
+            session = self.donnees["sessions"][sid]
+            refs = sorted(session["messages"], key=lambda m: m["timestamp"])
+        messages, ids = [], []
+        for ref in refs:
+            data = self._lire_reference(ref)
+            if data is not None:
+                messages.append(data)
+                ids.append(ref["id"])
+        return messages, ids
+
+    def _lire_reference(self, ref: Dict[str, Any]) -> Optional[Dict]:
+        chemin = self.dossier_historique / ref["source"]
+        try:
+            if ref.get("offset") is None:
+                with open(chemin, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            with open(chemin, "rb") as f:
+                f.seek(ref["offset"])
+                data = json.loads(f.readline())
+            meta = data.get("meta") or {}
+            if str(meta.get("id") or data.get("id") or "") in ("", ref["id"]):
+                return data
+        except (OSError, ValueError):
+            pass
+        return self.journal.lire(ref["id"]) if self.journal else None
+
+    def traitees(self, sid: str) -> set:
+        with self._verrou:
+            return set(self.donnees["sessions"][sid].get("traitees", []))
+
+    def marquer_en_cours(self, sid: str):
+        with self._verrou:
+            self.donnees["sessions"][sid]["statut"] = EN_COURS
+            self.sauvegarder()
+
+    def marquer_message_traite(self, sid: str, mid: str):
+        """
+        Point de contrôle après chaque résumé sauvegardé (reprise fine après crash).
+        Ajout d'une ligne au journal des points : coût constant, quel que soit le registre.
+        """
+        with self._verrou:
+            session = self.donnees["sessions"][sid]
+            if mid in session["traitees"]:
+                return
+            session["traitees"].append(mid)
+            with open(self.chemin_points, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"sid": sid, "id": mid}, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def marquer_consolidee(self, sid: str, sauvegarder: bool = True):
+        """Réduit la session à son résumé : le registre ne garde plus ses messages."""
+        with self._verrou:
+            session = self.donnees["sessions"][sid]
+            self.donnees["sessions"][sid] = {
+                "statut": CONSOLIDEE,
+                "dernier_timestamp": session["dernier_timestamp"],
+                "nb_messages": len(session.get("messages", []))
+                + session.get("nb_messages", 0),
+                "consolidee_le": datetime.now().isoformat(),
+            }
+            self._ids_par_session.pop(sid, None)
+            if sauvegarder:
+                self.sauvegarder()
+
+    # =========================================================================
+    # 🔧 UTILITAIRES
+    # =========================================================================
+
+    def _log_warning(self, message: str):
+        if self.logger:
+            self.logger.log_warning(message)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: Registre de Consolidation
+Cible : agentique/sous_agents_gouvernes/agent_Memoire/registre_consolidation.py
+Objectif : Valider le scan incrémental, le regroupement par session et la reprise après crash.
+"""
+
+import unittest
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+from pathlib import Path
+
+from agentique.sous_agents_gouvernes.agent_Memoire.journal_historique import (
+    JournalHistorique,
+)
+from agentique.sous_agents_gouvernes.agent_Memoire.registre_consolidation import (
+    RegistreConsolidation,
+    CONSOLIDEE,
+    EN_COURS,
+)
+
+
+def _interaction(i: int, session: str = "S1", jour: str = "2025-01-15") -> dict:
+    return {
+        "prompt": f"Question {i}",
+        "reponse": f"Réponse {i}",
+        "meta": {
+            "id": f"id_{session}_{i}",
+            "timestamp": f"{jour}T10:00:{i:02d}",
+            "session_id": session,
+            "message_turn": i,
+        },
+    }
+
+
+class TestRegistreConsolidation(unittest.TestCase):
+    def setUp(self):
+        self.dossier = Path(tempfile.mkdtemp())
+        self.journal = JournalHistorique.__new__(JournalHistorique)
+        self.journal.logger = MagicMock()
+        self.journal._initialiser_stockage(self.dossier, {})
+
+    def tearDown(self):
+        self.journal.fermer()
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def _registre(self, ids_deja_traites=None) -> RegistreConsolidation:
+        return RegistreConsolidation(
+            chemin_registre=self.dossier / ".registre.json",
+            dossier_historique=self.dossier,
+            dossier_journal=self.journal.dossier_journal,
+            journal=self.journal,
+            logger=MagicMock(),
+            ids_deja_traites=ids_deja_traites,
+        )
+
+    # =========================================================================
+    # 1. SCAN INCRÉMENTAL
+    # =========================================================================
+
+    def test_scan_incremental_ne_relit_que_la_queue(self):
+        """Un fichier inchangé n'est pas rouvert ; un segment agrandi est lu depuis l'offset consommé."""
+        self.journal.ajouter(_interaction(1))
+        registre = self._registre()
+        self.assertEqual(registre.scanner()["messages_nouveaux"], 1)
+
+        self.assertEqual(registre.scanner(), {"fichiers_ouverts": 0, "messages_nouveaux": 0})
+
+        self.journal.ajouter(_interaction(2))
+        ouvertures = []
+        vrai_open = open
+
+        def open_espion(chemin, mode="r", *a, **k):
+            if "b" in mode and "r" in mode:
+                ouvertures.append(chemin)
+            return vrai_open(chemin, mode, *a, **k)
+
+        with patch("builtins.open", side_effect=open_espion):
+            rapport = registre.scanner()
+
+        self.assertEqual(rapport, {"fichiers_ouverts": 1, "messages_nouveaux": 1})
+        self.assertEqual(len(ouvertures), 1)
+        messages, ids = registre.charger_messages("S1")
+        self.assertEqual(ids, ["id_S1_1", "id_S1_2"])
+        self.assertEqual(messages[1]["prompt"], "Question 2")
+
+    def test_legacy_puis_migration_sans_doublon(self):
+        """Un ancien fichier migré dans un segment reste UN seul message (référence suivie)."""
+        legacy = self.dossier / "interaction_a.json"
+        legacy.write_text(json.dumps(_interaction(1, session="OLD")), encoding="utf-8")
+        registre = self._registre()
+        registre.scanner()
+
+        self.journal.compacter()
+        registre.scanner()
+
+        messages, ids = registre.charger_messages("OLD")
+        self.assertEqual(ids, ["id_OLD_1"])
+        self.assertEqual(messages[0]["prompt"], "Question 1")
+        self.assertNotIn("interaction_a.json", registre.donnees["fichiers"])
+
+    def test_messages_sans_id_restent_distincts(self):
+        """Sans meta.id, les IDs suivent le journal (nom legacy, puis segment:offset)."""
+        anciens = []
+        for i in (1, 2):
+            data = _interaction(i, session="OLD")
+            del data["meta"]["id"]
+            anciens.append(self.dossier / f"interaction_{i}.json")
+            anciens[-1].write_text(json.dumps(data), encoding="utf-8")
+        sans_id = _interaction(3, session="OLD")
+        del sans_id["meta"]["id"]
+        entree = self.journal.ajouter(sans_id)
+
+        registre = self._registre()
+        registre.scanner()
+        self.assertEqual(
+            sorted(registre.charger_messages("OLD")[1]),
+            sorted(["interaction_1.json", "interaction_2.json", entree["id"]]),
+        )
+
+        self.journal.compacter()  # Migration : les deux legacy gardent leur ID
+        registre.scanner()
+        messages, ids = registre.charger_messages("OLD")
+        self.assertEqual(len(ids), 3)
+        self.assertEqual(sorted(m["prompt"] for m in messages), ["Question 1", "Question 2", "Question 3"])
+
+    def test_reprise_ancien_etat(self):
+        """Les noms de l'ancien `fichiers_historiques_traites` consolident directement leurs sessions."""
+        (self.dossier / "interaction_a.json").write_text(
+            json.dumps(_interaction(1, session="OLD")), encoding="utf-8"
+        )
+        self.journal.ajouter(_interaction(1, session="NEW"))
+        registre = self._registre(ids_deja_traites={"interaction_a.json"})
+        registre.scanner()
+
+        self.assertEqual(registre.donnees["sessions"]["OLD"]["statut"], CONSOLIDEE)
+        self.assertEqual(
+            [sid for sid, _ in registre.sessions_a_consolider(timedelta(0))], ["NEW"]
+        )
+
+    # =========================================================================
+    # 2. POINTS DE CONTRÔLE
+    # =========================================================================
+
+    def test_reprise_apres_crash_et_compactage(self):
+        """Progression relue depuis le disque ; session consolidée réduite et non rouverte."""
+        for i in range(3):
+            self.journal.ajouter(_interaction(i))
+        registre = self._registre()
+        registre.scanner()
+        registre.marquer_en_cours("S1")
+        registre.marquer_message_traite("S1", "id_S1_0")
+
+        # "Crash" : nouveau registre relu depuis le disque
+        registre = self._registre()
+        self.assertEqual(registre.sessions_en_cours(), ["S1"])
+        self.assertEqual(registre.traitees("S1"), {"id_S1_0"})
+
+        registre.marquer_consolidee("S1")
+        self.assertNotIn("messages", registre.donnees["sessions"]["S1"])
+
+        # Relecture complète (fiche perdue) : les anciens messages ne rouvrent pas la session
+        registre.donnees["fichiers"].clear()
+        registre.scanner()
+        self.assertEqual(registre.donnees["sessions"]["S1"]["statut"], CONSOLIDEE)
+
+        # Un message postérieur la rouvre
+        self.journal.ajouter(_interaction(9))
+        registre.scanner()
+        session = registre.donnees["sessions"]["S1"]
+        self.assertNotIn(session["statut"], (CONSOLIDEE, EN_COURS))
+        self.assertEqual([m["id"] for m in session["messages"]], ["id_S1_9"])
+
+    def test_points_ajoutes_sans_reecrire_le_registre(self):
+        """Un message traité = une ligne ajoutée ; le registre n'est réécrit qu'à la sauvegarde."""
+        for i in range(3):
+            self.journal.ajouter(_interaction(i))
+        registre = self._registre()
+        registre.scanner()
+        registre.marquer_en_cours("S1")
+        avant = registre.chemin.read_bytes()
+
+        for i in range(3):
+            registre.marquer_message_traite("S1", f"id_S1_{i}")
+        registre.marquer_message_traite("S1", "id_S1_0")  # Déjà noté : rien d'ajouté
+
+        self.assertEqual(registre.chemin.read_bytes(), avant)
+        self.assertEqual(len(registre.chemin_points.read_text(encoding="utf-8").splitlines()), 3)
+
+        # Crash (ligne tronquée en fin de journal des points) : progression rejouée
+        with open(registre.chemin_points, "a", encoding="utf-8") as f:
+            f.write('{"sid": "S1", "id": "id_S')
+        relu = self._registre()
+        self.assertEqual(relu.traitees("S1"), {"id_S1_0", "id_S1_1", "id_S1_2"})
+
+        relu.sauvegarder()
+        self.assertFalse(relu.chemin_points.exists())
+        self.assertEqual(self._registre().traitees("S1"), {"id_S1_0", "id_S1_1", "id_S1_2"})
+
+
+if __name__ == "__main__":
+    unittest.main()
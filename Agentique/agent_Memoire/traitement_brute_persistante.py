@@ -17,7 +17,7 @@ Stratégie "Global Context, Granular Storage" :
        et le Dataset d'entraînement (pour le Fine-Tuning futur).
 ==========================================================================
 Workflow :
-1. Scanne 'historique' et regroupe par SESSION ID.
+1. Parcourt le journal 'historique' (segments) et regroupe par SESSION ID.
 2. Attend la fin de session (Time-out > 4h ou Test immédiat).
 3. Envoie TOUT le transcript au LLM pour analyse contextuelle globale.
 4. Le LLM génère une série de blocs "Micro-Résumés" cohérents entre eux.
@@ -27,15 +27,16 @@ Workflow :
 
 import sys
 import json
-import yaml
 import hashlib
 from pathlib import Path
 from dataclasses import asdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import logging
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Imports système
 SCRIPT_DIR = Path(__file__).resolve().parent
@@ -54,7 +55,14 @@ from agentique.base.contrats_interface import (
     Categorie,
     Souvenir,
 )
+from agentique.base.demarrage import charger_yaml
 from agentique.sous_agents_gouvernes.agent_Memoire.moteur_vecteur import MoteurVectoriel
+from agentique.sous_agents_gouvernes.agent_Memoire.journal_historique import (
+    JournalHistorique,
+)
+from agentique.sous_agents_gouvernes.agent_Memoire.registre_consolidation import (
+    RegistreConsolidation,
+)
 from agentique.sous_agents_gouvernes.agent_Recherche.agent_Recherche import (
     AgentRecherche,
 )
@@ -65,6 +73,9 @@ from agentique.sous_agents_gouvernes.agent_Entraineur.auto_dataset_builder impor
 
 logger = logging.getLogger(__name__)
 
+MARQUEUR_FIN = "=== FIN DE SESSION ==="
+MOTIF_MARQUEUR_MSG = re.compile(r"===\s*MSG\s*(\d+)\s*===")
+
 
 class ProcesseurBrutePersistante(AgentBase):
     def __init__(self, llm_engine=None):
@@ -88,6 +99,19 @@ class ProcesseurBrutePersistante(AgentBase):
 
         # 2. Paramètres dynamiques
         self.delai_timeout_heures = self.proc_config.get("timeout_session_heures", 4)
+        self.sessions_paralleles = max(1, self.proc_config.get("sessions_paralleles", 2))
+        self.fenetres_paralleles = max(1, self.proc_config.get("fenetres_paralleles", 2))
+        self.taille_fenetre = max(2, self.proc_config.get("taille_fenetre_messages", 24))
+        self.chevauchement = min(
+            max(0, self.proc_config.get("chevauchement_messages", 4)),
+            self.taille_fenetre - 1,
+        )
+
+        # Map (LLM) parallèle, Reduce (disque/index/dataset) sérialisé
+        self._verrou_persistance = threading.Lock()
+        self._verrou_metriques = threading.Lock()
+        self._pool_fenetres: Optional[ThreadPoolExecutor] = None
+        self._metriques = self._nouvelles_metriques(0)
 
         self.moteur_vectoriel = MoteurVectoriel()
         self.agent_recherche = AgentRecherche()
@@ -98,16 +122,26 @@ class ProcesseurBrutePersistante(AgentBase):
             self.llm_synthese = MoteurLLM()
 
         self.source_dir = Path(self.auditor.get_path("historique", nom_agent="memoire"))
+        self.journal_historique = JournalHistorique(dossier_historique=str(self.source_dir))
         self.persistante_dir = Path(
             self.auditor.get_path("persistante", nom_agent="memoire")
         )
-        self.state_file = (
-            Path(self.auditor.get_path("base", nom_agent="memoire"))
-            / ".traitement_state.json"
+        base_dir = Path(self.auditor.get_path("base", nom_agent="memoire"))
+        self.state_file = base_dir / ".traitement_state.json"
+
+        # Registre de points de contrôle (fichiers scannés + avancement par session)
+        chemin_registre = base_dir / ".registre_consolidation.json"
+        ancien_etat = {} if chemin_registre.exists() else self._charger_etat_legacy()
+        self.registre = RegistreConsolidation(
+            chemin_registre=chemin_registre,
+            dossier_historique=self.source_dir,
+            dossier_journal=self.journal_historique.dossier_journal,
+            journal=self.journal_historique,
+            logger=self.logger,
+            ids_deja_traites=self._ids_deja_traites(ancien_etat),
         )
-
-        self.state = self._charger_etat()
-        self.fichiers_ignores = set(self.state.get("fichiers_historiques_traites", []))
+        if ancien_etat.get("dernier_run") and not self.registre.donnees["dernier_run"]:
+            self.registre.donnees["dernier_run"] = ancien_etat["dernier_run"]
         self.dataset_builder = AutoDatasetBuilder()
 
         self.logger.info(
@@ -117,11 +151,15 @@ class ProcesseurBrutePersistante(AgentBase):
     def _load_config(self):
         path = self.auditor.get_path("config", "memoire")
         if path and Path(path).exists():
-            with open(path, "r", encoding="utf-8") as f:
-                return yaml.safe_load(f).get("configuration", {})
+            return charger_yaml(path).get("configuration", {})
         return {}
 
     def _charger_etat(self) -> Dict:
+        """État courant (registre). `dernier_run` est lu par AgentSemi au démarrage."""
+        return self.registre.donnees
+
+    def _charger_etat_legacy(self) -> Dict:
+        """Ancien `.traitement_state.json` (repris une seule fois dans le registre)."""
         if self.state_file.exists():
             try:
                 with open(self.state_file, "r", encoding="utf-8") as f:
@@ -130,182 +168,447 @@ class ProcesseurBrutePersistante(AgentBase):
                 return {}
         return {}
 
-    def _sauver_etat(self):
-        self.state["fichiers_historiques_traites"] = list(self.fichiers_ignores)
-        self.state["dernier_run"] = datetime.now().isoformat()
-        try:
-            with open(self.state_file, "w", encoding="utf-8") as f:
-                json.dump(self.state, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            self.logger.log_error(f"Erreur sauvegarde état: {e}")
+    def _ids_deja_traites(self, ancien_etat: Dict) -> set:
+        """
+        Convertit l'ancien set `fichiers_historiques_traites` (noms de fichiers ou IDs)
+        en IDs d'interactions, via l'index du journal pour l'historique déjà migré.
+        """
+        anciens = set(ancien_etat.get("fichiers_historiques_traites", []))
+        if not anciens:
+            return set()
+        ids = {
+            e["id"]
+            for e in self.journal_historique.entrees()
+            if e.get("legacy") in anciens
+        }
+        return anciens | ids
 
     def traiter_batch_differe(self):
         """
-        Orchestrateur du pipeline de traitement différé.
+        Orchestrateur du pipeline de traitement différé (Map-Reduce).
 
         Exécute la boucle principale :
         1. Identifie les sessions terminées (delta temps > timeout).
-        2. Lance l'analyse sémantique globale via le LLM.
+        2. Lance l'analyse sémantique via le LLM, plusieurs sessions à la fois
+           (pool borné `sessions_paralleles`), les longues sessions en fenêtres parallèles.
         3. Sauvegarde les résultats sous forme d'objets 'Interaction' enrichis.
         4. Déclenche la vectorisation et l'indexation des nouveaux souvenirs.
         5. Alimente le dataset d'entraînement avec les paires (Prompt Original / Intention Corrigée).
 
+        Seule l'analyse LLM est parallèle : la persistance (fichiers, index, dataset)
+        reste sérialisée. Chaque résumé sauvegardé est consigné dans le registre ;
+        une session interrompue (`en_cours`) reprend en sautant les messages déjà traités.
+
         Returns:
-            Dict: Rapport d'exécution contenant le nombre d'items traités.
+            Dict: Rapport d'exécution (items traités + métriques de débit).
         """
         self.logger.info("🕒 Regroupement des sessions en attente...")
         sessions = self._grouper_fichiers_par_session()
+        self._synchroniser_catalogue()
+
+        # --- LOGIQUE TIME-OUT ---
+        # Pour le mode "Temps réel", mettez le timedelta à 0
+        delai = timedelta(hours=self.delai_timeout_heures)
+        a_traiter = [
+            sid
+            for sid, data in sessions.items()
+            if (datetime.now() - data["last_timestamp"]) > delai
+        ]
+        self._metriques = self._nouvelles_metriques(len(a_traiter))
         count = 0
 
-        for session_id, data in sessions.items():
-            messages = data["messages"]
+        if a_traiter:
+            self.logger.info(
+                f"🧵 Consolidation de {len(a_traiter)} session(s) "
+                f"({self.sessions_paralleles} en parallèle)..."
+            )
+            with ThreadPoolExecutor(
+                max_workers=self.fenetres_paralleles, thread_name_prefix="Fenetre"
+            ) as pool_fenetres, ThreadPoolExecutor(
+                max_workers=self.sessions_paralleles, thread_name_prefix="Consolidation"
+            ) as pool_sessions:
+                self._pool_fenetres = pool_fenetres
+                futures = {
+                    pool_sessions.submit(self._consolider_session, sid): sid
+                    for sid in a_traiter
+                }
+                for future in as_completed(futures):
+                    session_id = futures[future]
+                    try:
+                        count += future.result()
+                    except Exception as e:
+                        self._incrementer("sessions_en_echec")
+                        self.logger.log_error(
+                            f"Erreur traitement session {session_id}: {e}"
+                        )
+                    self._incrementer("sessions_terminees")
+                    self._signaler_progression()
+            self._pool_fenetres = None
 
-            # --- LOGIQUE TIME-OUT ---
-            # Pour le mode "Temps réel", mettez le timedelta à 0
-            if (datetime.now() - data["last_timestamp"]) > timedelta(
-                hours=self.delai_timeout_heures
-            ):
-                nb_msgs = len(messages)
+        # Sauvegarde état
+        self._sauver_etat()
+        return {"items_traites": count, "metriques": self.obtenir_metriques_consolidation()}
+
+    def _consolider_session(self, session_id: str) -> int:
+        """
+        Consolide UNE session : analyse (Map, parallélisable) puis persistance (Reduce, verrouillée).
+
+        Returns:
+            int: Nombre de résumés sauvegardés.
+        """
+        # Lecture des messages UNIQUEMENT pour les sessions à consolider
+        messages, fichiers = self.registre.charger_messages(session_id)
+        deja_traites = self.registre.traitees(session_id)
+        if not messages:
+            return 0
+        self.logger.info(
+            f"🔒 Consolidation session {session_id[:8]} ({len(messages)} messages"
+            f"{f', reprise après {len(deja_traites)}' if deja_traites else ''})..."
+        )
+        self._incrementer("messages_total", len(messages))
+        self.registre.marquer_en_cours(session_id)
+
+        # 1. Analyse de la session (fenêtres LLM parallèles)
+        resultats_resumes = self._analyser_session_complete(messages, session_id)
+        if not resultats_resumes:
+            return 0
+
+        count = 0
+        with self._verrou_persistance:
+            # 2. Sauvegarde Granulaire
+            for i, interaction_resume in enumerate(resultats_resumes):
+                # On récupère les métadonnées originales pour le lien
+                data_orig = messages[i]
+                fichier_source = fichiers[i]
+                if interaction_resume is None or fichier_source in deja_traites:
+                    continue
+
+                # --- 🧠 LOGIQUE DATASET 🧠 ---
+                # On récupère le VRAI prompt utilisateur (pas le "Résumé 1/5")
+                vrai_prompt = data_orig.get("prompt") or data_orig.get("user", "")
+
+                # On crée une interaction hybride pour l'entraînement :
+                if vrai_prompt and interaction_resume.intention:
+                    training_interaction = Interaction(
+                        prompt=vrai_prompt,
+                        reponse="",  # On s'en fiche pour l'intention detector
+                        intention=interaction_resume.intention,
+                        contexte_memoire=[],
+                        system="",
+                        meta=MetadataFichier(),
+                    )
+                    self.dataset_builder.ajouter_interaction(
+                        training_interaction, source="batch_qwen14b"
+                    )
+                # ------------------------------
+
+                # Sauvegarde du résumé (Inchangé)
+                path = self._sauvegarder_resume(interaction_resume, data_orig)
+
+                # Vectorisation (Inchangé)
+                self._indexer_resume(interaction_resume, path)
+
+                # Point de contrôle (durable)
+                self.registre.marquer_message_traite(session_id, fichier_source)
+                deja_traites.add(fichier_source)
+                self._marquer_catalogue(fichier_source)
+                count += 1
+
+            # Session close seulement si TOUS ses messages sont traités
+            if deja_traites.issuperset(fichiers):
+                self.registre.marquer_consolidee(session_id)
                 self.logger.info(
-                    f"🔒 Consolidation session {session_id[:8]} ({nb_msgs} messages)..."
+                    f"✅ Session {session_id[:8]} archivée et injectée dans le dataset."
                 )
 
-                try:
-                    # 1. Traitement GLOBAL de la session (Batch LLM)
-                    resultats_resumes = self._analyser_session_complete(
-                        messages, session_id
-                    )
+        self._incrementer("messages_persistes", count)
+        return count
 
-                    if resultats_resumes:
-                        # 2. Sauvegarde Granulaire
-                        for i, interaction_resume in enumerate(resultats_resumes):
-                            # On récupère les métadonnées originales pour le lien
-                            data_orig = messages[i]
-                            fichier_source = data["files"][i]
-
-                            # --- 🧠 LOGIQUE DATASET 🧠 ---
-                            # On récupère le VRAI prompt utilisateur (pas le "Résumé 1/5")
-                            vrai_prompt = data_orig.get("prompt") or data_orig.get(
-                                "user", ""
-                            )
-
-                            # On crée une interaction hybride pour l'entraînement :
-                            if vrai_prompt and interaction_resume.intention:
-                                training_interaction = Interaction(
-                                    prompt=vrai_prompt,
-                                    reponse="",  # On s'en fiche pour l'intention detector
-                                    intention=interaction_resume.intention,
-                                    contexte_memoire=[],
-                                    system="",
-                                    meta=MetadataFichier(),
-                                )
-                                self.dataset_builder.ajouter_interaction(
-                                    training_interaction, source="batch_qwen14b"
-                                )
-                            # ------------------------------
-
-                            # Sauvegarde du résumé (Inchangé)
-                            path = self._sauvegarder_resume(
-                                interaction_resume, data_orig
-                            )
-
-                            # Vectorisation (Inchangé)
-                            self._indexer_resume(interaction_resume, path)
-
-                            # Marquage
-                            self.fichiers_ignores.add(fichier_source)
-                            count += 1
-
-                        self.logger.info(
-                            f"✅ Session {session_id[:8]} archivée et injectée dans le dataset."
-                        )
-                except Exception as e:
-                    self.logger.log_error(
-                        f"Erreur traitement session {session_id}: {e}"
-                    )
+    def _synchroniser_catalogue(self):
+        """Rattrape dans le catalogue analytique les interactions qu'il n'a pas encore vues."""
+        try:
+            self.journal_historique.synchroniser_catalogue()
+        except Exception as e:
+            self.logger.log_warning(f"⚠️ Synchronisation catalogue échouée : {e}")
 
-        # Sauvegarde état
-        self._sauver_etat()
-        return {"items_traites": count}
+    def _marquer_catalogue(self, interaction_id: str):
+        catalogue = self.journal_historique.catalogue
+        if catalogue is None:
+            return
+        try:
+            catalogue.marquer_consolidee(interaction_id)
+        except Exception as e:
+            self.logger.log_warning(f"⚠️ Catalogue : consolidation non marquée ({interaction_id}) : {e}")
+
+    def _sauver_etat(self):
+        try:
+            self.registre.sauvegarder(dernier_run=True)
+        except Exception as e:
+            self.logger.log_error(f"Erreur sauvegarde état: {e}")
 
     def _grouper_fichiers_par_session(self) -> Dict:
-        """Groupe les fichiers non traités par session_id"""
-        sessions = {}
-        files = sorted(
-            list(self.source_dir.rglob("*.json"))
-        )  # Tri important pour l'ordre chrono
+        """
+        Groupe les interactions non consolidées par session_id.
 
-        for fichier in files:
-            if fichier.name in self.fichiers_ignores:
-                continue
-            try:
-                with open(fichier, "r", encoding="utf-8") as fd:
-                    data = json.load(fd)
-                meta = data.get("meta", {})
-                sid = meta.get("session_id") or data.get("session_id") or "unknown"
-                ts_str = meta.get("timestamp") or data.get("timestamp")
-                try:
-                    ts = datetime.fromisoformat(str(ts_str))
-                except Exception:
-                    ts = datetime.now()
-
-                if sid not in sessions:
-                    sessions[sid] = {"messages": [], "last_timestamp": ts, "files": []}
-                sessions[sid]["messages"].append(data)
-                sessions[sid]["files"].append(fichier.name)
-                if ts > sessions[sid]["last_timestamp"]:
-                    sessions[sid]["last_timestamp"] = ts
-            except Exception:
-                continue
-
-        # Tri chronologique des messages dans chaque session
-        for s in sessions:
-            # On trie les paires (message, fichier) ensemble
-            zipped = sorted(
-                zip(sessions[s]["messages"], sessions[s]["files"]),
-                key=lambda pair: pair[0].get("meta", {}).get("timestamp", ""),
+        Scan incrémental : seuls les segments ajoutés/modifiés (queue uniquement) et les
+        anciens fichiers nouveaux sont ouverts. Le regroupement vient ensuite du registre,
+        sans relire l'historique ; les messages sont chargés plus tard, session par session.
+        """
+        rapport = self.registre.scanner()
+        if rapport["fichiers_ouverts"]:
+            self.logger.info(
+                f"🔎 Registre : {rapport['fichiers_ouverts']} fichier(s) lus, "
+                f"{rapport['messages_nouveaux']} nouveau(x) message(s)."
             )
-            sessions[s]["messages"] = [z[0] for z in zipped]
-            sessions[s]["files"] = [z[1] for z in zipped]
 
+        sessions = {}
+        for sid, session in self.registre.sessions_a_consolider(timedelta(0)):
+            try:
+                ts = datetime.fromisoformat(session["dernier_timestamp"])
+            except Exception:
+                ts = datetime.now()
+            sessions[sid] = {
+                "last_timestamp": ts,
+                "statut": session["statut"],
+                "files": [m["id"] for m in session["messages"]],
+            }
         return sessions
 
     def _analyser_session_complete(
         self, messages: List[Dict], session_id: str
-    ) -> List[Interaction]:
+    ) -> List[Optional[Interaction]]:
         """
-        Cœur cognitif du processeur : Analyse Batch Contextuelle.
+        Cœur cognitif du processeur : Analyse Batch Contextuelle (Map-Reduce).
 
-        Construit un prompt massif contenant l'intégralité du transcript de la session.
-        Force le LLM à agir comme un "Superviseur" qui re-qualifie chaque message
-        avec le recul de la conversation entière (ex: comprendre que "ça marche pas"
+        Demande au LLM d'agir comme un "Superviseur" qui re-qualifie chaque message
+        avec le recul de la conversation (ex: comprendre que "ça marche pas"
         fait référence au code envoyé 3 messages plus tôt).
 
+        Les longues sessions sont découpées en fenêtres qui se chevauchent
+        (`taille_fenetre_messages` / `chevauchement_messages`) : chaque fenêtre tient
+        dans le contexte du LLM, garde la continuité avec la précédente, et les fenêtres
+        sont analysées en parallèle puis fusionnées.
+
         Applique une taxonomie stricte (Sujet/Action/Catégorie) et impose un format
-        de sortie JSON séquentiel pour un parsing robuste.
+        de sortie JSON séquentiel, parsé bloc par bloc pendant le streaming :
+        un JSON invalide n'invalide que son message.
 
         Args:
             messages (List[Dict]): La liste chronologique des logs bruts.
             session_id (str): Identifiant unique de la session (pour traçabilité).
 
         Returns:
-            List[Interaction]: Liste d'objets standardisés prêts pour la persistance.
+            List[Optional[Interaction]]: Alignée sur `messages` (None = message non classé).
         """
-        # --- CHRONO DÉBUT ---
         start = time.time()
-        print(f"\n--- ⏱️ TOP CHRONO SESSION {session_id[:8]} ---")
+        fenetres = self._decouper_fenetres(len(messages))
+        self.logger.info(
+            f"🧠 Analyse session {session_id[:8]} ({len(messages)} msgs, {len(fenetres)} fenêtre(s))..."
+        )
+
+        def analyser(fenetre):
+            return self._analyser_fenetre(messages, fenetre, session_id)
+
+        if self._pool_fenetres is not None and len(fenetres) > 1:
+            analyses = list(self._pool_fenetres.map(analyser, fenetres))
+        else:
+            analyses = [analyser(f) for f in fenetres]
+
+        interactions = self._fusionner_fenetres(
+            len(messages), fenetres, analyses, session_id
+        )
+        self.logger.info(
+            f"⏱️ Session {session_id[:8]} analysée en {time.time() - start:.2f}s "
+            f"({sum(1 for x in interactions if x)}/{len(messages)} messages classés)."
+        )
+        return interactions
+
+    def _decouper_fenetres(self, nb_messages: int) -> List[Tuple[int, int, int, int]]:
+        """
+        Découpe [0, nb_messages) en fenêtres chevauchantes.
+
+        Returns:
+            List[(debut, fin, debut_propre, fin_propre)] : la fenêtre envoyée au LLM
+            et la plage dont elle est "propriétaire" à la fusion (milieu du chevauchement).
+        """
+        if nb_messages <= self.taille_fenetre:
+            return [(0, nb_messages, 0, nb_messages)]
+
+        pas = self.taille_fenetre - self.chevauchement
+        debuts = [0]
+        while debuts[-1] + self.taille_fenetre < nb_messages:
+            debuts.append(debuts[-1] + pas)
+
+        demi = self.chevauchement // 2
+        fenetres = []
+        for k, debut in enumerate(debuts):
+            fin = min(debut + self.taille_fenetre, nb_messages)
+            debut_propre = debut + demi if k > 0 else 0
+            fin_propre = debuts[k + 1] + demi if k + 1 < len(debuts) else nb_messages
+            fenetres.append((debut, fin, debut_propre, fin_propre))
+        return fenetres
+
+    def _analyser_fenetre(
+        self, messages: List[Dict], fenetre: Tuple[int, int, int, int], session_id: str
+    ) -> Dict[int, Tuple[ResultatIntention, str]]:
+        """
+        Analyse LLM d'une fenêtre (Map). Les messages gardent leur numéro global.
+
+        Returns:
+            Dict[index_global, (intention, résumé)] pour les blocs valides.
+        """
+        debut, fin = fenetre[0], fenetre[1]
+        self._incrementer("fenetres")
 
         transcript = ""
-        for i, m in enumerate(messages):
+        for i in range(debut, fin):
+            m = messages[i]
             role = "User" if m.get("prompt") else "Assistant"
             cont = m.get("prompt") if role == "User" else m.get("reponse")
             transcript += f"--- MESSAGE {i + 1} ({role}) ---\n{cont}\n\n"
 
+        extrait = ""
+        if debut > 0 or fin < len(messages):
+            extrait = (
+                f"(Extrait de la session : messages {debut + 1} à {fin} sur {len(messages)}. "
+                f"Garde la numérotation globale dans les blocs === MSG n ===.)\n"
+            )
+
+        prompt_final = (
+            f"<|im_start|>system\n{self._consigne_consolidation()}<|im_end|>\n"
+            f"<|im_start|>user\nVoici le transcript à analyser :\n{extrait}{transcript}<|im_end|>\n"
+            f"<|im_start|>assistant\n"
+        )
+
+        resultats = {}
+        try:
+            generateur = self.llm_synthese.generer_stream(prompt_final)
+            for rang, (numero, bloc_texte) in enumerate(
+                self._parser_flux_blocs(generateur, self._compter_caracteres)
+            ):
+                # Numérotation globale attendue ; repli sur l'ordre si le LLM renumérote
+                index = numero - 1 if debut <= numero - 1 < fin else debut + rang
+                if index >= fin or not bloc_texte.strip():
+                    continue
+                try:
+                    resultats[index] = self._extraire_intention_du_bloc(bloc_texte)
+                    self._incrementer("messages_analyses")
+                except Exception as e:
+                    self._incrementer("echecs_parsing")
+                    self.logger.log_error(f"Erreur parsing MSG {index + 1}: {e}")
+                if len(resultats) >= fin - debut:
+                    break  # Tous les messages reçus : inutile d'attendre la fin du flux
+        except Exception as e:
+            self.logger.log_error(
+                f"Erreur LLM Batch (session {session_id[:8]}, fenêtre {debut + 1}-{fin}): {e}"
+            )
+        return resultats
+
+    @staticmethod
+    def _parser_flux_blocs(generateur, sur_token=None):
+        """
+        Parsing en streaming : émet (numéro, texte) dès qu'un bloc `=== MSG n ===` est complet
+        (marqueur suivant ou fin de session), sans attendre la réponse entière.
+        """
+        numero = None
+        tampon = ""
+        for chunk in generateur:
+            token = str(chunk)
+            if sur_token:
+                sur_token(token)
+            tampon += token
+
+            arret = MARQUEUR_FIN in tampon
+            if arret:
+                tampon = tampon.split(MARQUEUR_FIN)[0]
+
+            while True:
+                marqueur = MOTIF_MARQUEUR_MSG.search(tampon)
+                if not marqueur:
+                    break
+                if numero is not None:
+                    yield numero, tampon[: marqueur.start()]
+                numero = int(marqueur.group(1))
+                tampon = tampon[marqueur.end() :]
+
+            if arret:
+                break
+
+        if numero is not None:
+            yield numero, tampon
+
+    def _fusionner_fenetres(
+        self,
+        nb_messages: int,
+        fenetres: List[Tuple[int, int, int, int]],
+        analyses: List[Dict[int, Tuple[ResultatIntention, str]]],
+        session_id: str,
+    ) -> List[Optional[Interaction]]:
+        """
+        Fusion (Reduce) : chaque message prend le résultat de la fenêtre propriétaire,
+        ou à défaut celui d'une fenêtre voisine qui l'a aussi vu (chevauchement).
+        """
+        interactions: List[Optional[Interaction]] = [None] * nb_messages
+        for i in range(nb_messages):
+            candidats = [
+                analyse
+                for (_, _, debut_propre, fin_propre), analyse in zip(fenetres, analyses)
+                if debut_propre <= i < fin_propre
+            ] + analyses
+            for analyse in candidats:
+                if i in analyse:
+                    intention_obj, resume_str = analyse[i]
+                    interactions[i] = self._construire_interaction(
+                        i, nb_messages, session_id, intention_obj, resume_str
+                    )
+                    break
+        return interactions
+
+    def _construire_interaction(
+        self,
+        i: int,
+        nb_messages: int,
+        session_id: str,
+        intention_obj: ResultatIntention,
+        resume_str: str,
+    ) -> Interaction:
+        contexte_technique = [
+            Souvenir(contenu="Batch Auto", titre="BATCH", type="systeme", score=0.0)
+        ]
+
+        inter = Interaction(
+            prompt=f"Résumé {i + 1}/{nb_messages}",
+            reponse=resume_str,  # ✅ String Résumé
+            system="System Prompt Batch (Consolidation)",
+            intention=intention_obj,  # ✅ Objet Intention
+            contexte_memoire=contexte_technique,
+            meta=MetadataFichier(
+                session_id=session_id,
+                message_turn=i + 1,
+                source_agent="ProcesseurBrutePersistante",
+                type_memoire="persistante",
+                fichiers_consultes=[],
+                validation_juge=True,
+                score_qualite=1.0,
+                nb_problemes=0,
+                details_juge="Généré par Consolidation Batch",
+                len_contenu=len(resume_str),
+                ref_vectoriel=None,
+                ref_whoosh=None,
+                data_libre={"source": "consolidation_globale"},
+            ),
+        )
+        # 🛡️👁️‍🗨️🛡️# VALIDATION FORMAT SORTIE
+        # On valide chaque item généré par le batch
+        self.auditor.valider_format_sortie(inter)
+        return inter
+
+    def _consigne_consolidation(self) -> str:
         # --- ASTUCE AFFICHAGE : On définit les backticks dans une variable ---
         CODE_BLOCK = "```"
 
         # --- PROMPT UTILISATEUR INTÉGRÉ ---
-        consigne_systeme = f"""Tu es un Moteur de Consolidation Mémoire.
+        return f"""Tu es un Moteur de Consolidation Mémoire.
 Tâche : Analyse cette session COMPLÈTE et génère une fiche de résumé pour CHAQUE message.
 Ta mission est de classer CHAQUE message utilisateur selon trois axes :
 1. SUJET
@@ -387,94 +690,50 @@ FORMAT DE SORTIE (Répéter ce bloc pour chaque message) :
 IMPORTANT : Une fois tous les messages traités, écris EXPLICITEMENT : "=== FIN DE SESSION ===" et arrête-toi.
 """
 
-        prompt_final = (
-            f"<|im_start|>system\n{consigne_systeme}<|im_end|>\n"
-            f"<|im_start|>user\nVoici le transcript à analyser :\n{transcript}<|im_end|>\n"
-            f"<|im_start|>assistant\n"
-        )
-
-        try:
-            self.logger.info(
-                f"🧠 Analyse globale session {session_id[:8]} ({len(messages)} msgs)..."
-            )
-
-            generateur = self.llm_synthese.generer_stream(prompt_final)
-            full_response = ""
-
-            print("--- 📺 DÉBUT DU STREAMING LLM ---")
-            for chunk in generateur:
-                token = str(chunk)
-                full_response += token
-                print(token, end="", flush=True)
-
-                if "=== FIN DE SESSION ===" in full_response:
-                    print("\n🛑 Stop Signal détecté.")
-                    break
-
-            full_response = full_response.split("=== FIN DE SESSION ===")[0]
-
-            # --- PARSING JSON ROBUSTE ---
-            interactions_generees = []
-            blocs = re.split(r"===\s*MSG\s*\d+\s*===", full_response)
-
-            if len(blocs) > 1:
-                blocs = blocs[1:]
-            nb_a_traiter = min(len(blocs), len(messages))
-
-            for i in range(nb_a_traiter):
-                bloc_texte = blocs[i].strip()
-                if not bloc_texte:
-                    continue
-
-                # Extraction via JSON Parser
-                try:
-                    intention_obj, resume_str = self._extraire_intention_du_bloc(
-                        bloc_texte
-                    )
-                except Exception as e:
-                    self.logger.log_error(f"Erreur parsing MSG {i + 1}: {e}")
-                    continue
-
-                contexte_technique = [
-                    Souvenir(
-                        contenu="Batch Auto", titre="BATCH", type="systeme", score=0.0
-                    )
-                ]
-
-                inter = Interaction(
-                    prompt=f"Résumé {i + 1}/{len(messages)}",
-                    reponse=resume_str,  # ✅ String Résumé
-                    system="System Prompt Batch (Consolidation)",
-                    intention=intention_obj,  # ✅ Objet Intention
-                    contexte_memoire=contexte_technique,
-                    meta=MetadataFichier(
-                        session_id=session_id,
-                        message_turn=i + 1,
-                        source_agent="ProcesseurBrutePersistante",
-                        type_memoire="persistante",
-                        fichiers_consultes=[],
-                        validation_juge=True,
-                        score_qualite=1.0,
-                        nb_problemes=0,
-                        details_juge="Généré par Consolidation Batch",
-                        len_contenu=len(resume_str),
-                        ref_vectoriel=None,
-                        ref_whoosh=None,
-                        data_libre={"source": "consolidation_globale"},
-                    ),
-                )
-                # 🛡️👁️‍🗨️🛡️# VALIDATION FORMAT SORTIE
-                # On valide chaque item généré par le batch
-                self.auditor.valider_format_sortie(inter)
-
-                interactions_generees.append(inter)
-
-            print(f"⏱️ Temps écoulé : {time.time() - start:.2f}s")
-            return interactions_generees
+    # =========================================================================
+    # 📊 MÉTRIQUES DE CONSOLIDATION
+    # =========================================================================
+
+    @staticmethod
+    def _nouvelles_metriques(nb_sessions: int) -> Dict:
+        return {
+            "sessions_total": nb_sessions,
+            "sessions_terminees": 0,
+            "sessions_en_echec": 0,
+            "messages_total": 0,
+            "messages_analyses": 0,
+            "messages_persistes": 0,
+            "fenetres": 0,
+            "echecs_parsing": 0,
+            "caracteres_generes": 0,
+            "debut": time.monotonic(),
+        }
 
-        except Exception as e:
-            self.logger.log_error(f"Erreur LLM Batch: {e}")
-            return None
+    def _incrementer(self, cle: str, valeur: int = 1):
+        with self._verrou_metriques:
+            self._metriques[cle] += valeur
+
+    def _compter_caracteres(self, token: str):
+        self._incrementer("caracteres_generes", len(token))
+
+    def obtenir_metriques_consolidation(self) -> Dict:
+        """Progression et débit du dernier batch (messages/s, sessions/min, caractères/s)."""
+        with self._verrou_metriques:
+            m = dict(self._metriques)
+        duree = max(time.monotonic() - m.pop("debut"), 1e-6)
+        m["duree_s"] = round(duree, 2)
+        m["messages_par_s"] = round(m["messages_analyses"] / duree, 2)
+        m["sessions_par_min"] = round(m["sessions_terminees"] * 60 / duree, 2)
+        m["caracteres_par_s"] = round(m["caracteres_generes"] / duree, 1)
+        return m
+
+    def _signaler_progression(self):
+        m = self.obtenir_metriques_consolidation()
+        self.logger.info(
+            f"📊 Consolidation {m['sessions_terminees']}/{m['sessions_total']} sessions | "
+            f"{m['messages_analyses']} msgs classés ({m['messages_par_s']} msg/s) | "
+            f"{m['echecs_parsing']} échec(s) parsing"
+        )
 
     def _extraire_intention_du_bloc(self, texte: str) -> Tuple[ResultatIntention, str]:
         """
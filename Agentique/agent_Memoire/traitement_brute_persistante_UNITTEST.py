@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: Processeur Brute Persistante (Consolidation Map-Reduce)
+Cible : agentique/sous_agents_gouvernes/agent_Memoire/traitement_brute_persistante.py
+Objectif : Valider le découpage en fenêtres, le parsing en streaming, la fusion et le pool de sessions.
+"""
+
+import unittest
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from agentique.sous_agents_gouvernes.agent_Memoire.traitement_brute_persistante import (
+    ProcesseurBrutePersistante,
+)
+
+
+def _bloc(n: int, sujet: str = "Script") -> str:
+    return (
+        f"=== MSG {n} ===\n```json\n"
+        f'{{"sujet": "{sujet}", "action": "Coder", "categorie": "Agent", "resume": "R{n}"}}\n```\n'
+    )
+
+
+class TestConsolidationMapReduce(unittest.TestCase):
+    def setUp(self):
+        """Bypass du __init__ (LLM, moteurs, index) : seuls les paramètres du moteur sont injectés."""
+        self.proc = ProcesseurBrutePersistante.__new__(ProcesseurBrutePersistante)
+        self.proc.logger = MagicMock()
+        self.proc.auditor = MagicMock()
+        self.proc.llm_synthese = MagicMock()
+        self.proc.journal_historique = MagicMock()
+        self.proc.sessions_paralleles = 4
+        self.proc.fenetres_paralleles = 2
+        self.proc.taille_fenetre = 10
+        self.proc.chevauchement = 4
+        self.proc._verrou_persistance = threading.Lock()
+        self.proc._verrou_metriques = threading.Lock()
+        self.proc._pool_fenetres = None
+        self.proc._metriques = self.proc._nouvelles_metriques(0)
+
+    # =========================================================================
+    # 1. FENÊTRES
+    # =========================================================================
+
+    def test_decoupage_fenetres_chevauchantes(self):
+        """Chaque message appartient à exactement UNE fenêtre, et chaque fenêtre tient dans la taille max."""
+        self.assertEqual(self.proc._decouper_fenetres(7), [(0, 7, 0, 7)])
+
+        fenetres = self.proc._decouper_fenetres(25)
+        proprietaires = [
+            sum(1 for f in fenetres if f[2] <= i < f[3]) for i in range(25)
+        ]
+        self.assertEqual(proprietaires, [1] * 25)
+        for debut, fin, debut_propre, fin_propre in fenetres:
+            self.assertLessEqual(fin - debut, 10)
+            self.assertTrue(debut <= debut_propre and fin_propre <= fin)
+        # Chevauchement : chaque fenêtre (sauf la première) revoit la fin de la précédente
+        self.assertEqual(fenetres[1][0], fenetres[0][1] - 4)
+
+    # =========================================================================
+    # 2. STREAMING + FUSION
+    # =========================================================================
+
+    def test_parser_flux_emet_les_blocs_au_fil_de_l_eau(self):
+        """Un bloc est émis dès que le marqueur suivant arrive, sans attendre la fin du flux."""
+        emis = []
+
+        def flux():
+            yield _bloc(1)[:15]
+            yield _bloc(1)[15:]
+            yield "=== MSG 2 ==="
+            emis.append("apres_msg2")
+            yield '{"sujet": "Script"}\n=== FIN DE SESSION === texte parasite'
+
+        blocs = []
+        for numero, texte in ProcesseurBrutePersistante._parser_flux_blocs(flux()):
+            blocs.append(numero)
+            if numero == 1:
+                self.assertEqual(emis, [])
+                self.assertIn('"R1"', texte)
+        self.assertEqual(blocs, [1, 2])
+
+    def test_json_invalide_n_affecte_que_son_message(self):
+        self.proc.llm_synthese.generer_stream.return_value = iter(
+            [_bloc(1), "=== MSG 2 ===\n{pas du json", _bloc(3), "=== FIN DE SESSION ==="]
+        )
+        messages = [{"prompt": f"q{i}"} for i in range(3)]
+
+        resultats = self.proc._analyser_session_complete(messages, "S1")
+
+        self.assertEqual([r is not None for r in resultats], [True, False, True])
+        self.assertEqual(resultats[2].reponse, "R3")
+        self.assertEqual(self.proc.obtenir_metriques_consolidation()["echecs_parsing"], 1)
+
+    def test_session_longue_fenetres_fusionnees(self):
+        """25 messages -> plusieurs appels LLM en parallèle, un résultat par message, numérotation globale."""
+        appels = []
+
+        def generer(prompt):
+            numeros = [
+                int(l.split()[2]) for l in prompt.splitlines() if l.startswith("--- MESSAGE ")
+            ]
+            appels.append(numeros)
+            return iter([_bloc(n) for n in numeros] + ["=== FIN DE SESSION ==="])
+
+        self.proc.llm_synthese.generer_stream.side_effect = generer
+        messages = [{"prompt": f"q{i}"} for i in range(25)]
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            self.proc._pool_fenetres = pool
+            resultats = self.proc._analyser_session_complete(messages, "S1")
+
+        self.assertGreater(len(appels), 1)
+        self.assertTrue(all(len(a) <= 10 for a in appels))
+        self.assertEqual([r.reponse for r in resultats], [f"R{i + 1}" for i in range(25)])
+        self.assertEqual(resultats[24].meta.message_turn, 25)
+
+    # =========================================================================
+    # 3. POOL DE SESSIONS
+    # =========================================================================
+
+    def test_sessions_consolidees_en_parallele(self):
+        """Le pool borné traite plusieurs sessions simultanément ; les métriques suivent."""
+        from datetime import datetime, timedelta
+
+        ancien = datetime.now() - timedelta(hours=10)
+        self.proc.delai_timeout_heures = 4
+        self.proc._grouper_fichiers_par_session = MagicMock(
+            return_value={f"S{i}": {"last_timestamp": ancien} for i in range(4)}
+        )
+        self.proc.registre = MagicMock()
+        en_vol, pic = [0], [0]
+        verrou = threading.Lock()
+
+        def consolider(sid):
+            with verrou:
+                en_vol[0] += 1
+                pic[0] = max(pic[0], en_vol[0])
+            time.sleep(0.05)
+            with verrou:
+                en_vol[0] -= 1
+            return 2
+
+        self.proc._consolider_session = consolider
+
+        rapport = self.proc.traiter_batch_differe()
+
+        self.assertEqual(rapport["items_traites"], 8)
+        self.assertGreater(pic[0], 1)
+        self.assertLessEqual(pic[0], 4)
+        self.assertEqual(rapport["metriques"]["sessions_terminees"], 4)
+        self.proc.registre.sauvegarder.assert_called_once_with(dernier_run=True)
+        self.proc.journal_historique.synchroniser_catalogue.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EcrivainWALBrute - Journal Brut à Validation Groupée (Group Commit)
+Module d'infrastructure de la Couche Brute (Safety Layer) de l'AgentMemoire.
+
+Avant : chaque appel à `sauvegarder_interaction_brute` ouvrait le JSONL du jour, écrivait
+une ligne, puis forçait un `os.fsync`. Sous charge, la latence du fsync s'ajoutait
+directement à chaque tour de `penser`.
+
+Ici, un thread écrivain unique :
+1.  **Garde un handle ouvert** par fichier journalier (`interactions_AAAA-MM-JJ.jsonl`).
+2.  **Regroupe** les enregistrements de tous les threads dans une file.
+3.  **Valide par fenêtre** : un seul `os.fsync` par fenêtre de commit (N ms ou N enregistrements).
+4.  **Réveille** chaque appelant uniquement quand SON enregistrement est durable.
+
+Garantie inchangée : `ecrire()` ne retourne True qu'après le fsync couvrant l'enregistrement.
+Une ligne tronquée par un crash (jamais acquittée) est retirée à la réouverture du fichier.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from agentique.base.META_agent import AgentBase
+from agentique.base.contrats_interface import CustomJSONEncoder
+
+
+class _DemandeEcriture:
+    """Enregistrement en attente de durabilité (ligne sérialisée + signal de réveil)."""
+
+    __slots__ = ("fichier", "ligne", "evenement", "succes", "erreur")
+
+    def __init__(self, fichier: str, ligne: bytes):
+        self.fichier = fichier
+        self.ligne = ligne
+        self.evenement = threading.Event()
+        self.succes = False
+        self.erreur: Optional[Exception] = None
+
+
+_ARRET = object()
+TAILLE_FENETRE_REPARATION = 1024 * 1024  # Lecture à rebours de la queue (octets)
+
+
+class EcrivainWALBrute(AgentBase):
+    """
+    Écrivain append-only à validation groupée pour 'memoire/brute'.
+
+    Attributes:
+        dossier (Path): Dossier des journaux bruts.
+        fenetre_commit_s (float): Durée max d'accumulation avant fsync.
+        max_enregistrements (int): Taille max d'un lot avant fsync anticipé.
+    """
+
+    def __init__(self, dossier_brute: str = None, config: Dict = None):
+        super().__init__(nom_agent="EcrivainWALBrute")
+        dossier = dossier_brute or self.auditor.get_path("brute")
+        if not dossier:
+            raise RuntimeError("❌ EcrivainWALBrute : Chemin 'brute' introuvable.")
+        self._initialiser_ecrivain(Path(dossier), config or {})
+
+    def _initialiser_ecrivain(self, dossier: Path, config: Dict):
+        """Prépare la file, les paramètres de fenêtre et démarre le thread écrivain."""
+        self.dossier = dossier
+        self.dossier.mkdir(parents=True, exist_ok=True)
+
+        self.fenetre_commit_s = config.get("fenetre_commit_ms", 5) / 1000.0
+        self.max_enregistrements = max(1, int(config.get("max_enregistrements", 64)))
+        self.fsync_actif = config.get("fsync", True)
+        self.timeout_attente_s = config.get("timeout_attente_s", 10.0)
+
+        self._file: "queue.Queue" = queue.Queue()
+        self._handles: Dict[str, Any] = {}
+        self._stats = {"enregistrements": 0, "commits": 0, "fsyncs": 0}
+        self._verrou_stats = threading.Lock()
+
+        self._thread = threading.Thread(
+            target=self._boucle_ecriture, daemon=True, name="WALBrute"
+        )
+        self._thread.start()
+        atexit.register(self.fermer)
+
+    # =========================================================================
+    # API APPELANTS (multi-threads)
+    # =========================================================================
+
+    def ecrire(self, donnees: Dict[str, Any], attendre: bool = True) -> bool:
+        """
+        Met en file un enregistrement pour le fichier du jour.
+
+        La sérialisation JSON se fait dans le thread appelant (parallélisable),
+        seule l'écriture disque est sérialisée.
+
+        Args:
+            donnees: Dictionnaire à journaliser (une ligne JSONL).
+            attendre: Si True, bloque jusqu'au fsync couvrant cet enregistrement.
+
+        Returns:
+            bool: True si l'enregistrement est durable (ou mis en file si attendre=False).
+        """
+        if not self._thread.is_alive():
+            raise RuntimeError("❌ EcrivainWALBrute arrêté : écriture refusée.")
+
+        nom_fichier = f"interactions_{datetime.now().strftime('%Y-%m-%d')}.jsonl"
+        ligne = (
+            json.dumps(donnees, ensure_ascii=False, cls=CustomJSONEncoder) + "\n"
+        ).encode("utf-8")
+
+        demande = _DemandeEcriture(nom_fichier, ligne)
+        self._file.put(demande)
+
+        if not attendre:
+            return True
+        if not demande.evenement.wait(self.timeout_attente_s):
+            raise TimeoutError("❌ WAL brute : fsync non confirmé dans le délai imparti.")
+        if demande.erreur:
+            raise demande.erreur
+        return demande.succes
+
+    def fermer(self, timeout: float = 5.0):
+        """Vide la file, synchronise et ferme les handles (arrêt propre)."""
+        if self._thread.is_alive():
+            self._file.put(_ARRET)
+            self._thread.join(timeout)
+
+    def obtenir_stats_wal(self) -> Dict[str, Any]:
+        """Compteurs : enregistrements, commits, fsyncs et taille moyenne des lots."""
+        with self._verrou_stats:
+            stats = dict(self._stats)
+        stats["enregistrements_par_fsync"] = round(
+            stats["enregistrements"] / stats["fsyncs"], 2
+        ) if stats["fsyncs"] else 0.0
+        return stats
+
+    # =========================================================================
+    # THREAD ÉCRIVAIN
+    # =========================================================================
+
+    def _boucle_ecriture(self):
+        arret = False
+        while not arret:
+            premier = self._file.get()
+            if premier is _ARRET:
+                break
+
+            # Fenêtre de commit : on accumule jusqu'au délai ou à la taille max
+            lot: List[_DemandeEcriture] = [premier]
+            echeance = time.monotonic() + self.fenetre_commit_s
+            while len(lot) < self.max_enregistrements:
+                restant = echeance - time.monotonic()
+                if restant <= 0:
+                    break
+                try:
+                    suivant = self._file.get(timeout=restant)
+                except queue.Empty:
+                    break
+                if suivant is _ARRET:
+                    arret = True
+                    break
+                lot.append(suivant)
+
+            self._valider_lot(lot)
+
+        self._fermer_handles()
+
+    def _valider_lot(self, lot: List[_DemandeEcriture]):
+        """Écrit le lot (un write par fichier), un fsync par fichier, puis réveille les appelants."""
+        par_fichier: Dict[str, List[_DemandeEcriture]] = {}
+        for demande in lot:
+            par_fichier.setdefault(demande.fichier, []).append(demande)
+
+        nb_fsync = 0
+        for nom_fichier, demandes in par_fichier.items():
+            try:
+                handle = self._handle(nom_fichier)
+                handle.write(b"".join(d.ligne for d in demandes))
+                handle.flush()
+                if self.fsync_actif:
+                    os.fsync(handle.fileno())
+                    nb_fsync += 1
+                for d in demandes:
+                    d.succes = True
+            except Exception as e:
+                self.logger.log_error(f"❌ WAL brute : échec commit {nom_fichier}: {e}")
+                for d in demandes:
+                    d.erreur = e
+                self._fermer_handle(nom_fichier)
+            finally:
+                for d in demandes:
+                    d.evenement.set()
+
+        # Fichiers des jours précédents : plus aucune écriture à venir
+        for nom in [n for n in self._handles if n not in par_fichier]:
+            self._fermer_handle(nom)
+
+        with self._verrou_stats:
+            self._stats["enregistrements"] += len(lot)
+            self._stats["commits"] += 1
+            self._stats["fsyncs"] += nb_fsync
+
+    def _handle(self, nom_fichier: str):
+        handle = self._handles.get(nom_fichier)
+        if handle is None:
+            chemin = self.dossier / nom_fichier
+            self._reparer_queue(chemin)
+            handle = open(chemin, "ab")
+            self._handles[nom_fichier] = handle
+        return handle
+
+    @staticmethod
+    def _reparer_queue(chemin: Path):
+        """
+        Retire une éventuelle ligne tronquée en fin de fichier (crash pendant un write).
+        Une telle ligne n'a jamais été acquittée : la supprimer ne viole aucune garantie.
+        """
+        if not chemin.exists():
+            return
+        taille = chemin.stat().st_size
+        if taille == 0:
+            return
+        with open(chemin, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b"\n":
+                return
+            # Remontée par fenêtres : la ligne tronquée peut dépasser une fenêtre
+            coupure, fin_fenetre = 0, taille
+            while fin_fenetre > 0:
+                debut = max(0, fin_fenetre - TAILLE_FENETRE_REPARATION)
+                f.seek(debut)
+                fin = f.read(fin_fenetre - debut).rfind(b"\n")
+                if fin != -1:
+                    coupure = debut + fin + 1
+                    break
+                fin_fenetre = debut
+            # coupure == 0 seulement si le fichier entier ne contient aucun saut de ligne
+            f.truncate(coupure)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _fermer_handle(self, nom_fichier: str):
+        handle = self._handles.pop(nom_fichier, None)
+        if handle is not None:
+            try:
+                handle.close()
+            except Exception:
+                pass
+
+    def _fermer_handles(self):
+        for nom in list(self._handles):
+            self._fermer_handle(nom)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: WAL Brute (Group Commit)
+Cible : agentique/sous_agents_gouvernes/agent_Memoire/wal_brute.py
+Objectif : Valider le regroupement des fsync, le réveil des appelants et la cohérence après crash.
+"""
+
+import unittest
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+from unittest.mock import MagicMock, patch
+from pathlib import Path
+
+from agentique.sous_agents_gouvernes.agent_Memoire.wal_brute import EcrivainWALBrute
+
+
+def _nouvel_ecrivain(dossier: Path, **config) -> EcrivainWALBrute:
+    """Bypass du __init__ instrumenté (MetaAgent) : injection manuelle du logger."""
+    wal = EcrivainWALBrute.__new__(EcrivainWALBrute)
+    wal.logger = MagicMock()
+    wal._initialiser_ecrivain(dossier, config)
+    return wal
+
+
+def _lire_lignes(dossier: Path) -> list:
+    lignes = []
+    for f in sorted(dossier.glob("interactions_*.jsonl")):
+        lignes.extend(f.read_bytes().splitlines(keepends=True))
+    return lignes
+
+
+class TestEcrivainWALBrute(unittest.TestCase):
+    def setUp(self):
+        self.dossier = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    # =========================================================================
+    # 1. GROUP COMMIT
+    # =========================================================================
+
+    def test_ecritures_concurrentes_moins_de_fsync(self):
+        """N threads x M écritures : tout est présent, avec bien moins de fsync que d'enregistrements."""
+        wal = _nouvel_ecrivain(self.dossier, fenetre_commit_ms=20, max_enregistrements=64)
+        nb_threads, nb_par_thread = 8, 25
+        vrai_fsync = os.fsync
+
+        with patch(
+            "agentique.sous_agents_gouvernes.agent_Memoire.wal_brute.os.fsync",
+            side_effect=vrai_fsync,
+        ) as mock_fsync:
+
+            def producteur(t):
+                for i in range(nb_par_thread):
+                    self.assertTrue(wal.ecrire({"thread": t, "i": i}))
+
+            threads = [threading.Thread(target=producteur, args=(t,)) for t in range(nb_threads)]
+            for th in threads:
+                th.start()
+            for th in threads:
+                th.join()
+            wal.fermer()
+
+        total = nb_threads * nb_par_thread
+        lignes = [json.loads(l) for l in _lire_lignes(self.dossier)]
+        self.assertEqual(len(lignes), total)
+        self.assertEqual(len({(d["thread"], d["i"]) for d in lignes}), total)
+        self.assertLess(mock_fsync.call_count, total)
+        self.assertEqual(wal.obtenir_stats_wal()["enregistrements"], total)
+
+    def test_ecrire_attend_le_fsync(self):
+        """L'appelant n'est réveillé qu'APRÈS le fsync couvrant son enregistrement."""
+        wal = _nouvel_ecrivain(self.dossier, fenetre_commit_ms=1)
+        ordre = []
+
+        with patch(
+            "agentique.sous_agents_gouvernes.agent_Memoire.wal_brute.os.fsync",
+            side_effect=lambda fd: ordre.append("fsync"),
+        ):
+            wal.ecrire({"a": 1})
+            ordre.append("retour")
+        wal.fermer()
+
+        self.assertEqual(ordre, ["fsync", "retour"])
+
+    def test_echec_disque_propage_a_l_appelant(self):
+        wal = _nouvel_ecrivain(self.dossier, fenetre_commit_ms=1)
+        with patch(
+            "agentique.sous_agents_gouvernes.agent_Memoire.wal_brute.os.fsync",
+            side_effect=OSError("disque plein"),
+        ):
+            with self.assertRaises(OSError):
+                wal.ecrire({"a": 1})
+        wal.fermer()
+
+    # =========================================================================
+    # 2. COHÉRENCE APRÈS CRASH
+    # =========================================================================
+
+    def test_ligne_tronquee_retiree_a_la_reouverture(self):
+        """Un write interrompu (ligne sans \\n) est retiré avant de reprendre l'ajout."""
+        wal = _nouvel_ecrivain(self.dossier)
+        wal.ecrire({"ok": 1})
+        wal.fermer()
+        fichier = next(self.dossier.glob("interactions_*.jsonl"))
+        with open(fichier, "ab") as f:
+            f.write(b'{"tronque": ')
+
+        wal = _nouvel_ecrivain(self.dossier)
+        wal.ecrire({"ok": 2})
+        wal.fermer()
+
+        self.assertEqual([json.loads(l) for l in _lire_lignes(self.dossier)], [{"ok": 1}, {"ok": 2}])
+
+    def test_ligne_tronquee_plus_longue_qu_une_fenetre(self):
+        """Une queue tronquée > fenêtre de lecture ne fait pas perdre les lignes acquittées."""
+        wal = _nouvel_ecrivain(self.dossier)
+        wal.ecrire({"ok": 1})
+        wal.fermer()
+        fichier = next(self.dossier.glob("interactions_*.jsonl"))
+        with open(fichier, "ab") as f:
+            f.write(b'{"tronque": "' + b"x" * 100)
+
+        with patch(
+            "agentique.sous_agents_gouvernes.agent_Memoire.wal_brute.TAILLE_FENETRE_REPARATION", 16
+        ):
+            EcrivainWALBrute._reparer_queue(fichier)
+        self.assertEqual([json.loads(l) for l in _lire_lignes(self.dossier)], [{"ok": 1}])
+
+        fichier.write_bytes(b"x" * 100)  # Aucun saut de ligne : rien n'a jamais été acquitté
+        EcrivainWALBrute._reparer_queue(fichier)
+        self.assertEqual(fichier.stat().st_size, 0)
+
+    def test_crash_processus_aucun_acquittement_perdu(self):
+        """
+        Un processus fils écrit depuis plusieurs threads et annonce chaque acquittement,
+        puis meurt brutalement (os._exit) en pleine charge. Tout enregistrement acquitté
+        doit être sur disque, et toutes les lignes complètes doivent être valides.
+        """
+        script = textwrap.dedent(
+            f"""
+            import os, sys, threading, time
+            from unittest.mock import MagicMock
+            from pathlib import Path
+            from agentique.sous_agents_gouvernes.agent_Memoire.wal_brute import EcrivainWALBrute
+
+            wal = EcrivainWALBrute.__new__(EcrivainWALBrute)
+            wal.logger = MagicMock()
+            wal._initialiser_ecrivain(Path({str(self.dossier)!r}), {{"fenetre_commit_ms": 2}})
+            verrou = threading.Lock()
+
+            def producteur(t):
+                i = 0
+                while True:
+                    wal.ecrire({{"id": f"{{t}}-{{i}}", "pad": "x" * 512}})
+                    with verrou:
+                        sys.stdout.write(f"ACK {{t}}-{{i}}\\n")
+                        sys.stdout.flush()
+                    i += 1
+
+            for t in range(4):
+                threading.Thread(target=producteur, args=(t,), daemon=True).start()
+            time.sleep(0.3)
+            os._exit(0)
+            """
+        )
+        resultat = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, timeout=60
+        )
+        acquittes = {
+            l.split(" ", 1)[1] for l in resultat.stdout.splitlines() if l.startswith("ACK ")
+        }
+        self.assertTrue(acquittes, resultat.stderr)
+
+        lignes = _lire_lignes(self.dossier)
+        completes = [l for l in lignes if l.endswith(b"\n")]
+        # Seule la toute dernière ligne peut être tronquée
+        self.assertGreaterEqual(len(completes), len(lignes) - 1)
+        presents = {json.loads(l)["id"] for l in completes}
+        self.assertTrue(acquittes.issubset(presents))
+
+
+if __name__ == "__main__":
+    unittest.main()
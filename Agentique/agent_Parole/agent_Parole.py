@@ -21,7 +21,6 @@ Responsabilités :
        valeur en temps réel pour une personnalisation totale.
 """
 
-import yaml
 import json
 from typing import Union, List, Any
 from datetime import datetime
@@ -53,6 +52,7 @@ from agentique.base.contrats_interface import (
     DocumentationTechnique,
     FichierReadme,
 )
+from agentique.base.demarrage import charger_yaml
 
 
 class AgentParole(AgentBase):
@@ -93,8 +93,7 @@ class AgentParole(AgentBase):
         """Charge la configuration YAML spécifique à AgentParole."""
         path_config = self.auditor.get_path("config")
         if path_config and Path(path_config).exists():
-            with open(path_config, "r", encoding="utf-8") as f:
-                return yaml.safe_load(f).get("configuration", {})
+            return charger_yaml(path_config).get("configuration", {})
         return {}
 
     def _recuperer_profil_utilisateur(self) -> str:
@@ -27,7 +27,6 @@ import time
 from datetime import datetime, timedelta
 from collections import defaultdict
 
-import yaml
 
 from agentique.base.META_agent import AgentBase
 from agentique.base.contrats_interface import (
@@ -44,10 +43,23 @@ from agentique.base.contrats_interface import (
     ContenuFichierBrut,
     RatioQualite
 )  # <--- MODIF IMPORT
+from agentique.base.demarrage import charger_yaml
+from agentique.base.cache_resultats import (
+    CacheResultats,
+    signature_fichiers,
+    versions_magasins,
+)
 from agentique.sous_agents_gouvernes.agent_Recherche.recherche_memoire import (
     RechercheMemoireTool,
 )
 from agentique.sous_agents_gouvernes.agent_Recherche.recherche_web import RechercheWeb
+from agentique.sous_agents_gouvernes.agent_Recherche.reconstruction_whoosh import (
+    ReconstructeurWhoosh,
+    extraire_tout_le_texte,
+)
+from agentique.sous_agents_gouvernes.agent_Memoire.journal_historique import (
+    JournalHistorique,
+)
 
 try:
     from whoosh.index import create_in, open_dir, exists_in
@@ -102,6 +114,11 @@ class AgentRecherche(AgentBase):
         # 5. Initialisation Moteur Textuel
         self._garantir_existence_index_whoosh()
 
+        # 5b. Journal Historique (Lecture seule : l'écriture appartient à AgentMemoire)
+        self.journal_historique = JournalHistorique(
+            dossier_historique=self.auditor.get_path("historique")
+        )
+
         # 6. Outil Interne (Interface LLM)
         self.outiluration_memoire = RechercheMemoireTool(self)
 
@@ -112,6 +129,30 @@ class AgentRecherche(AgentBase):
         # via: self.agenturation.outil_web = RechercheWeb(self.moteur_llm)
         self.outil_web = None
 
+        # 8. Cache versionné des résultats RAG (invalidé par les écritures mémoire)
+        self.cache_resultats = CacheResultats.depuis_config(
+            "recherche_vectorielle",
+            self.configuration.get("cache_resultats"),
+            magasins=("vectoriel",),
+        )
+        self._enregistrer_sondes_magasins()
+
+    def _enregistrer_sondes_magasins(self):
+        """
+        READMEs et règles peuvent être déposés à la main (hors AgentMemoire) :
+        leur version inclut une signature disque (nombre + mtime max des fichiers).
+        """
+        versions = versions_magasins()
+        chemin_connaissances = self.auditor.get_path("connaissances")
+        chemin_regles = self.auditor.get_path("regles", nom_agent="memoire")
+        versions.enregistrer_sonde(
+            "readme",
+            lambda: signature_fichiers(chemin_connaissances, "README_*.md", recursif=True),
+        )
+        versions.enregistrer_sonde(
+            "regles", lambda: signature_fichiers(chemin_regles, "*.json")
+        )
+
     def _charger_config_yaml(self) -> Dict:
         path_conf_str = self.auditor.get_path("config")
 
@@ -126,8 +167,7 @@ class AgentRecherche(AgentBase):
                 f"❌ Fichier 'configuration.yaml' introuvable à l'adresse : {path_conf}"
             )
 
-        with open(path_conf, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+        return charger_yaml(path_conf)
 
     def _trouver_everything_strict(self) -> str:
         # --- CORRECTION ---
@@ -495,7 +535,24 @@ class AgentRecherche(AgentBase):
         """
         Exécute le pipeline RAG principal avec optimisation contextuelle.
         Retourne un objet ResultatRechercheMemoire standardisé.
+
+        Le résultat est mis en cache par (prompt normalisé, intention) et version du
+        magasin vectoriel : un hit est rendu sans encodage ni FAISS, une entrée
+        antérieure à la dernière écriture mémoire n'est jamais servie.
         """
+        jeton = self.cache_resultats.jeton()
+        en_cache = self.cache_resultats.obtenir(query, intention)
+        if en_cache is not None:
+            return en_cache
+
+        resultat = self._executer_recherche_vectorielle(query, intention)
+        self.cache_resultats.stocker(query, intention, resultat, jeton)
+        return resultat
+
+    def _executer_recherche_vectorielle(
+        self, query: str, intention: Optional[ResultatIntention] = None
+    ) -> ResultatRechercheMemoire:
+        """Pipeline RAG sans cache : FAISS -> Swap résumés -> Boost intention -> Top N."""
         t_start = time.time() # ⏱️ Début chrono
 
         # Config Limits
@@ -601,38 +658,19 @@ class AgentRecherche(AgentBase):
         """
         historique_recent = []
         try:
-            chemin_historique = self.auditor.get_path("historique")
-            if not chemin_historique:
-                return []
-
-            p = Path(chemin_historique)
-            if not p.exists():
-                return []
-
-            # 1. Lister et trier par modification (plus récent à la fin)
-            fichiers = sorted(list(p.glob("interaction_*.json")), key=os.path.getmtime)
+            # 1. Les N plus récents via l'index du journal (remis dans l'ordre chronologique)
+            derniers = self.journal_historique.derniers(limit)
+            derniers.reverse()
 
-            # 2. Prendre les N derniers
-            fichiers_recents = fichiers[-limit:]
-
-            for f_path in fichiers_recents:
-                try:
-                    with open(f_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        # Extraction robuste User/Assistant
-                        p_user = data.get("prompt", "")
-                        r_assistant = data.get("reponse", "")
+            for _, data in derniers:
+                # Extraction robuste User/Assistant
+                p_user = data.get("prompt", "")
+                r_assistant = data.get("reponse", "")
 
-                        if p_user:
-                            historique_recent.append(p_user)
-                        if r_assistant:
-                            historique_recent.append(r_assistant)
-
-                except Exception as e:
-                    self.logger.log_warning(
-                        f"Fichier historique corrompu ignoré {f_path.name}: {e}"
-                    )
-                    continue
+                if p_user:
+                    historique_recent.append(p_user)
+                if r_assistant:
+                    historique_recent.append(r_assistant)
 
             return historique_recent
 
@@ -645,13 +683,18 @@ class AgentRecherche(AgentBase):
     # =========================================================================
 
     def _swapper_vers_resume(
-        self, original_path: Path, session_id: str, turn: int
+        self,
+        original_path: Path,
+        session_id: str,
+        turn: int,
+        contenu_original: Optional[str] = None,
     ) -> Souvenir:
         """
         Logique de Fallback :
         1. Tente de trouver le résumé via _tenter_recuperation_resume.
         2. Si trouvé -> Retourne le Résumé.
-        3. Si non trouvé -> Lit le fichier original et le retourne.
+        3. Si non trouvé -> Retourne `contenu_original` (déjà lu depuis le journal)
+           ou, à défaut, lit le fichier original.
         """
         chemin_persistante = self.auditor.get_path("persistante")
 
@@ -664,6 +707,13 @@ class AgentRecherche(AgentBase):
                 return resume
 
         # 2. Fallback : Lecture de l'original (Si pas de swap possible)
+        if contenu_original is not None:
+            return Souvenir(
+                contenu=contenu_original,
+                titre=original_path.name,
+                type="historique_recent",
+                score=1.0,
+            )
         try:
             # Utilisation de la méthode safe interne ou lecture directe
             if hasattr(self, "_lire_fichier_safe"):
@@ -755,38 +805,25 @@ class AgentRecherche(AgentBase):
             limit = self.confuration.get("limites", {}).get("historique_recent", 5)
 
 
-        # 1. Accès au chemin via Auditor
-        chemin_historique = self.auditor.get_path("historique", nom_agent="memoire")
-        if not chemin_historique:
-            raise RuntimeError("❌ AgentRecherche : Chemin 'historique' introuvable.")
-
-        dossier_hist = Path(chemin_historique)
-        if not dossier_hist.exists():
-            return []
-
-        # 2. Collecte des fichiers (triés par date de modification décroissante)
-        fichiers = sorted(
-            dossier_hist.glob("interaction_*.json"),
-            key=lambda x: x.stat().st_mtime,
-            reverse=True
-        )
-
-        selection = fichiers[:limit]
+        # 1. Sélection via l'index du journal (timestamp décroissant, aucun scan de dossier)
+        selection = self.journal_historique.derniers(limit)
         souvenirs_reconstruits: List[Souvenir] = []
 
-        # 3. Reconstitution des atomes avec Context Swapping
-        for f_path in selection:
+        # 2. Reconstitution des atomes avec Context Swapping
+        for entree, data in selection:
+            f_path = Path(self.journal_historique.reference(entree))
             try:
-                content = self._lire_fichier_safe(f_path)
-                data = json.loads(content)
-                meta = data.get("meta", {})
-
-                sid = meta.get("session_id") or data.get("session_id")
-                turn = meta.get("message_turn") or data.get("message_turn")
+                content = json.dumps(
+                    data, ensure_ascii=False, indent=2, cls=CustomJSONEncoder
+                )
+                sid = entree.get("session_id")
+                turn = entree.get("message_turn")
 
                 if sid and turn:
                     # Utilise le résumé consolidé si disponible (Swapping)
-                    souvenir = self._swapper_vers_resume(f_path, sid, turn)
+                    souvenir = self._swapper_vers_resume(
+                        f_path, sid, turn, contenu_original=content
+                    )
                     souvenirs_reconstruits.append(souvenir)
                 else:
                     # Fallback sur le brut
@@ -802,7 +839,7 @@ class AgentRecherche(AgentBase):
                 self.logger.log_warning(f"Erreur lecture historique {f_path.name}: {e}")
                 continue
 
-        # 4. Remise dans l'ordre chronologique (du plus vieux au plus récent pour le contexte)
+        # 3. Remise dans l'ordre chronologique (du plus vieux au plus récent pour le contexte)
         souvenirs_reconstruits.reverse()
 
         # 🛡️👁️‍🗨️🛡️ VALIDATION PAR L'AUDITOR
@@ -834,19 +871,7 @@ class AgentRecherche(AgentBase):
 
     def _extraire_tout_le_texte(self, data):
         """Exploration récursive pour indexer 100% du contenu JSON."""
-        texte = []
-        if isinstance(data, dict):
-            for k, v in data.items():
-                # On ignore les IDs techniques pour ne pas polluer l'index
-                if k in ["id", "session_id", "ref_vectoriel"]:
-                    continue
-                texte.append(self._extraire_tout_le_texte(v))
-        elif isinstance(data, list):
-            for item in data:
-                texte.append(self._extraire_tout_le_texte(item))
-        else:
-            texte.append(str(data))
-        return " ".join(texte)
+        return extraire_tout_le_texte(data)
 
     # =========================================================================
     # 🔍 RECHERCHE 7 : FICHIERS PROJET HORS MÉMOIRE (CODE & CONFIG)
@@ -978,9 +1003,9 @@ class AgentRecherche(AgentBase):
         Recherche une citation EXACTE dans l'historique complet.
 
         Pipeline :
-        1. Everything : Trouve tous les fichiers historique_*.json
-        2. Whoosh : Cherche la phrase dans le contenu
-        3. Validation disque : Vérifie que la citation est présente
+        1. Index de citations : candidats par trigrammes (repli : balayage du journal)
+        2. Validation : La phrase doit être présente dans le prompt ou la réponse
+           (offsets ajoutés au contenu sous la clé `occurrences`)
 
         Args:
             phrase_exacte: La phrase exacte à retrouver (avec ponctuation)
@@ -990,40 +1015,25 @@ class AgentRecherche(AgentBase):
         """
         start_time = time.time()
 
-        # 1. Everything : Pré-filtre sur les fichiers historique
-        chemin_hist = self.auditor.get_path("historique")
-        if not chemin_hist:
-            self.logger.log_warning("Chemin historique introuvable pour recherche verbatim")
-            return []
-
-        chemin_str = str(chemin_hist)
-        base_query = f'path:"{chemin_str}"' if " " in chemin_str else f'path:{chemin_str}'
-        query_everything = f'{base_query} *.json'
-        fichiers_candidats = self._executer_everything(query_everything, limit=100)
-
-        # 2. Skip Whoosh (il tokenise la phrase), validation disque directe
+        # Skip Whoosh (il tokenise la phrase) : index trigrammes du journal
         resultats_verifies = []
 
-        # 3. Validation disque sur TOUS les fichiers candidats
-        for fichier_path in fichiers_candidats:
-            try:
-                path_obj = Path(fichier_path)
-                contenu_brut = path_obj.read_text(encoding='utf-8', errors='replace')
-
-                # Vérification stricte : la phrase DOIT être dedans
-                if phrase_exacte in contenu_brut:
-                    resultats_verifies.append(Souvenir(
-                        contenu=contenu_brut,
-                        titre=path_obj.name,
-                        type="verbatim_prouve",
-                        score=10.0  # Score max : citation confirmée
-                    ))
-            except Exception as e:
-                self.logger.log_warning(f"Erreur lecture {fichier_path}: {e}")
-                continue
+        try:
+            for entree, data, offsets in self.journal_historique.rechercher_citation(phrase_exacte):
+                resultats_verifies.append(Souvenir(
+                    contenu=json.dumps(
+                        dict(data, occurrences=offsets),
+                        ensure_ascii=False, indent=2, cls=CustomJSONEncoder,
+                    ),
+                    titre=entree.get("legacy") or entree["id"],
+                    type="verbatim_prouve",
+                    score=10.0  # Score max : citation confirmée
+                ))
+        except Exception as e:
+            self.logger.log_warning(f"Erreur recherche citation historique: {e}")
 
         elapsed = time.time() - start_time
-        self.logger.info(f"Recherche verbatim: {len(resultats_verifies)} résultats en {elapsed:.2f}s")
+        self.logger.info(f"Recherche verbatim: {len(resultats_verifies)} résultats en {elapsed * 1000:.1f} ms")
 
         # Validation Auditor
         self.auditor.valider_format_sortie(resultats_verifies)
@@ -1067,6 +1077,7 @@ class AgentRecherche(AgentBase):
         session_id: str = None,
         message_turn: int = None,
         nouveau_fichier: str = None,
+        reconstruction_complete: bool = False,
     ):
         """
         Gère la maintenance de l'index inversé (Whoosh) pour la recherche textuelle.
@@ -1074,12 +1085,14 @@ class AgentRecherche(AgentBase):
         Supporte deux modes opératoires :
         1. **Mise à jour Atomique** (si `nouveau_fichier` est fourni) : Met à jour un seul document
            en temps réel après une interaction.
-        2. **Reconstruction Totale** (si aucun argument) : Lance un ré-indexage complet
-           en mode batch via `AsyncWriter` pour optimiser les I/O et garantir la consistance.
+        2. **Reconstruction** (si aucun argument) : Pipeline `ReconstructeurWhoosh`
+           (préparation en pool de processus, writer multi-segments). Incrémentale grâce
+           au manifeste d'empreintes : seuls les documents modifiés sont ré-indexés.
 
         Args:
             contenu (str, optional): Texte brut à indexer directement.
             nouveau_fichier (str, optional): Chemin du fichier physique à ingérer.
+            reconstruction_complete (bool): Ignore le manifeste et ré-indexe tout.
             [...tags metadata]: Métadonnées pour les facettes de recherche.
         """
         if not self.chemin_index_whoosh.exists():
@@ -1122,18 +1135,10 @@ class AgentRecherche(AgentBase):
                 self.logger.log_error(f"❌ Erreur Cas 1 : {e}")
 
         # =========================================================
-        # CAS 2 : RECONSTRUCTION TOTALE
+        # CAS 2 : RECONSTRUCTION (Parallèle + Incrémentale)
         # =========================================================
         else:
-            self.logger.info(
-                "🔧 Maintenance : Reconstruction totale via AsyncWriter..."
-            )
-            count = 0
-
-            # On utilise AsyncWriter pour éviter le verrouillage "already in a doc"
-            from whoosh.writing import AsyncWriter
-
-            writer = AsyncWriter(ix)
+            self.logger.info("🔧 Maintenance : Reconstruction de l'index Whoosh...")
 
             types_memoire = [
                 "reflexive",
@@ -1142,85 +1147,32 @@ class AgentRecherche(AgentBase):
                 "connaissances",
                 "modules_formation",
             ]
+            # L'historique est un journal segmenté : lecture séquentielle dédiée
+            sources = [
+                (type_mem, Path(self.auditor.get_path(type_mem)))
+                for type_mem in types_memoire
+                if type_mem != "historique" and self.auditor.get_path(type_mem)
+            ]
 
+            reconstructeur = ReconstructeurWhoosh.depuis_config(
+                self.chemin_index_whoosh,
+                self._creer_schema_whoosh,
+                self.configuration.get("index_whoosh", {}),
+            )
             try:
-                for type_mem in types_memoire:
-                    path_str = self.auditor.get_path(type_mem)
-                    if not path_str:
-                        continue
-                    dossier = Path(path_str)
-                    if not dossier.exists():
-                        continue
-
-                    for fichier in dossier.rglob("*"):
-                        if not fichier.is_file() or fichier.suffix not in [
-                            ".json",
-                            ".jsonl",
-                            ".txt",
-                            ".md",
-                        ]:
-                            continue
-                        if any(
-                            ex in str(fichier).lower()
-                            for ex in ["backup", "trash", "archive", ".git"]
-                        ):
-                            continue
-
-                        # --- PRÉPARATION (HORS WRITER) ---
-                        try:
-                            if fichier.suffix in [".json", ".jsonl"]:
-                                data = json.loads(fichier.read_text(encoding="utf-8"))
-                                content_val = self._extraire_tout_le_texte(data)
-
-                                # Tags robustes
-                                s_val, a_val, c_val = "", "", ""
-                                cl = data.get("classification") or data.get("intention")
-                                if cl:
-                                    s_val = cl.get("sujet", "")
-                                    a_val = cl.get("action", "")
-                                    c_val = cl.get("categorie", "")
-                            else:
-                                content_val = fichier.read_text(
-                                    encoding="utf-8", errors="replace"
-                                )
-
-                            if not content_val.strip():
-                                continue
-
-                            # --- AJOUT AU DOCUMENT ---
-                            # On utilise add_document au lieu d'update pour une reconstruction
-                            # C'est beaucoup plus rapide et évite les conflits de verrous
-                            writer.add_document(
-                                path=str(fichier),
-                                filename=fichier.name,
-                                content=content_val,
-                                type_memoire=type_mem,
-                                timestamp=datetime.fromtimestamp(
-                                    fichier.stat().st_mtime
-                                ),
-                                sujet_tag=str(s_val),
-                                action_tag=str(a_val),
-                                categorie_tag=str(c_val),
-                                session_id="",
-                                message_turn=0,
-                            )
-                            count += 1
-
-                            if count % 1000 == 0:
-                                self.logger.info(
-                                    f"💾 Ingestion en cours : {count} fichiers..."
-                                )
-
-                        except Exception as e_file:
-                            # Ici, on log l'erreur mais le writer n'est pas bloqué
-                            continue
-
-                # Un SEUL commit à la toute fin pour tout valider
-                writer.commit()
-                self.logger.info(f"✅ Terminé : {count} documents indexés.")
-
+                stats = reconstructeur.reconstruire(
+                    sources,
+                    journal=self.journal_historique,
+                    complete=reconstruction_complete,
+                )
+                self.logger.info(
+                    f"✅ Terminé ({stats['mode']}, préparation {stats['preparation']}, "
+                    f"écriture {stats['ecriture']}) : {stats['indexes']} documents indexés, "
+                    f"{stats['inchanges']} inchangés, {stats['supprimes']} supprimés "
+                    f"en {stats['duree_s']}s ({stats['docs_par_s']} docs/s)."
+                )
+                return stats
             except Exception as e_globale:
-                writer.cancel()
                 self.logger.log_error(
                     f"❌ Erreur critique reconstruction : {e_globale}"
                 )
@@ -1241,6 +1193,9 @@ class AgentRecherche(AgentBase):
         (Sujet, Action, Catégorie) plutôt que sur le contenu textuel. Utile pour les
         tâches de synthèse périodique ou d'analyse comportementale.
 
+        Sélection par le catalogue analytique (requête indexée, tri et limite en SQL) :
+        seules les `limite` interactions retenues sont lues dans le journal.
+
         Args:
             sujet, action, categorie (Enum): Filtres taxonomiques.
             depuis (datetime): Fenêtre temporelle d'analyse.
@@ -1250,50 +1205,51 @@ class AgentRecherche(AgentBase):
         """
         self.stats_manager.incrementer_stat_specifique("recherches_semantiques", 1)
 
-        resultats = []
-        dossier_historique = Path(self.auditor.get_path("historique"))
+        catalogue = self._catalogue_analytique()
+        if catalogue is not None:
+            try:
+                resultats = []
+                for ligne in catalogue.rechercher(
+                    sujet=sujet.value if sujet else None,
+                    action=action.value if action else None,
+                    categorie=categorie.value if categorie else None,
+                    tags=tags,
+                    depuis=depuis,
+                    limite=limite,
+                ):
+                    resultat = self._resultat_depuis_catalogue(ligne)
+                    if resultat is not None:
+                        resultats.append(resultat)
+
+                self.logger.info(
+                    f"Recherche sémantique (catalogue): {len(resultats)} résultats trouvés"
+                )
+                return resultats
+            except Exception as e:
+                self.logger.log_warning(f"Catalogue analytique indisponible, repli journal: {e}")
 
-        if not dossier_historique or not dossier_historique.exists():
-            self.logger.log_warning(
-                "Dossier historique non trouvé pour recherche sémantique"
-            )
-            return resultats
+        resultats = []
 
         try:
-            # Parcourir tous les fichiers d'historique
-            for fichier in dossier_historique.glob("**/*.json"):
+            # Pré-filtre taxonomique sur l'index du journal : seuls les segments
+            # contenant des interactions retenues sont lus (séquentiellement).
+            for entree, contenu in self.journal_historique.iterer(
+                depuis=depuis,
+                sujet=sujet.value if sujet else None,
+                action=action.value if action else None,
+                categorie=categorie.value if categorie else None,
+            ):
                 try:
-                    contenu = json.loads(fichier.read_text(encoding="utf-8"))
-
-                    # Vérifier si c'est une interaction avec classification
-                    if not isinstance(contenu, dict) or "classification" not in contenu:
-                        continue
-
-                    classification = contenu["classification"]
-                    timestamp_str = contenu.get("timestamp", "")
-
-                    # Filtres de date
-                    if depuis:
-                        try:
-                            timestamp = datetime.fromisoformat(
-                                timestamp_str.replace("Z", "+00:00")
-                            )
-                            if timestamp < depuis:
-                                continue
-                        except:
-                            continue
-
-                    # Filtres sémantiques
-                    correspond = True
-
-                    if sujet and classification.get("sujet") != sujet.value:
-                        correspond = False
-
-                    if action and classification.get("action") != action.value:
-                        correspond = False
-
-                    if categorie and classification.get("categorie") != categorie.value:
-                        correspond = False
+                    # Format historique : tags dans 'intention' (ancien format : 'classification')
+                    classification = dict(
+                        contenu.get("classification")
+                        or {
+                            "sujet": entree.get("sujet", ""),
+                            "action": entree.get("action", ""),
+                            "categorie": entree.get("categorie", ""),
+                        }
+                    )
+                    timestamp_str = entree.get("timestamp", "")
 
                     if tags:
                         tags_interaction = classification.get("tags", [])
@@ -1301,24 +1257,23 @@ class AgentRecherche(AgentBase):
                             tag.lower() in [t.lower() for t in tags_interaction]
                             for tag in tags
                         ):
-                            correspond = False
-
-                    if correspond:
-                        resultats.append(
-                            {
-                                "fichier": str(fichier),
-                                "timestamp": timestamp_str,
-                                "prompt": contenu.get("prompt", ""),
-                                "reponse": contenu.get("reponse", "") + "..."
-                                if len(contenu.get("reponse", "")) > 200
-                                else contenu.get("reponse", ""),
-                                "classification": classification,
-                                "metadata": contenu.get("metadata", {}),
-                            }
-                        )
+                            continue
+
+                    resultats.append(
+                        {
+                            "fichier": self.journal_historique.reference(entree),
+                            "timestamp": timestamp_str,
+                            "prompt": contenu.get("prompt", ""),
+                            "reponse": contenu.get("reponse", "") + "..."
+                            if len(contenu.get("reponse", "")) > 200
+                            else contenu.get("reponse", ""),
+                            "classification": classification,
+                            "metadata": contenu.get("metadata") or contenu.get("meta", {}),
+                        }
+                    )
 
                 except Exception as e:
-                    self.logger.log_warning(f"Erreur lecture fichier {fichier}: {e}")
+                    self.logger.log_warning(f"Erreur lecture interaction {entree.get('id')}: {e}")
                     continue
 
             # Trier par timestamp décroissant et limiter
@@ -1334,10 +1289,50 @@ class AgentRecherche(AgentBase):
             self.logger.log_error(f"Erreur dans recherche sémantique: {e}")
             return []
 
+    def _catalogue_analytique(self):
+        """Catalogue SQLite du journal, synchronisé une fois par instance (None si désactivé)."""
+        catalogue = self.journal_historique.catalogue
+        if catalogue is not None and not getattr(self, "_catalogue_synchronise", False):
+            self.journal_historique.synchroniser_catalogue()
+            self._catalogue_synchronise = True
+        return catalogue
+
+    def _resultat_depuis_catalogue(self, ligne: Dict[str, Any]) -> Optional[Dict]:
+        """Lecture ciblée (journal ou ancien fichier) d'une interaction retenue par le catalogue."""
+        if ligne.get("fichier"):
+            entree = {"id": ligne["id"], "fichier": ligne["fichier"]}
+        else:
+            entree = self.journal_historique.entree(ligne["id"])
+        contenu = self.journal_historique.lire(entree) if entree else None
+        if contenu is None:
+            return None
+
+        classification = dict(
+            contenu.get("classification")
+            or {
+                "sujet": ligne["sujet"],
+                "action": ligne["action"],
+                "categorie": ligne["categorie"],
+                "tags": ligne["tags"],
+            }
+        )
+        reponse = contenu.get("reponse", "")
+        return {
+            "fichier": self.journal_historique.reference(entree),
+            "timestamp": ligne["timestamp"],
+            "prompt": contenu.get("prompt", ""),
+            "reponse": reponse + "..." if len(reponse) > 200 else reponse,
+            "classification": classification,
+            "metadata": contenu.get("metadata") or contenu.get("meta", {}),
+        }
+
     def statistiques_semantiques(self, periode_jours: int = 30) -> Dict[str, Any]:
         """
         Génère des statistiques sur les interactions par classification.
 
+        Calculées depuis les rollups journaliers du catalogue analytique (aucune lecture
+        de contenu) ; repli sur l'agrégation des interactions si le catalogue est désactivé.
+
         Args:
             periode_jours: Période d'analyse en jours
 
@@ -1346,6 +1341,25 @@ class AgentRecherche(AgentBase):
         """
         depuis = datetime.now() - timedelta(days=periode_jours)
 
+        catalogue = self._catalogue_analytique()
+        if catalogue is not None:
+            try:
+                agregats = catalogue.statistiques(depuis=depuis)
+                if not agregats["total"]:
+                    return {"erreur": "Aucune interaction trouvée pour la période"}
+                total = agregats.pop("total")
+                stats = {
+                    "periode": f"{periode_jours} derniers jours",
+                    "total_interactions": total,
+                    **agregats,
+                }
+                self.logger.info(
+                    f"Statistiques sémantiques générées pour {total} interactions (rollups)"
+                )
+                return stats
+            except Exception as e:
+                self.logger.log_warning(f"Rollups indisponibles, repli journal: {e}")
+
         # Récupérer toutes les interactions de la période
         toutes_interactions = self.rechercher_par_classification(
             depuis=depuis, limite=1000
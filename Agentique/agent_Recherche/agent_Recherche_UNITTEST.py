@@ -29,6 +29,7 @@ except Exception:
     AgentRecherche = None
 
 try:
+    from agentique.base.cache_resultats import CacheResultats
     from agentique.base.contrats_interface import Souvenir, Regle, ResultatRecherche
 except Exception:
     Souvenir = Regle = ResultatRecherche = None
@@ -78,6 +79,9 @@ class AgentRechercheUnitTestBase(unittest.TestCase):
         agent.agent_memoire = None
         agent.moteur_vectoriel = None
 
+        # Result cache disabled: each test exercises the full pipeline
+        agent.cache_resultats = CacheResultats("test", magasins=("vectoriel",), actif=False)
+
         return agent
 
 
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ClientWeb - Téléchargement concurrent + cache HTTP disque pour RechercheWeb
+
+Remplace le `requests.get` bloquant page par page de la Deep Research :
+1.  **Client mutualisé** : une `requests.Session` (keep-alive, pool de connexions)
+    partagée par un pool de threads ; les pages d'un tour sont téléchargées en parallèle.
+2.  **Limite par hôte** : un sémaphore par domaine borne les requêtes simultanées
+    vers un même serveur (politesse, pas de rafale sur un site).
+3.  **Cache HTTP disque** (`CacheHTTP`) : une fiche JSON par URL (ETag, Last-Modified,
+    empreinte du corps). Une page fraîche est servie sans réseau ; au-delà, elle est
+    revalidée (If-None-Match / If-Modified-Since -> 304 = texte réutilisé).
+4.  **Déduplication par contenu** : le texte extrait est stocké par empreinte SHA-256 du
+    corps ; deux URLs au contenu identique (miroirs, redirections) ne sont parsées qu'une
+    fois, et RechercheWeb n'analyse qu'une fois un même contenu.
+5.  **Parseur rapide** : `lxml` si disponible, sinon `html.parser`.
+
+Le client n'a aucune dépendance au pipeline : il se teste contre un serveur HTTP local.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+try:
+    import lxml  # noqa: F401
+
+    PARSEUR_HTML = "lxml"
+except ImportError:
+    PARSEUR_HTML = "html.parser"
+
+USER_AGENT_DEFAUT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+)
+BALISES_BRUIT = ("script", "style", "nav", "footer", "header", "aside", "noscript")
+
+
+@dataclass
+class PageWeb:
+    """
+    Résultat d'un téléchargement.
+
+    origine : "reseau" (200), "revalidee" (304), "cache" (fraîche, sans réseau), "erreur".
+    """
+
+    url: str
+    texte: str = ""
+    empreinte: str = ""
+    statut: int = 0
+    origine: str = "erreur"
+    erreur: str = ""
+
+
+def extraire_texte(html: Union[str, bytes], max_caracteres: int = 0) -> str:
+    """HTML -> texte lisible (bruit retiré, lignes vides compactées)."""
+    soup = BeautifulSoup(html, PARSEUR_HTML)
+    for balise in soup(BALISES_BRUIT):
+        balise.decompose()
+    lignes = (ligne.strip() for ligne in soup.get_text(separator="\n").splitlines())
+    morceaux = (phrase.strip() for ligne in lignes for phrase in ligne.split("  "))
+    texte = "\n".join(m for m in morceaux if m)
+    return texte[:max_caracteres] if max_caracteres else texte
+
+
+class CacheHTTP:
+    """
+    Cache disque : `fiches/<sha1(url)>.json` (validateurs HTTP) + `textes/<sha256(corps)>.txt`.
+
+    Attributes:
+        fraicheur_s (float): Âge en deçà duquel une fiche est servie sans revalidation.
+    """
+
+    def __init__(self, dossier: Union[str, Path], fraicheur_s: float = 3600.0):
+        self.dossier = Path(dossier)
+        self.fraicheur_s = float(fraicheur_s)
+        self._fiches = self.dossier / "fiches"
+        self._textes = self.dossier / "textes"
+        self._fiches.mkdir(parents=True, exist_ok=True)
+        self._textes.mkdir(parents=True, exist_ok=True)
+
+    def _chemin_fiche(self, url: str) -> Path:
+        return self._fiches / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+    def fiche(self, url: str) -> Optional[Dict]:
+        try:
+            return json.loads(self._chemin_fiche(url).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def est_fraiche(self, fiche: Dict) -> bool:
+        return time.time() - fiche.get("verifie_le", 0) < self.fraicheur_s
+
+    def texte(self, empreinte: str) -> Optional[str]:
+        try:
+            return (self._textes / f"{empreinte}.txt").read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def enregistrer_texte(self, empreinte: str, texte: str):
+        self._ecrire_atomique(self._textes / f"{empreinte}.txt", texte)
+
+    def enregistrer_fiche(self, url: str, empreinte: str, etag: str = "", last_modified: str = ""):
+        fiche = {
+            "url": url,
+            "empreinte": empreinte,
+            "etag": etag or "",
+            "last_modified": last_modified or "",
+            "verifie_le": time.time(),
+        }
+        self._ecrire_atomique(self._chemin_fiche(url), json.dumps(fiche, ensure_ascii=False))
+
+    def revalider(self, url: str, fiche: Dict):
+        """304 reçu : la fiche redevient fraîche."""
+        fiche = dict(fiche, verifie_le=time.time())
+        self._ecrire_atomique(self._chemin_fiche(url), json.dumps(fiche, ensure_ascii=False))
+
+    @staticmethod
+    def _ecrire_atomique(chemin: Path, contenu: str):
+        temporaire = chemin.with_name(f"{chemin.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temporaire.write_text(contenu, encoding="utf-8")
+        temporaire.replace(chemin)
+
+
+class ClientWeb:
+    """
+    Téléchargeur concurrent (pool de threads + session HTTP mutualisée).
+
+    Attributes:
+        max_paralleles (int): Téléchargements simultanés (tous hôtes confondus).
+        max_par_hote (int): Téléchargements simultanés vers un même hôte.
+        timeout (float): Délai par requête (secondes).
+        max_caracteres (int): Troncature du texte extrait (0 = aucune).
+    """
+
+    def __init__(
+        self,
+        cache: Optional[CacheHTTP] = None,
+        max_paralleles: int = 8,
+        max_par_hote: int = 2,
+        timeout: float = 10.0,
+        max_caracteres: int = 0,
+        user_agent: str = USER_AGENT_DEFAUT,
+    ):
+        self.cache = cache
+        self.max_par_hote = max(1, int(max_par_hote))
+        self.timeout = timeout
+        self.max_caracteres = max_caracteres
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        adaptateur = HTTPAdapter(pool_connections=max_paralleles, pool_maxsize=max_paralleles)
+        self.session.mount("http://", adaptateur)
+        self.session.mount("https://", adaptateur)
+
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(max_paralleles)), thread_name_prefix="ClientWeb")
+        self._verrou = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+    def _semaphore(self, url: str) -> threading.BoundedSemaphore:
+        hote = urlsplit(url).netloc.lower()
+        with self._verrou:
+            if hote not in self._semaphores:
+                self._semaphores[hote] = threading.BoundedSemaphore(self.max_par_hote)
+            return self._semaphores[hote]
+
+    # ------------------------------------------------------------------
+    # Téléchargement
+    # ------------------------------------------------------------------
+
+    def telecharger(self, url: str) -> PageWeb:
+        """Télécharge (ou ressert depuis le cache) une page et retourne son texte."""
+        fiche = self.cache.fiche(url) if self.cache else None
+        if fiche:
+            texte = self.cache.texte(fiche["empreinte"])
+            if texte is None:
+                fiche = None  # Texte purgé : on repart d'un téléchargement complet
+            elif self.cache.est_fraiche(fiche):
+                return PageWeb(url, texte, fiche["empreinte"], 200, "cache")
+
+        entetes = {}
+        if fiche:
+            if fiche.get("etag"):
+                entetes["If-None-Match"] = fiche["etag"]
+            if fiche.get("last_modified"):
+                entetes["If-Modified-Since"] = fiche["last_modified"]
+
+        try:
+            with self._semaphore(url):
+                reponse = self.session.get(url, headers=entetes, timeout=self.timeout)
+            if reponse.status_code == 304 and fiche:
+                self.cache.revalider(url, fiche)
+                return PageWeb(url, texte, fiche["empreinte"], 304, "revalidee")
+            reponse.raise_for_status()
+        except requests.RequestException as e:
+            statut = e.response.status_code if e.response is not None else 0
+            return PageWeb(url, statut=statut, erreur=str(e))
+
+        empreinte = hashlib.sha256(reponse.content).hexdigest()
+        texte = self.cache.texte(empreinte) if self.cache else None
+        if texte is None:
+            texte = extraire_texte(reponse.content, self.max_caracteres)
+            if self.cache:
+                self.cache.enregistrer_texte(empreinte, texte)
+        if self.cache:
+            self.cache.enregistrer_fiche(
+                url,
+                empreinte,
+                reponse.headers.get("ETag", ""),
+                reponse.headers.get("Last-Modified", ""),
+            )
+        return PageWeb(url, texte, empreinte, reponse.status_code, "reseau")
+
+    def soumettre(self, urls: List[str]) -> List[Future]:
+        """Lance les téléchargements en parallèle ; les Futures suivent l'ordre des URLs."""
+        return [self._pool.submit(self.telecharger, url) for url in urls]
+
+    def telecharger_tous(self, urls: List[str]) -> List[PageWeb]:
+        return [futur.result() for futur in self.soumettre(urls)]
+
+    def fermer(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+
+__all__ = [
+    "CacheHTTP",
+    "ClientWeb",
+    "PageWeb",
+    "PARSEUR_HTML",
+    "USER_AGENT_DEFAUT",
+    "extraire_texte",
+]
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: ClientWeb (téléchargement concurrent + cache HTTP)
+Cible : agentique/sous_agents_gouvernes/agent_Recherche/client_web.py
+Objectif : Valider, contre un serveur HTTP local, le parallélisme borné par hôte,
+la revalidation ETag/Last-Modified (304), le service sans réseau d'une page fraîche
+et la déduplication par empreinte de contenu.
+"""
+
+import unittest
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from agentique.sous_agents_gouvernes.agent_Recherche.client_web import (
+    CacheHTTP,
+    ClientWeb,
+    extraire_texte,
+)
+
+PAGE = (
+    b"<html><head><script>var x = 1;</script></head>"
+    b"<body><nav>Menu</nav><h1>SecondMind</h1><p>Architecture cognitive.</p></body></html>"
+)
+ETAG = '"v1"'
+LAST_MODIFIED = "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+class _ServeurFixture(BaseHTTPRequestHandler):
+    """Sert PAGE sur toute URL ; /lent attend 0.2 s ; répond 304 si l'ETag concorde."""
+
+    compteur = {"requetes": 0, "304": 0, "en_cours": 0, "max_en_cours": 0}
+    verrou = threading.Lock()
+
+    def do_GET(self):
+        with self.verrou:
+            self.compteur["requetes"] += 1
+            self.compteur["en_cours"] += 1
+            self.compteur["max_en_cours"] = max(self.compteur["max_en_cours"], self.compteur["en_cours"])
+        try:
+            if self.path.startswith("/lent"):
+                time.sleep(0.2)
+            if self.headers.get("If-None-Match") == ETAG:
+                with self.verrou:
+                    self.compteur["304"] += 1
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("ETag", ETAG)
+            self.send_header("Last-Modified", LAST_MODIFIED)
+            self.send_header("Content-Length", str(len(PAGE)))
+            self.end_headers()
+            self.wfile.write(PAGE)
+        finally:
+            with self.verrou:
+                self.compteur["en_cours"] -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+class TestClientWeb(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.serveur = ThreadingHTTPServer(("127.0.0.1", 0), _ServeurFixture)
+        cls.base = f"http://127.0.0.1:{cls.serveur.server_address[1]}"
+        threading.Thread(target=cls.serveur.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.serveur.shutdown()
+        cls.serveur.server_close()
+
+    def setUp(self):
+        for cle in _ServeurFixture.compteur:
+            _ServeurFixture.compteur[cle] = 0
+        self.dossier = Path(tempfile.mkdtemp())
+        self.clients = []
+
+    def tearDown(self):
+        for client in self.clients:
+            client.fermer()
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def _client(self, fraicheur_s=3600, **options):
+        client = ClientWeb(CacheHTTP(self.dossier, fraicheur_s=fraicheur_s), **options)
+        self.clients.append(client)
+        return client
+
+    def test_extraction_texte(self):
+        texte = extraire_texte(PAGE)
+        self.assertIn("SecondMind", texte)
+        self.assertNotIn("Menu", texte)
+        self.assertNotIn("var x", texte)
+
+    def test_parallele_borne_par_hote(self):
+        client = self._client(max_paralleles=8, max_par_hote=2)
+        urls = [f"{self.base}/lent/{i}" for i in range(6)]
+
+        debut = time.perf_counter()
+        pages = client.telecharger_tous(urls)
+        duree = time.perf_counter() - debut
+
+        self.assertEqual([p.url for p in pages], urls)  # Ordre des URLs conservé
+        self.assertTrue(all(p.origine == "reseau" for p in pages))
+        self.assertEqual(_ServeurFixture.compteur["max_en_cours"], 2)
+        self.assertLess(duree, 6 * 0.2)  # Plus rapide que la lecture en série
+
+    def test_page_fraiche_servie_sans_reseau(self):
+        client = self._client()
+        premiere = client.telecharger(f"{self.base}/doc")
+        seconde = client.telecharger(f"{self.base}/doc")
+
+        self.assertEqual(premiere.origine, "reseau")
+        self.assertEqual(seconde.origine, "cache")
+        self.assertEqual(seconde.texte, premiere.texte)
+        self.assertEqual(_ServeurFixture.compteur["requetes"], 1)
+
+    def test_revalidation_304(self):
+        client = self._client(fraicheur_s=0)
+        premiere = client.telecharger(f"{self.base}/doc")
+        seconde = client.telecharger(f"{self.base}/doc")
+
+        self.assertEqual((seconde.statut, seconde.origine), (304, "revalidee"))
+        self.assertEqual(seconde.empreinte, premiere.empreinte)
+        self.assertIn("SecondMind", seconde.texte)
+        self.assertEqual(_ServeurFixture.compteur["304"], 1)
+
+    def test_deduplication_par_contenu(self):
+        client = self._client()
+        miroir_a = client.telecharger(f"{self.base}/a")
+        miroir_b = client.telecharger(f"{self.base}/b")
+
+        self.assertEqual(miroir_a.empreinte, miroir_b.empreinte)
+        self.assertEqual(len(list((self.dossier / "textes").iterdir())), 1)
+
+    def test_erreur_reseau(self):
+        client = self._client(timeout=1)
+        page = client.telecharger("http://127.0.0.1:9/injoignable")
+        self.assertEqual(page.origine, "erreur")
+        self.assertTrue(page.erreur)
+        self.assertEqual(page.texte, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PreselectionPassages - Filtre sémantique avant l'analyse LLM de RechercheWeb
+
+L'analyse d'une page (`_analyser_contenu`) est l'étape la plus coûteuse de la Deep Research,
+alors que l'essentiel d'une page est hors-sujet. Ce module réduit le prompt envoyé au LLM :
+1.  **Découpage** : la page est coupée en passages (lignes regroupées jusqu'à `taille_passage`
+    caractères ; une ligne trop longue est recoupée par mots).
+2.  **Vectorisation par lots** : passages encodés avec le modèle de phrases partagé
+    (celui du MoteurVectoriel), `taille_lot` textes par appel.
+3.  **Sélection** : similarité cosinus maximale de chaque passage avec les références
+    (objectif + requêtes générées) ; seuls les `top_k` meilleurs passages, remis dans
+    l'ordre de la page, sont transmis au LLM.
+4.  **Rejet précoce** : une page dont le meilleur passage reste sous `seuil_page`
+    n'est pas envoyée au LLM du tout.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+SEPARATEUR_EXTRAITS = "\n[...]\n"
+
+
+@dataclass
+class SelectionPassages:
+    """
+    Résultat de la pré-sélection d'une page.
+
+    score : meilleure similarité passage/référence (0 à 1) ; `pertinente` indique s'il
+    dépasse `seuil_page`. `extrait` est le texte réduit destiné au LLM.
+    """
+
+    extrait: str
+    score: float
+    pertinente: bool
+    passages_retenus: int
+    passages_total: int
+
+
+class PreselecteurPassages:
+    """
+    Pré-sélection des passages d'une page par similarité d'embeddings.
+
+    Attributes:
+        encodeur (Callable): `encodeur(textes) -> matrice (n, dim)` (ex: `SentenceTransformer.encode`).
+        taille_passage (int): Taille cible d'un passage (caractères).
+        top_k (int): Nombre de passages transmis au LLM.
+        seuil_page (float): Similarité minimale du meilleur passage pour analyser la page.
+        taille_lot (int): Nombre de textes par appel à l'encodeur.
+    """
+
+    def __init__(
+        self,
+        encodeur: Callable[[List[str]], Sequence],
+        taille_passage: int = 800,
+        top_k: int = 6,
+        seuil_page: float = 0.25,
+        taille_lot: int = 32,
+    ):
+        self.encodeur = encodeur
+        self.taille_passage = max(100, int(taille_passage))
+        self.top_k = max(1, int(top_k))
+        self.seuil_page = float(seuil_page)
+        self.taille_lot = max(1, int(taille_lot))
+
+        self._verrou = threading.Lock()
+        self._stats = {"pages": 0, "pages_ignorees": 0, "caracteres_source": 0, "caracteres_envoyes": 0}
+
+    @classmethod
+    def depuis_config(cls, encodeur, config: Optional[Dict]) -> Optional["PreselecteurPassages"]:
+        """Construit le pré-sélecteur depuis `web_research.preselection` (None si désactivé)."""
+        config = config or {}
+        if encodeur is None or not config.get("actif", True):
+            return None
+        return cls(
+            encodeur,
+            taille_passage=config.get("taille_passage", 800),
+            top_k=config.get("top_k", 6),
+            seuil_page=config.get("seuil_page", 0.25),
+            taille_lot=config.get("taille_lot", 32),
+        )
+
+    # ------------------------------------------------------------------
+    # Découpage et vectorisation
+    # ------------------------------------------------------------------
+
+    def decouper(self, texte: str) -> List[str]:
+        """Regroupe les lignes de la page en passages d'environ `taille_passage` caractères."""
+        passages, courant = [], ""
+        for ligne in texte.splitlines():
+            ligne = ligne.strip()
+            if not ligne:
+                continue
+            for morceau in self._recouper(ligne):
+                if courant and len(courant) + len(morceau) + 1 > self.taille_passage:
+                    passages.append(courant)
+                    courant = ""
+                courant = f"{courant}\n{morceau}" if courant else morceau
+        if courant:
+            passages.append(courant)
+        return passages
+
+    def _recouper(self, ligne: str) -> List[str]:
+        if len(ligne) <= self.taille_passage:
+            return [ligne]
+        morceaux, courant = [], []
+        longueur = 0
+        for mot in ligne.split():
+            if courant and longueur + len(mot) + 1 > self.taille_passage:
+                morceaux.append(" ".join(courant))
+                courant, longueur = [], 0
+            courant.append(mot)
+            longueur += len(mot) + 1
+        if courant:
+            morceaux.append(" ".join(courant))
+        return morceaux
+
+    def encoder(self, textes: List[str]) -> np.ndarray:
+        """Vecteurs L2-normalisés, encodés par lots de `taille_lot`."""
+        lots = [
+            np.asarray(self.encodeur(textes[i : i + self.taille_lot]), dtype=np.float32)
+            for i in range(0, len(textes), self.taille_lot)
+        ]
+        if not lots:
+            return np.zeros((0, 0), dtype=np.float32)
+        vecteurs = np.vstack(lots)
+        normes = np.linalg.norm(vecteurs, axis=1, keepdims=True)
+        return vecteurs / np.maximum(normes, 1e-12)
+
+    def preparer_references(self, references: List[str]) -> np.ndarray:
+        """Encode une fois par tour l'objectif et les requêtes générées."""
+        return self.encoder([r for r in references if r and r.strip()])
+
+    # ------------------------------------------------------------------
+    # Sélection
+    # ------------------------------------------------------------------
+
+    def selectionner(self, texte: str, vecteurs_references: np.ndarray) -> SelectionPassages:
+        """Retourne les `top_k` passages les plus proches des références."""
+        passages = self.decouper(texte)
+        if not passages or vecteurs_references.size == 0:
+            return self._comptabiliser(texte, SelectionPassages(texte, 0.0, True, len(passages), len(passages)))
+
+        similarites = (self.encoder(passages) @ vecteurs_references.T).max(axis=1)
+        meilleurs = np.argsort(-similarites)[: self.top_k]
+        score = float(similarites[meilleurs[0]])
+        extrait = SEPARATEUR_EXTRAITS.join(passages[i] for i in sorted(meilleurs))
+
+        selection = SelectionPassages(
+            extrait=extrait,
+            score=score,
+            pertinente=score >= self.seuil_page,
+            passages_retenus=len(meilleurs),
+            passages_total=len(passages),
+        )
+        return self._comptabiliser(texte, selection)
+
+    def _comptabiliser(self, texte: str, selection: SelectionPassages) -> SelectionPassages:
+        with self._verrou:
+            self._stats["pages"] += 1
+            self._stats["caracteres_source"] += len(texte)
+            if selection.pertinente:
+                self._stats["caracteres_envoyes"] += len(selection.extrait)
+            else:
+                self._stats["pages_ignorees"] += 1
+        return selection
+
+    def statistiques(self) -> Dict:
+        with self._verrou:
+            stats = dict(self._stats)
+        source = stats["caracteres_source"]
+        stats["reduction"] = round(1 - stats["caracteres_envoyes"] / source, 4) if source else 0.0
+        return stats
+
+
+__all__ = ["PreselecteurPassages", "SelectionPassages", "SEPARATEUR_EXTRAITS"]
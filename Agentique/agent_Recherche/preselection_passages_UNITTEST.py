@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: Pré-sélection des passages (RechercheWeb)
+Cible : agentique/sous_agents_gouvernes/agent_Recherche/preselection_passages.py
+Objectif : Valider le découpage, l'encodage par lots, la sélection top-k dans l'ordre
+de la page, le rejet des pages hors-sujet et les statistiques de réduction.
+"""
+
+import unittest
+import re
+import zlib
+
+import numpy as np
+
+from agentique.sous_agents_gouvernes.agent_Recherche.preselection_passages import (
+    SEPARATEUR_EXTRAITS,
+    PreselecteurPassages,
+)
+
+
+class EncodeurSacDeMots:
+    """Encodeur déterministe (sac de mots haché) qui mémorise la taille des lots."""
+
+    def __init__(self):
+        self.lots = []
+
+    def __call__(self, textes):
+        self.lots.append(len(textes))
+        vecteurs = np.zeros((len(textes), 128), dtype=np.float32)
+        for i, texte in enumerate(textes):
+            for mot in re.findall(r"\w+", texte.lower()):
+                vecteurs[i, zlib.crc32(mot.encode("utf-8")) % 128] += 1.0
+        return vecteurs
+
+
+def _page(nb_bruit=20):
+    bruit = [f"Publicité numéro {i} promotion cuisine recette jardin" for i in range(nb_bruit)]
+    return "\n".join(
+        bruit[:5]
+        + ["FAISS index vectoriel recherche similarité embeddings"]
+        + bruit[5:]
+        + ["Les embeddings FAISS accélèrent la recherche vectorielle"]
+    )
+
+
+class TestPreselecteurPassages(unittest.TestCase):
+    def setUp(self):
+        self.encodeur = EncodeurSacDeMots()
+        self.preselecteur = PreselecteurPassages(
+            self.encodeur, taille_passage=100, top_k=2, seuil_page=0.3, taille_lot=4
+        )
+        self.references = self.preselecteur.preparer_references(
+            ["recherche vectorielle FAISS", "embeddings similarité", ""]
+        )
+
+    def test_decoupage(self):
+        passages = self.preselecteur.decouper("a\n\n" + "mot " * 80)
+        self.assertTrue(all(len(p) <= 100 for p in passages))
+        self.assertEqual(passages[0].split("\n")[0], "a")
+        self.assertEqual(self.preselecteur.decouper(""), [])
+
+    def test_top_k_dans_l_ordre_de_la_page(self):
+        selection = self.preselecteur.selectionner(_page(), self.references)
+
+        self.assertTrue(selection.pertinente)
+        self.assertEqual(selection.passages_retenus, 2)
+        self.assertGreater(selection.passages_total, 4)
+        extraits = selection.extrait.split(SEPARATEUR_EXTRAITS)
+        self.assertIn("FAISS index vectoriel", extraits[0])
+        self.assertIn("accélèrent la recherche vectorielle", extraits[1])
+        self.assertNotIn("Publicité numéro 12", selection.extrait)
+        self.assertEqual(max(self.encodeur.lots), 4)  # Encodage par lots
+
+    def test_page_hors_sujet_ignoree(self):
+        selection = self.preselecteur.selectionner(
+            "Recette de la tarte aux pommes\nCuire trente minutes", self.references
+        )
+        self.assertFalse(selection.pertinente)
+
+        stats = self.preselecteur.statistiques()
+        self.assertEqual((stats["pages"], stats["pages_ignorees"]), (1, 1))
+        self.assertEqual(stats["caracteres_envoyes"], 0)
+
+    def test_reduction_et_config(self):
+        page = _page(nb_bruit=60)
+        selection = self.preselecteur.selectionner(page, self.references)
+        stats = self.preselecteur.statistiques()
+        self.assertEqual(stats["caracteres_envoyes"], len(selection.extrait))
+        self.assertGreater(stats["reduction"], 0.8)
+
+        self.assertIsNone(PreselecteurPassages.depuis_config(None, {"actif": True}))
+        self.assertIsNone(PreselecteurPassages.depuis_config(self.encodeur, {"actif": False}))
+        self.assertEqual(PreselecteurPassages.depuis_config(self.encodeur, {"top_k": 3}).top_k, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
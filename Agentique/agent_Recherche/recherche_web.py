@@ -3,15 +3,18 @@
 """
 RechercheWeb - Module de Deep Research.
 Implémente une boucle cognitive : Search -> Scrape -> Evaluate -> Repeat.
-Utilise BeautifulSoup pour la lecture profonde et le LLM pour l'évaluation de pertinence.
+Les pages d'un tour sont téléchargées en parallèle (ClientWeb : session mutualisée,
+limite par hôte, cache HTTP disque avec revalidation ETag/Last-Modified) pendant que
+le LLM évalue, dans l'ordre, celles déjà reçues. Un même contenu n'est analysé qu'une fois.
+Si un encodeur de phrases est fourni, seuls les passages les plus proches de l'objectif et
+des requêtes sont transmis au LLM, et les pages hors-sujet ne lui sont pas envoyées.
 """
 
 import time
-import requests
 import json
 import re
+from pathlib import Path
 from typing import List, Dict, Tuple
-from bs4 import BeautifulSoup
 # --- IMPORT SÉCURISÉ ---
 try:
     from duckduckgo_search import DDGS
@@ -21,21 +24,74 @@ except ImportError:
     DDGS_AVAILABLE = False
 
 from agentique.base.META_agent import AgentBase
+from agentique.base.demarrage import charger_yaml
+from agentique.sous_agents_gouvernes.agent_Recherche.client_web import (
+    CacheHTTP,
+    ClientWeb,
+    USER_AGENT_DEFAUT,
+)
+from agentique.sous_agents_gouvernes.agent_Recherche.preselection_passages import (
+    PreselecteurPassages,
+)
 
 class RechercheWeb(AgentBase):
-    def __init__(self, moteur_llm):
+    def __init__(self, moteur_llm, encodeur=None):
+        """
+        Args:
+            moteur_llm: Moteur utilisé pour planifier et évaluer.
+            encodeur (Callable, optionnel): `encodeur(textes) -> vecteurs` (modèle de phrases
+                partagé) ; active la pré-sélection des passages avant l'analyse LLM.
+        """
         super().__init__(nom_agent="RechercheWeb")
         
         if not moteur_llm:
             raise RuntimeError("RechercheWeb nécessite un MoteurLLM pour évaluer le contenu.")
         
         self.moteur_llm = moteur_llm
-        
-        # Configuration Haute Capacité (RTX 3090 / Qwen 128k)
-        self.MAX_CONTENT_LEN = 100000  # ~25k tokens, très large pour ne pas limiter
-        self.MAX_TOURS = 4             # Nombre max d'itérations de recherche
-        self.SEUIL_SUFFISANCE = 8      # Sur 10, pour arrêter la recherche
-        self.TIMEOUT_REQUEST = 10      # Secondes pour le scraping
+
+        # Configuration Haute Capacité (RTX 3090 / Qwen 128k) - section web_research du YAML
+        config = self._charger_config()
+        scraping = config.get("scraping", {})
+        boucle = config.get("boucle_cognitive", {})
+        self.MAX_CONTENT_LEN = scraping.get("max_content_length", 100000)  # ~25k tokens
+        self.MAX_TOURS = boucle.get("max_tours", 4)                  # Itérations de recherche
+        self.SEUIL_SUFFISANCE = boucle.get("seuil_suffisance", 8)    # Sur 10, pour arrêter
+        self.SEUIL_PERTINENCE = boucle.get("seuil_pertinence_page", 6)
+        self.MAX_RESULTATS = boucle.get("max_resultats_par_requete", 4)
+        self.TIMEOUT_REQUEST = scraping.get("timeout_request", 10)   # Secondes par page
+
+        # Client HTTP concurrent + cache disque (mémoire/cache_web)
+        telechargement = config.get("telechargement", {})
+        self.client = ClientWeb(
+            cache=self._creer_cache_http(telechargement),
+            max_paralleles=telechargement.get("max_paralleles", 8),
+            max_par_hote=telechargement.get("max_par_hote", 2),
+            timeout=self.TIMEOUT_REQUEST,
+            max_caracteres=self.MAX_CONTENT_LEN,
+            user_agent=scraping.get("user_agent", USER_AGENT_DEFAUT),
+        )
+
+        # Pré-sélection sémantique des passages (None = page tronquée envoyée telle quelle)
+        self.preselecteur = PreselecteurPassages.depuis_config(encodeur, config.get("preselection"))
+
+    def _charger_config(self) -> Dict:
+        """Section `web_research` de config_recherche.yaml (valeurs par défaut si absente)."""
+        try:
+            chemin = self.auditor.get_path("config", nom_agent="recherche")
+            return (charger_yaml(chemin) or {}).get("web_research", {}) if chemin else {}
+        except Exception as e:
+            self.logger.log_warning(f"Config web_research illisible ({e}), valeurs par défaut.")
+            return {}
+
+    def _creer_cache_http(self, telechargement: Dict):
+        if not telechargement.get("cache_disque", True):
+            return None
+        racine = self.auditor.get_path("memoire", nom_agent="recherche")
+        if not racine:
+            return None
+        return CacheHTTP(
+            Path(racine) / "cache_web", fraicheur_s=telechargement.get("fraicheur_s", 3600)
+        )
 
     # =========================================================================
     # 1. PLANIFICATION (Query Expansion)
@@ -84,43 +140,36 @@ TES REQUÊTES (JSON) :"""
         self.logger.info(f"🔍 Recherche : '{query}'")
         try:
             with DDGS() as ddgs:
-                results = list(ddgs.text(query, max_results=4))
+                results = list(ddgs.text(query, max_results=self.MAX_RESULTATS))
                 return results
         except Exception as e:
             self.logger.log_error(f"Erreur DDGS: {e}")
             return []
 
     def _scraper_url(self, url: str) -> str:
-        """Télécharge et nettoie le contenu d'une page Web."""
+        """Télécharge et nettoie le contenu d'une page Web (via le cache HTTP)."""
+        page = self.client.telecharger(url)
+        if page.erreur:
+            self.logger.log_warning(f"Échec scraping {url}: {page.erreur}")
+        return page.texte
+
+    def _preparer_references(self, textes: List[str]):
+        """Vecteurs de l'objectif + requêtes du tour (None si pré-sélection inactive)."""
+        if not self.preselecteur:
+            return None
         try:
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-            response = requests.get(url, headers=headers, timeout=self.TIMEOUT_REQUEST)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Suppression du bruit (scripts, styles, pubs)
-            for script in soup(["script", "style", "nav", "footer", "header", "aside"]):
-                script.extract()
-            
-            # Extraction texte
-            text = soup.get_text(separator='\n')
-            
-            # Nettoyage des lignes vides multiples
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = '\n'.join(chunk for chunk in chunks if chunk)
-            
-            # Troncature Haute Limite
-            if len(text) > self.MAX_CONTENT_LEN:
-                self.logger.info(f"✂️ Contenu tronqué à {self.MAX_CONTENT_LEN} chars (Original: {len(text)})")
-                return text[:self.MAX_CONTENT_LEN]
-            
-            return text
-            
+            return self.preselecteur.preparer_references(textes)
         except Exception as e:
-            self.logger.log_warning(f"Échec scraping {url}: {e}")
-            return ""
+            self.logger.log_warning(f"Pré-sélection indisponible pour ce tour ({e}), pages complètes.")
+            return None
+
+    def _selectionner_passages(self, texte: str, references, url: str):
+        """Passages pertinents de la page (None si l'encodage échoue : page complète)."""
+        try:
+            return self.preselecteur.selectionner(texte, references)
+        except Exception as e:
+            self.logger.log_warning(f"Pré-sélection impossible ({e}), page complète : {url}")
+            return None
 
     # =========================================================================
     # 3. ÉVALUATION (Le Juge Interne)
@@ -170,10 +219,17 @@ Réponds STRICTEMENT au format JSON :
     def executer_recherche_profonde(self, objectif: str) -> str:
         """
         Lance la boucle de recherche itérative.
+
+        À chaque tour, les URLs inédites de toutes les requêtes sont soumises d'un bloc au
+        ClientWeb ; les pages sont évaluées dans l'ordre d'arrivée prévu pendant que les
+        suivantes se téléchargent. Un contenu déjà analysé (même empreinte) est ignoré et
+        les téléchargements restants sont annulés dès que la suffisance est atteinte.
         Retourne une synthèse complète.
         """
         connaissances_accumulees = ""
+        stats_avant = self.preselecteur.statistiques() if self.preselecteur else None
         urls_visitees = set()
+        contenus_analyses = set()
         score_suffisance_global = 0
         tour = 0
         
@@ -185,47 +241,80 @@ Réponds STRICTEMENT au format JSON :
             
             # A. Planification
             requetes = self._generer_requetes(objectif, connaissances_accumulees)
+            references = self._preparer_references([objectif] + list(requetes))
             
+            # B. Recherche (URLs inédites de toutes les requêtes du tour)
+            a_lire = []
             for query in requetes:
-                # B. Recherche
-                resultats = self._rechercher_urls(query)
-                
-                for res in resultats:
-                    url = res['href']
-                    if url in urls_visitees: continue
-                    urls_visitees.add(url)
-                    
-                    # C. Lecture (Scraping)
-                    self.logger.info(f"📖 Lecture : {res['title']}")
-                    contenu_brut = self._scraper_url(url)
-                    
-                    if len(contenu_brut) < 500: # Trop court, on passe
+                for res in self._rechercher_urls(query):
+                    url = res.get('href')
+                    if not url or url in urls_visitees:
                         continue
-                        
-                    # D. Évaluation
-                    analyse = self._analyser_contenu(contenu_brut, url, objectif)
+                    urls_visitees.add(url)
+                    a_lire.append(res)
+
+            # C. Lecture (Téléchargement concurrent, lancé d'un bloc)
+            futurs = self.client.soumettre([res['href'] for res in a_lire])
+
+            for res, futur in zip(a_lire, futurs):
+                if score_suffisance_global >= self.SEUIL_SUFFISANCE:
+                    futur.cancel()
+                    continue
+
+                url = res['href']
+                page = futur.result()
+                if page.erreur:
+                    self.logger.log_warning(f"Échec scraping {url}: {page.erreur}")
+                    continue
+                self.logger.info(f"📖 Lecture : {res.get('title', url)} [{page.origine}]")
+
+                if len(page.texte) < 500: # Trop court, on passe
+                    continue
+                if page.empreinte in contenus_analyses: # Miroir / doublon déjà évalué
+                    self.logger.info(f"♻️ Contenu déjà analysé, ignoré : {url}")
+                    continue
+                contenus_analyses.add(page.empreinte)
+
+                # D. Pré-sélection des passages (embeddings) puis Évaluation LLM
+                contenu = page.texte
+                if references is not None:
+                    selection = self._selectionner_passages(page.texte, references, url)
+                    if selection is not None:
+                        if not selection.pertinente:
+                            self.logger.info(f"🗑️ Page hors-sujet ignorée (similarité: {selection.score:.2f}) : {url}")
+                            continue
+                        contenu = selection.extrait
+
+                analyse = self._analyser_contenu(contenu, url, objectif)
+                
+                pertinence = analyse.get('pertinence', 0)
+                suffisance_page = analyse.get('suffisance', 0)
+                
+                if pertinence >= self.SEUIL_PERTINENCE: # Seuil de qualité
+                    connaissances_accumulees += f"\n\nSOURCE: {res.get('title', url)} ({url})\n"
+                    connaissances_accumulees += f"INFO: {analyse.get('extraction')}\n"
                     
-                    pertinence = analyse.get('pertinence', 0)
-                    suffisance_page = analyse.get('suffisance', 0)
+                    # Mise à jour du score global (On prend le max de ce qu'on a trouvé)
+                    score_suffisance_global = max(score_suffisance_global, suffisance_page)
+                    self.logger.info(f"✅ Info pertinente trouvée (Score: {pertinence}, Suffisance: {suffisance_page})")
+                else:
+                    self.logger.info(f"🗑️ Rejeté (Pertinence faible: {pertinence})")
                     
-                    if pertinence >= 6: # Seuil de qualité
-                        connaissances_accumulees += f"\n\nSOURCE: {res['title']} ({url})\n"
-                        connaissances_accumulees += f"INFO: {analyse.get('extraction')}\n"
-                        
-                        # Mise à jour du score global (On prend le max de ce qu'on a trouvé)
-                        score_suffisance_global = max(score_suffisance_global, suffisance_page)
-                        self.logger.info(f"✅ Info pertinente trouvée (Score: {pertinence}, Suffisance: {suffisance_page})")
-                    else:
-                        self.logger.info(f"🗑️ Rejeté (Pertinence faible: {pertinence})")
-                        
-                    if score_suffisance_global >= self.SEUIL_SUFFISANCE:
-                        self.logger.info("🎯 Suffisance atteinte ! Arrêt prématuré.")
-                        break
-                
-                if score_suffisance_global >= self.SEUIL_SUFFISANCE: break
+                if score_suffisance_global >= self.SEUIL_SUFFISANCE:
+                    self.logger.info("🎯 Suffisance atteinte ! Arrêt prématuré.")
             
-            # Petite pause pour être poli avec les serveurs
-            time.sleep(1)
+            # Petite pause entre deux tours (la politesse par hôte est gérée par le client)
+            if score_suffisance_global < self.SEUIL_SUFFISANCE and tour < self.MAX_TOURS:
+                time.sleep(1)
+
+        if stats_avant:
+            stats = self.preselecteur.statistiques()
+            source = stats["caracteres_source"] - stats_avant["caracteres_source"]
+            envoyes = stats["caracteres_envoyes"] - stats_avant["caracteres_envoyes"]
+            self.logger.info(
+                f"✂️ Pré-sélection : {envoyes}/{source} caractères envoyés au LLM, "
+                f"{stats['pages_ignorees'] - stats_avant['pages_ignorees']} page(s) ignorée(s)."
+            )
 
         # Synthèse Finale
         rapport_final = (
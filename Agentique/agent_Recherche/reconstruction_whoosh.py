@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ReconstructionWhoosh - Reconstruction parallèle et incrémentale de l'index textuel
+Module utilisé par `AgentRecherche.update_index` (mode sans argument).
+
+La reconstruction parcourait cinq dossiers mémoire, lisait et aplatissait chaque JSON sur
+un seul thread puis alimentait un unique `AsyncWriter`, en repartant de zéro à chaque fois.
+Ce module organise un pipeline en trois étages :
+1.  **Manifeste** (`manifeste_reconstruction.json`, dans le dossier de l'index) : pour chaque
+    document indexé, son empreinte de contenu (SHA-256 des octets ; pour le journal historique,
+    la localisation de l'enregistrement, immuable en ajout seul). Taille + mtime servent de
+    pré-filtre : un fichier non modifié n'est même pas relu.
+2.  **Préparation (pool de processus)** : lecture, hachage, `json.loads` et aplatissement
+    (`extraire_tout_le_texte`) par lots, en flux borné (mémoire constante).
+3.  **Ingestion multi-segments** : `ix.writer(procs=N, multisegment=True)` répartit l'analyse
+    Whoosh sur N processus qui écrivent chacun leur segment ; un seul commit final.
+
+Mode incrémental : seuls les documents nouveaux/modifiés sont ré-indexés (`delete_by_term`
+puis ajout), les documents disparus sont supprimés. Débit rapporté en docs/s.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from whoosh.index import exists_in, open_dir
+
+NOM_MANIFESTE = "manifeste_reconstruction.json"
+EXTENSIONS_INDEXEES = (".json", ".jsonl", ".txt", ".md")
+EXCLUSIONS = ("backup", "trash", "archive", ".git")
+CLES_IGNOREES = ("id", "session_id", "ref_vectoriel")
+
+# Statuts d'un document préparé
+NOUVEAU, INCHANGE, VIDE = "nouveau", "inchange", "vide"
+
+
+# =============================================================================
+# PRÉPARATION (exécutée dans les processus du pool : fonctions de module picklables)
+# =============================================================================
+
+
+def extraire_tout_le_texte(data: Any) -> str:
+    """Exploration récursive pour indexer 100% du contenu JSON."""
+    texte = []
+    if isinstance(data, dict):
+        for k, v in data.items():
+            # On ignore les IDs techniques pour ne pas polluer l'index
+            if k in CLES_IGNOREES:
+                continue
+            texte.append(extraire_tout_le_texte(v))
+    elif isinstance(data, list):
+        for item in data:
+            texte.append(extraire_tout_le_texte(item))
+    else:
+        texte.append(str(data))
+    return " ".join(texte)
+
+
+def _document_fichier(tache: Tuple[str, str, Optional[str]]) -> Optional[Tuple[str, str, str, Optional[Dict]]]:
+    """(chemin, type_memoire, empreinte connue) -> (clé, empreinte, statut, document Whoosh)."""
+    chemin, type_mem, empreinte_connue = tache
+    fichier = Path(chemin)
+    try:
+        octets = fichier.read_bytes()
+        mtime = fichier.stat().st_mtime
+    except OSError:
+        return None  # Disparu entre l'énumération et la lecture
+    empreinte = hashlib.sha256(octets).hexdigest()
+    if empreinte == empreinte_connue:
+        return chemin, empreinte, INCHANGE, None
+
+    s_val = a_val = c_val = ""
+    try:
+        if fichier.suffix in (".json", ".jsonl"):
+            data = json.loads(octets.decode("utf-8"))
+            contenu = extraire_tout_le_texte(data)
+            cl = data.get("classification") or data.get("intention") if isinstance(data, dict) else None
+            if cl:
+                s_val, a_val, c_val = cl.get("sujet", ""), cl.get("action", ""), cl.get("categorie", "")
+        else:
+            contenu = octets.decode("utf-8", errors="replace")
+    except Exception:
+        return chemin, empreinte, VIDE, None  # Illisible : mémorisé pour ne pas le relire
+
+    if not contenu.strip():
+        return chemin, empreinte, VIDE, None
+    return chemin, empreinte, NOUVEAU, {
+        "path": chemin,
+        "filename": fichier.name,
+        "content": contenu,
+        "type_memoire": type_mem,
+        "timestamp": datetime.fromtimestamp(mtime),
+        "sujet_tag": str(s_val),
+        "action_tag": str(a_val),
+        "categorie_tag": str(c_val),
+        "session_id": "",
+        "message_turn": 0,
+    }
+
+
+def _document_interaction(tache: Tuple[str, str, Dict, Dict]) -> Tuple[str, str, str, Optional[Dict]]:
+    """(référence, empreinte, entrée d'index, données) -> (clé, empreinte, statut, document Whoosh)."""
+    reference, empreinte, entree, data = tache
+    contenu = extraire_tout_le_texte(data)
+    if not contenu.strip():
+        return reference, empreinte, VIDE, None
+    try:
+        ts = datetime.fromisoformat(entree.get("timestamp", ""))
+    except ValueError:
+        ts = datetime.now()
+    return reference, empreinte, NOUVEAU, {
+        "path": reference,
+        "filename": Path(reference).name,
+        "content": contenu,
+        "type_memoire": "historique",
+        "timestamp": ts,
+        "sujet_tag": entree.get("sujet", ""),
+        "action_tag": entree.get("action", ""),
+        "categorie_tag": entree.get("categorie", ""),
+        "session_id": entree.get("session_id") or "",
+        "message_turn": entree.get("message_turn") or 0,
+    }
+
+
+def _preparer_lot(lot: Tuple[str, List]) -> List[Tuple[str, str, str, Optional[Dict]]]:
+    genre, taches = lot
+    fonction = _document_fichier if genre == "fichier" else _document_interaction
+    return [r for r in map(fonction, taches) if r is not None]
+
+
+# =============================================================================
+# RECONSTRUCTEUR
+# =============================================================================
+
+
+class ReconstructeurWhoosh:
+    """
+    Reconstruit l'index Whoosh (complet ou incrémental) à partir des dossiers mémoire et du journal.
+
+    Attributes:
+        chemin_index (Path): Dossier de l'index Whoosh (contient aussi le manifeste).
+        creer_schema (Callable): Crée un index vide (efface l'existant) pour une reconstruction complète.
+        processus (int): Taille du pool de préparation (0 = nombre de CPU).
+        processus_ecriture (int): Processus du writer multi-segments (0 = nombre de CPU).
+        seuil_parallele (int): En deçà de ce nombre de documents à traiter, tout reste en série.
+        taille_lot (int): Documents par tâche envoyée au pool.
+        limitmb (int): Mémoire de tri par writer Whoosh (Mo).
+        statistiques (Dict): Bilan de la dernière reconstruction (dont `docs_par_s`).
+    """
+
+    def __init__(
+        self,
+        chemin_index: Path,
+        creer_schema: Callable[[], None],
+        processus: int = 0,
+        processus_ecriture: int = 0,
+        seuil_parallele: int = 64,
+        taille_lot: int = 64,
+        limitmb: int = 256,
+    ):
+        self.chemin_index = Path(chemin_index)
+        self.chemin_manifeste = self.chemin_index / NOM_MANIFESTE
+        self.creer_schema = creer_schema
+        self.processus = processus or os.cpu_count() or 1
+        self.processus_ecriture = processus_ecriture or os.cpu_count() or 1
+        self.seuil_parallele = seuil_parallele
+        self.taille_lot = max(1, taille_lot)
+        self.limitmb = limitmb
+        self.statistiques: Dict = {}
+        self._mode_preparation = "serie"
+
+    @classmethod
+    def depuis_config(cls, chemin_index: Path, creer_schema: Callable, config: Optional[Dict]):
+        """Construit le reconstructeur depuis `configuration.index_whoosh`."""
+        config = config or {}
+        return cls(
+            chemin_index,
+            creer_schema,
+            processus=config.get("processus", 0),
+            processus_ecriture=config.get("processus_ecriture", 0),
+            seuil_parallele=config.get("seuil_parallele", 64),
+            taille_lot=config.get("taille_lot", 64),
+            limitmb=config.get("limitmb", 256),
+        )
+
+    # ------------------------------------------------------------------
+    # Orchestration
+    # ------------------------------------------------------------------
+
+    def reconstruire(
+        self, sources: List[Tuple[str, Path]], journal=None, complete: bool = False
+    ) -> Dict:
+        """
+        Args:
+            sources: (type_memoire, dossier) à parcourir récursivement.
+            journal: JournalHistorique (type "historique"), ou None.
+            complete: Force l'effacement de l'index et la ré-indexation de tout.
+
+        Returns:
+            Dict: statistiques (indexes, inchanges, supprimes, vides, mode, ecriture, duree_s, docs_par_s).
+        """
+        debut = time.perf_counter()
+        ancien = {} if complete else self._charger_manifeste()
+        if not ancien or not exists_in(str(self.chemin_index)):
+            complete, ancien = True, {}
+
+        manifeste: Dict[str, Dict] = {}
+        taches_fichiers = self._enumerer_fichiers(sources, ancien, manifeste)
+        taches_journal, exclus = self._selectionner_journal(journal, ancien, manifeste)
+        a_traiter = len(taches_fichiers) + len(taches_journal)
+
+        lots = self._lots(taches_fichiers, journal, exclus, ancien, manifeste)
+        parallele = a_traiter >= self.seuil_parallele and self.processus > 1
+
+        if complete:
+            self.creer_schema()
+        ix = open_dir(str(self.chemin_index))
+        writer, ecriture = self._ouvrir_writer(ix, parallele)
+
+        compteurs = {"indexes": 0, "vides": 0, "supprimes": 0}
+        try:
+            for cle, empreinte, statut, document in self._preparer(lots, parallele):
+                manifeste[cle] = dict(manifeste.get(cle, {}), empreinte=empreinte)
+                if statut == INCHANGE:
+                    continue
+                if not complete:
+                    writer.delete_by_term("path", cle)
+                if statut == NOUVEAU:
+                    writer.add_document(**document)
+                    compteurs["indexes"] += 1
+                else:
+                    compteurs["vides"] += 1
+
+            if not complete:
+                for cle in set(ancien) - set(manifeste):
+                    writer.delete_by_term("path", cle)
+                    compteurs["supprimes"] += 1
+            writer.commit()
+        except Exception:
+            writer.cancel()
+            raise
+
+        self._sauvegarder_manifeste(manifeste)
+        duree = time.perf_counter() - debut
+        self.statistiques = dict(
+            compteurs,
+            documents=len(manifeste),
+            inchanges=len(manifeste) - compteurs["indexes"] - compteurs["vides"],
+            mode="complet" if complete else "incremental",
+            preparation=self._mode_preparation,
+            ecriture=ecriture,
+            duree_s=round(duree, 3),
+            docs_par_s=round(compteurs["indexes"] / duree, 1) if duree > 0 else 0.0,
+        )
+        return self.statistiques
+
+    # ------------------------------------------------------------------
+    # Sélection (pré-filtre par le manifeste)
+    # ------------------------------------------------------------------
+
+    def _enumerer_fichiers(
+        self, sources: List[Tuple[str, Path]], ancien: Dict, manifeste: Dict
+    ) -> List[Tuple[str, str, Optional[str]]]:
+        taches = []
+        for type_mem, dossier in sources:
+            if not dossier or not Path(dossier).exists():
+                continue
+            for fichier in Path(dossier).rglob("*"):
+                if fichier.suffix not in EXTENSIONS_INDEXEES or not fichier.is_file():
+                    continue
+                if any(ex in str(fichier).lower() for ex in EXCLUSIONS):
+                    continue
+                try:
+                    stat = fichier.stat()
+                except OSError:
+                    continue
+                cle = str(fichier)
+                signature = {"taille": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+                connu = ancien.get(cle)
+                if connu and all(connu.get(k) == v for k, v in signature.items()):
+                    manifeste[cle] = connu  # Inchangé : ni relu, ni ré-indexé
+                    continue
+                manifeste[cle] = signature
+                taches.append((cle, type_mem, (connu or {}).get("empreinte")))
+        return taches
+
+    def _selectionner_journal(self, journal, ancien: Dict, manifeste: Dict) -> Tuple[List[str], set]:
+        """IDs du journal à (ré)indexer et IDs inchangés (exclus de la lecture)."""
+        if journal is None:
+            return [], set()
+        a_lire, exclus = [], set()
+        for entree in journal.entrees():
+            cle = journal.reference(entree)
+            empreinte = self._empreinte_entree(entree)
+            if ancien.get(cle, {}).get("empreinte") == empreinte:
+                manifeste[cle] = ancien[cle]
+                exclus.add(entree["id"])
+            else:
+                a_lire.append(entree["id"])
+        return a_lire, exclus
+
+    @staticmethod
+    def _empreinte_entree(entree: Dict) -> str:
+        if entree.get("fichier"):
+            return f"legacy:{entree.get('legacy')}:{entree.get('timestamp')}"
+        return f"{entree['segment']}:{entree['offset']}:{entree['longueur']}"
+
+    def _lots(self, taches_fichiers, journal, exclus: set, ancien: Dict, manifeste: Dict) -> Iterator[Tuple[str, List]]:
+        for i in range(0, len(taches_fichiers), self.taille_lot):
+            yield "fichier", taches_fichiers[i : i + self.taille_lot]
+        if journal is None:
+            return
+        lot = []
+        for entree, data in journal.iterer(exclure_ids=exclus):
+            cle = journal.reference(entree)
+            empreinte = self._empreinte_entree(entree)
+            if ancien.get(cle, {}).get("empreinte") == empreinte:  # Ancien fichier inchangé
+                manifeste[cle] = ancien[cle]
+                continue
+            lot.append((cle, empreinte, entree, data))
+            if len(lot) >= self.taille_lot:
+                yield "interaction", lot
+                lot = []
+        if lot:
+            yield "interaction", lot
+
+    # ------------------------------------------------------------------
+    # Préparation et écriture
+    # ------------------------------------------------------------------
+
+    def _preparer(self, lots: Iterable[Tuple[str, List]], parallele: bool) -> Iterator[Tuple]:
+        """
+        Flux ordonné des documents préparés. En parallèle, au plus 2 lots en vol par
+        processus (mémoire bornée) ; si le pool tombe (sandbox, spawn), les lots non
+        encore livrés sont repris en série.
+        """
+        self._mode_preparation = "serie"
+        lots = iter(lots)
+        en_vol = deque()  # (lot, future) dans l'ordre de soumission
+        if parallele:
+            try:
+                with ProcessPoolExecutor(max_workers=self.processus) as pool:
+                    for lot in lots:
+                        en_vol.append((lot, pool.submit(_preparer_lot, lot)))
+                        if len(en_vol) >= self.processus * 2:
+                            yield from self._livrer(en_vol)
+                    while en_vol:
+                        yield from self._livrer(en_vol)
+                return
+            except Exception:
+                pass
+        for lot, _ in en_vol:
+            yield from _preparer_lot(lot)
+        for lot in lots:
+            yield from _preparer_lot(lot)
+
+    def _livrer(self, en_vol: deque) -> List[Tuple]:
+        resultat = en_vol[0][1].result()
+        en_vol.popleft()  # Retiré seulement une fois livré (sinon repris en série)
+        self._mode_preparation = "parallele"
+        return resultat
+
+    def _ouvrir_writer(self, ix, parallele: bool):
+        """Writer multi-segments (N processus d'analyse) si le volume le justifie."""
+        if parallele and self.processus_ecriture > 1:
+            try:
+                writer = ix.writer(
+                    procs=self.processus_ecriture, multisegment=True, limitmb=self.limitmb, timeout=60
+                )
+                return writer, f"multisegment({self.processus_ecriture})"
+            except Exception:
+                pass
+        return ix.writer(limitmb=self.limitmb, timeout=60), "simple"
+
+    # ------------------------------------------------------------------
+    # Persistance du manifeste
+    # ------------------------------------------------------------------
+
+    def _charger_manifeste(self) -> Dict[str, Dict]:
+        if not self.chemin_manifeste.exists():
+            return {}
+        try:
+            return json.loads(self.chemin_manifeste.read_text(encoding="utf-8")).get("documents", {})
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _sauvegarder_manifeste(self, manifeste: Dict[str, Dict]):
+        temporaire = self.chemin_manifeste.with_suffix(".tmp")
+        try:
+            temporaire.write_text(json.dumps({"documents": manifeste}, ensure_ascii=False), encoding="utf-8")
+            temporaire.replace(self.chemin_manifeste)
+        except OSError:
+            pass
+
+
+__all__ = ["ReconstructeurWhoosh", "NOM_MANIFESTE", "extraire_tout_le_texte"]
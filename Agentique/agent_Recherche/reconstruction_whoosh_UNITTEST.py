@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: Reconstruction de l'index Whoosh
+Cible : agentique/sous_agents_gouvernes/agent_Recherche/reconstruction_whoosh.py
+Objectif : Valider la reconstruction complète, le saut des documents inchangés via le
+manifeste, la ré-indexation/suppression incrémentale et l'équivalence série/parallèle.
+"""
+
+import unittest
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from whoosh.fields import DATETIME, ID, NUMERIC, TEXT, Schema
+from whoosh.index import create_in, open_dir
+
+from agentique.sous_agents_gouvernes.agent_Recherche.reconstruction_whoosh import (
+    ReconstructeurWhoosh,
+    extraire_tout_le_texte,
+)
+
+
+def _schema() -> Schema:
+    return Schema(
+        path=ID(stored=True, unique=True),
+        filename=TEXT(stored=True),
+        content=TEXT(stored=True),
+        type_memoire=ID(stored=True),
+        timestamp=DATETIME(stored=True),
+        sujet_tag=ID(stored=True),
+        action_tag=ID(stored=True),
+        categorie_tag=ID(stored=True),
+        session_id=ID(stored=True),
+        message_turn=NUMERIC(stored=True),
+    )
+
+
+class TestReconstructionWhoosh(unittest.TestCase):
+    def setUp(self):
+        self.dossier = Path(tempfile.mkdtemp())
+        self.index = self.dossier / "index"
+        self.persistante = self.dossier / "persistante"
+        self.persistante.mkdir()
+        for i in range(5):
+            (self.persistante / f"souvenir_{i}.json").write_text(
+                json.dumps({"id": f"s{i}", "contenu": f"mot{i} commun", "intention": {"sujet": "Script"}}),
+                encoding="utf-8",
+            )
+        (self.persistante / "notes.md").write_text("notes markdown", encoding="utf-8")
+        (self.persistante / "backup").mkdir()
+        (self.persistante / "backup" / "ignore.json").write_text("{}", encoding="utf-8")
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def _reconstructeur(self, **kwargs) -> ReconstructeurWhoosh:
+        def creer_schema():
+            self.index.mkdir(exist_ok=True)
+            create_in(str(self.index), _schema())
+
+        return ReconstructeurWhoosh(self.index, creer_schema, **kwargs)
+
+    def _paths(self) -> set:
+        with open_dir(str(self.index)).searcher() as s:
+            return {d["path"] for d in s.all_stored_fields()}
+
+    def test_extraction(self):
+        texte = extraire_tout_le_texte({"id": "x", "a": ["b", {"session_id": "s", "c": 1}]})
+        self.assertEqual(texte.split(), ["b", "1"])
+
+    def test_complet_puis_incremental(self):
+        sources = [("persistante", self.persistante)]
+        stats = self._reconstructeur(seuil_parallele=1000).reconstruire(sources)
+        self.assertEqual((stats["mode"], stats["indexes"]), ("complet", 6))
+        self.assertGreater(stats["docs_par_s"], 0)
+
+        # Rien n'a changé : aucun document relu ni ré-indexé
+        stats = self._reconstructeur(seuil_parallele=1000).reconstruire(sources)
+        self.assertEqual((stats["mode"], stats["indexes"], stats["inchanges"]), ("incremental", 0, 6))
+
+        (self.persistante / "souvenir_1.json").write_text(json.dumps({"contenu": "modifie"}), encoding="utf-8")
+        (self.persistante / "souvenir_2.json").unlink()
+        stats = self._reconstructeur(seuil_parallele=1000).reconstruire(sources)
+        self.assertEqual((stats["indexes"], stats["supprimes"]), (1, 1))
+
+        paths = self._paths()
+        self.assertEqual(len(paths), 5)
+        self.assertNotIn(str(self.persistante / "souvenir_2.json"), paths)
+        with open_dir(str(self.index)).searcher() as s:
+            doc = s.document(path=str(self.persistante / "souvenir_1.json"))
+        self.assertIn("modifie", doc["content"])
+
+    def test_parallele_identique_a_la_serie(self):
+        sources = [("persistante", self.persistante)]
+        self._reconstructeur(processus=1, processus_ecriture=1).reconstruire(sources)
+        serie = self._paths()
+
+        stats = self._reconstructeur(
+            processus=2, processus_ecriture=2, seuil_parallele=2, taille_lot=2
+        ).reconstruire(sources, complete=True)
+        self.assertEqual(self._paths(), serie)
+        self.assertEqual(stats["indexes"], 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -20,7 +20,6 @@ Architectures impliquées :
 """
 
 import json
-import yaml
 from datetime import datetime
 from typing import Dict, List, Optional, TYPE_CHECKING
 from pathlib import Path
@@ -28,6 +27,7 @@ from pathlib import Path
 from agentique.base.META_agent import AgentBase
 from agentique.base.config_paths import ROOT_DIR
 from agentique.base.contrats_interface import EntreeJournalReflexif, TypeEcart
+from agentique.base.demarrage import charger_yaml
 
 # Import conditionnel
 if TYPE_CHECKING:
@@ -89,8 +89,7 @@ class AgentReflexor(AgentBase):
         if not path_conf.exists():
             raise RuntimeError("❌ Fichier 'config_reflexor.yaml' introuvable.")
 
-        with open(path_conf, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+        return charger_yaml(path_conf)
 
     def rechercher_cas_similaires(self, texte: str, top_k: int = None) -> List[Dict]:
         """
@@ -34,6 +34,7 @@ from pathlib import Path
 if TYPE_CHECKING:
     from flask_socketio import SocketIO  # Pour que VS Code comprenne le type
 from agentique.base.META_agent import AgentBase
+from agentique.base.traceur import demarrer_trace, span, span_courant, propager
 from agentique.base.contrats_interface import (
     Action,
     Categorie,
@@ -64,27 +65,24 @@ from agentique.base.contrats_interface import (
     MemorySearchFirstPrompt,
 )
 
-from agentique.sous_agents_gouvernes.agent_Memoire.agent_Memoire import AgentMemoire
-from agentique.sous_agents_gouvernes.agent_Parole.agent_Parole import AgentParole
-from agentique.sous_agents_gouvernes.agent_Parole.moteurs.moteur_llm import MoteurLLM
-from agentique.sous_agents_gouvernes.agent_Parole.moteurs.moteur_mini_llm import (
-    MoteurMiniLLM,
-)
-from agentique.sous_agents_gouvernes.agent_Juge.agent_Juge import AgentJuge
-from agentique.sous_agents_gouvernes.agent_Reflexor.agent_Reflexor import AgentReflexor
-from agentique.sous_agents_gouvernes.agent_Recherche.agent_Recherche import (
-    AgentRecherche,
-)
-from agentique.sous_agents_gouvernes.agent_Contexte.agent_Contexte import AgentContexte
-from agentique.sous_agents_gouvernes.agent_Code.agent_Code import AgentCode
-from agentique.sous_agents_gouvernes.agent_Code.code_extractor_manager import (
-    CodeExtractorManager,
-)
-from agentique.Semi.classes_cognitives import IntentionDetector
-from agentique.sous_agents_gouvernes.agent_Memoire.traitement_brute_persistante import (
-    ProcesseurBrutePersistante,
+from agentique.base.demarrage import charger_yaml, composant_paresseux, importer, prechauffer
+
+# Les sous-agents et moteurs (torch, sentence-transformers, faiss, whoosh...) sont importés
+# et construits au premier accès (@composant_paresseux), puis pré-chauffés en arrière-plan.
+if TYPE_CHECKING:
+    from agentique.sous_agents_gouvernes.agent_Memoire.agent_Memoire import AgentMemoire
+    from agentique.sous_agents_gouvernes.agent_Parole.agent_Parole import AgentParole
+
+_AGENTS = "agentique.sous_agents_gouvernes"
+
+# Ordre de pré-chauffage : les composants d'une même étape sont indépendants (parallèles)
+ETAPES_PRECHAUFFAGE = (
+    ("moteur_llm", "moteur_mini_llm", "moteur_vectoriel", "intention_detector", "agent_code", "code_extractor"),
+    ("agent_recherche", "processeur_batch"),
+    ("agent_memoire", "agent_juge"),
+    ("agent_reflexor", "agent_contexte"),
+    ("agent_parole",),
 )
-from agentique.sous_agents_gouvernes.agent_Memoire.moteur_vecteur import MoteurVectoriel
 
 
 class AgentSemi(AgentBase):
@@ -110,104 +108,165 @@ class AgentSemi(AgentBase):
         self.get_cache = get_cache
         self.get_lock = get_lock
 
-        # 2. Initialisation des composants (Méthodes extraites)
-        self._initialiser_moteurs()
-        self._initialiser_sous_agents()
-        self._initialiser_outils_systeme()
-        self._initialiser_agent_code()
+        # 2. Les composants (moteurs, sous-agents, outils) sont des @composant_paresseux :
+        #    construits au premier accès, pré-chauffés en arrière-plan (étape 4).
 
-        # 3. Configuration Callback & État
-        self._setup_callbacks_viewer()
+        # 3. État
         self._initialiser_etat_session()
 
-        # 4. Démarrage des processus de fond
+        # 4. Démarrage des processus de fond (pré-chauffage parallèle + boot sequence)
         self._lancer_processus_demarrage()
 
         self.logger.info("✅ AgentSemi initialisé (Refactorisé).")
 
-    def _initialiser_outils_systeme(self):
+    @composant_paresseux
+    def code_extractor(self):
         # On instancie le nouveau Manager (Outil stateless)
-        self.code_extractor = CodeExtractorManager()
+        CodeExtractorManager = importer(f"{_AGENTS}.agent_Code.code_extractor_manager", "CodeExtractorManager")
+        return CodeExtractorManager()
 
         # ------------------------------------------------------
         # Initialisation des Moteurs
         # ------------------------------------------------------
 
-    def _initialiser_moteurs(self):
-        self.moteur_llm = MoteurLLM()
-        self.moteur_mini_llm = MoteurMiniLLM()
-        self.moteur_vectoriel = MoteurVectoriel()
-        self.processeur_batch = ProcesseurBrutePersistante(llm_engine=self.moteur_llm)
+    @composant_paresseux
+    def moteur_llm(self):
+        MoteurLLM = importer(f"{_AGENTS}.agent_Parole.moteurs.moteur_llm", "MoteurLLM")
+        return MoteurLLM()
+
+    @composant_paresseux
+    def moteur_mini_llm(self):
+        MoteurMiniLLM = importer(f"{_AGENTS}.agent_Parole.moteurs.moteur_mini_llm", "MoteurMiniLLM")
+        return MoteurMiniLLM()
+
+    @composant_paresseux
+    def moteur_vectoriel(self):
+        MoteurVectoriel = importer(f"{_AGENTS}.agent_Memoire.moteur_vecteur", "MoteurVectoriel")
+        return MoteurVectoriel()
+
+    @composant_paresseux
+    def processeur_batch(self):
+        ProcesseurBrutePersistante = importer(
+            f"{_AGENTS}.agent_Memoire.traitement_brute_persistante", "ProcesseurBrutePersistante"
+        )
+        return ProcesseurBrutePersistante(llm_engine=self.moteur_llm)
 
         # =====================================================
         # Initialisation des Agents (Ordre Strict)
         # =====================================================
 
-    def _initialiser_sous_agents(self):
-        """
-        Instancie les agents et injecte les dépendances croisées.
-
-        ⚠️ ORDRE CRITIQUE :
-        1. Recherche (Base I/O)
-        2. Memoire (Dépend de Recherche + Moteurs)
-        3. Reflexor/Juge (Dépendent de Memoire/Recherche)
-        4. Parole (Dépend de tout le monde pour construire le prompt)
-
-        Modifie l'état interne de l'instance (self.agent_*).
-        """
-        self.agent_recherche = AgentRecherche()
-        self.agent_recherche.moteur_vectoriel = self.moteur_vectoriel  # Injection
+    # Chaque fabrique résout ses dépendances par simple accès aux attributs :
+    # l'ordre critique (Recherche -> Memoire -> Reflexor/Juge -> Contexte -> Parole)
+    # découle du graphe, quel que soit l'agent demandé en premier.
+
+    @composant_paresseux
+    def agent_recherche(self):
+        """Recherche (Base I/O) + injection du moteur vectoriel et de l'outil RechercheWeb."""
+        AgentRecherche = importer(f"{_AGENTS}.agent_Recherche.agent_Recherche", "AgentRecherche")
+        agent = AgentRecherche()
+        agent.moteur_vectoriel = self.moteur_vectoriel  # Injection
+
+        # --- INJECTION TARDIVE POUR DEEP RESEARCH ---
+        # L'outil avancé a besoin du LLM.
+        RechercheWeb = importer(f"{_AGENTS}.agent_Recherche.recherche_web", "RechercheWeb")
+        agent.outil_web = RechercheWeb(self.moteur_llm, encodeur=self.moteur_vectoriel.model.encode)
+        self.logger.info("✅ Outil RechercheWeb injecté.")
+        return agent
 
-        self.agent_memoire: AgentMemoire = AgentMemoire(
+    @composant_paresseux
+    def agent_memoire(self) -> "AgentMemoire":
+        """Memoire (Dépend de Recherche + Moteurs)."""
+        AgentMemoire = importer(f"{_AGENTS}.agent_Memoire.agent_Memoire", "AgentMemoire")
+        agent = AgentMemoire(
             agent_recherche=self.agent_recherche, moteur_vectoriel=self.moteur_vectoriel
         )
-        self.agent_recherche.agent_memoire = self.agent_memoire
+        self.agent_recherche.agent_memoire = agent
+        return agent
 
-        self.agent_reflexor = AgentReflexor(
+    @composant_paresseux
+    def agent_reflexor(self):
+        AgentReflexor = importer(f"{_AGENTS}.agent_Reflexor.agent_Reflexor", "AgentReflexor")
+        return AgentReflexor(
             agent_memoire=self.agent_memoire,
             agent_recherche=self.agent_recherche,
             moteur_llm=self.moteur_llm,
             moteur_vectoriel=self.moteur_vectoriel,
         )
-        self.agent_juge = AgentJuge(
+
+    @composant_paresseux
+    def agent_juge(self):
+        AgentJuge = importer(f"{_AGENTS}.agent_Juge.agent_Juge", "AgentJuge")
+        return AgentJuge(
             agent_recherche=self.agent_recherche, moteur_mini_llm=self.moteur_mini_llm
         )
-        self.agent_contexte = AgentContexte(
+
+    @composant_paresseux
+    def agent_contexte(self):
+        AgentContexte = importer(f"{_AGENTS}.agent_Contexte.agent_Contexte", "AgentContexte")
+        return AgentContexte(
             agent_recherche=self.agent_recherche, agent_juge=self.agent_juge
         )
-        self.agent_parole: AgentParole = AgentParole(
+
+    @composant_paresseux
+    def agent_parole(self) -> "AgentParole":
+        """Parole (Dépend de tout le monde pour construire le prompt) + callback Prompt Viewer."""
+        AgentParole = importer(f"{_AGENTS}.agent_Parole.agent_Parole", "AgentParole")
+        agent = AgentParole(
             agent_contexte=self.agent_contexte,
             agent_semi=self,
             get_cache=self.get_cache,
             get_lock=self.get_lock,
         )
-
-        self.intention_detector = IntentionDetector()
-
-        # --- H. INJECTION TARDIVE POUR DEEP RESEARCH ---
-        # AgentRecherche a besoin du LLM pour l'outil avancé, mais il a été créé avant.
-        # On initialise l'outil maintenant que le moteur est dispo.
-        from agentique.sous_agents_gouvernes.agent_Recherche.recherche_web import (
-            RechercheWeb,
-        )
-
-        self.agent_recherche.outil_web = RechercheWeb(self.moteur_llm)
-        self.logger.info("✅ Outil RechercheWeb injecté.")
-
-    def _initialiser_agent_code(self):
+        if self.get_lock:
+            agent.prompt_viewer_lock = self.get_lock
+        self._setup_callbacks_viewer(agent)
+        self.system_instructions = agent.recuperer_instruction("instructions_systeme")
+        return agent
+
+    @composant_paresseux
+    def intention_detector(self):
+        IntentionDetector = importer("agentique.Semi.classes_cognitives", "IntentionDetector")
+        return IntentionDetector()
+
+    @composant_paresseux
+    def cache_reponses(self):
+        """
+        Cache sémantique des réponses (opt-in : section `cache_reponses` de config_semi.yaml).
+        L'encodeur (MoteurVectoriel) n'est sollicité que si le cache est actif.
+        """
+        CacheReponses = importer("agentique.Semi.cache_reponses", "CacheReponses")
+        try:
+            config = charger_yaml(self.auditor.get_path("config")) or {}
+            config = config.get("configuration", {}).get("cache_reponses", {})
+            chemin = Path(self.auditor.get_path("agent_dir")) / "cache_reponses.jsonl"
+        except Exception as e:
+            self.logger.log_warning(f"⚠️ Cache réponses désactivé (config illisible) : {e}")
+            config, chemin = {}, None
+        encodeur = lambda textes: self.moteur_vectoriel.model.encode(textes)
+        try:
+            return CacheReponses(config, encodeur=encodeur, chemin=chemin)
+        except ValueError as e:
+            # Config invalide (mode, catégorie) : cache inactif plutôt qu'une erreur à chaque tour
+            self.logger.log_error(f"❌ Cache réponses désactivé (config invalide) : {e}")
+            return CacheReponses({}, encodeur=encodeur)
+
+    @composant_paresseux
+    def agent_code(self):
         """Initialise le cerveau du code."""
         try:
-            self.agent_code = AgentCode()  # ✅ Nouvelle classe
+            AgentCode = importer(f"{_AGENTS}.agent_Code.agent_Code", "AgentCode")
+            agent = AgentCode()  # ✅ Nouvelle classe
             self.logger.info("✅ AgentCode connecté.")
+            return agent
         except Exception as e:
             self.logger.log_error(f"⚠️ Échec init AgentCode: {e}")
-            self.agent_code = None
+            return None
 
         # =================================================================
         # 🔧 CORRECTIF PROMPT VIEWER : UNIVERSEL & SOCKET.IO
         # =================================================================
 
-    def _setup_callbacks_viewer(self):
+    def _setup_callbacks_viewer(self, agent_parole):
         """Configure le callback pour le Prompt Viewer (SocketIO)."""
 
         def update_viewer_callback(prompt_str):
@@ -231,7 +290,7 @@ class AgentSemi(AgentBase):
                 except Exception as e:
                     print(f"⚠️ Erreur émission SocketIO: {e}")
 
-        self.agent_parole._prompt_callback = update_viewer_callback
+        agent_parole._prompt_callback = update_viewer_callback
 
     def _initialiser_etat_session(self):
         """Initialise les variables d'état de session."""
@@ -240,14 +299,24 @@ class AgentSemi(AgentBase):
         self.derniere_classification: Optional[ResultatIntention] = None
         self.derniere_interaction = None
         self.dernier_code_hash = None
-        self.system_instructions = self.agent_parole.recuperer_instruction(
-            "instructions_systeme"
-        )
+        self.system_instructions = None  # Renseigné à la construction d'AgentParole
         self.active_plan = PlanExecution(objectif_global="")  # Utilise la dataclass
         # NOUVEAU : La liste des fichiers "ouverts" dans l'IDE mental de Semi
         self.fichiers_actifs = set()
 
     def _lancer_processus_demarrage(self):
+        """
+        Pré-chauffe les composants en arrière-plan (étapes indépendantes en parallèle),
+        puis enchaîne la boot sequence. Le constructeur rend la main immédiatement.
+        """
+        self.thread_prechauffage = prechauffer(
+            self,
+            ETAPES_PRECHAUFFAGE,
+            au_terme=self._sequence_demarrage,
+            journal=self.logger.log_warning,
+        )
+
+    def _sequence_demarrage(self):
         """
         Boot Sequence : Procédures de démarrage à froid.
 
@@ -378,6 +447,43 @@ class AgentSemi(AgentBase):
         Yields:
             str: Tokens de texte ou signaux de contrôle.
         """
+        # Trace du tour : l'ID de corrélation devient l'ID de trace, et chaque appel
+        # d'agent (auto-instrumentation) s'y rattache comme span enfant.
+        correlation_id = self.logger.set_correlation_id()
+        with demarrer_trace(
+            correlation_id,
+            "AgentSemi.penser",
+            prompt=prompt[:80],
+            session_id=session_id or self.current_session_id,
+            search_mode=search_mode,
+        ):
+            yield from self._penser(
+                prompt,
+                interaction_id=interaction_id,
+                session_id=session_id,
+                message_turn=message_turn,
+                stream=stream,
+                search_mode=search_mode,
+                historique_brut=historique_brut,
+                enable_thinking=enable_thinking,
+                archive_history=archive_history,
+                correlation_id=correlation_id,
+            )
+
+    def _penser(
+        self,
+        prompt: str,
+        interaction_id: str = None,
+        session_id: str = None,
+        message_turn: int = None,
+        stream: bool = False,
+        search_mode: str = "auto",
+        historique_brut: Optional[List[str]] = None,
+        enable_thinking: bool = False,
+        archive_history: Optional[List[dict]] = None,
+        correlation_id: str = None,
+    ):
+        """Corps de `penser` (exécuté dans le span racine du tour)."""
 
         # --- ⏱️ DÉBUT MOUCHARD ---
         t_start = time.time()
@@ -385,6 +491,7 @@ class AgentSemi(AgentBase):
 
         def tick(label):
             logs_perf.append(f"{label}: {time.time() - t_start:.2f}s")
+            span_courant().marquer(label)
 
         # -------------------------
 
@@ -412,7 +519,6 @@ class AgentSemi(AgentBase):
             )
         # -------------------------------------
 
-        correlation_id = self.logger.set_correlation_id()
         self.logger.info(f"Nouvelle requête [{correlation_id}] : {prompt[:50]}...")
 
         # Métriques Log (Volatiles)
@@ -758,13 +864,52 @@ class AgentSemi(AgentBase):
 
         tick("7. Prompt Construit")
         self.derniere_classification = prompt_final_obj.intention
+
+        # ------------------------------------------------------
+        # 7-BIS. CACHE SÉMANTIQUE DES RÉPONSES (opt-in)
+        # ------------------------------------------------------
+        # Prompt quasi identique + même empreinte de contexte => réponse rejouée sans LLM.
+        cache_reponses = self.cache_reponses
+        categorie_cache = resultat_intention.categorie.value
+        empreinte_cache = None
+        decision_cache = None
+        if not cache_reponses.exclusion(
+            prompt,
+            categorie_cache,
+            protocole_actif=bool(getattr(self, "active_protocol_override", None)),
+            search_mode=search_mode,
+            prompt_standard=isinstance(prompt_final_obj, (StandardPrompt, StandardPromptCode)),
+        ):
+            try:
+                empreinte_cache = cache_reponses.empreinte(
+                    resultat_contexte.regles_actives,
+                    list(resultat_contexte.contexte_memoire)
+                    + list(resultat_contexte.fichiers_readme)
+                    + liste_code_chunks
+                    + chunks_actifs,
+                    self.agent_parole._recuperer_resume_systeme(),
+                    resultat_contexte.historique,
+                )
+                decision_cache = cache_reponses.consulter(
+                    prompt, categorie_cache, empreinte_cache
+                )
+                tick(f"Cache réponse : {decision_cache.statut} ({decision_cache.similarite:.3f})")
+            except Exception as e:
+                self.logger.log_warning(f"⚠️ Cache réponses indisponible : {e}")
+                empreinte_cache = None
+        servi_par_cache = decision_cache is not None and decision_cache.statut == "hit"
+        if decision_cache is not None and decision_cache.statut != "miss":
+            self.logger.info(
+                f"♻️ Cache réponse [{decision_cache.statut}] sim={decision_cache.similarite} "
+                f"(source : {decision_cache.prompt_source[:50]}...)"
+            )
+
         # ------------------------------------------------------
         # 8. Génération (Appel AgentParole -> LLM)
         # ==========================================================
         final_response_text = ""
         llm_success = True
         prompt_texte = self.agent_parole.construire_prompt_llm(prompt_final_obj)
-        tick("8. Envoi au Moteur LLM...")
 
         t_gen_start = time.time()
         first_token_received = False
@@ -772,49 +917,60 @@ class AgentSemi(AgentBase):
         check_json_done = False
         is_hidden_json_mode = False
 
-        response_generator = self.moteur_llm.generer_stream(prompt_texte)
+        if servi_par_cache:
+            final_response_text = decision_cache.reponse
+            tick("8. Réponse servie par le cache")
+            tick(f"⚡ TTFT: {time.time() - t_gen_start:.2f}s")
+            if stream:
+                yield from cache_reponses.morceaux(final_response_text)
+        else:
+            tick("8. Envoi au Moteur LLM...")
+            response_generator = self.moteur_llm.generer_stream(prompt_texte)
 
-        try:
-            for token in response_generator:
-                if not token:
-                    continue
-                if not first_token_received:
-                    ttft = time.time() - t_gen_start
-                    tick(f"⚡ TTFT: {ttft:.2f}s")
-                    first_token_received = True
+            # Span de génération (le générateur du moteur n'est pas tracé automatiquement)
+            with span("MoteurLLM.generer_stream", caracteres_prompt=len(prompt_texte)):
+                try:
+                    for token in response_generator:
+                        if not token:
+                            continue
+                        if not first_token_received:
+                            ttft = time.time() - t_gen_start
+                            tick(f"⚡ TTFT: {ttft:.2f}s")
+                            first_token_received = True
 
-                final_response_text += token
+                        final_response_text += token
 
-                # BUFFER JSON
-                if stream:
-                    if not check_json_done:
-                        buffer_detection += token
-                        if len(buffer_detection) > 50:
-                            if re.match(r"^\s*({|```json)", buffer_detection):
-                                is_hidden_json_mode = True
+                        # BUFFER JSON
+                        if stream:
+                            if not check_json_done:
+                                buffer_detection += token
+                                if len(buffer_detection) > 50:
+                                    if re.match(r"^\s*({|```json)", buffer_detection):
+                                        is_hidden_json_mode = True
+                                    else:
+                                        yield buffer_detection
+                                    check_json_done = True
                             else:
-                                yield buffer_detection
-                            check_json_done = True
-                    else:
-                        if not is_hidden_json_mode:
-                            yield token
+                                if not is_hidden_json_mode:
+                                    yield token
 
-            if stream and not check_json_done and not is_hidden_json_mode:
-                yield buffer_detection
+                    if stream and not check_json_done and not is_hidden_json_mode:
+                        yield buffer_detection
 
-        except Exception as e:
-            self.logger.log_error(
-                f"[{correlation_id}] Erreur génération LLM: {e}", exc_info=True
-            )
-            final_response_text = "Désolé, une erreur interne est survenue."
-            llm_success = False
-            if stream:
-                yield final_response_text
+                except Exception as e:
+                    self.logger.log_error(
+                        f"[{correlation_id}] Erreur génération LLM: {e}", exc_info=True
+                    )
+                    final_response_text = "Désolé, une erreur interne est survenue."
+                    llm_success = False
+                    if stream:
+                        yield final_response_text
 
         # ==========================================================
         # 9. TRAITEMENT DU JSON (Post-Génération) & ROUTAGE OUTILS
         # ==========================================================
-        if final_response_text:
+        outil_utilise = False
+        if final_response_text and not servi_par_cache:
             # 1. Nettoyage et Parsing Initial
             text_to_parse = re.sub(r"```json\s*", "", final_response_text)
             text_to_parse = re.sub(r"```$", "", text_to_parse.strip())
@@ -823,6 +979,7 @@ class AgentSemi(AgentBase):
             current_tool_result = self._detecter_et_executer_function_call(
                 text_to_parse
             )
+            outil_utilise = bool(current_tool_result)
 
             # Limite de sécurité pour éviter les boucles infinies
             max_autonomy_steps = 10
@@ -968,6 +1125,20 @@ class AgentSemi(AgentBase):
                         break
                 else:
                     break
+        # ------------------------------------------------------
+        # 9-BIS. Mémorisation (cache sémantique) : tours sans outil uniquement
+        # ------------------------------------------------------
+        if empreinte_cache and llm_success and not servi_par_cache:
+            if outil_utilise or is_hidden_json_mode:
+                cache_reponses.exclure("outil")
+            else:
+                threading.Thread(
+                    target=propager(lambda: cache_reponses.memoriser(
+                        prompt, categorie_cache, empreinte_cache, final_response_text
+                    )),
+                    daemon=True,
+                ).start()
+
         # ==========================================================
         # 10. Post-Traitement Asynchrone (Sauvegarde & Stats)
         # ==========================================================
@@ -996,14 +1167,14 @@ class AgentSemi(AgentBase):
 
             try:
                 threading.Thread(
-                    target=lambda: self.post_traitement_async(
+                    target=propager(lambda: self.post_traitement_async(
                         prompt,
                         final_response_text,
                         prompt_final_obj,
                         meta_pipeline.interaction_id,
                         self.current_session_id,
                         self.current_message_turn,
-                    ),
+                    )),
                     daemon=True,
                 ).start()
             except Exception as e:
@@ -1482,7 +1653,8 @@ class AgentSemi(AgentBase):
     def _verifier_batch_au_demarrage(self):
         """
         Vérifie si le traitement batch différé doit être lancé au démarrage.
-        Se déclenche si le dernier run date de plus de 45h ou n'existe pas.
+        Se déclenche si le dernier run date de plus de 45h ou n'existe pas,
+        ou si une consolidation a été interrompue (lecture du registre seul).
         """
         try:
             state = self.processeur_batch._charger_etat()
@@ -1497,6 +1669,15 @@ class AgentSemi(AgentBase):
                 self._lancer_batch_async()
                 return
 
+            # CAS 1b : Consolidation interrompue (crash) -> reprise par session
+            interrompues = self.processeur_batch.registre.sessions_en_cours()
+            if interrompues:
+                self.logger.info(
+                    f"🕒 {len(interrompues)} session(s) interrompue(s). Reprise asynchrone..."
+                )
+                self._lancer_batch_async()
+                return
+
             # CAS 2 : Vérification du délai
             dernier_run = datetime.fromisoformat(dernier_run_str)
             delta = datetime.now() - dernier_run
@@ -1889,20 +2070,34 @@ _Mise à jour : {datetime.now().strftime("%Y-%m-%d %H:%M")}_
         etat_cognitif = {}
 
         # Liste des agents à interroger
+        # (Lecture sans construction : un agent pas encore pré-chauffé vaut None)
         agents_a_interroger = [
-            ("AgentMemoire", self.agent_memoire),
-            ("AgentRecherche", self.agent_recherche),
-            ("AgentContexte", self.agent_contexte),
-            ("AgentParole", self.agent_parole),
-            ("AgentJuge", self.agent_juge),
-            ("AgentReflexor", self.agent_reflexor),
-            ("MoteurLLM", self.moteur_llm),
-            ("MoteurMiniLLM", self.moteur_mini_llm),
-            ("IntentionDetector", self.intention_detector),
+            (nom, vars(self).get(attribut))
+            for nom, attribut in (
+                ("AgentMemoire", "agent_memoire"),
+                ("AgentRecherche", "agent_recherche"),
+                ("AgentContexte", "agent_contexte"),
+                ("AgentParole", "agent_parole"),
+                ("AgentJuge", "agent_juge"),
+                ("AgentReflexor", "agent_reflexor"),
+                ("MoteurLLM", "moteur_llm"),
+                ("MoteurMiniLLM", "moteur_mini_llm"),
+                ("IntentionDetector", "intention_detector"),
+            )
         ]
 
         for nom_agent, instance_agent in agents_a_interroger:
             try:
+                if instance_agent is None:
+                    etat_cognitif[nom_agent] = {
+                        "appels_total": 0,
+                        "erreurs_total": 0,
+                        "temps_moyen_ms": 0,
+                        "stats_specifiques": {},
+                        "charge": False,
+                    }
+                    continue
+
                 # Vérifier si l'agent a un stats_manager
                 if (
                     hasattr(instance_agent, "stats_manager")
@@ -1954,6 +2149,18 @@ _Mise à jour : {datetime.now().strftime("%Y-%m-%d %H:%M")}_
                 f"Erreur lors de la collecte des stats pour AgentSemi: {e}"
             )
 
+        # Cache sémantique des réponses (taux de hit, exclusions)
+        cache_reponses = vars(self).get("cache_reponses")
+        if cache_reponses is not None:
+            stats_cache = cache_reponses.statistiques()
+            etat_cognitif["CacheReponses"] = {
+                "appels_total": stats_cache["consultations"],
+                "erreurs_total": 0,
+                "temps_moyen_ms": 0,
+                "stats_specifiques": stats_cache,
+                "charge": cache_reponses.actif,
+            }
+
         self.logger.info(f"📊 État cognitif collecté pour {len(etat_cognitif)} agents")
         return etat_cognitif
 
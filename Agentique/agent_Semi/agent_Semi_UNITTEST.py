@@ -8,6 +8,7 @@ Objectif : Valider la boucle cognitive, le routage des outils et la gestion de s
 
 import unittest
 import json
+import sys
 from unittest.mock import MagicMock, patch, ANY
 from types import SimpleNamespace
 
@@ -20,6 +21,8 @@ from agentique.base.contrats_interface import (
     Action,
     Categorie,
     Souvenir,
+    Regle,
+    FichierReadme,
 )
 
 # Import conditionnel
@@ -160,6 +163,57 @@ class TestAgentSemi(unittest.TestCase):
         # Vérifie qu'on n'a PAS appelé l'intention detector (bypass)
         self.agent.intention_detector.intention_detector.assert_not_called()
 
+    def test_penser_cache_reponses_hit(self):
+        """Un quasi-doublon au contexte identique est rejoué sans solliciter le LLM."""
+        from agentique.Semi.cache_reponses import CacheReponses
+
+        mock_intention = ResultatIntention(
+            prompt="Statut du projet",
+            sujet=Sujet.SECONDMIND,
+            action=Action.PENSER,
+            categorie=Categorie.PLANIFIER,
+        )
+        self.agent.intention_detector.intention_detector.return_value = mock_intention
+        souvenir = Souvenir(contenu="Étape 3", titre="M1", type="txt", score=1.0)
+        regles = [Regle(contenu="Toujours citer la source", titre="R_001")]
+        readmes = [FichierReadme(contenu="Doc projet", titre="README.md")]
+        self.agent.agent_contexte.recuperer_contexte_intelligent.return_value = SimpleNamespace(
+            contexte_memoire=[souvenir],
+            regles_actives=regles,
+            historique=[],
+            fichiers_readme=readmes,
+            intention_detectee=mock_intention,
+        )
+        self.agent.agent_parole._recuperer_resume_systeme.return_value = "Résumé"
+        self.agent.agent_code = None
+
+        encodeur = lambda textes: [[1.0, float(len(t.split()))] for t in textes]
+        cache = CacheReponses({"actif": True, "mode": "servir"}, encodeur)
+        cache.memoriser(
+            "Statut du projet",
+            "Planifier",
+            cache.empreinte(regles, [souvenir] + readmes, "Résumé", []),
+            "Étape 3 sur 5.",
+        )
+        self.agent.cache_reponses = cache
+
+        reponse = "".join(self.agent.penser("statut du projet", stream=True))
+
+        self.assertEqual(reponse, "Étape 3 sur 5.")
+        self.agent.moteur_llm.generer_stream.assert_not_called()
+        self.assertEqual(cache.statistiques()["hits"], 1)
+
+    def test_cache_reponses_config_invalide(self):
+        """Une config invalide donne un cache inactif (construit une fois), pas une erreur par tour."""
+        config = {"configuration": {"cache_reponses": {"actif": True, "mode": "inconnu"}}}
+        module = sys.modules[AgentSemi.__module__]
+        with patch.object(module, "charger_yaml", return_value=config):
+            cache = self.agent.cache_reponses
+
+        self.assertFalse(cache.actif)
+        self.assertIs(self.agent.cache_reponses, cache)
+        self.agent.logger.log_error.assert_called_once()
+
     # =========================================================================
     # 3. TEST ROUTAGE OUTILS (Function Calling)
     # =========================================================================
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark AgentSemi.penser - Hors ligne, sans GPU ni interface
+
+Remplace, pour le suivi des régressions, les routes interactives `/api/benchmark/*`
+(serveurs GPU + UI requis) :
+1.  **Moteurs factices** : Deux ServeurLlamaFactice (LLM principal + Mini-LLM) sur ports
+    éphémères ; les moteurs y sont redirigés par `SECONDMIND_LLM_URL` / `SECONDMIND_MINI_LLM_URL`.
+2.  **Corpus synthétique** : Mémoire / règles / code générés par échelle (`corpus_synthetique`),
+    branchés via `AuditorBase.rediriger_memoire` ; indexés par les moteurs du pipeline.
+3.  **Timings par étape** : Lus dans la trace du tour (TRACEUR) : écarts entre jalons `tick`
+    du span racine (`etape:*`), spans enfants du thread de `penser` (`span:*`), TTFT et total.
+4.  **Référence** : Les résultats (p50/p95/moyenne par métrique) sont comparés à une
+    référence stockée ; le code de sortie vaut 1 si une métrique régresse au-delà du seuil.
+
+Chaque échelle tourne dans un processus fils (singletons, caches et index repartent de zéro).
+
+Usage :
+    python benchmark_penser.py --echelles petit moyen --repetitions 5
+    python benchmark_penser.py --enregistrer-reference       # fige la référence courante
+    python benchmark_penser.py --seuil 0.15 --plancher-ms 10  # CI : échec si régression > 15 %
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from agentique.base.traceur import TRACEUR
+
+DOSSIER_BENCHMARK = Path(__file__).parent / "benchmark"
+REFERENCE_DEFAUT = DOSSIER_BENCHMARK / "reference_penser.json"
+
+# Prompts fixes couvrant les principales routes (code, mémoire, conversation, règles)
+PROMPTS_BENCHMARK = [
+    "Explique comment AgentContexte trie les souvenirs avant la construction du prompt.",
+    "Debug : le test de agent_Recherche échoue sur le boost d'intention, que vérifier ?",
+    "Quelle règle s'applique aux chemins de fichiers dans le projet ?",
+    "Code une fonction Python qui lit un fichier JSONL en flux.",
+    "Résume ce qu'on a décidé sur la latence du moteur vectoriel.",
+    "Comment configurer llama-server sur le port 8080 avec la quantisation ?",
+    "Compare le journal historique et la mémoire persistante.",
+    "Salut, on reprend le travail sur SecondMind aujourd'hui ?",
+]
+
+
+# =============================================================================
+# 📐 MESURES
+# =============================================================================
+
+
+def normaliser_jalon(label: str) -> str:
+    """'⚡ TTFT: 0.42s' -> '⚡ TTFT' (les jalons porteurs de valeur deviennent des clés stables)."""
+    return label.split(":", 1)[0].strip()
+
+
+def mesures_trace(spans: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Métriques (ms) d'une trace de `penser` au format compact du TRACEUR.
+
+    - `etape:<jalon>` : durée écoulée depuis le jalon précédent (ou le début du tour) ;
+    - `etape:fin` : du dernier jalon à la fin du tour (génération, outils, sauvegarde brute) ;
+    - `span:<nom>` : somme des spans enfants directs exécutés dans le thread du tour ;
+    - `ttft`, `total`.
+    """
+    racine = next((s for s in spans if s.get("p") is None), None)
+    if racine is None:
+        return {}
+
+    mesures: Dict[str, float] = {}
+    precedent = 0.0
+    for label, ms in racine.get("m", []):
+        cle = normaliser_jalon(label)
+        if "TTFT" in cle:
+            mesures["ttft"] = ms
+        mesures[f"etape:{cle}"] = round(mesures.get(f"etape:{cle}", 0.0) + ms - precedent, 2)
+        precedent = ms
+    mesures["etape:fin"] = round(racine["ms"] - precedent, 2)
+    mesures["total"] = racine["ms"]
+
+    for s in spans:
+        if s.get("p") == racine["s"] and s.get("th") == racine.get("th"):
+            cle = f"span:{s['n']}"
+            mesures[cle] = round(mesures.get(cle, 0.0) + s["ms"], 2)
+    return mesures
+
+
+def percentile(valeurs: List[float], q: float) -> float:
+    """Percentile par interpolation linéaire (q dans [0, 100])."""
+    ordonnees = sorted(valeurs)
+    if not ordonnees:
+        return 0.0
+    position = (len(ordonnees) - 1) * q / 100
+    bas = int(position)
+    haut = min(bas + 1, len(ordonnees) - 1)
+    return ordonnees[bas] + (ordonnees[haut] - ordonnees[bas]) * (position - bas)
+
+
+def resumer(echantillons: Iterable[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """{métrique: {p50, p95, moyenne, n}} sur l'ensemble des tours mesurés."""
+    par_metrique: Dict[str, List[float]] = {}
+    for mesures in echantillons:
+        for cle, valeur in mesures.items():
+            par_metrique.setdefault(cle, []).append(valeur)
+    return {
+        cle: {
+            "p50": round(percentile(valeurs, 50), 2),
+            "p95": round(percentile(valeurs, 95), 2),
+            "moyenne": round(sum(valeurs) / len(valeurs), 2),
+            "n": len(valeurs),
+        }
+        for cle, valeurs in sorted(par_metrique.items())
+    }
+
+
+def comparer(
+    courant: Dict[str, Any],
+    reference: Dict[str, Any],
+    seuil: float = 0.20,
+    plancher_ms: float = 5.0,
+    statistique: str = "p50",
+) -> List[Dict[str, Any]]:
+    """
+    Régressions de `courant` par rapport à `reference` (mêmes échelles, mêmes métriques).
+
+    Une métrique régresse si elle dépasse la référence de plus de `seuil` (relatif)
+    ET de plus de `plancher_ms` (absolu : les étapes de quelques ms sont du bruit).
+    """
+    regressions = []
+    for echelle, resultat in courant.get("echelles", {}).items():
+        mesures_ref = reference.get("echelles", {}).get(echelle, {}).get("mesures", {})
+        for metrique, stats in resultat.get("mesures", {}).items():
+            ref = mesures_ref.get(metrique, {}).get(statistique)
+            valeur = stats.get(statistique)
+            if ref is None or valeur is None:
+                continue
+            if valeur > ref * (1 + seuil) and valeur - ref > plancher_ms:
+                regressions.append({
+                    "echelle": echelle,
+                    "metrique": metrique,
+                    "reference_ms": ref,
+                    "courant_ms": valeur,
+                    "ecart": round(valeur / ref - 1, 3) if ref else None,
+                })
+    return regressions
+
+
+# =============================================================================
+# 🏗️ EXÉCUTION D'UNE ÉCHELLE (processus fils)
+# =============================================================================
+
+
+def indexer_corpus(agent, manifeste: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Construit les index du corpus avec les moteurs du pipeline (une seule sauvegarde par index).
+    Retourne les durées d'indexation (s) par magasin.
+    """
+    from agentique.Semi.corpus_synthetique import lire_souvenirs
+
+    memoire = Path(manifeste["memoire"])
+    durees: Dict[str, float] = {}
+
+    def charger_moteur(moteur, textes: List[str], metas: List[Dict[str, Any]], nom: str):
+        if moteur is None or not textes:
+            return
+        debut = time.perf_counter()
+        vecteurs = moteur.model.encode(textes, batch_size=64, show_progress_bar=False)
+        moteur.index.add(vecteurs.astype("float32"))
+        moteur.metadonnees.extend(metas)
+        moteur._sauvegarder_index()
+        durees[nom] = round(time.perf_counter() - debut, 3)
+
+    # 1. Souvenirs -> moteur narratif
+    textes, metas = [], []
+    for fichier, souvenir in lire_souvenirs(memoire):
+        meta = souvenir["meta"]
+        contenu = f"{souvenir['prompt']}\n{souvenir['reponse']}"
+        textes.append(contenu)
+        metas.append({
+            "contenu": contenu,
+            "type": "persistante",
+            "fichier": str(fichier),
+            "session_id": meta["session_id"],
+            "message_turn": meta["message_turn"],
+            **souvenir["intention"],
+        })
+    charger_moteur(agent.agent_memoire.moteur_vectoriel, textes, metas, "vectoriel")
+
+    # 2. Règles -> moteur législatif
+    textes, metas = [], []
+    for fichier in sorted((memoire / "reflexive" / "regles").glob("R_*.json")):
+        regle = json.loads(fichier.read_text(encoding="utf-8"))
+        textes.append(regle["regle"])
+        metas.append({"regle": regle["regle"], "trigger": regle["id"], "type": regle["type"]})
+    charger_moteur(agent.agent_memoire.moteur_regles, textes, metas, "regles")
+
+    # 3. Index Whoosh (reconstruction complète)
+    debut = time.perf_counter()
+    agent.agent_recherche.update_index()
+    durees["whoosh"] = round(time.perf_counter() - debut, 3)
+
+    # 4. Code : FAISS des chunks puis rechargement en RAM
+    from agentique.base.contrats_interface import ContexteCode
+
+    with open(memoire / "code" / "code_chunks.jsonl", "r", encoding="utf-8") as f:
+        chunks = [ContexteCode(**json.loads(ligne)) for ligne in f if ligne.strip()]
+    debut = time.perf_counter()
+    agent.agent_code.moteur_vecteur.construire_index_vectoriel(chunks)
+    agent.agent_code._charger_index_en_memoire()
+    durees["code"] = round(time.perf_counter() - debut, 3)
+    return durees
+
+
+def _attendre_fin_post_traitement(threads_avant: int, delai_s: float):
+    """Le post-traitement (Juge, mémorisation) tourne en thread : on le laisse finir entre deux tours."""
+    limite = time.monotonic() + delai_s
+    while threading.active_count() > threads_avant and time.monotonic() < limite:
+        time.sleep(0.05)
+
+
+def _jouer_tour(agent, prompt: str) -> Optional[List[Dict[str, Any]]]:
+    """Exécute un tour complet de `penser` ; retourne les spans de sa trace."""
+    avant = {t["trace_id"] for t in TRACEUR.lister_traces(TRACEUR.capacite)}
+    for _ in agent.penser(prompt, stream=True):
+        pass
+    nouvelles = [
+        t for t in TRACEUR.lister_traces(TRACEUR.capacite)
+        if t["trace_id"] not in avant and t["nom"] == "AgentSemi.penser"
+    ]
+    return TRACEUR.obtenir_trace(nouvelles[0]["trace_id"]) if nouvelles else None
+
+
+@dataclass
+class EnvironnementFactice:
+    """AgentSemi réel branché sur un corpus synthétique et deux llama-server factices."""
+
+    agent: Any
+    manifeste: Dict[str, Any]
+    llm: Any
+    mini: Any
+    demarrage_s: float
+    indexation_s: Dict[str, float]
+
+
+@contextmanager
+def environnement_factice(
+    echelle: str,
+    dossier_corpus: Path,
+    graine: int = 0,
+    ttft_ms: float = 50.0,
+    tokens_par_s: float = 50.0,
+    nb_tokens: int = 64,
+) -> Iterator[EnvironnementFactice]:
+    """
+    Corpus (généré ou réutilisé) + moteurs factices + AgentSemi pré-chauffé et indexé.
+    À utiliser une fois par processus (les moteurs lisent leur URL à la construction).
+    """
+    from agentique.base.auditor_base import AuditorBase
+    from agentique.Semi.corpus_synthetique import generer_corpus
+    from agentique.sous_agents_gouvernes.agent_Parole.moteurs.serveur_llama_factice import (
+        ServeurLlamaFactice,
+    )
+
+    manifeste = generer_corpus(Path(dossier_corpus) / echelle, echelle, graine)
+    AuditorBase.rediriger_memoire(manifeste["memoire"])
+
+    with ServeurLlamaFactice(ttft_ms=ttft_ms, tokens_par_s=tokens_par_s, nb_tokens=nb_tokens) as llm, \
+            ServeurLlamaFactice(ttft_ms=ttft_ms / 2, tokens_par_s=0, nb_tokens=nb_tokens // 2) as mini:
+        os.environ["SECONDMIND_LLM_URL"] = llm.url
+        os.environ["SECONDMIND_MINI_LLM_URL"] = mini.url
+
+        from agentique.Semi.agent_Semi import AgentSemi
+
+        debut = time.perf_counter()
+        agent = AgentSemi()
+        agent.thread_prechauffage.join()
+        demarrage_s = time.perf_counter() - debut
+
+        yield EnvironnementFactice(
+            agent=agent,
+            manifeste=manifeste,
+            llm=llm,
+            mini=mini,
+            demarrage_s=round(demarrage_s, 3),
+            indexation_s=indexer_corpus(agent, manifeste),
+        )
+
+
+def mesurer_echelle(
+    echelle: str,
+    dossier_corpus: Path,
+    repetitions: int = 5,
+    echauffement: int = 1,
+    graine: int = 0,
+    ttft_ms: float = 50.0,
+    tokens_par_s: float = 50.0,
+    nb_tokens: int = 64,
+    attente_post_s: float = 30.0,
+) -> Dict[str, Any]:
+    """Mesure `repetitions` passes sur PROMPTS_BENCHMARK dans un environnement factice."""
+    with environnement_factice(echelle, dossier_corpus, graine, ttft_ms, tokens_par_s, nb_tokens) as env:
+        for prompt in PROMPTS_BENCHMARK[:echauffement]:
+            threads_avant = threading.active_count()
+            _jouer_tour(env.agent, prompt)
+            _attendre_fin_post_traitement(threads_avant, attente_post_s)
+
+        echantillons = []
+        for _ in range(repetitions):
+            for prompt in PROMPTS_BENCHMARK:
+                threads_avant = threading.active_count()
+                spans = _jouer_tour(env.agent, prompt)
+                if spans:
+                    echantillons.append(mesures_trace(spans))
+                _attendre_fin_post_traitement(threads_avant, attente_post_s)
+
+        return {
+            "volumes": env.manifeste["volumes"],
+            "demarrage_s": env.demarrage_s,
+            "indexation_s": env.indexation_s,
+            "tours": len(echantillons),
+            "requetes_llm": env.llm.nb_requetes,
+            "requetes_mini_llm": env.mini.nb_requetes,
+            "mesures": resumer(echantillons),
+        }
+
+
+# =============================================================================
+# 🖥️ CLI
+# =============================================================================
+
+
+def _lancer_echelle(echelle: str, args) -> Dict[str, Any]:
+    """Une échelle = un processus fils (état global vierge)."""
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+        sortie = Path(tmp.name)
+    commande = [
+        sys.executable, "-m", "agentique.Semi.benchmark_penser",
+        "--echelle-unique", echelle,
+        "--sortie-echelle", str(sortie),
+        "--corpus", str(args.corpus),
+        "--repetitions", str(args.repetitions),
+        "--echauffement", str(args.echauffement),
+        "--graine", str(args.graine),
+        "--ttft-ms", str(args.ttft_ms),
+        "--tokens-par-s", str(args.tokens_par_s),
+        "--nb-tokens", str(args.nb_tokens),
+    ]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    try:
+        subprocess.run(commande, check=True, env=env)
+        return json.loads(sortie.read_text(encoding="utf-8"))
+    finally:
+        sortie.unlink(missing_ok=True)
+
+
+def _afficher(resultats: Dict[str, Any], reference: Optional[Dict[str, Any]]):
+    for echelle, resultat in resultats["echelles"].items():
+        print(f"\n📊 Échelle {echelle} ({resultat['tours']} tours, démarrage {resultat['demarrage_s']}s)")
+        mesures_ref = (reference or {}).get("echelles", {}).get(echelle, {}).get("mesures", {})
+        for metrique, stats in resultat["mesures"].items():
+            ref = mesures_ref.get(metrique, {}).get("p50")
+            comparaison = f" (réf. {ref:.1f})" if ref is not None else ""
+            print(f"  {metrique:<45} p50 {stats['p50']:>9.1f} ms | p95 {stats['p95']:>9.1f} ms{comparaison}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark hors ligne d'AgentSemi.penser")
+    parser.add_argument("--echelles", nargs="+", default=["petit"], help="Échelles du corpus synthétique")
+    parser.add_argument("--repetitions", type=int, default=5, help="Passes mesurées sur les prompts fixes")
+    parser.add_argument("--echauffement", type=int, default=1, help="Tours non mesurés (caches, JIT)")
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--corpus", type=Path, default=Path(tempfile.gettempdir()) / "secondmind_benchmark")
+    parser.add_argument("--ttft-ms", type=float, default=50.0, help="TTFT du LLM factice")
+    parser.add_argument("--tokens-par-s", type=float, default=50.0, help="Débit du LLM factice")
+    parser.add_argument("--nb-tokens", type=int, default=64, help="Longueur des réponses factices")
+    parser.add_argument("--reference", type=Path, default=REFERENCE_DEFAUT)
+    parser.add_argument("--enregistrer-reference", action="store_true", help="Écrit les résultats comme référence")
+    parser.add_argument("--seuil", type=float, default=0.20, help="Régression relative tolérée (0.20 = +20 %%)")
+    parser.add_argument("--plancher-ms", type=float, default=5.0, help="Écart absolu ignoré (bruit)")
+    parser.add_argument("--sortie", type=Path, default=None, help="Fichier de résultats (défaut : benchmark/)")
+    # Interne : exécution d'une seule échelle dans le processus fils
+    parser.add_argument("--echelle-unique", help=argparse.SUPPRESS)
+    parser.add_argument("--sortie-echelle", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.echelle_unique:
+        resultat = mesurer_echelle(
+            args.echelle_unique, args.corpus, args.repetitions, args.echauffement,
+            args.graine, args.ttft_ms, args.tokens_par_s, args.nb_tokens,
+        )
+        args.sortie_echelle.write_text(json.dumps(resultat, ensure_ascii=False), encoding="utf-8")
+        return 0
+
+    resultats = {
+        "date": datetime.now().isoformat(),
+        "parametres": {
+            "repetitions": args.repetitions,
+            "echauffement": args.echauffement,
+            "graine": args.graine,
+            "ttft_ms": args.ttft_ms,
+            "tokens_par_s": args.tokens_par_s,
+            "nb_tokens": args.nb_tokens,
+            "prompts": len(PROMPTS_BENCHMARK),
+        },
+        "echelles": {echelle: _lancer_echelle(echelle, args) for echelle in args.echelles},
+    }
+
+    DOSSIER_BENCHMARK.mkdir(parents=True, exist_ok=True)
+    sortie = args.sortie or DOSSIER_BENCHMARK / f"resultats_{datetime.now():%Y%m%d_%H%M%S}.json"
+    sortie.write_text(json.dumps(resultats, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"💾 Résultats : {sortie}")
+
+    reference = None
+    if args.reference.exists():
+        reference = json.loads(args.reference.read_text(encoding="utf-8"))
+    _afficher(resultats, reference)
+
+    if args.enregistrer_reference:
+        args.reference.write_text(json.dumps(resultats, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"📌 Référence enregistrée : {args.reference}")
+        return 0
+    if reference is None:
+        print(f"⚠️ Aucune référence ({args.reference}) : relancer avec --enregistrer-reference.")
+        return 0
+
+    regressions = comparer(resultats, reference, args.seuil, args.plancher_ms)
+    for r in regressions:
+        ecart = f"+{r['ecart'] * 100:.0f} %" if r["ecart"] is not None else "réf. nulle"
+        print(
+            f"❌ RÉGRESSION [{r['echelle']}] {r['metrique']} : "
+            f"{r['reference_ms']:.1f} -> {r['courant_ms']:.1f} ms ({ecart})"
+        )
+    if regressions:
+        return 1
+    print(f"✅ Aucune régression au-delà de {args.seuil * 100:.0f} % / {args.plancher_ms} ms.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: Benchmark hors ligne de penser
+Cible : agentique/Semi/benchmark_penser.py (+ corpus_synthetique, serveur_llama_factice)
+Objectif : Valider le serveur llama factice (SSE déterministe), le corpus reproductible,
+l'extraction des timings par étape depuis une trace et la détection des régressions.
+"""
+
+import unittest
+import json
+import shutil
+import tempfile
+import urllib.request
+from pathlib import Path
+
+from agentique.Semi.benchmark_penser import comparer, mesures_trace, percentile, resumer
+from agentique.Semi.corpus_synthetique import generer_corpus, lire_souvenirs
+from agentique.sous_agents_gouvernes.agent_Parole.moteurs.serveur_llama_factice import (
+    ServeurLlamaFactice,
+)
+
+
+def _post(url, payload):
+    requete = urllib.request.Request(
+        f"{url}/completion",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    return urllib.request.urlopen(requete, timeout=5)
+
+
+class TestServeurLlamaFactice(unittest.TestCase):
+    def test_stream_deterministe_et_health(self):
+        with ServeurLlamaFactice(ttft_ms=0, tokens_par_s=0, nb_tokens=8) as serveur:
+            with urllib.request.urlopen(f"{serveur.url}/health", timeout=5) as r:
+                self.assertEqual(json.loads(r.read())["status"], "ok")
+
+            def tokens():
+                with _post(serveur.url, {"prompt": "Bonjour", "stream": True}) as r:
+                    lignes = [l.decode("utf-8").strip() for l in r if l.strip()]
+                self.assertEqual(lignes[-1], "data: [DONE]")
+                return [json.loads(l[6:])["content"] for l in lignes[:-1]]
+
+            premier = tokens()
+            self.assertEqual(len([t for t in premier if t]), 8)
+            self.assertEqual(premier, tokens())
+
+            with _post(serveur.url, {"prompt": "Bonjour", "stream": False, "n_predict": 3}) as r:
+                contenu = json.loads(r.read())["content"]
+            self.assertEqual(contenu, "".join(premier[:3]))
+            self.assertEqual(serveur.nb_requetes, 3)
+
+
+class TestCorpusSynthetique(unittest.TestCase):
+    def setUp(self):
+        self.dossier = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def test_corpus_reproductible(self):
+        a = generer_corpus(self.dossier / "a", "petit", graine=3)
+        b = generer_corpus(self.dossier / "b", "petit", graine=3)
+        memoire_a, memoire_b = Path(a["memoire"]), Path(b["memoire"])
+
+        souvenirs = list(lire_souvenirs(memoire_a))
+        self.assertEqual(len(souvenirs), a["volumes"]["souvenirs"])
+        self.assertEqual(
+            [s for _, s in souvenirs][:5], [s for _, s in list(lire_souvenirs(memoire_b))[:5]]
+        )
+        self.assertEqual(len(list((memoire_a / "reflexive" / "regles").glob("R_*.json"))), a["volumes"]["regles"])
+        self.assertEqual(
+            (memoire_a / "code" / "code_chunks.jsonl").read_bytes(),
+            (memoire_b / "code" / "code_chunks.jsonl").read_bytes(),
+        )
+        # Manifeste identique : réutilisation sans régénération
+        self.assertEqual(generer_corpus(self.dossier / "a", "petit", graine=3)["genere_le"], a["genere_le"])
+
+
+class TestMesuresEtRegressions(unittest.TestCase):
+    def _trace(self, intention_ms, total_ms):
+        return [
+            {"t": "x", "s": "r", "p": None, "n": "AgentSemi.penser", "d": 0.0, "ms": total_ms, "th": "Main",
+             "m": [["Avant Intention", 10.0], ["Après Intention", 10.0 + intention_ms], ["⚡ TTFT: 0.30s", 300.0]]},
+            {"t": "x", "s": "a", "p": "r", "n": "IntentionDetector.intention_detector", "d": 0.01,
+             "ms": intention_ms, "th": "Main"},
+            {"t": "x", "s": "b", "p": "r", "n": "AgentJuge.evaluer", "d": 0.5, "ms": 999.0, "th": "Thread-9"},
+        ]
+
+    def test_mesures_trace(self):
+        mesures = mesures_trace(self._trace(40.0, 500.0))
+        self.assertEqual(mesures["etape:Après Intention"], 40.0)
+        self.assertEqual(mesures["etape:⚡ TTFT"], 250.0)
+        self.assertEqual(mesures["etape:fin"], 200.0)
+        self.assertEqual(mesures["ttft"], 300.0)
+        self.assertEqual(mesures["span:IntentionDetector.intention_detector"], 40.0)
+        self.assertNotIn("span:AgentJuge.evaluer", mesures)  # Post-traitement (autre thread)
+
+    def test_comparaison_seuil_et_plancher(self):
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2.5)
+        reference = {"echelles": {"petit": {"mesures": resumer([mesures_trace(self._trace(40.0, 500.0))])}}}
+        stable = {"echelles": {"petit": {"mesures": resumer([mesures_trace(self._trace(43.0, 503.0))])}}}
+        lent = {"echelles": {"petit": {"mesures": resumer([mesures_trace(self._trace(90.0, 550.0))])}}}
+
+        self.assertEqual(comparer(stable, reference, seuil=0.2, plancher_ms=5.0), [])
+        regressions = {r["metrique"] for r in comparer(lent, reference, seuil=0.2, plancher_ms=5.0)}
+        self.assertIn("etape:Après Intention", regressions)
+        self.assertIn("span:IntentionDetector.intention_detector", regressions)
+        self.assertNotIn("total", regressions)  # +10 % < seuil
+
+
+if __name__ == "__main__":
+    unittest.main()
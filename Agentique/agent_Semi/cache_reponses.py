@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CacheReponses - Cache sémantique des réponses du LLM principal (opt-in)
+
+Beaucoup de prompts quotidiens sont des quasi-doublons ("où en est le projet ?",
+"rappelle-moi…", la même question de code reposée) : chacun paie une génération
+complète du LLM principal. Ce cache intercepte le tour JUSTE AVANT la génération :
+
+1.  **Embedding** : le prompt est encodé (encodeur injecté, ex: SentenceTransformer du
+    MoteurVectoriel) puis comparé (cosinus) aux prompts déjà servis.
+2.  **Empreinte de contexte** : une réponse n'est réutilisable que si le contexte qui l'a
+    produite est identique : règles actives + éléments récupérés (titre + hash du contenu)
+    + hash du résumé système + historique récent injecté. Une règle ajoutée, un souvenir
+    modifié ou un autre fil de conversation ("continue", "et ensuite ?") = pas de hit.
+3.  **Décision** : `hit` (réponse rejouée en streaming, LLM non sollicité) ou `candidat`
+    (mode observation : le tour est marqué dans la trace, la génération a lieu).
+4.  **Exclusions** : protocole `!!!`, modes forcés (web, contexte manuel), prompts
+    spéciaux (cartographie, inspection, review) et tours ayant utilisé des outils.
+
+Configuration (section `cache_reponses` de config_semi.yaml) :
+    actif, mode ("servir" | "candidat"), seuil_similarite, seuils_categories,
+    categories (vide = toutes), ttl_s, taille_max.
+    Les clés de `seuils_categories` et `categories` sont des valeurs de `Categorie`
+    (Planifier, Agent, Backend...) : une valeur inconnue (ex: une Action) est refusée.
+
+Les entrées sont persistées en JSONL (prompt, réponse, empreinte, catégorie, horodatage) ;
+les vecteurs sont recalculés au premier accès (encodage par lot).
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from agentique.base.contrats_interface import Categorie
+
+MODES = ("servir", "candidat")
+
+
+@dataclass
+class EntreeReponse:
+    """Réponse mémorisée et le contexte qui l'a produite."""
+
+    prompt: str
+    reponse: str
+    empreinte: str
+    categorie: str
+    horodatage: float
+
+
+@dataclass
+class DecisionCache:
+    """
+    Résultat d'une consultation.
+
+    statut : "hit" (réponse à servir), "candidat" (mode observation), "miss", "inactif".
+    """
+
+    statut: str
+    reponse: Optional[str] = None
+    similarite: float = 0.0
+    prompt_source: Optional[str] = None
+
+
+def _hash(texte: Any) -> str:
+    return hashlib.blake2b(str(texte or "").encode("utf-8"), digest_size=8).hexdigest()
+
+
+def empreinte_contexte(
+    regles: Iterable[Any],
+    elements: Iterable[Any],
+    resume_systeme: str = "",
+    historique: Iterable[Any] = (),
+) -> str:
+    """
+    Empreinte stable du contexte injecté dans le prompt.
+
+    Args:
+        regles: Atomes Regle (ou Souvenir) actifs.
+        elements: Éléments récupérés (souvenirs, READMEs, chunks de code).
+        resume_systeme: Résumé système courant.
+        historique: Tours récents injectés dans le prompt (ordre significatif).
+    """
+
+    def signature(atome: Any) -> str:
+        titre = getattr(atome, "titre", None) or getattr(atome, "chemin", None) or ""
+        return f"{titre}:{_hash(getattr(atome, 'contenu', atome))}"
+
+    parties = [
+        "R|" + "|".join(sorted(signature(r) for r in regles)),
+        "E|" + "|".join(sorted(signature(e) for e in elements)),
+        "S|" + _hash(resume_systeme),
+        "H|" + "|".join(_hash(tour) for tour in historique or ()),
+    ]
+    return _hash("\n".join(parties))
+
+
+class CacheReponses:
+    """
+    Index (prompt -> réponse) interrogé par similarité cosinus, filtré par empreinte.
+
+    Attributes:
+        actif (bool): Opt-in global (désactivé par défaut).
+        mode (str): "servir" (rejoue la réponse) ou "candidat" (marque seulement).
+        seuil_similarite (float): Cosinus minimal pour considérer deux prompts équivalents.
+        seuils_categories (Dict[str, float]): Seuils spécifiques par catégorie d'intention.
+        categories (List[str]): Catégories éligibles (vide = toutes).
+        ttl_s (float): Âge maximal d'une réponse servie (0 = illimité).
+        taille_max (int): Nombre d'entrées conservées (les plus anciennes sont évincées).
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]],
+        encodeur: Callable[[List[str]], Any],
+        chemin: Optional[Path] = None,
+    ):
+        config = config or {}
+        self.actif = bool(config.get("actif", False))
+        self.mode = config.get("mode", "servir")
+        if self.mode not in MODES:
+            raise ValueError(f"❌ cache_reponses.mode invalide : {self.mode} (attendu : {MODES})")
+        self.seuil_similarite = float(config.get("seuil_similarite", 0.95))
+        self.seuils_categories = {
+            str(k): float(v) for k, v in (config.get("seuils_categories") or {}).items()
+        }
+        self.categories = [str(c) for c in (config.get("categories") or [])]
+        inconnues = (set(self.seuils_categories) | set(self.categories)) - {c.value for c in Categorie}
+        if inconnues:
+            raise ValueError(
+                f"❌ cache_reponses : catégories inconnues {sorted(inconnues)} "
+                f"(attendu : valeurs de Categorie, ex: {Categorie.AGENT.value})"
+            )
+        self.ttl_s = float(config.get("ttl_s", 0) or 0)
+        self.taille_max = max(1, int(config.get("taille_max", 500)))
+
+        self.encodeur = encodeur
+        self.chemin = Path(chemin) if chemin else None
+
+        self._verrou = threading.Lock()
+        self._entrees: List[EntreeReponse] = []
+        self._vecteurs: Optional[np.ndarray] = None
+        self._verrou_chargement = threading.Lock()
+        self._charge = False
+        self._stats: Dict[str, Any] = {
+            "consultations": 0,
+            "hits": 0,
+            "candidats": 0,
+            "miss": 0,
+            "memorisees": 0,
+            "exclusions": {},
+        }
+
+    empreinte = staticmethod(empreinte_contexte)
+
+    # ------------------------------------------------------------------
+    # Éligibilité
+    # ------------------------------------------------------------------
+
+    def exclusion(
+        self,
+        prompt: str,
+        categorie: str,
+        protocole_actif: bool = False,
+        search_mode: str = "auto",
+        prompt_standard: bool = True,
+    ) -> Optional[str]:
+        """Raison d'exclusion du tour (None = éligible). Les exclusions sont comptées."""
+        if not self.actif:
+            return "inactif"
+        raison = None
+        if protocole_actif or "!!!" in (prompt or ""):
+            raison = "protocole"
+        elif search_mode not in ("auto", None, ""):
+            raison = f"mode_{search_mode}"
+        elif not prompt_standard:
+            raison = "prompt_special"
+        elif self.categories and categorie not in self.categories:
+            raison = "categorie"
+        if raison:
+            self.exclure(raison)
+        return raison
+
+    def exclure(self, raison: str):
+        """Comptabilise un tour non éligible (ex: "outil" après détection d'un appel d'outil)."""
+        with self._verrou:
+            self._stats["exclusions"][raison] = self._stats["exclusions"].get(raison, 0) + 1
+
+    # ------------------------------------------------------------------
+    # Consultation / Mémorisation
+    # ------------------------------------------------------------------
+
+    def consulter(self, prompt: str, categorie: str, empreinte: str) -> DecisionCache:
+        """Cherche un prompt quasi identique, de même catégorie et de même empreinte."""
+        if not self.actif:
+            return DecisionCache("inactif")
+        self._charger()
+        vecteur = self._encoder([prompt])[0]
+        seuil = self.seuils_categories.get(categorie, self.seuil_similarite)
+        maintenant = time.time()
+
+        with self._verrou:
+            self._stats["consultations"] += 1
+            meilleur, meilleure_sim = None, -1.0
+            if self._entrees:
+                similarites = self._vecteurs @ vecteur
+                for i in np.argsort(-similarites):
+                    sim = float(similarites[i])
+                    if sim < seuil:
+                        break
+                    entree = self._entrees[i]
+                    if entree.empreinte != empreinte or entree.categorie != categorie:
+                        continue
+                    if self.ttl_s and maintenant - entree.horodatage > self.ttl_s:
+                        continue
+                    meilleur, meilleure_sim = entree, sim
+                    break
+
+            if meilleur is None:
+                self._stats["miss"] += 1
+                return DecisionCache("miss")
+
+            statut = "hit" if self.mode == "servir" else "candidat"
+            self._stats["hits" if statut == "hit" else "candidats"] += 1
+            return DecisionCache(
+                statut,
+                reponse=meilleur.reponse,
+                similarite=round(meilleure_sim, 4),
+                prompt_source=meilleur.prompt,
+            )
+
+    def memoriser(self, prompt: str, categorie: str, empreinte: str, reponse: str):
+        """Enregistre la réponse d'un tour éligible (remplace un prompt identique)."""
+        if not self.actif or not reponse or not reponse.strip():
+            return
+        self._charger()
+        entree = EntreeReponse(prompt, reponse, empreinte, categorie, time.time())
+        vecteur = self._encoder([prompt])[0]
+
+        with self._verrou:
+            doublons = [
+                i for i, e in enumerate(self._entrees)
+                if e.prompt == prompt and e.empreinte == empreinte
+            ]
+            self._retirer(doublons)
+            self._entrees.append(entree)
+            self._vecteurs = (
+                vecteur[None, :] if self._vecteurs is None or not len(self._vecteurs)
+                else np.vstack([self._vecteurs, vecteur])
+            )
+            evince = len(self._entrees) > self.taille_max
+            if evince:
+                self._retirer(range(len(self._entrees) - self.taille_max))
+            self._stats["memorisees"] += 1
+            compacter = bool(doublons) or evince
+
+        self._persister(entree, compacter)
+
+    @staticmethod
+    def morceaux(reponse: str) -> Iterator[str]:
+        """Découpe une réponse mémorisée en tokens "mot + espaces" pour le streaming."""
+        for morceau in re.findall(r"\s*\S+\s*", reponse or ""):
+            yield morceau
+
+    def statistiques(self) -> Dict[str, Any]:
+        with self._verrou:
+            stats = json.loads(json.dumps(self._stats))
+            stats["entrees"] = len(self._entrees)
+        consultations = stats["consultations"]
+        stats["taux_hit"] = round(stats["hits"] / consultations, 4) if consultations else 0.0
+        stats["taux_candidat"] = (
+            round(stats["candidats"] / consultations, 4) if consultations else 0.0
+        )
+        return stats
+
+    # ------------------------------------------------------------------
+    # Interne
+    # ------------------------------------------------------------------
+
+    def _encoder(self, textes: Sequence[str]) -> np.ndarray:
+        vecteurs = np.asarray(self.encodeur(list(textes)), dtype=np.float32)
+        if vecteurs.ndim == 1:
+            vecteurs = vecteurs[None, :]
+        normes = np.linalg.norm(vecteurs, axis=1, keepdims=True)
+        return vecteurs / np.maximum(normes, 1e-12)
+
+    def _retirer(self, indices: Iterable[int]):
+        """(Sous verrou) Retire des entrées et leurs vecteurs."""
+        indices = set(indices)
+        if not indices:
+            return
+        garder = [i for i in range(len(self._entrees)) if i not in indices]
+        self._entrees = [self._entrees[i] for i in garder]
+        self._vecteurs = self._vecteurs[garder] if self._vecteurs is not None else None
+
+    def _charger(self):
+        """
+        Relit le JSONL (une seule fois), écarte les entrées expirées, encode par lot.
+
+        Les appels concurrents attendent la fin du chargement : `_charge` n'est levé
+        qu'une fois entrées et vecteurs installés.
+        """
+        if self._charge:
+            return
+        with self._verrou_chargement:
+            if self._charge:
+                return
+            if not self.chemin or not self.chemin.exists():
+                with self._verrou:
+                    self._charge = True
+                return
+
+            entrees: List[EntreeReponse] = []
+            maintenant = time.time()
+            with open(self.chemin, "r", encoding="utf-8") as f:
+                for ligne in f:
+                    try:
+                        entree = EntreeReponse(**json.loads(ligne))
+                    except (TypeError, ValueError):
+                        continue
+                    if self.ttl_s and maintenant - entree.horodatage > self.ttl_s:
+                        continue
+                    entrees.append(entree)
+
+            # Dernière occurrence gagnante, puis bornage
+            uniques: Dict[tuple, EntreeReponse] = {}
+            for entree in entrees:
+                uniques.pop((entree.prompt, entree.empreinte), None)
+                uniques[(entree.prompt, entree.empreinte)] = entree
+            entrees = list(uniques.values())[-self.taille_max:]
+            vecteurs = self._encoder([e.prompt for e in entrees]) if entrees else None
+
+            with self._verrou:
+                self._entrees = entrees + self._entrees
+                if vecteurs is not None:
+                    self._vecteurs = (
+                        vecteurs if self._vecteurs is None else np.vstack([vecteurs, self._vecteurs])
+                    )
+                self._charge = True
+            self._persister(None, compacter=True)
+
+    def _persister(self, entree: Optional[EntreeReponse], compacter: bool = False):
+        """Ajout en fin de JSONL ; réécriture complète après éviction/remplacement."""
+        if not self.chemin:
+            return
+        try:
+            self.chemin.parent.mkdir(parents=True, exist_ok=True)
+            if compacter:
+                with self._verrou:
+                    lignes = [json.dumps(asdict(e), ensure_ascii=False) for e in self._entrees]
+                temporaire = self.chemin.with_suffix(".tmp")
+                temporaire.write_text("".join(l + "\n" for l in lignes), encoding="utf-8")
+                temporaire.replace(self.chemin)
+            elif entree is not None:
+                with open(self.chemin, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(asdict(entree), ensure_ascii=False) + "\n")
+        except OSError:
+            pass  # Le cache reste fonctionnel en mémoire
+
+
+__all__ = ["CacheReponses", "DecisionCache", "EntreeReponse", "empreinte_contexte"]
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: Cache sémantique des réponses
+Cible : agentique/Semi/cache_reponses.py
+Objectif : Valider les hits sur quasi-doublons, le filtrage par empreinte de contexte,
+le mode candidat, les exclusions, le TTL et la persistance JSONL.
+"""
+
+import unittest
+import re
+import shutil
+import tempfile
+import threading
+import zlib
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+from agentique.Semi.cache_reponses import CacheReponses, empreinte_contexte
+
+
+def encodeur_sac_de_mots(textes):
+    """Encodeur déterministe : sac de mots haché (cosinus élevé si mêmes mots)."""
+    vecteurs = np.zeros((len(textes), 64), dtype=np.float32)
+    for i, texte in enumerate(textes):
+        for mot in re.findall(r"\w+", texte.lower()):
+            vecteurs[i, zlib.crc32(mot.encode("utf-8")) % 64] += 1.0
+    return vecteurs
+
+
+class TestCacheReponses(unittest.TestCase):
+    def setUp(self):
+        self.dossier = Path(tempfile.mkdtemp())
+        self.config = {"actif": True, "mode": "servir", "seuil_similarite": 0.9}
+        self.empreinte = empreinte_contexte(
+            [SimpleNamespace(titre="R_001", contenu="Toujours citer la source")],
+            [SimpleNamespace(titre="M1", contenu="Souvenir")],
+            "Résumé système v1",
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def _cache(self, **config):
+        return CacheReponses(
+            dict(self.config, **config), encodeur_sac_de_mots, self.dossier / "cache.jsonl"
+        )
+
+    def test_hit_quasi_doublon_meme_empreinte(self):
+        cache = self._cache()
+        cache.memoriser("Où en est le projet SecondMind ?", "Planifier", self.empreinte, "Étape 3 sur 5.")
+
+        decision = cache.consulter("où en est le projet secondmind", "Planifier", self.empreinte)
+        self.assertEqual(decision.statut, "hit")
+        self.assertEqual(decision.reponse, "Étape 3 sur 5.")
+        self.assertEqual("".join(cache.morceaux(decision.reponse)), "Étape 3 sur 5.")
+
+        # Contexte différent (résumé système modifié) ou autre catégorie : pas de hit
+        autre = empreinte_contexte([], [], "Résumé système v2")
+        self.assertEqual(cache.consulter("Où en est le projet SecondMind ?", "Planifier", autre).statut, "miss")
+        self.assertEqual(cache.consulter("Où en est le projet SecondMind ?", "Agent", self.empreinte).statut, "miss")
+        self.assertEqual(cache.consulter("Recette de la tarte aux pommes", "Planifier", self.empreinte).statut, "miss")
+
+        stats = cache.statistiques()
+        self.assertEqual((stats["consultations"], stats["hits"]), (4, 1))
+        self.assertEqual(stats["taux_hit"], 0.25)
+
+    def test_mode_candidat_et_exclusions(self):
+        cache = self._cache(mode="candidat", categories=["Planifier"])
+        cache.memoriser("Statut du projet", "Planifier", self.empreinte, "OK")
+        self.assertEqual(cache.consulter("statut du projet", "Planifier", self.empreinte).statut, "candidat")
+
+        self.assertEqual(cache.exclusion("!!! Tout est cassé", "Planifier"), "protocole")
+        self.assertEqual(cache.exclusion("Statut", "Planifier", search_mode="web"), "mode_web")
+        self.assertEqual(cache.exclusion("Statut", "Planifier", prompt_standard=False), "prompt_special")
+        self.assertEqual(cache.exclusion("Statut", "Agent"), "categorie")
+        self.assertIsNone(cache.exclusion("Statut", "Planifier"))
+        cache.exclure("outil")
+        self.assertEqual(cache.statistiques()["exclusions"]["outil"], 1)
+
+        self.assertEqual(self._cache(actif=False).exclusion("Statut", "Planifier"), "inactif")
+
+    def test_seuils_par_categorie(self):
+        cache = self._cache(seuil_similarite=0.8, seuils_categories={"Agent": 0.99})
+        for categorie in ("Agent", "Planifier"):
+            cache.memoriser("corrige le bug du parseur yaml", categorie, self.empreinte, categorie)
+
+        # Quasi-doublon (cosinus ~0.83) : servi en Planifier, trop loin pour le seuil strict de Agent
+        prompt = "corrige le bug du parseur json"
+        self.assertEqual(cache.consulter(prompt, "Planifier", self.empreinte).reponse, "Planifier")
+        self.assertEqual(cache.consulter(prompt, "Agent", self.empreinte).statut, "miss")
+
+        # Les clés sont des valeurs de Categorie : une Action ("Coder") est refusée
+        with self.assertRaises(ValueError):
+            self._cache(seuils_categories={"Coder": 0.98})
+        with self.assertRaises(ValueError):
+            self._cache(categories=["Coder"])
+
+    def test_historique_dans_l_empreinte(self):
+        regles, elements = [SimpleNamespace(titre="R_001", contenu="Toujours citer la source")], []
+        fil_a = empreinte_contexte(regles, elements, "Résumé", ["Explique FAISS", "FAISS indexe..."])
+        fil_b = empreinte_contexte(regles, elements, "Résumé", ["Explique Whoosh", "Whoosh indexe..."])
+        self.assertNotEqual(fil_a, fil_b)
+        self.assertNotEqual(fil_a, empreinte_contexte(regles, elements, "Résumé", list(reversed(
+            ["Explique FAISS", "FAISS indexe..."]
+        ))))
+        self.assertEqual(
+            empreinte_contexte(regles, elements, "Résumé"), empreinte_contexte(regles, elements, "Résumé", [])
+        )
+
+        # "continue" dépend du fil : la réponse d'un autre fil n'est jamais rejouée
+        cache = self._cache()
+        cache.memoriser("continue", "Planifier", fil_a, "Suite sur FAISS")
+        self.assertEqual(cache.consulter("continue", "Planifier", fil_b).statut, "miss")
+        self.assertEqual(cache.consulter("continue", "Planifier", fil_a).reponse, "Suite sur FAISS")
+
+    def test_ttl_et_persistance(self):
+        cache = self._cache(ttl_s=60)
+        cache.memoriser("Statut du projet", "Planifier", self.empreinte, "V1")
+        cache.memoriser("Statut du projet", "Planifier", self.empreinte, "V2")  # Remplace
+
+        recharge = self._cache(ttl_s=60)
+        decision = recharge.consulter("Statut du projet", "Planifier", self.empreinte)
+        self.assertEqual(decision.reponse, "V2")
+        self.assertEqual(recharge.statistiques()["entrees"], 1)
+
+        recharge._entrees[0].horodatage -= 120  # Expirée
+        self.assertEqual(recharge.consulter("Statut du projet", "Planifier", self.empreinte).statut, "miss")
+
+    def test_taille_max(self):
+        cache = self._cache(taille_max=2)
+        for i, prompt in enumerate(("alpha beta", "gamma delta", "epsilon zeta")):
+            cache.memoriser(prompt, "Planifier", self.empreinte, f"R{i}")
+        self.assertEqual(cache.consulter("alpha beta", "Planifier", self.empreinte).statut, "miss")
+        self.assertEqual(cache.consulter("epsilon zeta", "Planifier", self.empreinte).reponse, "R2")
+        recharge = self._cache(taille_max=2)
+        recharge.consulter("alpha beta", "Planifier", self.empreinte)
+        self.assertEqual(recharge.statistiques()["entrees"], 2)
+
+    def test_consultation_pendant_le_chargement(self):
+        """Un appel concurrent attend la fin du rechargement au lieu de voir un cache vide."""
+        self._cache().memoriser("Statut du projet", "Planifier", self.empreinte, "V1")
+        en_cours, liberer = threading.Event(), threading.Event()
+
+        def encodeur_lent(textes):
+            if not en_cours.is_set():  # Premier appel : encodage par lot du rechargement
+                en_cours.set()
+                liberer.wait(5)
+            return encodeur_sac_de_mots(textes)
+
+        recharge = CacheReponses(self.config, encodeur_lent, self.dossier / "cache.jsonl")
+        chargement = threading.Thread(
+            target=recharge.consulter, args=("Statut du projet", "Planifier", self.empreinte)
+        )
+        chargement.start()
+        en_cours.wait(5)
+        decisions = []
+        concurrent = threading.Thread(
+            target=lambda: decisions.append(
+                recharge.consulter("Statut du projet", "Planifier", self.empreinte)
+            )
+        )
+        concurrent.start()
+        concurrent.join(0.1)
+        liberer.set()
+        chargement.join(5)
+        concurrent.join(5)
+
+        self.assertEqual(decisions[0].statut, "hit")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CorpusSynthetique - Mémoire, règles et code générés pour les benchmarks hors ligne
+
+Produit, sous `<dossier>/memoire/`, une arborescence au format réel du projet :
+1.  **persistante/** : Souvenirs (Interaction sérialisée : prompt, réponse, intention, meta).
+2.  **reflexive/regles/** : Règles `R_NNN_<type>_<nom>.json` (id, type, regle).
+3.  **code/** : `code_chunks.jsonl` (ContexteCode) + `code_architecture.json` (clé "files").
+
+Le contenu est déterministe (graine) et dimensionné par échelle (`ECHELLES`) : un même
+couple (échelle, graine) redonne le même corpus, donc des mesures comparables d'une
+exécution à l'autre. Le manifeste `corpus.json` permet de réutiliser un corpus déjà généré.
+
+Les index (FAISS, Whoosh) ne sont PAS construits ici : ils dépendent des moteurs du
+pipeline (voir `benchmark_penser.indexer_corpus`).
+"""
+
+import json
+import random
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple, Union
+
+# Volumes par échelle (souvenirs persistants, règles, chunks de code)
+ECHELLES: Dict[str, Dict[str, int]] = {
+    "petit": {"souvenirs": 200, "regles": 20, "chunks": 500},
+    "moyen": {"souvenirs": 2000, "regles": 100, "chunks": 5000},
+    "grand": {"souvenirs": 20000, "regles": 500, "chunks": 50000},
+}
+
+NOM_MANIFESTE = "corpus.json"
+
+SUJETS = ("SecondMind", "Setup", "Script", "Fichier", "Général")
+ACTIONS = ("Faire", "Penser", "Parler", "Coder", "Debug")
+CATEGORIES = ("Planifier", "Tester", "Configurer", "Documenter", "Analyser", "Agent", "Système", "Backend")
+TYPES_REGLES = ("sys", "code", "chemins", "shield", "style")
+
+THEMES = {
+    "SecondMind": ["orchestrateur", "agent", "mémoire vive", "intention", "juge", "réflexion", "contexte"],
+    "Setup": ["GPU", "llama-server", "CUDA", "port 8080", "quantisation", "VRAM", "installation"],
+    "Script": ["fonction", "classe", "décorateur", "générateur", "thread", "dataclass", "exception"],
+    "Fichier": ["README", "markdown", "PDF", "configuration YAML", "journal", "archive", "export"],
+    "Général": ["planning", "lecture", "recette", "voyage", "musique", "sport", "budget"],
+}
+LIAISONS = [
+    "il faut vérifier", "on a corrigé", "je propose de refactorer", "le problème vient de",
+    "on mesure la latence de", "la prochaine étape concerne", "le test échoue sur", "on documente",
+]
+MODULES = [
+    "agent_Semi", "agent_Contexte", "agent_Recherche", "agent_Memoire", "agent_Juge",
+    "agent_Parole", "agent_Code", "moteur_vecteur", "traceur", "auditor_base",
+]
+
+
+def _phrase(alea: random.Random, sujet: str, n_mots: int = 12) -> str:
+    mots = [alea.choice(LIAISONS)]
+    while len(mots) < n_mots:
+        mots.append(alea.choice(THEMES[sujet]))
+        mots.append(alea.choice(MODULES))
+    return " ".join(mots) + "."
+
+
+def _souvenir(alea: random.Random, i: int, horodatage: datetime) -> Dict[str, Any]:
+    sujet, action, categorie = alea.choice(SUJETS), alea.choice(ACTIONS), alea.choice(CATEGORIES)
+    prompt = _phrase(alea, sujet, alea.randint(6, 20))
+    reponse = " ".join(_phrase(alea, sujet, alea.randint(10, 30)) for _ in range(alea.randint(2, 8)))
+    return {
+        "prompt": prompt,
+        "reponse": reponse,
+        "system": "Benchmark (corpus synthétique)",
+        "intention": {"prompt": prompt, "sujet": sujet, "action": action, "categorie": categorie},
+        "contexte_memoire": [],
+        "meta": {
+            "id": f"synth-{i:07d}",
+            "timestamp": horodatage.isoformat(),
+            "session_id": f"synth-session-{i // 20:05d}",
+            "message_turn": i % 20,
+            "source_agent": "CorpusSynthetique",
+            "type_memoire": "persistante",
+            "fichiers_consultes": [],
+            "validation_juge": True,
+            "score_qualite": round(alea.uniform(0.5, 1.0), 2),
+            "nb_problemes": 0,
+            "details_juge": "",
+            "len_contenu": len(reponse),
+            "ref_vectoriel": None,
+            "ref_whoosh": None,
+            "data_libre": {"source": "corpus_synthetique"},
+        },
+    }
+
+
+def _chunk(alea: random.Random, i: int) -> Dict[str, Any]:
+    module = f"agentique.synth.{alea.choice(MODULES)}_{i // 50:04d}"
+    nom = f"{alea.choice(['traiter', 'charger', 'calculer', 'valider', 'indexer'])}_{i:06d}"
+    sujet = alea.choice(("SecondMind", "Script"))
+    return {
+        "id": f"{module}::FUNC::{nom}",
+        "type": "function",
+        "module": module,
+        "name": nom,
+        "signature": f"def {nom}(self, donnees: Dict[str, Any]) -> bool",
+        "docstring": _phrase(alea, sujet, 8),
+        "code_summary": _phrase(alea, sujet, 6),
+        "contenu": f"def {nom}(self, donnees):\n    return bool(donnees)\n",
+        "dependencies": [],
+        "key_concepts": alea.sample(THEMES[sujet], 3),
+        "variables_used": ["donnees"],
+        "bases": [],
+        "attributes": {},
+        "methods": [],
+    }
+
+
+def corpus_existant(dossier: Union[str, Path], echelle: str, graine: int = 0) -> bool:
+    """Vrai si `dossier` contient déjà le corpus (échelle, graine) complet."""
+    manifeste = Path(dossier) / NOM_MANIFESTE
+    try:
+        donnees = json.loads(manifeste.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return False
+    return donnees.get("echelle") == echelle and donnees.get("graine") == graine
+
+
+def generer_corpus(
+    dossier: Union[str, Path],
+    echelle: str = "petit",
+    graine: int = 0,
+    forcer: bool = False,
+) -> Dict[str, Any]:
+    """
+    Génère (ou réutilise) le corpus synthétique.
+
+    Args:
+        dossier: Racine du corpus ; la mémoire est écrite dans `<dossier>/memoire`.
+        echelle: Clé de `ECHELLES`.
+        graine: Graine du générateur (contenu reproductible).
+        forcer: Régénère même si le manifeste correspond.
+
+    Returns:
+        Dict: Manifeste (échelle, graine, volumes, chemin de la mémoire).
+    """
+    if echelle not in ECHELLES:
+        raise ValueError(f"Échelle inconnue : {echelle} (attendu : {', '.join(ECHELLES)})")
+    dossier = Path(dossier)
+    memoire = dossier / "memoire"
+
+    if not forcer and corpus_existant(dossier, echelle, graine):
+        return json.loads((dossier / NOM_MANIFESTE).read_text(encoding="utf-8"))
+
+    shutil.rmtree(memoire, ignore_errors=True)
+    volumes = ECHELLES[echelle]
+    alea = random.Random(graine)
+    origine = datetime(2026, 1, 1)
+
+    # 1. Souvenirs persistants (un fichier par souvenir, comme en production)
+    persistante = memoire / "persistante"
+    persistante.mkdir(parents=True)
+    for i in range(volumes["souvenirs"]):
+        souvenir = _souvenir(alea, i, origine + timedelta(minutes=7 * i))
+        intention = souvenir["intention"]
+        nom = f"{intention['sujet']}_{intention['action']}_{intention['categorie']}_{i:07d}.json"
+        (persistante / nom).write_text(json.dumps(souvenir, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    # 2. Règles de gouvernance
+    regles = memoire / "reflexive" / "regles"
+    regles.mkdir(parents=True)
+    for i in range(volumes["regles"]):
+        type_regle = alea.choice(TYPES_REGLES)
+        sujet = alea.choice(("SecondMind", "Script", "Setup"))
+        regle = {
+            "id": f"R{i:03d}_{type_regle}_Synth{i}",
+            "type": type_regle,
+            "regle": _phrase(alea, sujet, 10),
+        }
+        (regles / f"R_{i:03d}_{type_regle}_Synth{i}.json").write_text(
+            json.dumps(regle, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+
+    # 3. Code : chunks JSONL + architecture
+    code = memoire / "code"
+    code.mkdir(parents=True)
+    fichiers: Dict[str, Dict[str, Any]] = {}
+    with open(code / "code_chunks.jsonl", "w", encoding="utf-8") as f:
+        for i in range(volumes["chunks"]):
+            chunk = _chunk(alea, i)
+            f.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+            module = chunk["module"]
+            nom_fichier = module.rsplit(".", 1)[-1] + ".py"
+            entree = fichiers.setdefault(
+                nom_fichier, {"path": module.replace(".", "/") + ".py", "module": module, "classes": {}, "functions": {}}
+            )
+            entree["functions"][chunk["name"]] = {"signature": chunk["signature"]}
+    (code / "code_architecture.json").write_text(
+        json.dumps({"files": fichiers}, ensure_ascii=False), encoding="utf-8"
+    )
+
+    # 4. Dossiers attendus par les agents (vides)
+    for sous_dossier in ("historique", "brute", "connaissances", "vectorielle", "reflexive/feedback"):
+        (memoire / sous_dossier).mkdir(parents=True, exist_ok=True)
+
+    manifeste = {
+        "echelle": echelle,
+        "graine": graine,
+        "volumes": dict(volumes),
+        "memoire": str(memoire),
+        "genere_le": datetime.now().isoformat(),
+    }
+    (dossier / NOM_MANIFESTE).write_text(json.dumps(manifeste, ensure_ascii=False, indent=2), encoding="utf-8")
+    return manifeste
+
+
+def lire_souvenirs(memoire: Union[str, Path]) -> Iterator[Tuple[Path, Dict[str, Any]]]:
+    """(fichier, souvenir) des souvenirs persistants du corpus (pour l'indexation)."""
+    for fichier in sorted((Path(memoire) / "persistante").glob("*.json")):
+        try:
+            yield fichier, json.loads(fichier.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            continue
+
+
+__all__ = ["ECHELLES", "generer_corpus", "corpus_existant", "lire_souvenirs"]
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rejeu de charge - Trafic réel (journaux bruts) rejoué contre AgentSemi
+
+Les journaux `interactions_AAAA-MM-JJ.jsonl` (sauvegarder_interaction_brute / EcrivainWALBrute)
+contiennent le prompt, l'intention détectée et l'horodatage de chaque tour. Ce module :
+1.  **Charge** les interactions (fichiers ou dossier `memoire/brute`), triées par horodatage.
+2.  **Planifie** les arrivées avec les écarts réels, compressés (`acceleration`) et bornés
+    (`pause_max_s` : une nuit d'inactivité ne devient pas une attente de 8 h).
+3.  **Rejoue** en boucle ouverte : chaque requête part à son heure, servie par au plus
+    `concurrence` workers ; l'attente en file compte dans la latence (comme pour un utilisateur).
+4.  **Rapporte** débit, TTFT et latence de bout en bout p50/p95/p99, globalement et par
+    catégorie d'intention (axe configurable).
+
+Cibles :
+    - `penser` : AgentSemi en processus, sur corpus synthétique et llama-server factices
+      (voir `benchmark_penser.environnement_factice`) ; la mémoire réelle n'est pas modifiée.
+    - `http` : route `/command` d'un backend déjà lancé (ses propres moteurs et sa mémoire).
+
+Usage :
+    python rejeu_charge.py --concurrence 1 4 8 --acceleration 20 --limite 300
+    python rejeu_charge.py --cible http --url http://127.0.0.1:5000 --concurrence 2
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from agentique.Semi.benchmark_penser import DOSSIER_BENCHMARK, environnement_factice, percentile
+
+AXES_INTENTION = ("sujet", "action", "categorie")
+
+
+@dataclass
+class RequeteRejouee:
+    """Une interaction du journal, prête à être rejouée."""
+
+    horodatage: float       # Epoch (s) de l'interaction d'origine
+    prompt: str
+    categorie: str          # Valeur de l'axe d'intention retenu (ou "inconnue")
+    session_id: Optional[str] = None
+    decalage_s: float = 0.0  # Instant d'arrivée planifié (depuis le début du rejeu)
+
+
+@dataclass
+class ResultatRequete:
+    categorie: str
+    arrivee_s: float
+    attente_s: float                 # File d'attente (aucun worker libre)
+    ttft_s: Optional[float]          # Arrivée -> premier token
+    e2e_s: float                     # Arrivée -> dernier token
+    caracteres: int
+    erreur: Optional[str] = None
+
+
+# =============================================================================
+# 📥 CHARGEMENT & PLANIFICATION
+# =============================================================================
+
+
+def _horodatage(donnees: Dict[str, Any]) -> Optional[float]:
+    meta = donnees.get("meta") if isinstance(donnees.get("meta"), dict) else {}
+    for valeur in (meta.get("timestamp"), donnees.get("timestamp_log"), donnees.get("timestamp")):
+        if not valeur:
+            continue
+        try:
+            return datetime.fromisoformat(str(valeur)).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+def _vers_requete(donnees: Dict[str, Any], axe: str) -> Optional[RequeteRejouee]:
+    """Format Interaction (standard) ou ancien format (role / contenu : tours 'user' seulement)."""
+    horodatage = _horodatage(donnees)
+    if horodatage is None:
+        return None
+
+    if "prompt" in donnees:
+        prompt = donnees.get("prompt")
+        intention = donnees.get("intention") or {}
+        session_id = (donnees.get("meta") or {}).get("session_id")
+    elif donnees.get("role") == "user":
+        prompt, intention, session_id = donnees.get("contenu"), {}, donnees.get("session_id")
+    else:
+        return None
+    if not prompt or not isinstance(prompt, str):
+        return None
+
+    if axe == "complet":
+        valeurs = [str(intention.get(a) or "?") for a in AXES_INTENTION]
+        categorie = "/".join(valeurs) if intention else "inconnue"
+    else:
+        categorie = str(intention.get(axe) or "inconnue")
+    return RequeteRejouee(horodatage, prompt, categorie, session_id)
+
+
+def charger_journaux(
+    sources: Iterable[Union[str, Path]],
+    axe: str = "categorie",
+    limite: Optional[int] = None,
+) -> List[RequeteRejouee]:
+    """
+    Interactions des journaux bruts, triées par horodatage.
+
+    Args:
+        sources: Fichiers `interactions_*.jsonl` ou dossiers les contenant.
+        axe: 'sujet' | 'action' | 'categorie' | 'complet' (sujet/action/catégorie).
+        limite: Nombre maximal d'interactions (les plus anciennes d'abord).
+    """
+    fichiers: List[Path] = []
+    for source in sources:
+        source = Path(source)
+        fichiers.extend(sorted(source.glob("interactions_*.jsonl")) if source.is_dir() else [source])
+
+    requetes = []
+    for fichier in fichiers:
+        if not fichier.exists():
+            continue
+        with open(fichier, "r", encoding="utf-8") as f:
+            for ligne in f:
+                try:
+                    donnees = json.loads(ligne)
+                except json.JSONDecodeError:
+                    continue  # Ligne tronquée (crash) : ignorée comme à la réouverture du WAL
+                if isinstance(donnees, dict):
+                    requete = _vers_requete(donnees, axe)
+                    if requete is not None:
+                        requetes.append(requete)
+
+    requetes.sort(key=lambda r: r.horodatage)
+    return requetes[:limite] if limite else requetes
+
+
+def planifier(
+    requetes: List[RequeteRejouee],
+    acceleration: float = 1.0,
+    pause_max_s: Optional[float] = None,
+) -> List[RequeteRejouee]:
+    """Renseigne `decalage_s` : écarts réels bornés à `pause_max_s`, puis divisés par `acceleration`."""
+    decalage, precedent = 0.0, None
+    for requete in requetes:
+        if precedent is not None:
+            ecart = max(0.0, requete.horodatage - precedent)
+            if pause_max_s is not None:
+                ecart = min(ecart, pause_max_s)
+            decalage += ecart / max(acceleration, 1e-9)
+        requete.decalage_s = decalage
+        precedent = requete.horodatage
+    return requetes
+
+
+# =============================================================================
+# 🎯 CIBLES
+# =============================================================================
+
+
+def cible_penser(agent) -> Callable[[RequeteRejouee], Iterator[str]]:
+    """Tokens de `AgentSemi.penser` (stream), avec la session d'origine."""
+
+    def executer(requete: RequeteRejouee) -> Iterator[str]:
+        return agent.penser(requete.prompt, stream=True, session_id=requete.session_id)
+
+    return executer
+
+
+def cible_http(url: str, timeout: float = 300.0) -> Callable[[RequeteRejouee], Iterator[str]]:
+    """Flux texte de la route `/command` d'un backend lancé."""
+    import requests
+
+    def executer(requete: RequeteRejouee) -> Iterator[str]:
+        with requests.post(
+            f"{url.rstrip('/')}/command",
+            json={"prompt": requete.prompt, "search_mode": "auto"},
+            stream=True,
+            timeout=timeout,
+        ) as reponse:
+            reponse.raise_for_status()
+            for morceau in reponse.iter_content(chunk_size=None, decode_unicode=True):
+                if morceau:
+                    yield morceau
+
+    return executer
+
+
+# =============================================================================
+# ▶️ REJEU
+# =============================================================================
+
+
+def rejouer(
+    requetes: List[RequeteRejouee],
+    cible: Callable[[RequeteRejouee], Iterator[str]],
+    concurrence: int = 4,
+) -> Dict[str, Any]:
+    """
+    Boucle ouverte : chaque requête est soumise à son `decalage_s`, quel que soit l'état
+    des précédentes. Retourne {"duree_s", "resultats": [ResultatRequete...]}.
+    """
+    resultats: List[ResultatRequete] = []
+    verrou = threading.Lock()
+
+    def servir(requete: RequeteRejouee, arrivee: float):
+        debut = time.perf_counter()
+        ttft, caracteres, erreur = None, 0, None
+        try:
+            for token in cible(requete):
+                if not token:
+                    continue
+                if ttft is None:
+                    ttft = time.perf_counter() - arrivee
+                caracteres += len(token)
+        except Exception as e:
+            erreur = f"{type(e).__name__}: {e}"[:200]
+        fin = time.perf_counter()
+        with verrou:
+            resultats.append(ResultatRequete(
+                categorie=requete.categorie,
+                arrivee_s=round(arrivee - origine, 4),
+                attente_s=debut - arrivee,
+                ttft_s=ttft,
+                e2e_s=fin - arrivee,
+                caracteres=caracteres,
+                erreur=erreur,
+            ))
+
+    origine = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrence), thread_name_prefix="Rejeu") as pool:
+        for requete in requetes:
+            delai = origine + requete.decalage_s - time.perf_counter()
+            if delai > 0:
+                time.sleep(delai)
+            pool.submit(servir, requete, origine + requete.decalage_s)
+    return {"duree_s": time.perf_counter() - origine, "resultats": resultats}
+
+
+def _distribution(valeurs: List[float]) -> Dict[str, Optional[float]]:
+    if not valeurs:
+        return {"p50": None, "p95": None, "p99": None}
+    return {f"p{q}": round(percentile(valeurs, q) * 1000, 1) for q in (50, 95, 99)}
+
+
+def rapport(rejeu: Dict[str, Any]) -> Dict[str, Any]:
+    """Débit et distributions (ms) globales et par catégorie d'intention."""
+    duree = max(rejeu["duree_s"], 1e-9)
+
+    def resumer(resultats: List[ResultatRequete]) -> Dict[str, Any]:
+        reussis = [r for r in resultats if r.erreur is None]
+        return {
+            "requetes": len(resultats),
+            "erreurs": len(resultats) - len(reussis),
+            "debit_rps": round(len(reussis) / duree, 3),
+            "ttft_ms": _distribution([r.ttft_s for r in reussis if r.ttft_s is not None]),
+            "e2e_ms": _distribution([r.e2e_s for r in reussis]),
+            "attente_ms": _distribution([r.attente_s for r in reussis]),
+        }
+
+    par_categorie: Dict[str, List[ResultatRequete]] = {}
+    for r in rejeu["resultats"]:
+        par_categorie.setdefault(r.categorie, []).append(r)
+
+    return {
+        "duree_s": round(rejeu["duree_s"], 2),
+        "global": resumer(rejeu["resultats"]),
+        "categories": {c: resumer(rs) for c, rs in sorted(par_categorie.items())},
+    }
+
+
+# =============================================================================
+# 🖥️ CLI
+# =============================================================================
+
+
+def _afficher(concurrence: int, resultat: Dict[str, Any]):
+    g = resultat["global"]
+    print(
+        f"\n🚦 Concurrence {concurrence} : {g['requetes']} requêtes en {resultat['duree_s']}s "
+        f"| {g['debit_rps']} req/s | erreurs {g['erreurs']}"
+    )
+    print(f"  {'catégorie':<32} {'n':>5} {'TTFT p50/p95/p99 (ms)':>28} {'E2E p50/p95/p99 (ms)':>28}")
+    for nom, stats in [("(global)", g), *resultat["categories"].items()]:
+        ttft = "/".join(str(stats["ttft_ms"][k]) for k in ("p50", "p95", "p99"))
+        e2e = "/".join(str(stats["e2e_ms"][k]) for k in ("p50", "p95", "p99"))
+        print(f"  {nom[:32]:<32} {stats['requetes']:>5} {ttft:>28} {e2e:>28}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rejeu des journaux bruts contre AgentSemi")
+    parser.add_argument("--journaux", nargs="*", type=Path, help="Fichiers/dossiers (défaut : memoire/brute)")
+    parser.add_argument("--limite", type=int, default=None, help="Nombre maximal d'interactions")
+    parser.add_argument("--axe", default="categorie", choices=[*AXES_INTENTION, "complet"])
+    parser.add_argument("--concurrence", type=int, nargs="+", default=[1, 4], help="Niveaux (un rejeu chacun)")
+    parser.add_argument("--acceleration", type=float, default=10.0, help="Compression du temps réel")
+    parser.add_argument("--pause-max-s", type=float, default=30.0, help="Écart réel maximal avant compression")
+    parser.add_argument("--cible", choices=["penser", "http"], default="penser")
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="Backend (cible http)")
+    parser.add_argument("--echelle", default="petit", help="Corpus synthétique (cible penser)")
+    parser.add_argument("--corpus", type=Path, default=Path(tempfile.gettempdir()) / "secondmind_benchmark")
+    parser.add_argument("--ttft-ms", type=float, default=50.0)
+    parser.add_argument("--tokens-par-s", type=float, default=50.0)
+    parser.add_argument("--nb-tokens", type=int, default=64)
+    parser.add_argument("--sortie", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    # Journaux réels lus AVANT toute redirection de la mémoire vers le corpus synthétique
+    sources = args.journaux
+    if not sources:
+        from agentique.base.auditor_base import AuditorBase
+
+        sources = [Path(AuditorBase("memoire").get_path("brute"))]
+    requetes = charger_journaux(sources, args.axe, args.limite)
+    if not requetes:
+        print(f"⚠️ Aucune interaction trouvée dans : {', '.join(map(str, sources))}")
+        return 1
+    planifier(requetes, args.acceleration, args.pause_max_s)
+    print(
+        f"📼 {len(requetes)} interactions, {len({r.categorie for r in requetes})} catégories, "
+        f"durée planifiée {requetes[-1].decalage_s:.1f}s"
+    )
+
+    def campagne(cible) -> Dict[str, Any]:
+        resultats = {}
+        for niveau in args.concurrence:
+            resultats[str(niveau)] = rapport(rejouer(requetes, cible, niveau))
+            _afficher(niveau, resultats[str(niveau)])
+        return resultats
+
+    if args.cible == "http":
+        par_concurrence = campagne(cible_http(args.url))
+    else:
+        with environnement_factice(
+            args.echelle, args.corpus, ttft_ms=args.ttft_ms,
+            tokens_par_s=args.tokens_par_s, nb_tokens=args.nb_tokens,
+        ) as env:
+            par_concurrence = campagne(cible_penser(env.agent))
+
+    sortie = args.sortie or DOSSIER_BENCHMARK / f"rejeu_{datetime.now():%Y%m%d_%H%M%S}.json"
+    sortie.parent.mkdir(parents=True, exist_ok=True)
+    sortie.write_text(json.dumps({
+        "date": datetime.now().isoformat(),
+        "parametres": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items() if k != "journaux"},
+        "interactions": len(requetes),
+        "concurrence": par_concurrence,
+    }, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"💾 Rapport : {sortie}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: Rejeu de charge
+Cible : agentique/Semi/rejeu_charge.py
+Objectif : Valider la lecture des journaux bruts (deux formats), la planification des arrivées
+et les statistiques par catégorie d'intention en boucle ouverte.
+"""
+
+import unittest
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from agentique.Semi.rejeu_charge import charger_journaux, planifier, rapport, rejouer
+
+
+class TestRejeuCharge(unittest.TestCase):
+    def setUp(self):
+        self.dossier = Path(tempfile.mkdtemp())
+        lignes = [
+            {"prompt": "Corrige ce script", "intention": {"sujet": "Script", "action": "Debug", "categorie": "Agent"},
+             "meta": {"timestamp": "2026-01-02T10:00:00", "session_id": "s1"}},
+            {"prompt": "Bonjour", "intention": {"sujet": "Général", "action": "Parler", "categorie": "Saluer"},
+             "meta": {"timestamp": "2026-01-02T10:00:04", "session_id": "s1"}},
+            {"role": "assistant", "contenu": "ignoré", "timestamp": "2026-01-02T10:00:05"},
+            {"role": "user", "contenu": "Ancien format", "timestamp": "2026-01-02T18:00:00", "session_id": "s2"},
+        ]
+        with open(self.dossier / "interactions_2026-01-02.jsonl", "w", encoding="utf-8") as f:
+            for ligne in reversed(lignes):
+                f.write(json.dumps(ligne, ensure_ascii=False) + "\n")
+            f.write('{"prompt": "tronqu')  # Ligne coupée par un crash
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def test_chargement_et_planification(self):
+        requetes = charger_journaux([self.dossier], axe="categorie")
+        self.assertEqual([r.prompt for r in requetes], ["Corrige ce script", "Bonjour", "Ancien format"])
+        self.assertEqual([r.categorie for r in requetes], ["Agent", "Saluer", "inconnue"])
+
+        planifier(requetes, acceleration=2.0, pause_max_s=10.0)
+        # 4 s réels -> 2 s ; 8 h d'inactivité bornées à 10 s -> 5 s
+        self.assertEqual([r.decalage_s for r in requetes], [0.0, 2.0, 7.0])
+
+        complet = charger_journaux([self.dossier], axe="complet")
+        self.assertEqual(complet[0].categorie, "Script/Debug/Agent")
+
+    def test_rejeu_boucle_ouverte_par_categorie(self):
+        requetes = planifier(charger_journaux([self.dossier]), acceleration=1000.0, pause_max_s=10.0)
+
+        def cible(requete):
+            if requete.categorie == "inconnue":
+                raise RuntimeError("serveur indisponible")
+            time.sleep(0.05)
+            yield "ok"
+            yield " fini"
+
+        resultat = rapport(rejouer(requetes, cible, concurrence=1))
+        self.assertEqual(resultat["global"]["requetes"], 3)
+        self.assertEqual(resultat["global"]["erreurs"], 1)
+        self.assertEqual(set(resultat["categories"]), {"Agent", "Saluer", "inconnue"})
+        # Concurrence 1 : la deuxième requête arrive pendant la première et attend en file
+        self.assertGreater(resultat["categories"]["Saluer"]["attente_ms"]["p50"], 20)
+        self.assertGreaterEqual(resultat["categories"]["Agent"]["e2e_ms"]["p50"], 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
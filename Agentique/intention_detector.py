@@ -2,11 +2,14 @@
 # -*- coding: utf-8 -*-
 
 import json
+import threading
+import time
 import torch
-import yaml
 
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple, Any
 from sentence_transformers import SentenceTransformer
 from agentique.base.META_agent import AgentBase
 from agentique.base.contrats_interface import (
@@ -15,6 +18,13 @@ from agentique.base.contrats_interface import (
     Categorie,
     ResultatIntention,
 )
+from agentique.base.demarrage import charger_yaml
+from agentique.sous_agents_gouvernes.agent_Entraineur.registre_tetes import (
+    RegistreTetes,
+    VERSION_INITIALE,
+)
+
+AXES_INTENTION = ("sujet", "action", "categorie")
 
 
 # ============================================================
@@ -26,29 +36,104 @@ class ClassifierHead(torch.nn.Module):
     (SBERT -> Embedding -> MLP 256 -> nb_labels)
     """
 
-    def __init__(self, emb_dim: int, nb_labels: int):
+    def __init__(self, emb_dim: int, nb_labels: int, hidden_dim: int = 256):
         super().__init__()
+        self.emb_dim = emb_dim
+        self.nb_labels = nb_labels
         self.net = torch.nn.Sequential(
-            torch.nn.Linear(emb_dim, 256),
+            torch.nn.Linear(emb_dim, hidden_dim),
             torch.nn.ReLU(),
-            torch.nn.Linear(256, nb_labels),
+            torch.nn.Linear(hidden_dim, nb_labels),
+        )
+
+    @classmethod
+    def depuis_fichier(cls, pth: Path, device: str) -> "ClassifierHead":
+        """Dimensions déduites du state_dict (hidden_dim configurable côté entraîneur)."""
+        poids = torch.load(pth, map_location=device)
+        tete = cls(
+            poids["net.0.weight"].shape[1],
+            poids["net.2.weight"].shape[0],
+            poids["net.0.weight"].shape[0],
         )
+        tete.load_state_dict(poids)
+        return tete.to(device).eval()
 
     def forward(self, x):
         return self.net(x)
 
 
+class TeteFusionnee(torch.nn.Module):
+    """
+    Les 3 ClassifierHead (Sujet / Action / Catégorie) fusionnées en un seul passage :
+    - Couche 1 : poids concaténés -> UNE matmul (emb -> h_sujet + h_action + h_categorie)
+    - Couche 2 : poids bloc-diagonaux -> UNE matmul (h -> logits des 3 axes)
+    Résultat strictement identique aux 3 forwards séparés.
+    """
+
+    def __init__(self, w1: torch.Tensor, b1: torch.Tensor, w2: torch.Tensor, b2: torch.Tensor,
+                 tailles: Tuple[int, int, int]):
+        super().__init__()
+        self.couche1 = torch.nn.Linear(w1.shape[1], w1.shape[0])
+        self.couche2 = torch.nn.Linear(w2.shape[1], w2.shape[0])
+        with torch.no_grad():
+            self.couche1.weight.copy_(w1)
+            self.couche1.bias.copy_(b1)
+            self.couche2.weight.copy_(w2)
+            self.couche2.bias.copy_(b2)
+        self.tailles = tailles
+
+    @classmethod
+    def depuis_tetes(cls, tetes: List[ClassifierHead]) -> "TeteFusionnee":
+        premieres = [t.net[0] for t in tetes]
+        secondes = [t.net[2] for t in tetes]
+        w1 = torch.cat([l.weight for l in premieres], dim=0)
+        b1 = torch.cat([l.bias for l in premieres], dim=0)
+        w2 = torch.block_diag(*[l.weight for l in secondes])
+        b2 = torch.cat([l.bias for l in secondes], dim=0)
+        tailles = tuple(l.out_features for l in secondes)
+        return cls(w1.detach(), b1.detach(), w2.detach(), b2.detach(), tailles)
+
+    def forward(self, x):
+        logits = self.couche2(torch.relu(self.couche1(x)))
+        return torch.split(logits, self.tailles, dim=-1)
+
+
+@dataclass(frozen=True)
+class EtatTetes:
+    """
+    Tout ce qui dépend d'une version des têtes (poids, fusion, espaces de labels).
+    Remplacé d'un bloc par échange de référence : une requête lit `self._etat` une fois
+    et termine sur la version qu'elle a commencée.
+    """
+
+    version: str
+    tetes: Tuple[ClassifierHead, ClassifierHead, ClassifierHead]
+    tete_fusionnee: TeteFusionnee
+    labels: Tuple[List[str], List[str], List[str]]
+    id2: Tuple[Dict[int, str], Dict[int, str], Dict[int, str]]
+
+
 # ============================================================
 #  AGENT PRINCIPAL
 # ============================================================
 class IntentionDetector(AgentBase):
     """
-    IntentionDetector v4 — SBERT + 3 classifieurs PyTorch
+    IntentionDetector v5 — SBERT + 3 classifieurs PyTorch (fusionnés à l'inférence)
     Piloté EXCLUSIVEMENT par le YAML.
     Zéro hardcode.
+
+    Chemin d'inférence (section `inference_cpu` du profil SbertClassifier) :
+    - SBERT quantifié int8 dynamique (CPU) ; threads intra-op réglés seulement si `threads` > 0
+      (réglage global au processus).
+    - Tête fusionnée : 3 axes + probabilités calibrées (température par axe) en un passage.
+    - Cache LRU par (version des têtes, prompt, fin d'historique).
+
+    Têtes à chaud (section `registre`) : une version candidate publiée par l'AgentEntraineur
+    est chargée en arrière-plan, validée sur le holdout contre la version active, puis activée
+    par échange de référence entre deux requêtes. `retour_arriere()` réactive la précédente.
     """
 
-    def __init__(self):
+    def __init__(self, surcharge_inference: Optional[Dict[str, Any]] = None):
         super().__init__(nom_agent="IntentionDetector")
 
         # ------------------------------------------------------------
@@ -61,8 +146,7 @@ class IntentionDetector(AgentBase):
             raise RuntimeError("Configuration absente.")
         
         try:
-            with open(chemin_config_mini_llm, "r", encoding="utf-8") as f:
-                self.cfg = yaml.safe_load(f)
+            self.cfg = charger_yaml(chemin_config_mini_llm)
         except Exception as e:
             raise RuntimeError(f"Impossible de lire YAML {chemin_config_mini_llm}: {e}")
 
@@ -103,48 +187,274 @@ class IntentionDetector(AgentBase):
             raise RuntimeError(f"Impossible de lire label_map JSON ({self.label_map_path}): {e}")
 
         # ------------------------------------------------------------
-        # 4) Construire espaces de labels
+        # 4) Registre des têtes versionnées
         # ------------------------------------------------------------
-        self.labels_sujet = list(self.label_map["Sujet"].values())
-        self.labels_action = list(self.label_map["Action"].values())
-        self.labels_categorie = list(self.label_map["Categorie"].values())
+        self.registre = RegistreTetes(base_dir / "registre")
+        cfg_registre = self.cfg_sbert.get("registre", {}) or {}
+        self.tolerance_registre = float(cfg_registre.get("tolerance", 0.02))
+        self._verrou_bascule = threading.Lock()
+        self._holdout: Optional[Tuple[Any, List[Dict[str, Any]], Optional[torch.Tensor]]] = None
+
+        # ------------------------------------------------------------
+        # 5) Charger les classifieurs PyTorch (version active, sinon fichiers historiques)
+        # ------------------------------------------------------------
+        version_active = self.registre.active()
+        try:
+            self._etat = self._charger_etat(version_active)
+        except Exception as e:
+            if not version_active:
+                raise
+            self.logger.log_error(f"❌ Version active '{version_active}' illisible ({e}) → fichiers historiques")
+            self._etat = self._charger_etat(None)
 
-        # index -> label (inverse mapping)
-        self.id2sujet = {i: lbl for i, lbl in enumerate(self.labels_sujet)}
-        self.id2action = {i: lbl for i, lbl in enumerate(self.labels_action)}
-        self.id2categorie = {i: lbl for i, lbl in enumerate(self.labels_categorie)}
+        # ------------------------------------------------------------
+        # 6) Chemin d'inférence optimisé (quantification, fusion, cache)
+        # ------------------------------------------------------------
+        self._configurer_inference(surcharge_inference or {})
 
         # ------------------------------------------------------------
-        # 5) Charger les classifieurs PyTorch
+        # 7) Surveillance du registre (nouvelles versions entraînées)
         # ------------------------------------------------------------
-        self.classifier_sujet = ClassifierHead(self.emb_dim, len(self.labels_sujet)).to(self.device)
-        self.classifier_action = ClassifierHead(self.emb_dim, len(self.labels_action)).to(self.device)
-        self.classifier_categorie = ClassifierHead(self.emb_dim, len(self.labels_categorie)).to(self.device)
+        if cfg_registre.get("surveillance", True):
+            threading.Thread(
+                target=self._surveiller_registre,
+                args=(float(cfg_registre.get("intervalle_s", 60)),),
+                daemon=True,
+                name="RegistreTetes",
+            ).start()
+
+        self.logger.info(f"✅ IntentionDetector_SBERTClassifier initialisé (têtes {self._etat.version}).")
+
+    def _configurer_inference(self, surcharge: Dict[str, Any]):
+        cfg = {**self.cfg_sbert.get("inference_cpu", {}), **surcharge}
+        axes = ("sujet", "action", "categorie")
+        temperatures = cfg.get("temperature", {}) or {}
+        self.temperatures = tuple(float(temperatures.get(a, 1.0)) for a in axes)
+        self.taille_cache = int(cfg.get("taille_cache", 512))
+        self._cache_resultats: "OrderedDict[Tuple[str, str], ResultatIntention]" = OrderedDict()
+        self._verrou_cache = threading.Lock()
+        self.sbert_quantifie = False
+
+        if self.device == "cpu":
+            # Opt-in : torch.set_num_threads est global au processus (backend, Whisper, entraîneur
+            # partagent le même pool intra-op). 0 = réglage de torch laissé tel quel.
+            threads = int(cfg.get("threads", 0))
+            if threads > 0:
+                self.logger.info(
+                    f"⚙️ inference_cpu.threads={threads} : torch.set_num_threads s'applique à tout le processus."
+                )
+                torch.set_num_threads(threads)
 
-        self._load_classifier_weights()
+            if cfg.get("quantisation", "int8") == "int8":
+                try:
+                    self.sbert = torch.quantization.quantize_dynamic(
+                        self.sbert, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                    self.sbert_quantifie = True
+                except Exception as e:
+                    self.logger.log_warning(f"⚠️ Quantification int8 impossible, SBERT fp32 conservé : {e}")
 
-        self.logger.info("✅ IntentionDetector_SBERTClassifier initialisé.")
+        self.logger.info(
+            f"⚡ Inférence : int8={self.sbert_quantifie} | threads={torch.get_num_threads()} "
+            f"| cache={self.taille_cache} | T={self.temperatures}"
+        )
+
+    def vider_cache(self):
+        """À appeler si les poids des classifieurs changent."""
+        with self._verrou_cache:
+            self._cache_resultats.clear()
 
     # ------------------------------------------------------------
-    # Charger les poids PyTorch
+    # Vues sur la version active (compatibilité : benchmark, chemin de référence)
     # ------------------------------------------------------------
-    def _load_classifier_weights(self):
-        def load(pth: Path, model: torch.nn.Module, axis: str):
+    @property
+    def version_tetes(self) -> str:
+        return self._etat.version
+
+    @property
+    def tete_fusionnee(self) -> TeteFusionnee:
+        return self._etat.tete_fusionnee
+
+    @property
+    def classifier_sujet(self) -> ClassifierHead:
+        return self._etat.tetes[0]
+
+    @property
+    def classifier_action(self) -> ClassifierHead:
+        return self._etat.tetes[1]
+
+    @property
+    def classifier_categorie(self) -> ClassifierHead:
+        return self._etat.tetes[2]
+
+    @property
+    def labels_sujet(self) -> List[str]:
+        return self._etat.labels[0]
+
+    @property
+    def labels_action(self) -> List[str]:
+        return self._etat.labels[1]
+
+    @property
+    def labels_categorie(self) -> List[str]:
+        return self._etat.labels[2]
+
+    @property
+    def id2sujet(self) -> Dict[int, str]:
+        return self._etat.id2[0]
+
+    @property
+    def id2action(self) -> Dict[int, str]:
+        return self._etat.id2[1]
+
+    @property
+    def id2categorie(self) -> Dict[int, str]:
+        return self._etat.id2[2]
+
+    # ------------------------------------------------------------
+    # Charger les poids PyTorch (une version = un EtatTetes)
+    # ------------------------------------------------------------
+    def _charger_etat(self, version: Optional[str]) -> EtatTetes:
+        if version and version != VERSION_INITIALE:
+            chemins = self.registre.chemins(version)
+            label_map = self.registre.label_map(version) or self.label_map
+        else:
+            version = VERSION_INITIALE
+            chemins = {
+                "sujet": self.path_classifier_sujet,
+                "action": self.path_classifier_action,
+                "categorie": self.path_classifier_categorie,
+            }
+            label_map = self.label_map
+
+        labels = tuple(list(label_map[cle].values()) for cle in ("Sujet", "Action", "Categorie"))
+        tetes = []
+        for axe, lbls in zip(AXES_INTENTION, labels):
+            pth = chemins[axe]
             if not pth.exists():
                 raise RuntimeError(
-                    f"❌ Classifier {axis} introuvable : {pth}\n"
-                    f"→ As-tu bien exécuté entrainement_intention_sbert.py ?"
+                    f"❌ Classifier {axe} introuvable : {pth}\n"
+                    f"→ As-tu bien exécuté l'AgentEntraineur ?"
                 )
             try:
-                model.load_state_dict(torch.load(pth, map_location=self.device))
-                model.eval()
-                self.logger.info(f"🔹 Classifieur {axis} chargé → {pth.name}")
+                tete = ClassifierHead.depuis_fichier(pth, self.device)
             except Exception as e:
-                raise RuntimeError(f"Erreur chargement classifieur {axis}: {e}")
+                raise RuntimeError(f"Erreur chargement classifieur {axe}: {e}")
+            if tete.emb_dim != self.emb_dim or tete.nb_labels != len(lbls):
+                raise RuntimeError(
+                    f"Classifieur {axe} incompatible ({tete.emb_dim}→{tete.nb_labels}, "
+                    f"attendu {self.emb_dim}→{len(lbls)})"
+                )
+            tetes.append(tete)
+            self.logger.info(f"🔹 Classifieur {axe} chargé → {pth.name} ({version})")
+
+        return EtatTetes(
+            version=version,
+            tetes=tuple(tetes),
+            tete_fusionnee=TeteFusionnee.depuis_tetes(tetes).to(self.device).eval(),
+            labels=labels,
+            id2=tuple({i: lbl for i, lbl in enumerate(l)} for l in labels),
+        )
 
-        load(self.path_classifier_sujet, self.classifier_sujet, "Sujet")
-        load(self.path_classifier_action, self.classifier_action, "Action")
-        load(self.path_classifier_categorie, self.classifier_categorie, "Categorie")
+    # ------------------------------------------------------------
+    # Têtes à chaud : validation, bascule, retour arrière
+    # ------------------------------------------------------------
+    def _surveiller_registre(self, intervalle_s: float):
+        while True:
+            time.sleep(intervalle_s)
+            try:
+                self.verifier_nouvelle_version()
+            except Exception as e:
+                self.logger.log_warning(f"⚠️ Surveillance du registre : {e}")
+
+    def _holdout_encode(self) -> Tuple[List[Dict[str, Any]], Optional[torch.Tensor]]:
+        """Holdout du registre, encodé une fois par version du fichier."""
+        chemin = self.registre.chemin_holdout
+        signature = chemin.stat().st_mtime_ns if chemin.exists() else None
+        if self._holdout is None or self._holdout[0] != signature:
+            exemples = [e for e in self.registre.lire_holdout() if e.get("prompt")]
+            emb = None
+            if exemples:
+                emb = self.sbert.encode(
+                    [e["prompt"] for e in exemples],
+                    batch_size=64,
+                    normalize_embeddings=True,
+                    convert_to_tensor=True,
+                ).to(self.device).float()
+            self._holdout = (signature, exemples, emb)
+        return self._holdout[1], self._holdout[2]
+
+    def _evaluer_holdout(self, etat: EtatTetes) -> Dict[str, float]:
+        """Précision par axe de `etat` sur le holdout (labels inconnus de la version ignorés)."""
+        exemples, emb = self._holdout_encode()
+        if not exemples:
+            return {}
+        with torch.inference_mode():
+            logits = etat.tete_fusionnee(emb)
+        scores = {}
+        for i, axe in enumerate(AXES_INTENTION):
+            label2id = {lbl: k for k, lbl in etat.id2[i].items()}
+            paires = [(j, label2id[ex[axe]]) for j, ex in enumerate(exemples) if ex.get(axe) in label2id]
+            if not paires:
+                continue
+            lignes = torch.tensor([j for j, _ in paires], device=logits[i].device)
+            cibles = torch.tensor([c for _, c in paires], device=logits[i].device)
+            scores[axe] = round(float((logits[i][lignes].argmax(dim=-1) == cibles).float().mean()), 4)
+        return scores
+
+    def _basculer(self, etat: EtatTetes):
+        ancienne = self._etat.version
+        self._etat = etat  # Échange de référence : atomique, les requêtes en cours finissent sur l'ancien état
+        self.vider_cache()
+        self.logger.info(f"🔁 Têtes d'intention : {ancienne} → {etat.version}")
+
+    def verifier_nouvelle_version(self) -> bool:
+        """
+        Charge la dernière version candidate (hors chemin des requêtes), la compare à la version
+        active sur le holdout et l'active si aucun axe ne régresse au-delà de la tolérance.
+        """
+        candidate = self.registre.derniere_candidate()
+        if not candidate or candidate == self._etat.version:
+            return False
+
+        with self._verrou_bascule:
+            if self.registre.statut(candidate) != "candidate":
+                return False
+            try:
+                etat = self._charger_etat(candidate)
+            except Exception as e:
+                self.registre.rejeter(candidate, erreur=str(e))
+                self.logger.log_error(f"❌ Version '{candidate}' rejetée (chargement) : {e}")
+                return False
+
+            score_candidat = self._evaluer_holdout(etat)
+            score_actuel = self._evaluer_holdout(self._etat)
+            regressions = {
+                axe: {"active": score_actuel[axe], "candidate": score}
+                for axe, score in score_candidat.items()
+                if axe in score_actuel and score < score_actuel[axe] - self.tolerance_registre
+            }
+            if regressions:
+                self.registre.rejeter(candidate, holdout=score_candidat, regressions=regressions)
+                self.logger.log_warning(f"⚠️ Version '{candidate}' rejetée (holdout) : {regressions}")
+                return False
+            if not score_candidat:
+                self.logger.log_warning(f"⚠️ Holdout vide : version '{candidate}' activée sans comparaison.")
+
+            self._basculer(etat)
+            self.registre.activer(candidate, holdout=score_candidat, precedente_holdout=score_actuel)
+            return True
+
+    def retour_arriere(self) -> Optional[str]:
+        """Réactive la version active précédente du registre. Retourne la version réactivée."""
+        with self._verrou_bascule:
+            precedente = self.registre.precedente()
+            if not precedente:
+                self.logger.log_warning("⚠️ Retour arrière impossible : aucune version précédente.")
+                return None
+            self._basculer(self._charger_etat(precedente))
+            self.registre.retour_arriere()
+            return precedente
 
     # ------------------------------------------------------------
     # Construction contexte
@@ -168,6 +478,33 @@ class IntentionDetector(AgentBase):
         morceaux.append(f"U: {prompt}")
         return "\n".join(morceaux)
 
+    # ------------------------------------------------------------
+    # INFÉRENCE
+    # ------------------------------------------------------------
+    def _encoder(self, texte: str) -> torch.Tensor:
+        emb = self.sbert.encode(texte, normalize_embeddings=True, convert_to_tensor=True)
+        return emb.to(self.device).float()
+
+    def predire(
+        self, texte: str, etat: Optional[EtatTetes] = None
+    ) -> Tuple[Tuple[int, int, int], Tuple[torch.Tensor, ...]]:
+        """Chemin optimisé : un passage dans la tête fusionnée -> (ids, probabilités calibrées)."""
+        etat = etat or self._etat
+        with torch.inference_mode():
+            logits = etat.tete_fusionnee(self._encoder(texte))
+            probas = tuple(
+                torch.softmax(l / t, dim=-1) for l, t in zip(logits, self.temperatures)
+            )
+        ids = tuple(int(p.argmax().item()) for p in probas)
+        return ids, probas
+
+    def predire_reference(self, texte: str) -> Tuple[int, int, int]:
+        """Chemin historique (3 forwards séparés, argmax) : référence du benchmark."""
+        emb = self._encoder(texte)
+        tetes = self._etat.tetes
+        with torch.no_grad():
+            return tuple(tete(emb).argmax().item() for tete in tetes)
+
     # ------------------------------------------------------------
     # API PRINCIPALE
     # ------------------------------------------------------------
@@ -179,24 +516,32 @@ class IntentionDetector(AgentBase):
 
         self.logger.log_thought(f"[SBERTClassifier] Prompt: {prompt[:80]!r}")
 
-        # 1) Encoder
+        # 1) Contexte encodé = clé du cache (version des têtes + prompt + fin d'historique)
+        etat = self._etat  # Une requête = une version, même si une bascule survient pendant
         texte = self._construire_contexte(prompt, historique_brut)
-        emb = self.sbert.encode(texte, normalize_embeddings=True, convert_to_tensor=True)
-        emb = emb.to(self.device).float()
+        cle = (etat.version, texte)
+        with self._verrou_cache:
+            en_cache = self._cache_resultats.get(cle)
+            if en_cache is not None:
+                self._cache_resultats.move_to_end(cle)
+        if en_cache is not None:
+            return replace(en_cache, prompt=prompt, confiance=dict(en_cache.confiance))
 
-        # 2) Passer dans les 3 classifieurs
-        with torch.no_grad():
-            id_sujet = self.classifier_sujet(emb).argmax().item()
-            id_action = self.classifier_action(emb).argmax().item()
-            id_categorie = self.classifier_categorie(emb).argmax().item()
+        # 2) Encoder + tête fusionnée (3 axes en un passage)
+        (id_sujet, id_action, id_categorie), probas = self.predire(texte, etat)
 
         # 3) Convertir → valeurs finales
-        sujet_val = self.id2sujet[id_sujet]
-        action_val = self.id2action[id_action]
-        categorie_val = self.id2categorie[id_categorie]
+        sujet_val = etat.id2[0][id_sujet]
+        action_val = etat.id2[1][id_action]
+        categorie_val = etat.id2[2][id_categorie]
+        confiance = {
+            "sujet": round(float(probas[0][id_sujet]), 4),
+            "action": round(float(probas[1][id_action]), 4),
+            "categorie": round(float(probas[2][id_categorie]), 4),
+        }
 
         self.logger.info(
-            f"🎯 SBERTClassifier → {sujet_val} / {action_val} / {categorie_val}"
+            f"🎯 SBERTClassifier → {sujet_val} / {action_val} / {categorie_val} | {confiance}"
         )
 
         # 4) Convertir → enums
@@ -208,9 +553,16 @@ class IntentionDetector(AgentBase):
         prompt=prompt,
         sujet=sujet_enum,
         action=action_enum,
-        categorie=categorie_enum
+        categorie=categorie_enum,
+        confiance=confiance,
     )
         # ✅ Validation du contrat de sortie (Sécurité Runtime)
         self.auditor.valider_format_sortie(resultat)
-        
-        return resultat
\ No newline at end of file
+
+        if self.taille_cache > 0:
+            with self._verrou_cache:
+                self._cache_resultats[cle] = resultat
+                while len(self._cache_resultats) > self.taille_cache:
+                    self._cache_resultats.popitem(last=False)
+
+        return resultat
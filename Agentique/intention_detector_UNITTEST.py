@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: IntentionDetector (chemin d'inférence CPU)
+Cible : agentique/Semi/classes_cognitives.py (intention_detector.py)
+Objectif : Valider l'équivalence tête fusionnée / 3 têtes séparées et le cache de résultats.
+"""
+
+import unittest
+import torch
+from unittest.mock import MagicMock
+
+from agentique.base.contrats_interface import Action, Categorie, Sujet
+from agentique.Semi.classes_cognitives import (
+    ClassifierHead,
+    EtatTetes,
+    IntentionDetector,
+    TeteFusionnee,
+)
+
+EMB_DIM = 16
+
+
+def _tetes(graine: int):
+    """3 têtes aléatoires aux tailles (cachées et sorties) différentes par axe."""
+    torch.manual_seed(graine)
+    return (
+        ClassifierHead(EMB_DIM, 2, hidden_dim=8).eval(),
+        ClassifierHead(EMB_DIM, 3, hidden_dim=5).eval(),
+        ClassifierHead(EMB_DIM, 2, hidden_dim=12).eval(),
+    )
+
+
+def _etat(version: str, tetes) -> EtatTetes:
+    id2 = (
+        {0: Sujet.SCRIPT.value, 1: Sujet.SETUP.value},
+        {0: Action.CODER.value, 1: Action.DEBUG.value, 2: Action.FAIRE.value},
+        {0: Categorie.AGENT.value, 1: Categorie.TESTER.value},
+    )
+    return EtatTetes(
+        version=version,
+        tetes=tetes,
+        tete_fusionnee=TeteFusionnee.depuis_tetes(list(tetes)),
+        labels=tuple(list(d.values()) for d in id2),
+        id2=id2,
+    )
+
+
+class TestTeteFusionnee(unittest.TestCase):
+    def test_logits_identiques_aux_tetes_separees(self):
+        for graine in range(5):
+            tetes = _tetes(graine)
+            fusion = TeteFusionnee.depuis_tetes(list(tetes))
+            x = torch.randn(7, EMB_DIM)  # Lot
+            with torch.no_grad():
+                for fusionnes, tete in zip(fusion(x), tetes):
+                    torch.testing.assert_close(fusionnes, tete(x), rtol=1e-5, atol=1e-6)
+                # Vecteur seul (chemin `predire`)
+                for fusionnes, tete in zip(fusion(x[0]), tetes):
+                    torch.testing.assert_close(fusionnes, tete(x[0]), rtol=1e-5, atol=1e-6)
+
+
+class TestCacheResultats(unittest.TestCase):
+    def setUp(self):
+        """Bypass du __init__ (SBERT, YAML, registre) : état et encodeur injectés."""
+        self.detector = IntentionDetector.__new__(IntentionDetector)
+        self.detector.logger = MagicMock()
+        self.detector.auditor = MagicMock()
+        self.detector.cfg_sbert = {}
+        self.detector.device = "cpu"
+        self.detector._configurer_inference({"quantisation": "aucune", "taille_cache": 2})
+        self.detector._etat = _etat("v1", _tetes(0))
+        torch.manual_seed(1)
+        self.embeddings = {}
+        self.detector._encoder = MagicMock(
+            side_effect=lambda texte: self.embeddings.setdefault(texte, torch.randn(EMB_DIM))
+        )
+
+    def test_cache_hit(self):
+        premier = self.detector.intention_detector("Corrige ce script")
+        second = self.detector.intention_detector("Corrige ce script")
+
+        self.assertEqual(self.detector._encoder.call_count, 1)
+        self.assertEqual(
+            (second.sujet, second.action, second.categorie, second.confiance),
+            (premier.sujet, premier.action, premier.categorie, premier.confiance),
+        )
+        self.assertIsNot(second.confiance, premier.confiance)  # Copie : le cache reste intact
+        ids, _ = self.detector.predire("Corrige ce script")
+        self.assertEqual(ids, self.detector.predire_reference("Corrige ce script"))
+
+    def test_cle_du_cache(self):
+        self.detector.intention_detector("continue")
+        self.detector.intention_detector("continue", historique_brut=["Bonjour", "Salut"])
+        self.assertEqual(self.detector._encoder.call_count, 2)  # Historique différent
+
+        self.detector._etat = _etat("v2", _tetes(3))
+        self.detector.intention_detector("continue")
+        self.assertEqual(self.detector._encoder.call_count, 3)  # Nouvelle version des têtes
+
+        self.assertEqual(len(self.detector._cache_resultats), 2)  # Borné par taille_cache
+        self.detector.vider_cache()
+        self.assertEqual(len(self.detector._cache_resultats), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
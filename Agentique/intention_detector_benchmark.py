@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark IntentionDetector - Chemin historique vs chemin CPU optimisé
+
+Compare, sur les datasets étiquetés d'AgentEntraineur (restreints aux labels du label map) :
+1.  **Référence** : SBERT fp32 + 3 ClassifierHead séparées (argmax).
+2.  **Optimisé** : SBERT int8 + tête fusionnée + threads réglés (cache désactivé).
+
+Rapport : précision par axe, accord entre les deux chemins, latence p50/p95,
+et températures de calibration suggérées (à reporter dans `inference_cpu.temperature`).
+
+Usage :
+    python intention_detector_benchmark.py [--limite 500]
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Callable, Tuple, Any
+
+import numpy as np
+import torch
+
+from agentique.base.demarrage import charger_yaml
+from agentique.base.auditor_base import AuditorBase
+from agentique.Semi.classes_cognitives import IntentionDetector
+
+AXES = ("sujet", "action", "categorie")
+
+
+def charger_exemples(detector: IntentionDetector, limite: int = 500) -> List[Dict[str, Any]]:
+    """Exemples des datasets d'AgentEntraineur dont les 3 labels existent dans le label map."""
+    cfg = charger_yaml(AuditorBase("entraineur").get_path("config")) or {}
+    chemins = cfg.get("configuration", {}).get("chemins", {})
+    base = Path(chemins.get("base_data", "."))
+    espaces = {
+        "sujet": set(detector.labels_sujet),
+        "action": set(detector.labels_action),
+        "categorie": set(detector.labels_categorie),
+    }
+
+    exemples, vus = [], set()
+    for nom in chemins.get("datasets", []):
+        fichier = base / nom
+        if not fichier.exists():
+            continue
+        with open(fichier, "r", encoding="utf-8") as f:
+            for ligne in f:
+                try:
+                    obj = json.loads(ligne)
+                except json.JSONDecodeError:
+                    continue
+                prompt = obj.get("prompt")
+                if not prompt or prompt in vus:
+                    continue
+                if all(obj.get(a) in espaces[a] for a in AXES):
+                    exemples.append(obj)
+                    vus.add(prompt)
+                if len(exemples) >= limite:
+                    return exemples
+    return exemples
+
+
+def mesurer(predire: Callable[[str], Tuple[int, int, int]], textes: List[str]) -> Tuple[List, List[float]]:
+    predire(textes[0])  # Échauffement
+    predictions, latences = [], []
+    for texte in textes:
+        debut = time.perf_counter()
+        predictions.append(predire(texte))
+        latences.append((time.perf_counter() - debut) * 1000)
+    return predictions, latences
+
+
+def precision(detector: IntentionDetector, predictions: List, exemples: List[Dict]) -> Dict[str, float]:
+    id2 = (detector.id2sujet, detector.id2action, detector.id2categorie)
+    return {
+        axe: round(
+            sum(id2[i][p[i]] == ex[axe] for p, ex in zip(predictions, exemples)) / len(exemples), 4
+        )
+        for i, axe in enumerate(AXES)
+    }
+
+
+def calibrer_temperatures(detector: IntentionDetector, exemples: List[Dict]) -> Dict[str, float]:
+    """Temperature scaling : T par axe minimisant la NLL (recherche sur grille)."""
+    label2id = [
+        {v: k for k, v in m.items()}
+        for m in (detector.id2sujet, detector.id2action, detector.id2categorie)
+    ]
+    logits_axes: List[List[torch.Tensor]] = [[], [], []]
+    with torch.inference_mode():
+        for ex in exemples:
+            for i, l in enumerate(detector.tete_fusionnee(detector._encoder(ex["prompt"]))):
+                logits_axes[i].append(l)
+
+    grille = np.round(np.arange(0.5, 3.01, 0.1), 2)
+    temperatures = {}
+    for i, axe in enumerate(AXES):
+        logits = torch.stack(logits_axes[i])
+        cibles = torch.tensor([label2id[i][ex[axe]] for ex in exemples])
+        nll = [
+            torch.nn.functional.cross_entropy(logits / float(t), cibles).item() for t in grille
+        ]
+        temperatures[axe] = float(grille[int(np.argmin(nll))])
+    return temperatures
+
+
+def comparer(limite: int = 500) -> Dict[str, Any]:
+    reference = IntentionDetector(surcharge_inference={"quantisation": "aucune", "taille_cache": 0})
+    optimise = IntentionDetector(surcharge_inference={"taille_cache": 0})
+
+    exemples = charger_exemples(reference, limite)
+    if not exemples:
+        raise RuntimeError("Aucun exemple étiqueté compatible avec le label map.")
+    textes = [ex["prompt"] for ex in exemples]
+
+    pred_ref, lat_ref = mesurer(reference.predire_reference, textes)
+    pred_opt, lat_opt = mesurer(lambda t: optimise.predire(t)[0], textes)
+
+    def resume(latences):
+        return {
+            "p50_ms": round(float(np.percentile(latences, 50)), 2),
+            "p95_ms": round(float(np.percentile(latences, 95)), 2),
+        }
+
+    accord = sum(a == b for a, b in zip(pred_ref, pred_opt)) / len(exemples)
+    return {
+        "exemples": len(exemples),
+        "reference": {**resume(lat_ref), "precision": precision(reference, pred_ref, exemples)},
+        "optimise": {
+            **resume(lat_opt),
+            "precision": precision(optimise, pred_opt, exemples),
+            "int8": optimise.sbert_quantifie,
+            "threads": torch.get_num_threads(),
+        },
+        "accord_3_axes": round(accord, 4),
+        "acceleration_p50": round(
+            float(np.percentile(lat_ref, 50)) / max(float(np.percentile(lat_opt, 50)), 1e-6), 2
+        ),
+        "temperatures_suggerees": calibrer_temperatures(optimise, exemples),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark IntentionDetector (référence vs CPU optimisé)")
+    parser.add_argument("--limite", type=int, default=500, help="Nombre maximal d'exemples étiquetés")
+    args = parser.parse_args()
+
+    rapport = comparer(args.limite)
+    print(json.dumps(rapport, ensure_ascii=False, indent=2))
@@ -3,14 +3,16 @@
 """
 MoteurLLM - Version HTTP Client (llama-server)
 Source de vérité unique : config_moteurllm.yaml
+(`SECONDMIND_LLM_URL` remplace `server_url`, ex: serveur factice des benchmarks)
 """
 
 import json
-import yaml
+import os
 import requests
 from pathlib import Path
 from typing import Generator, Dict, List
 from agentique.base.META_agent import AgentBase
+from agentique.base.demarrage import charger_yaml
 
 class MoteurLLM(AgentBase):
     def __init__(self, perf_monitor=None):
@@ -27,8 +29,8 @@ class MoteurLLM(AgentBase):
         self.active_profile = active_profile
         self.model_config = self.config["models"][active_profile]
 
-        # 2. Configuration Serveur (Source: YAML)
-        self.server_url = self.model_config.get("server_url")
+        # 2. Configuration Serveur (Source: YAML, surchargeable par l'environnement)
+        self.server_url = os.environ.get("SECONDMIND_LLM_URL") or self.model_config.get("server_url")
         if not self.server_url:
              raise ValueError(f"❌ CONFIG: 'server_url' manquant pour le profil {active_profile}")
 
@@ -57,8 +59,7 @@ class MoteurLLM(AgentBase):
         if not self.config_path.exists():
             raise FileNotFoundError(f"❌ Config introuvable au chemin : {self.config_path}")
 
-        with open(self.config_path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+        return charger_yaml(self.config_path)
 
     def _prepare_payload(self, prompt_text: str, stream: bool = False) -> dict:
         """Prépare les paramètres de génération en utilisant exclusivement le YAML."""
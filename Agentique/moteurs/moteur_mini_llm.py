@@ -3,16 +3,18 @@
 """
 MoteurMiniLLM — Version Client HTTP (llama-server)
 Dédié aux tâches rapides (Classification, Juge, Résumé)
+(`SECONDMIND_MINI_LLM_URL` remplace `server_url`, ex: serveur factice des benchmarks)
 """
 
-import yaml
 import requests
 import json
+import os
 import threading
 from pathlib import Path
 from typing import Dict, Generator, Any
 
 from agentique.base.META_agent import AgentBase
+from agentique.base.demarrage import charger_yaml
 
 class MoteurMiniLLM(AgentBase):
     """
@@ -49,8 +51,7 @@ class MoteurMiniLLM(AgentBase):
         if not cfg_path.exists():
             raise FileNotFoundError(f"❌ Fichier config introuvable : {cfg_path}")
 
-        with open(cfg_path, "r", encoding="utf-8") as f:
-            self.config = yaml.safe_load(f)
+        self.config = charger_yaml(cfg_path)
 
         # Récupération du profil
         self.active_profile = self.config.get("active_profile_mini_llm", "phi3_mini_server")
@@ -59,8 +60,8 @@ class MoteurMiniLLM(AgentBase):
 
         self.model_cfg = self.config["models"][self.active_profile]
 
-        # Configuration URL
-        self.server_url = self.model_cfg.get("server_url")
+        # Configuration URL (YAML, surchargeable par l'environnement)
+        self.server_url = os.environ.get("SECONDMIND_MINI_LLM_URL") or self.model_cfg.get("server_url")
         if not self.server_url:
             raise ValueError(f"❌ URL manquante pour le profil {self.active_profile}")
 
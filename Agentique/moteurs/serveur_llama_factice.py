@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ServeurLlamaFactice - Bouchon local de llama-server (benchmarks sans GPU)
+
+Reproduit le contrat HTTP consommé par MoteurLLM / MoteurMiniLLM :
+1.  **/health** : `{"status": "ok"}`.
+2.  **/completion** (stream) : lignes SSE `data: {"content": ...}` puis `data: [DONE]`.
+3.  **/completion** (non stream) : `{"content": ..., "stop": true, "timings": {...}}`.
+
+Les tokens sont déterministes (graine = empreinte du prompt) et émis à vitesse réglable
+(latence du premier token + tokens/s) : deux exécutions du même benchmark envoient
+exactement les mêmes réponses au pipeline.
+
+Usage (manuel) :
+    python serveur_llama_factice.py --port 8080 --ttft-ms 80 --tokens-par-s 40
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, List, Optional
+
+VOCABULAIRE = (
+    "le", "la", "les", "un", "une", "module", "agent", "mémoire", "contexte", "règle",
+    "fonction", "classe", "index", "vecteur", "prompt", "réponse", "analyse", "donc",
+    "ensuite", "fichier", "code", "test", "résultat", "intention", "recherche", "et",
+    "avec", "pour", "dans", "sur", "cache", "latence", "requête", "session", "historique",
+)
+
+
+def generer_tokens(prompt: str, nb_tokens: int) -> List[str]:
+    """Suite de tokens déterministe pour un prompt donné."""
+    graine = int.from_bytes(hashlib.blake2b(prompt.encode("utf-8"), digest_size=8).digest(), "big")
+    alea = random.Random(graine)
+    return [(" " if i else "") + alea.choice(VOCABULAIRE) for i in range(max(0, nb_tokens))]
+
+
+class ServeurLlamaFactice:
+    """
+    Serveur HTTP multi-thread (un thread par requête), lancé en arrière-plan.
+
+    Attributes:
+        ttft_ms (float): Attente avant le premier token.
+        tokens_par_s (float): Débit de génération (0 = instantané).
+        nb_tokens (int): Longueur des réponses (bornée par `n_predict` du payload).
+        reponse (str | None): Réponse fixe (ex: JSON attendu par le Juge) au lieu des tokens générés.
+        nb_requetes (int): Compteur de requêtes /completion servies.
+    """
+
+    def __init__(
+        self,
+        hote: str = "127.0.0.1",
+        port: int = 0,
+        ttft_ms: float = 50.0,
+        tokens_par_s: float = 50.0,
+        nb_tokens: int = 64,
+        reponse: Optional[str] = None,
+    ):
+        self.ttft_ms = ttft_ms
+        self.tokens_par_s = tokens_par_s
+        self.nb_tokens = nb_tokens
+        self.reponse = reponse
+        self.nb_requetes = 0
+        self._verrou = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._httpd = ThreadingHTTPServer((hote, port), self._fabriquer_handler())
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        hote, port = self._httpd.server_address[:2]
+        return f"http://{hote}:{port}"
+
+    # ------------------------------------------------------------------
+    # Cycle de vie
+    # ------------------------------------------------------------------
+
+    def demarrer(self) -> "ServeurLlamaFactice":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="ServeurLlamaFactice", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def arreter(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.demarrer()
+
+    def __exit__(self, *exc):
+        self.arreter()
+        return False
+
+    # ------------------------------------------------------------------
+    # Génération
+    # ------------------------------------------------------------------
+
+    def _tokens(self, payload: dict) -> List[str]:
+        if self.reponse is not None:
+            return [self.reponse]
+        n = min(self.nb_tokens, int(payload.get("n_predict", self.nb_tokens) or self.nb_tokens))
+        return generer_tokens(str(payload.get("prompt", "")), n)
+
+    def _cadencer(self, tokens: List[str]) -> Iterator[str]:
+        """Émet les tokens au rythme configuré."""
+        time.sleep(self.ttft_ms / 1000)
+        intervalle = 1.0 / self.tokens_par_s if self.tokens_par_s > 0 else 0.0
+        for i, token in enumerate(tokens):
+            if i and intervalle:
+                time.sleep(intervalle)
+            yield token
+
+    def _fabriquer_handler(self):
+        serveur = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.0 : la fin du flux SSE est signalée par la fermeture de la connexion
+            protocol_version = "HTTP/1.0"
+
+            def log_message(self, *args):
+                pass
+
+            def _json(self, code: int, donnees: dict):
+                corps = json.dumps(donnees, ensure_ascii=False).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(corps)))
+                self.end_headers()
+                self.wfile.write(corps)
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/health":
+                    self._json(200, {"status": "ok"})
+                else:
+                    self._json(404, {"error": "not found"})
+
+            def do_POST(self):
+                if self.path.rstrip("/") != "/completion":
+                    self._json(404, {"error": "not found"})
+                    return
+                try:
+                    longueur = int(self.headers.get("Content-Length", 0))
+                    payload = json.loads(self.rfile.read(longueur) or b"{}")
+                except (ValueError, json.JSONDecodeError):
+                    self._json(400, {"error": "payload invalide"})
+                    return
+
+                with serveur._verrou:
+                    serveur.nb_requetes += 1
+                tokens = serveur._tokens(payload)
+                debut = time.perf_counter()
+
+                if not payload.get("stream"):
+                    contenu = "".join(serveur._cadencer(tokens))
+                    duree = time.perf_counter() - debut
+                    self._json(200, {
+                        "content": contenu,
+                        "stop": True,
+                        "tokens_predicted": len(tokens),
+                        "timings": {"predicted_ms": round(duree * 1000, 2)},
+                    })
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                try:
+                    for token in serveur._cadencer(tokens):
+                        self.wfile.write(f"data: {json.dumps({'content': token, 'stop': False})}\n\n".encode("utf-8"))
+                        self.wfile.flush()
+                    self.wfile.write(b'data: {"content": "", "stop": true}\n\ndata: [DONE]\n\n')
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # Client parti (stop token côté moteur)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serveur llama-server factice (tokens déterministes)")
+    parser.add_argument("--hote", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--ttft-ms", type=float, default=50.0, help="Latence du premier token")
+    parser.add_argument("--tokens-par-s", type=float, default=50.0, help="Débit (0 = instantané)")
+    parser.add_argument("--nb-tokens", type=int, default=64, help="Longueur des réponses")
+    args = parser.parse_args()
+
+    serveur = ServeurLlamaFactice(args.hote, args.port, args.ttft_ms, args.tokens_par_s, args.nb_tokens)
+    print(f"🧪 llama-server factice sur {serveur.url} (Ctrl+C pour arrêter)")
+    try:
+        serveur._httpd.serve_forever()
+    except KeyboardInterrupt:
+        serveur.arreter()
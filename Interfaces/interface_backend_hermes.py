@@ -19,7 +19,6 @@ import threading
 import time
 import webbrowser
 import subprocess
-import uuid
 from pathlib import Path
 from datetime import datetime
 
@@ -52,22 +51,34 @@ logger = logging.getLogger(__name__)
 
 # --- AJOUT AUDIO ---
 import tempfile
-try:
-    import whisper
-    import torch
-    # Chargement du modèle sur le GPU (RTX 3090)
-    # "small" est très rapide, "medium" est plus précis. Avec ta 3090, tu peux mettre "medium" ou "large-v2" sans souci.
-    device = "cpu"
-    logger.info(f"🎧 Chargement de Whisper sur {device}...")
-    audio_model = whisper.load_model("medium", device=device)
-    WHISPER_AVAILABLE = True
-    logger.info("✅ Whisper chargé et prêt à écouter.")
-except ImportError:
-    WHISPER_AVAILABLE = False
+import importlib.util
+# Whisper (et torch) ne sont chargés qu'au premier /transcribe ou par le pré-chauffage
+# lancé après le démarrage du serveur : l'import du backend reste léger.
+WHISPER_AVAILABLE = importlib.util.find_spec("whisper") is not None
+if not WHISPER_AVAILABLE:
     logger.warning("⚠️ Whisper non installé (pip install openai-whisper). L'audio ne fonctionnera pas.")
-except Exception as e:
-    WHISPER_AVAILABLE = False
-    logger.error(f"⚠️ Erreur chargement Whisper: {e}")
+audio_model = None
+_verrou_audio = threading.Lock()
+
+def charger_modele_audio():
+    """Charge Whisper une seule fois (thread-safe). Retourne None si indisponible."""
+    global audio_model, WHISPER_AVAILABLE
+    if audio_model is not None or not WHISPER_AVAILABLE:
+        return audio_model
+    with _verrou_audio:
+        if audio_model is None:
+            try:
+                import whisper
+                # "small" est très rapide, "medium" est plus précis.
+                device = "cpu"
+                logger.info(f"🎧 Chargement de Whisper sur {device}...")
+                audio_model = whisper.load_model("medium", device=device)
+                logger.info("✅ Whisper chargé et prêt à écouter.")
+            except Exception as e:
+                WHISPER_AVAILABLE = False
+                logger.error(f"⚠️ Erreur chargement Whisper: {e}")
+    return audio_model
+
 # ==============================================================================
 # 🎯 BOOTSTRAP : CHARGEMENT CENTRALISÉ DES CHEMINS
 # ==============================================================================
@@ -108,11 +119,16 @@ except Exception as e:
 # ==============================================================================
 
 try:
-    from agentique.Semi.agent_Semi import AgentSemi
+    from agentique.base.demarrage import PROFIL_DEMARRAGE
+    with PROFIL_DEMARRAGE.etape("import AgentSemi"):
+        from agentique.Semi.agent_Semi import AgentSemi
     from agentique.base.gardien_projet import GardienProjet
     from agentique.base.auditor_base import AuditorBase
     from routes_modules_externes import router_externes, init_external_routes
+    from stockage_conversations import ConversationManager
     from agentique.base.contrats_interface import CustomJSONEncoder
+    from agentique.base.metriques import registre_metriques
+    from agentique.base.traceur import TRACEUR
     from agentique.sous_agents_gouvernes.agent_Auditor.agent_Auditor import AgentAuditor
     SEMI_DISPONIBLE = True
 except Exception as e:
@@ -160,30 +176,34 @@ try:
     def get_last_prompt_cache(): return prompt_viewer_cache
     def get_prompt_lock(): return prompt_viewer_lock
 
-    agent_semi = AgentSemi(
-        get_cache=get_last_prompt_cache,
-        get_lock=get_prompt_lock,
-        socketio=socketio
-    )
-    logger.info("✅ Pipeline AgentSemi initialisé (SocketIO injecté).")
-
-    # Audit au démarrage
-    try:
-        auditor_sys = AgentAuditor()
+    with PROFIL_DEMARRAGE.etape("AgentSemi()"):
+        agent_semi = AgentSemi(
+            get_cache=get_last_prompt_cache,
+            get_lock=get_prompt_lock,
+            socketio=socketio
+        )
+    logger.info("✅ Pipeline AgentSemi initialisé (SocketIO injecté, composants en pré-chauffage).")
 
-        # 🆕 CORRECTION ENCODAGE AUTO (Avant l'audit complet)
-        logger.info("🔍 [Gardien] Vérification des encodages...")
-        stats_enc = auditor_sys.corriger_tous_encodages()
-        if stats_enc['fichiers_corriges'] > 0:
-            logger.info(f"🔧 Encodage réparé pour {stats_enc['fichiers_corriges']} fichiers.")
+    # Audit au démarrage (en arrière-plan : ne retarde pas l'ouverture du serveur)
+    def audit_demarrage():
+        try:
+            with PROFIL_DEMARRAGE.etape("audit_systeme"):
+                auditor_sys = AgentAuditor()
+
+                # 🆕 CORRECTION ENCODAGE AUTO (Avant l'audit complet)
+                logger.info("🔍 [Gardien] Vérification des encodages...")
+                stats_enc = auditor_sys.corriger_tous_encodages()
+                if stats_enc['fichiers_corriges'] > 0:
+                    logger.info(f"🔧 Encodage réparé pour {stats_enc['fichiers_corriges']} fichiers.")
+
+                # Audit normal
+                rapport = auditor_sys.auditer_systeme()
+                logger.info(f"🔍 Audit système complété – {rapport['nb_fichiers']} fichiers.")
+        except Exception as e:
+            logger.error(f"❌ Audit système échoué: {e}")
 
-        # Audit normal
-        rapport = auditor_sys.auditer_systeme()
-        logger.info(f"🔍 Audit système complété – {rapport['nb_fichiers']} fichiers.")
-    except Exception as e:
-        logger.error(f"❌ Audit système échoué: {e}")
+    threading.Thread(target=audit_demarrage, daemon=True, name="AuditDemarrage").start()
 
-    intention_detector = agent_semi.intention_detector
     init_external_routes(agent_semi)
 
 except Exception as e:
@@ -396,7 +416,7 @@ def route_synchroniser_stats():
 @app.route('/transcribe', methods=['POST'])
 def transcribe():
     """Reçoit un blob audio, le sauvegarde temporairement et le transcrit."""
-    if not WHISPER_AVAILABLE:
+    if charger_modele_audio() is None:
         return jsonify({"text": "[Erreur: Whisper n'est pas installé ou chargé sur le serveur]"}), 500
 
     if 'audio' not in request.files:
@@ -656,6 +676,38 @@ def health_check():
         return '', 200
     return jsonify({"status": "healthy", "timestamp": datetime.now().isoformat()}), 200
 
+@app.route('/metrics', methods=['GET'])
+def metrics_prometheus():
+    """Latences et appels par agent.méthode (auto-instrumentation MetaAgent), format Prometheus."""
+    return Response(
+        registre_metriques().exporter_prometheus(),
+        mimetype='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+@app.route('/api/metriques', methods=['GET'])
+def metriques_resume():
+    """Vue JSON : p50/p95/p99 par agent.méthode, triée par p95 décroissant."""
+    return jsonify({"metriques": registre_metriques().resume()})
+
+@app.route('/api/demarrage', methods=['GET'])
+def profil_demarrage():
+    """Profil du démarrage : imports, constructions d'agents et pré-chauffage, chronométrés."""
+    return jsonify(PROFIL_DEMARRAGE.rapport())
+
+@app.route('/api/traces', methods=['GET'])
+def traces_liste():
+    """Dernières traces de tours (`penser`) : durée totale, nombre de spans, TTFT."""
+    limite = request.args.get('limite', 50, type=int)
+    return jsonify({"traces": TRACEUR.lister_traces(limite)})
+
+@app.route('/api/traces/<trace_id>', methods=['GET'])
+def trace_detail(trace_id):
+    """Spans d'une trace (vue waterfall : trace_viewer.html)."""
+    spans = TRACEUR.obtenir_trace(trace_id)
+    if not spans:
+        return jsonify({"error": "Trace introuvable"}), 404
+    return jsonify({"trace_id": trace_id, "spans": spans})
+
 # ==============================================================================
 # UTILITAIRES BENCHMARK
 # ==============================================================================
@@ -1142,240 +1194,6 @@ def serve_hub():
 # Module Conversations
 # ==============================================================================
 
-class ConversationManager:
-    def __init__(self, base_path: Path):
-        self.base_path = base_path / "conversations"
-        self.base_path.mkdir(exist_ok=True)
-        self.metadata_file = self.base_path / "metadata.json"
-        self._init_metadata()
-
-    def _init_metadata(self):
-        if not self.metadata_file.exists():
-            # On utilise aussi la sauvegarde atomique pour les métadonnées pour être sûr
-            self._sauvegarder_atomique(self.metadata_file, {
-                "conversations": [],
-                "folders": ["Général"]
-            })
-
-    # =========================================================================
-    # 🛡️ HELPER: SAUVEGARDE ATOMIQUE (La protection contre le fichier vide)
-    # =========================================================================
-    def _sauvegarder_atomique(self, chemin_fichier: Path, donnees: dict):
-        """
-        Écrit dans un .tmp, force l'écriture disque, puis renomme.
-        Empêche la création de fichiers de 0 octet en cas de crash.
-        """
-        chemin_temp = chemin_fichier.with_suffix('.tmp')
-        try:
-            with open(chemin_temp, 'w', encoding='utf-8') as f:
-                json.dump(donnees, f, indent=2, ensure_ascii=False)
-                f.flush()
-                os.fsync(f.fileno()) # Le secret est ici : on force Windows à écrire
-
-            # Si on arrive ici, le fichier est intègre. On écrase l'ancien.
-            chemin_temp.replace(chemin_fichier)
-            return True
-        except Exception as e:
-            print(f"[Error] Echec sauvegarde atomique {chemin_fichier.name}: {e}")
-            if chemin_temp.exists():
-                try: os.remove(chemin_temp)
-                except: pass
-            return False
-
-    def create_conversation(self, title: str = None, folder: str = "Général", force_id: str = None):
-        # 1. LOGIQUE ID
-        conv_id = force_id if force_id else str(uuid.uuid4())
-        timestamp = datetime.now().isoformat()
-
-        conversation = {
-            "id": conv_id,
-            "title": title or ("Brouillon" if force_id else "Nouvelle conversation"),
-            "folder": folder,
-            "created_at": timestamp,
-            "updated_at": timestamp,
-            "messages": []
-        }
-
-        conv_file = self.base_path / f"{conv_id}.json"
-
-        # ✅ CORRECTION : Utilisation de la sauvegarde atomique
-        self._sauvegarder_atomique(conv_file, conversation)
-
-        # 2. FIX ENCODAGE ET DOUBLONS (MÉTADONNÉES)
-        try:
-            content = self.metadata_file.read_text(encoding='utf-8', errors='replace')
-            metadata = json.loads(content)
-        except Exception:
-            metadata = {"conversations": []}
-
-        # 3. GESTION INTELLIGENTE DES MÉTADONNÉES
-        existe_deja = False
-        for c in metadata["conversations"]:
-            if c["id"] == conv_id:
-                c["updated_at"] = timestamp
-                existe_deja = True
-                break
-
-        if not existe_deja:
-            metadata["conversations"].append({
-                "id": conv_id,
-                "title": conversation["title"],
-                "folder": folder,
-                "created_at": timestamp,
-                "updated_at": timestamp
-            })
-
-        # ✅ CORRECTION : Sauvegarde atomique aussi pour les métadonnées
-        self._sauvegarder_atomique(self.metadata_file, metadata)
-
-        return conversation
-
-    def get_conversation(self, conv_id: str):
-        conv_file = self.base_path / f"{conv_id}.json"
-
-        if not conv_file.exists():
-            return None
-
-        try:
-            # ✅ Lecture sécurisée
-            content = conv_file.read_text(encoding='utf-8', errors='replace')
-
-            if not content.strip():
-                print(f"[Warning] Fichier conversation vide détecté : {conv_id}.json (Ignoré)")
-                # Optionnel : Supprimer le fichier vide pour ne plus avoir l'erreur ?
-                # os.remove(conv_file)
-                return None
-
-            return json.loads(content)
-
-        except Exception as e:
-            print(f"[Error] Impossible de lire la conversation {conv_id}: {e}")
-            return None
-
-    def get_archive_history(self, conv_id: str) -> list:
-        """Retourne l'historique formaté pour injection dans le prompt."""
-        conversation = self.get_conversation(conv_id)
-        if not conversation:
-            return []
-
-        history = []
-        for msg in conversation.get("messages", []):
-            history.append({
-                "role": msg["role"],
-                "content": msg["content"]
-            })
-        return history
-
-    def add_message(self, conv_id: str, role: str, content: str):
-        conversation = self.get_conversation(conv_id)
-        if not conversation:
-            return False
-
-        conversation["messages"].append({
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now().isoformat()
-        })
-        conversation["updated_at"] = datetime.now().isoformat()
-
-        if len(conversation["messages"]) == 1 and conversation["title"] == "Nouvelle conversation":
-            conversation["title"] = content[:50] + "..." if len(content) > 50 else content
-
-        conv_file = self.base_path / f"{conv_id}.json"
-        conv_file.write_text(json.dumps(conversation, indent=2, ensure_ascii=False))
-
-        metadata = json.loads(self.metadata_file.read_text())
-        for conv in metadata["conversations"]:
-            if conv["id"] == conv_id:
-                conv["title"] = conversation["title"]
-                conv["updated_at"] = conversation["updated_at"]
-                break
-        self.metadata_file.write_text(json.dumps(metadata, indent=2, ensure_ascii=False))
-
-        return True
-
-    def list_conversations(self, folder: str = None):
-        try:
-            # ✅ Lecture sécurisée (utf-8 + replace)
-            content = self.metadata_file.read_text(encoding='utf-8', errors='replace')
-            metadata = json.loads(content)
-        except Exception:
-            # En cas de fichier metadata corrompu, on renvoie une liste vide plutôt que de crasher
-            metadata = {"conversations": []}
-
-        conversations = metadata.get("conversations", [])
-
-        if folder:
-            conversations = [c for c in conversations if c.get("folder") == folder]
-
-        # Tri sécurisé (gestion des clés manquantes)
-        conversations.sort(key=lambda x: x.get("updated_at", ""), reverse=True)
-        return conversations
-
-    def rename_conversation(self, conv_id: str, new_title: str):
-        # On utilise get_conversation qui est déjà sécurisé
-        conversation = self.get_conversation(conv_id)
-        if not conversation:
-            return False
-
-        conversation['title'] = new_title
-        conversation['updated_at'] = datetime.now().isoformat()
-
-        conv_file = self.base_path / f"{conv_id}.json"
-
-        # ✅ SAUVEGARDE ATOMIQUE (Fichier conversation)
-        if not self._sauvegarder_atomique(conv_file, conversation):
-            return False
-
-        # Mise à jour Metadata
-        try:
-            content = self.metadata_file.read_text(encoding='utf-8', errors='replace')
-            metadata = json.loads(content)
-        except Exception:
-            return False
-
-        for conv in metadata["conversations"]:
-            if conv["id"] == conv_id:
-                conv["title"] = new_title
-                conv["updated_at"] = conversation["updated_at"]
-                break
-
-        # ✅ SAUVEGARDE ATOMIQUE (Metadata)
-        return self._sauvegarder_atomique(self.metadata_file, metadata)
-
-    def delete_conversation(self, conv_id: str):
-        conv_file = self.base_path / f"{conv_id}.json"
-        if not conv_file.exists():
-            return False
-
-        trash_dir = self.base_path / "_trash"
-        trash_dir.mkdir(exist_ok=True)
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        trash_path = trash_dir / f"{conv_id}_{timestamp}.json"
-
-        try:
-            # Move est atomique par nature sur le même système de fichier, donc c'est OK
-            shutil.move(str(conv_file), str(trash_path))
-            print(f"🗑️ Conversation archivée: {trash_path.name}")
-        except Exception as e:
-            print(f"[Error] Erreur archivage conversation: {e}")
-            return False
-
-        # Mise à jour Metadata
-        try:
-            content = self.metadata_file.read_text(encoding='utf-8', errors='replace')
-            metadata = json.loads(content)
-
-            metadata["conversations"] = [c for c in metadata["conversations"] if c["id"] != conv_id]
-
-            # ✅ SAUVEGARDE ATOMIQUE (Metadata)
-            return self._sauvegarder_atomique(self.metadata_file, metadata)
-
-        except Exception as e:
-            print(f"[Error] Erreur mise à jour metadata après suppression: {e}")
-            return False
-
 # Initialiser le gestionnaire
 conversation_manager = ConversationManager(MEMOIRE_DIR)
 
@@ -1813,7 +1631,9 @@ if __name__ == '__main__':
                 '/api/status',
                 '/api/stats/sync',
                 '/health',
-                '/api/last_prompt'
+                '/api/last_prompt',
+                '/metrics',
+                '/api/traces'
             ]
             # Si le message contient une de ces routes, on retourne False (bloquer)
             return not any(route in msg for route in routes_ignorees)
@@ -1833,16 +1653,30 @@ if __name__ == '__main__':
     try:
         gardien = GardienProjet()
         gardien.start()
+
+        # Rollups périodiques des métriques (deltas par minute, un fichier par jour)
+        registre_metriques().demarrer_rollups(MEMOIRE_DIR / "metriques", intervalle_s=60)
+        # Journal compact des spans par tour (vue waterfall)
+        TRACEUR.configurer(MEMOIRE_DIR / "traces")
         threading.Thread(target=ouvrir_navigateur, daemon=True).start()
 
-        # Injection
+        # Injection (AgentParole reçoit le même verrou à sa construction paresseuse)
         agent_semi.prompt_viewer_lock = get_prompt_lock
-        if hasattr(agent_semi, 'agent_parole'):
-            agent_semi.agent_parole.prompt_viewer_lock = get_prompt_lock
 
         init_external_routes(agent_semi)
         logger.info("✅ Routes externes ET Prompt Viewer connectés à l'agent.")
 
+        # Pré-chauffage de Whisper, puis rapport de démarrage une fois les agents prêts
+        if WHISPER_AVAILABLE:
+            threading.Thread(target=charger_modele_audio, daemon=True, name="PrechauffageWhisper").start()
+
+        def journaliser_profil_demarrage():
+            agent_semi.thread_prechauffage.join()
+            logger.info("⏱️ Profil de démarrage :\n" + PROFIL_DEMARRAGE.rapport_texte())
+
+        threading.Thread(target=journaliser_profil_demarrage, daemon=True).start()
+        PROFIL_DEMARRAGE.marquer_pret()
+
         # On garde log_output=False pour couper les logs bas niveau de SocketIO
         socketio.run(
             app,
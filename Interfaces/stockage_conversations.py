@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Stockage des conversations de l'interface (snapshot + journal append-only).
+Extrait de interface_backend_hermes.py : testable sans Flask.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+
+
+class ConversationManager:
+    """
+    Stockage des conversations UI (dossier 'conversations/').
+
+    Format disque par conversation :
+    - `<conv_id>.json`        : Snapshot compacté (même format qu'avant, lisible tel quel).
+    - `<conv_id>.log.jsonl`   : Journal append-only des événements depuis le snapshot
+                                (messages numérotés `n`, changements de titre).
+
+    En RAM : LRU des conversations chaudes + métadonnées complètes.
+    Un thread d'écriture unique regroupe les ajouts (un write + un fsync par conversation
+    et par lot), réécrit `metadata.json` si modifié, et compacte le journal en snapshot
+    au-delà de `seuil_compaction` lignes. Envoyer un message = O(1) I/O ;
+    l'historique est servi depuis la RAM.
+    """
+
+    def __init__(self, base_path: Path, taille_lru: int = 32,
+                 intervalle_flush_s: float = 0.2, seuil_compaction: int = 200):
+        self.base_path = base_path / "conversations"
+        self.base_path.mkdir(exist_ok=True)
+        self.metadata_file = self.base_path / "metadata.json"
+
+        self.taille_lru = taille_lru
+        self.intervalle_flush_s = intervalle_flush_s
+        self.seuil_compaction = seuil_compaction
+
+        self._verrou = threading.RLock()
+        self._verrou_ecriture = threading.Lock()  # Un seul écrivain disque (thread ou fermeture)
+        self._cache = OrderedDict()          # conv_id -> conversation (LRU)
+        self._tampon = {}                    # conv_id -> [lignes JSONL en attente]
+        self._en_vol = set()                 # conv_id pris par le lot en cours d'écriture
+        self._lignes_journal = {}            # conv_id -> nb de lignes dans le .log.jsonl
+        self._metadata_sale = False
+        self._reveil = threading.Event()
+        self._actif = True
+
+        self._init_metadata()
+        self._metadata = self._lire_metadata()
+
+        self._thread_ecriture = threading.Thread(
+            target=self._boucle_ecriture, daemon=True, name="ConversationStore"
+        )
+        self._thread_ecriture.start()
+        atexit.register(self.fermer)
+
+    def _init_metadata(self):
+        if not self.metadata_file.exists():
+            # On utilise aussi la sauvegarde atomique pour les métadonnées pour être sûr
+            self._sauvegarder_atomique(self.metadata_file, {
+                "conversations": [],
+                "folders": ["Général"]
+            })
+
+    def _lire_metadata(self) -> dict:
+        try:
+            content = self.metadata_file.read_text(encoding='utf-8', errors='replace')
+            metadata = json.loads(content)
+        except Exception:
+            # En cas de fichier metadata corrompu, on repart d'une liste vide plutôt que de crasher
+            metadata = {"conversations": []}
+        metadata.setdefault("conversations", [])
+        return metadata
+
+    def _meta_conversation(self, conv_id: str):
+        for c in self._metadata["conversations"]:
+            if c["id"] == conv_id:
+                return c
+        return None
+
+    # =========================================================================
+    # 🛡️ HELPER: SAUVEGARDE ATOMIQUE (La protection contre le fichier vide)
+    # =========================================================================
+    def _sauvegarder_atomique(self, chemin_fichier: Path, donnees: dict):
+        """
+        Écrit dans un .tmp, force l'écriture disque, puis renomme.
+        Empêche la création de fichiers de 0 octet en cas de crash.
+        """
+        chemin_temp = chemin_fichier.with_suffix('.tmp')
+        if not self._ecrire_synchronise(chemin_temp, donnees):
+            return False
+        try:
+            # Si on arrive ici, le fichier est intègre. On écrase l'ancien.
+            chemin_temp.replace(chemin_fichier)
+            return True
+        except Exception as e:
+            print(f"[Error] Echec sauvegarde atomique {chemin_fichier.name}: {e}")
+            chemin_temp.unlink(missing_ok=True)
+            return False
+
+    @staticmethod
+    def _ecrire_synchronise(chemin_temp: Path, donnees: dict) -> bool:
+        try:
+            with open(chemin_temp, 'w', encoding='utf-8') as f:
+                json.dump(donnees, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno()) # Le secret est ici : on force Windows à écrire
+            return True
+        except Exception as e:
+            print(f"[Error] Echec écriture {chemin_temp.name}: {e}")
+            if chemin_temp.exists():
+                try: os.remove(chemin_temp)
+                except: pass
+            return False
+
+    # =========================================================================
+    # 🧠 CACHE LRU (Snapshot + rejeu du journal)
+    # =========================================================================
+    def _chemin_journal(self, conv_id: str) -> Path:
+        return self.base_path / f"{conv_id}.log.jsonl"
+
+    def _charger(self, conv_id: str):
+        """Conversation depuis le LRU, sinon snapshot + rejeu du journal (une seule fois)."""
+        conversation = self._cache.get(conv_id)
+        if conversation is not None:
+            self._cache.move_to_end(conv_id)
+            return conversation
+
+        conv_file = self.base_path / f"{conv_id}.json"
+        if not conv_file.exists():
+            return None
+
+        try:
+            # ✅ Lecture sécurisée
+            content = conv_file.read_text(encoding='utf-8', errors='replace')
+
+            if not content.strip():
+                print(f"[Warning] Fichier conversation vide détecté : {conv_id}.json (Ignoré)")
+                return None
+
+            conversation = json.loads(content)
+        except Exception as e:
+            print(f"[Error] Impossible de lire la conversation {conv_id}: {e}")
+            return None
+
+        # Rejeu du journal (les messages déjà présents dans le snapshot sont ignorés via `n`)
+        nb_lignes = 0
+        journal = self._chemin_journal(conv_id)
+        if journal.exists():
+            with open(journal, 'r+b') as f:
+                contenu = f.read()
+                # Ligne finale sans saut de ligne = write interrompu par un crash : retirée,
+                # sinon le prochain append s'y collerait et serait perdu au rejeu
+                fin = contenu.rfind(b"\n") + 1
+                if fin < len(contenu):
+                    f.truncate(fin)
+            for ligne in contenu[:fin].decode('utf-8', errors='replace').splitlines():
+                try:
+                    evenement = json.loads(ligne)
+                except ValueError:
+                    continue  # Ligne corrompue
+                nb_lignes += 1
+                self._appliquer(conversation, evenement)
+        self._lignes_journal[conv_id] = nb_lignes
+
+        self._cache[conv_id] = conversation
+        self._evincer()
+        return conversation
+
+    def _evincer(self):
+        """
+        Ramène le LRU à `taille_lru`. Une conversation dont des lignes ne sont pas encore sur
+        disque (tampon ou lot en vol) n'est pas évincée : rechargée depuis le disque, elle
+        perdrait ces messages. Elle l'est après le flush (`_vider_tampon` rappelle l'éviction).
+        La plus récente (celle qu'on vient de charger) n'est jamais évincée.
+        """
+        excedent = len(self._cache) - self.taille_lru
+        for conv_id in list(self._cache)[:-1]:
+            if excedent <= 0:
+                break
+            if conv_id in self._tampon or conv_id in self._en_vol:
+                continue
+            del self._cache[conv_id]
+            self._lignes_journal.pop(conv_id, None)
+            excedent -= 1
+
+    @staticmethod
+    def _appliquer(conversation: dict, evenement: dict):
+        if "meta" in evenement:
+            conversation.update(evenement["meta"])
+        elif evenement.get("n", 0) >= len(conversation["messages"]):
+            conversation["messages"].append({
+                "role": evenement["role"],
+                "content": evenement["content"],
+                "timestamp": evenement["timestamp"]
+            })
+
+    def _journaliser(self, conv_id: str, evenement: dict):
+        """Met l'événement en tampon : écrit par le thread d'écriture au prochain lot."""
+        ligne = json.dumps(evenement, ensure_ascii=False) + "\n"
+        self._tampon.setdefault(conv_id, []).append(ligne)
+        self._metadata_sale = True
+        self._reveil.set()
+
+    # =========================================================================
+    # ✍️ THREAD D'ÉCRITURE (Regroupement + Compaction)
+    # =========================================================================
+    def _boucle_ecriture(self):
+        while self._actif:
+            self._reveil.wait()
+            time.sleep(self.intervalle_flush_s)  # Fenêtre de regroupement
+            self._reveil.clear()
+            self.vider_tampon()
+
+    def vider_tampon(self):
+        """Écrit les événements en attente, compacte si besoin, puis met à jour metadata.json."""
+        with self._verrou_ecriture:
+            self._vider_tampon()
+
+    def _vider_tampon(self):
+        with self._verrou:
+            tampon, self._tampon = self._tampon, {}
+            self._en_vol = set(tampon)
+            # Objet conversation au moment du lot : une suppression (ou recréation par force_id)
+            # le retire du LRU, ce qui invalide l'écriture (re-vérifié sous verrou)
+            origines = {conv_id: self._cache.get(conv_id) for conv_id in tampon}
+            metadata = None
+            if self._metadata_sale:
+                metadata = json.loads(json.dumps(self._metadata))
+                self._metadata_sale = False
+
+            a_compacter = {}
+            for conv_id, lignes in tampon.items():
+                total = self._lignes_journal.get(conv_id, 0) + len(lignes)
+                self._lignes_journal[conv_id] = total
+                conversation = origines[conv_id]
+                if total >= self.seuil_compaction and conversation is not None:
+                    # Copie sous verrou : le snapshot couvre TOUTES les lignes prises ci-dessus
+                    a_compacter[conv_id] = dict(conversation, messages=list(conversation["messages"]))
+                    self._lignes_journal[conv_id] = 0
+
+        try:
+            for conv_id, lignes in tampon.items():
+                self._ajouter_au_journal(conv_id, origines[conv_id], lignes)
+            for conv_id, snapshot in a_compacter.items():
+                self._compacter(conv_id, origines[conv_id], snapshot)
+        finally:
+            with self._verrou:
+                self._en_vol = set()
+                self._evincer()  # Éviction différée des conversations désormais sur disque
+
+        if metadata is not None:
+            self._sauvegarder_atomique(self.metadata_file, metadata)
+
+    def _toujours_vivante(self, conv_id: str, origine) -> bool:
+        """À appeler sous `_verrou` : ni supprimée ni recréée depuis la prise du lot."""
+        return origine is not None and self._cache.get(conv_id) is origine
+
+    def _ajouter_au_journal(self, conv_id: str, origine, lignes: list):
+        """
+        Append sous verrou (écriture en cache noyau, rapide) : `delete_conversation` ne peut
+        pas s'intercaler entre la vérification et l'écriture. Le fsync se fait hors verrou ;
+        un fichier supprimé entre-temps reste valide pour le descripteur ouvert.
+        """
+        with self._verrou:
+            if not self._toujours_vivante(conv_id, origine):
+                return  # Supprimée entre-temps : ne pas recréer un journal orphelin
+            f = None
+            try:
+                f = open(self._chemin_journal(conv_id), 'a', encoding='utf-8')
+                f.write("".join(lignes))
+                f.flush()
+            except Exception as e:
+                print(f"[Error] Echec écriture journal {conv_id}: {e}")
+                if f is not None:
+                    f.close()
+                return
+        try:
+            os.fsync(f.fileno())
+        except Exception as e:
+            print(f"[Error] Echec fsync journal {conv_id}: {e}")
+        finally:
+            f.close()
+
+    def _compacter(self, conv_id: str, origine, snapshot: dict):
+        """Snapshot écrit et synchronisé hors verrou, puis remplacé + journal vidé sous verrou."""
+        chemin_temp = self.base_path / f"{conv_id}.compaction.tmp"
+        if not self._ecrire_synchronise(chemin_temp, snapshot):
+            return
+        with self._verrou:
+            if self._toujours_vivante(conv_id, origine):
+                try:
+                    chemin_temp.replace(self.base_path / f"{conv_id}.json")
+                    open(self._chemin_journal(conv_id), 'w').close()
+                    return
+                except Exception as e:
+                    print(f"[Error] Echec compaction {conv_id}: {e}")
+        chemin_temp.unlink(missing_ok=True)
+
+    def fermer(self):
+        """Arrêt propre : vide le tampon (appelé aussi à la sortie du processus)."""
+        self._actif = False
+        self._reveil.set()
+        self.vider_tampon()
+
+    # =========================================================================
+    # 📂 API CONVERSATIONS
+    # =========================================================================
+    def create_conversation(self, title: str = None, folder: str = "Général", force_id: str = None):
+        # 1. LOGIQUE ID
+        conv_id = force_id if force_id else str(uuid.uuid4())
+        timestamp = datetime.now().isoformat()
+
+        conversation = {
+            "id": conv_id,
+            "title": title or ("Brouillon" if force_id else "Nouvelle conversation"),
+            "folder": folder,
+            "created_at": timestamp,
+            "updated_at": timestamp,
+            "messages": []
+        }
+
+        conv_file = self.base_path / f"{conv_id}.json"
+
+        with self._verrou:
+            # ✅ Snapshot initial atomique (journal vide)
+            self._sauvegarder_atomique(conv_file, conversation)
+            self._chemin_journal(conv_id).unlink(missing_ok=True)
+            self._tampon.pop(conv_id, None)
+            self._cache[conv_id] = conversation
+            self._lignes_journal[conv_id] = 0
+            self._evincer()
+
+            # 2. GESTION INTELLIGENTE DES MÉTADONNÉES (RAM, écrites par lot)
+            meta = self._meta_conversation(conv_id)
+            if meta:
+                meta["updated_at"] = timestamp
+            else:
+                self._metadata["conversations"].append({
+                    "id": conv_id,
+                    "title": conversation["title"],
+                    "folder": folder,
+                    "created_at": timestamp,
+                    "updated_at": timestamp
+                })
+            self._metadata_sale = True
+            self._reveil.set()
+
+            return dict(conversation, messages=[])
+
+    def get_conversation(self, conv_id: str):
+        with self._verrou:
+            conversation = self._charger(conv_id)
+            if conversation is None:
+                return None
+            # Copie : la réponse HTTP ne doit pas voir un ajout concurrent
+            return dict(conversation, messages=list(conversation["messages"]))
+
+    def get_archive_history(self, conv_id: str) -> list:
+        """Retourne l'historique formaté pour injection dans le prompt (servi depuis la RAM)."""
+        with self._verrou:
+            conversation = self._charger(conv_id)
+            if not conversation:
+                return []
+
+            return [
+                {"role": msg["role"], "content": msg["content"]}
+                for msg in conversation.get("messages", [])
+            ]
+
+    def add_message(self, conv_id: str, role: str, content: str):
+        with self._verrou:
+            conversation = self._charger(conv_id)
+            if not conversation:
+                return False
+
+            timestamp = datetime.now().isoformat()
+            n = len(conversation["messages"])
+            conversation["messages"].append({
+                "role": role,
+                "content": content,
+                "timestamp": timestamp
+            })
+            conversation["updated_at"] = timestamp
+            self._journaliser(conv_id, {"n": n, "role": role, "content": content, "timestamp": timestamp})
+
+            meta_evenement = {"updated_at": timestamp}
+            if n == 0 and conversation["title"] == "Nouvelle conversation":
+                conversation["title"] = content[:50] + "..." if len(content) > 50 else content
+                meta_evenement["title"] = conversation["title"]
+                self._journaliser(conv_id, {"meta": meta_evenement})
+
+            meta = self._meta_conversation(conv_id)
+            if meta:
+                meta.update(meta_evenement)
+
+        return True
+
+    def list_conversations(self, folder: str = None):
+        with self._verrou:
+            conversations = [dict(c) for c in self._metadata.get("conversations", [])]
+
+        if folder:
+            conversations = [c for c in conversations if c.get("folder") == folder]
+
+        # Tri sécurisé (gestion des clés manquantes)
+        conversations.sort(key=lambda x: x.get("updated_at", ""), reverse=True)
+        return conversations
+
+    def rename_conversation(self, conv_id: str, new_title: str):
+        with self._verrou:
+            conversation = self._charger(conv_id)
+            if not conversation:
+                return False
+
+            conversation['title'] = new_title
+            conversation['updated_at'] = datetime.now().isoformat()
+            self._journaliser(conv_id, {"meta": {"title": new_title, "updated_at": conversation['updated_at']}})
+
+            meta = self._meta_conversation(conv_id)
+            if meta:
+                meta["title"] = new_title
+                meta["updated_at"] = conversation["updated_at"]
+            return True
+
+    def delete_conversation(self, conv_id: str):
+        with self._verrou:
+            conversation = self._charger(conv_id)
+            if conversation is None:
+                return False
+
+            trash_dir = self.base_path / "_trash"
+            trash_dir.mkdir(exist_ok=True)
+
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            trash_path = trash_dir / f"{conv_id}_{timestamp}.json"
+
+            # Snapshot complet (journal inclus) dans la corbeille
+            if not self._sauvegarder_atomique(trash_path, conversation):
+                return False
+            print(f"🗑️ Conversation archivée: {trash_path.name}")
+
+            self._tampon.pop(conv_id, None)
+            self._cache.pop(conv_id, None)
+            self._lignes_journal.pop(conv_id, None)
+            for chemin in (self.base_path / f"{conv_id}.json", self._chemin_journal(conv_id)):
+                try:
+                    chemin.unlink(missing_ok=True)
+                except Exception as e:
+                    print(f"[Error] Erreur archivage conversation: {e}")
+                    return False
+
+            # Mise à jour Metadata (écrite par lot)
+            self._metadata["conversations"] = [
+                c for c in self._metadata["conversations"] if c["id"] != conv_id
+            ]
+            self._metadata_sale = True
+            self._reveil.set()
+            return True
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: Stockage des conversations (snapshot + journal)
+Cible : Interfaces/stockage_conversations.py
+Objectif : Valider le rejeu du journal, la compaction, la reprise après crash, l'éviction
+LRU avec lignes en attente et la suppression pendant un flush.
+"""
+
+import unittest
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from stockage_conversations import ConversationManager
+
+
+class TestStockageConversations(unittest.TestCase):
+    def setUp(self):
+        self.dossier = Path(tempfile.mkdtemp())
+        self.gestionnaires = []
+
+    def tearDown(self):
+        for gestionnaire in self.gestionnaires:
+            gestionnaire.fermer()
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def _gestionnaire(self, **kwargs) -> ConversationManager:
+        # Fenêtre de regroupement longue : les flushs du test sont explicites
+        kwargs.setdefault("intervalle_flush_s", 60)
+        gestionnaire = ConversationManager(self.dossier, **kwargs)
+        self.gestionnaires.append(gestionnaire)
+        return gestionnaire
+
+    def _contenus(self, gestionnaire: ConversationManager, conv_id: str) -> list:
+        return [m["content"] for m in gestionnaire.get_conversation(conv_id)["messages"]]
+
+    @property
+    def _fichiers(self) -> set:
+        return {p.name for p in (self.dossier / "conversations").iterdir() if p.is_file()}
+
+    def test_rejeu_du_journal(self):
+        gestionnaire = self._gestionnaire()
+        conv_id = gestionnaire.create_conversation()["id"]
+        for i in range(3):
+            gestionnaire.add_message(conv_id, "user", f"m{i}")
+        gestionnaire.fermer()
+
+        # Le snapshot est resté vide : les messages viennent du journal
+        snapshot = json.loads((self.dossier / "conversations" / f"{conv_id}.json").read_text(encoding="utf-8"))
+        self.assertEqual(snapshot["messages"], [])
+
+        relu = self._gestionnaire()
+        self.assertEqual(self._contenus(relu, conv_id), ["m0", "m1", "m2"])
+        self.assertEqual(relu.get_conversation(conv_id)["title"], "m0")
+        self.assertEqual(relu.list_conversations()[0]["title"], "m0")
+
+    def test_compaction(self):
+        gestionnaire = self._gestionnaire(seuil_compaction=4)
+        conv_id = gestionnaire.create_conversation(title="T")["id"]
+        for i in range(5):
+            gestionnaire.add_message(conv_id, "user", f"m{i}")
+            gestionnaire.vider_tampon()
+
+        dossier = self.dossier / "conversations"
+        snapshot = json.loads((dossier / f"{conv_id}.json").read_text(encoding="utf-8"))
+        self.assertEqual(len(snapshot["messages"]), 4)
+        self.assertEqual(len((dossier / f"{conv_id}.log.jsonl").read_text(encoding="utf-8").splitlines()), 1)
+        self.assertFalse([n for n in self._fichiers if n.endswith(".tmp")])
+
+        gestionnaire.fermer()
+        self.assertEqual(self._contenus(self._gestionnaire(), conv_id), [f"m{i}" for i in range(5)])
+
+    def test_reprise_apres_crash(self):
+        dossier = self.dossier / "conversations"
+        dossier.mkdir()
+        (dossier / "c1.json").write_text(json.dumps({
+            "id": "c1", "title": "T", "folder": "Général", "created_at": "", "updated_at": "",
+            "messages": [{"role": "user", "content": "m0", "timestamp": ""}],
+        }), encoding="utf-8")
+        # Crash entre snapshot et troncature (m0 rejoué) puis ligne tronquée en fin de journal
+        (dossier / "c1.log.jsonl").write_text(
+            '{"n": 0, "role": "user", "content": "m0", "timestamp": ""}\n'
+            '{"n": 1, "role": "assistant", "content": "m1", "timestamp": ""}\n'
+            '{"n": 2, "role": "user", "con',
+            encoding="utf-8",
+        )
+
+        gestionnaire = self._gestionnaire()
+        self.assertEqual(self._contenus(gestionnaire, "c1"), ["m0", "m1"])
+        gestionnaire.add_message("c1", "user", "m2")
+        gestionnaire.fermer()
+        self.assertEqual(self._contenus(self._gestionnaire(), "c1"), ["m0", "m1", "m2"])
+
+    def test_eviction_attend_le_flush(self):
+        gestionnaire = self._gestionnaire(taille_lru=1)
+        a = gestionnaire.create_conversation(title="A")["id"]
+        gestionnaire.add_message(a, "user", "a0")
+        b = gestionnaire.create_conversation(title="B")["id"]
+
+        # A a une ligne non écrite : elle reste en RAM malgré la taille du LRU
+        self.assertIn(a, gestionnaire._cache)
+        gestionnaire.add_message(a, "user", "a1")
+        gestionnaire.vider_tampon()
+        self.assertEqual(len(gestionnaire._cache), 1)
+
+        gestionnaire.add_message(b, "user", "b0")
+        gestionnaire.fermer()
+        relu = self._gestionnaire()
+        self.assertEqual(self._contenus(relu, a), ["a0", "a1"])
+        self.assertEqual(self._contenus(relu, b), ["b0"])
+
+    def test_suppression_pendant_le_flush(self):
+        gestionnaire = self._gestionnaire(seuil_compaction=1)
+        conv_id = gestionnaire.create_conversation(title="T")["id"]
+        gestionnaire.add_message(conv_id, "user", "m0")
+
+        # La suppression s'intercale entre la prise du lot et l'écriture disque
+        ajouter = gestionnaire._ajouter_au_journal
+
+        def ajouter_apres_suppression(*args):
+            gestionnaire.delete_conversation(conv_id)
+            ajouter(*args)
+
+        gestionnaire._ajouter_au_journal = ajouter_apres_suppression
+        gestionnaire.vider_tampon()
+        gestionnaire.vider_tampon()
+
+        self.assertEqual(self._fichiers, {"metadata.json"})
+        self.assertEqual(gestionnaire.list_conversations(), [])
+        self.assertEqual(len(list((self.dossier / "conversations" / "_trash").iterdir())), 1)
+
+    def test_suppression_pendant_la_compaction(self):
+        gestionnaire = self._gestionnaire(seuil_compaction=1)
+        conv_id = gestionnaire.create_conversation(title="T")["id"]
+        gestionnaire.add_message(conv_id, "user", "m0")
+
+        compacter = gestionnaire._compacter
+
+        def compacter_apres_suppression(*args):
+            gestionnaire.delete_conversation(conv_id)
+            compacter(*args)
+
+        gestionnaire._compacter = compacter_apres_suppression
+        gestionnaire.vider_tampon()
+        gestionnaire.vider_tampon()
+
+        self.assertEqual(self._fichiers, {"metadata.json"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,11 +4,13 @@
 META AGENT - Métaclasse pour injection automatique des outils communs
 """
 import functools
+import inspect
 import time
 from typing import Any, Callable, Dict, List, Optional
 from agentique.base.auditor_base import AuditorBase
 from agentique.base.contrats_interface import StatsBase
 from agentique.base.cognitive_logger import CognitiveLogger
+from agentique.base.traceur import span, SPAN_NEUTRE
 
 
 class MemoireTravailRAM:
@@ -134,6 +136,11 @@ class MetaAgent(type):
     @staticmethod
     def _creer_wrapper_stats(instance, method, method_name):
         """Crée un wrapper qui loggue les appels et les erreurs automatiquement."""
+        # Span de trace par appel (enfant du span courant). Les générateurs retournent
+        # immédiatement : leur durée réelle est tracée par l'appelant.
+        est_generateur = inspect.isgeneratorfunction(method)
+        nom_span = f"{type(instance).__name__}.{method_name}"
+
         @functools.wraps(method)
         def wrapper(*method_args, **method_kwargs):
             # 1. Incrémenter l'appel global
@@ -149,7 +156,8 @@ class MetaAgent(type):
 
             try:
                 # Exécution réelle de la méthode
-                result = method(instance, *method_args, **method_kwargs)
+                with SPAN_NEUTRE if est_generateur else span(nom_span):
+                    result = method(instance, *method_args, **method_kwargs)
                 succes = True
                 return result
 
@@ -3,11 +3,29 @@
 """
 AUDITOR BASE - Gardien de la Conformité et des Standards
 =========================================================
-Version: 1.2 - Chemins corrigés avec dossier base
+Version: 1.3 - Validateurs de contrats compilés et mis en cache
+
+Validation runtime des dataclasses :
+1.  **Compilation unique** : Les type hints d'une dataclass sont résolus UNE fois ;
+    le validateur produit est une closure qui ne vérifie que les champs `List[Dataclass]`.
+    Il est rangé dans un registre par type (`_VALIDATEURS`).
+2.  **Mode** : `complet` (chaque appel), `echantillon` (1 appel sur N) ou `off` (production).
+    Variables d'environnement `SECONDMIND_VALIDATION` et `SECONDMIND_VALIDATION_N`,
+    ou `AuditorBase.configurer_validation(...)`.
+3.  **Violations par lot** : `runtime_violations.jsonl` est écrit par un thread unique
+    (une ouverture de fichier par lot, et non par violation).
+4.  **Mémoire redirigée** : Variable d'environnement `SECONDMIND_MEMOIRE` (ou
+    `AuditorBase.rediriger_memoire(...)`) : tous les chemins `memoire/...` pointent vers un
+    autre dossier (corpus synthétique des benchmarks), le reste du projet est inchangé.
 """
 
 import json
 import yaml
+import atexit
+import itertools
+import queue
+import threading
+import time
 from pathlib import Path
 import os
 from datetime import datetime
@@ -21,11 +39,150 @@ from typing import (
     get_type_hints,
     get_origin,
     get_args,
+    Callable,
 )
 from pathlib import Path
 
 # Imports depuis le dossier base - CHEMINS CORRECTS
 from agentique.base.config_paths import ROOT_DIR
+from agentique.base.metriques import registre_metriques
+
+
+# =============================================================================
+# ⚙️ VALIDATEURS COMPILÉS (un par type de dataclass)
+# =============================================================================
+
+Validateur = Callable[[Any], Optional[str]]  # None = conforme, sinon message de violation
+
+_VALIDATEURS: Dict[type, Validateur] = {}
+_verrou_validateurs = threading.Lock()
+
+
+def _validateur_neutre(instance: Any) -> Optional[str]:
+    return None
+
+
+def compiler_validateur(classe: type) -> Validateur:
+    """
+    Résout les type hints de `classe` une seule fois et retourne une closure
+    ne vérifiant que les champs `List[Dataclass]` (premier élément de la liste).
+    """
+    try:
+        type_hints = get_type_hints(classe)
+    except Exception as e:
+        print(f"⚠️ Erreur lors de la compilation du validateur {classe.__name__} : {e}")
+        return _validateur_neutre
+
+    controles: List[Tuple[str, str]] = []
+    for champ in fields(classe):
+        type_attendu = type_hints.get(champ.name)
+        origin = get_origin(type_attendu)
+        if origin is list or origin is List:
+            args = get_args(type_attendu)
+            if args and isinstance(args[0], type):
+                controles.append((champ.name, args[0].__name__))
+
+    if not controles:
+        return _validateur_neutre
+
+    nom_classe = classe.__name__
+    controles = tuple(controles)
+
+    def valider(instance: Any) -> Optional[str]:
+        for nom_champ, nom_attendu in controles:
+            valeur = getattr(instance, nom_champ, None)
+            if valeur and isinstance(valeur, list):
+                premier = valeur[0]
+                if hasattr(premier, "__dataclass_fields__"):
+                    nom_item = type(premier).__name__
+                    if nom_item != nom_attendu:
+                        return f"Champ '{nom_champ}' contient {nom_item} au lieu de {nom_attendu}"
+        return None
+
+    valider.__name__ = f"valider_{nom_classe}"
+    return valider
+
+
+def validateur_pour(classe: type) -> Validateur:
+    """Validateur compilé pour ce type (compilé au premier appel, puis servi depuis le registre)."""
+    validateur = _VALIDATEURS.get(classe)
+    if validateur is None:
+        with _verrou_validateurs:
+            validateur = _VALIDATEURS.get(classe)
+            if validateur is None:
+                validateur = _VALIDATEURS[classe] = compiler_validateur(classe)
+    return validateur
+
+
+# =============================================================================
+# 💾 ÉCRITURE PAR LOT DES VIOLATIONS
+# =============================================================================
+
+
+class EcrivainViolations:
+    """File + thread unique : les violations sont ajoutées à leur fichier JSONL par lot."""
+
+    def __init__(self, delai_lot_s: float = 0.5):
+        self.delai_lot_s = delai_lot_s
+        self._file: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._verrou = threading.Lock()
+        atexit.register(self.vider)
+
+    def deposer(self, chemin: Path, entree: Dict[str, Any]):
+        if self._thread is None:
+            with self._verrou:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._boucle, daemon=True, name="AuditorViolations"
+                    )
+                    self._thread.start()
+        self._file.put((chemin, entree))
+
+    def vider(self, timeout: float = 5.0) -> bool:
+        """Attend l'écriture de tout ce qui est en file (tests, arrêt)."""
+        if self._thread is None:
+            return True
+        fait = threading.Event()
+        self._file.put((None, fait))
+        return fait.wait(timeout)
+
+    def _boucle(self):
+        while True:
+            lot = [self._file.get()]
+            if lot[0][0] is not None:
+                time.sleep(self.delai_lot_s)  # Fenêtre de regroupement
+            while True:
+                try:
+                    lot.append(self._file.get_nowait())
+                except queue.Empty:
+                    break
+            self._ecrire(lot)
+
+    def _ecrire(self, lot):
+        par_fichier: Dict[Path, List[str]] = {}
+        signaux = []
+        for chemin, entree in lot:
+            if chemin is None:
+                signaux.append(entree)
+            else:
+                par_fichier.setdefault(chemin, []).append(
+                    json.dumps(entree, ensure_ascii=False) + "\n"
+                )
+        for chemin, lignes in par_fichier.items():
+            try:
+                with open(chemin, "a", encoding="utf-8") as f:
+                    f.write("".join(lignes))
+            except Exception as e:
+                print(f"⚠️ AUDITOR BASE: Impossible de persister {len(lignes)} violation(s): {e}")
+        for signal in signaux:
+            signal.set()
+
+
+ECRIVAIN_VIOLATIONS = EcrivainViolations()
+
+# Agents dont les chemins ont déjà été vérifiés sur disque (cf. verifier_integrite_systeme)
+_INTEGRITE_VERIFIEE: set = set()
 
 
 @dataclass
@@ -86,6 +243,27 @@ class StandardsAgents:
         "stats_specifiques": ["fragments_ajoutes", "recherches_effectuees"],
     }
 
+    journalhistorique = {
+        "paths": {
+            "agent_dir": "agentique/sous_agents_gouvernes/agent_Memoire",
+            "config": "agentique/sous_agents_gouvernes/agent_Memoire/config_memoire.yaml",
+            "historique": "memoire/historique",
+            "logs": "agentique/sous_agents_gouvernes/agent_Memoire/logs",
+        },
+        "config": {},
+        "stats_specifiques": [],
+    }
+
+    ecrivainwalbrute = {
+        "paths": {
+            "agent_dir": "agentique/sous_agents_gouvernes/agent_Memoire",
+            "brute": "memoire/brute",
+            "logs": "agentique/sous_agents_gouvernes/agent_Memoire/logs",
+        },
+        "config": {},
+        "stats_specifiques": [],
+    }
+
     processeurbrutepersistante = {
         "paths": {
             "agent_dir": "agentique/sous_agents_gouvernes/agent_Memoire",
@@ -295,6 +473,42 @@ class AuditorBase:
     Vérifie seulement l'existence
     """
 
+    # Mode de validation runtime partagé par tous les auditors : complet | echantillon | off
+    mode_validation: str = os.environ.get("SECONDMIND_VALIDATION", "complet").lower()
+    echantillon_validation: int = max(1, int(os.environ.get("SECONDMIND_VALIDATION_N", "10")))
+    _compteur_validation = itertools.count()
+    # Racine alternative des chemins `memoire/...` (None = ROOT_DIR / "memoire")
+    racine_memoire: Optional[str] = os.environ.get("SECONDMIND_MEMOIRE") or None
+
+    @classmethod
+    def rediriger_memoire(cls, dossier: Optional[str] = None):
+        """Redirige les chemins `memoire/...` vers `dossier` (None : retour à la mémoire du projet)."""
+        cls.racine_memoire = str(dossier) if dossier else None
+
+    @classmethod
+    def resoudre_chemin(cls, relatif: str) -> Path:
+        """Chemin absolu d'un chemin relatif à la racine (redirection mémoire comprise)."""
+        relatif = str(relatif).replace("\\", "/")
+        if cls.racine_memoire and (relatif == "memoire" or relatif.startswith("memoire/")):
+            return Path(cls.racine_memoire) / relatif[len("memoire"):].lstrip("/")
+        return ROOT_DIR / relatif
+
+    @classmethod
+    def configurer_validation(cls, mode: str = "complet", echantillon: int = 10):
+        """Bascule le mode de validation runtime (ex: 'off' en production)."""
+        if mode not in ("complet", "echantillon", "off"):
+            raise ValueError(f"Mode de validation inconnu : {mode}")
+        cls.mode_validation = mode
+        cls.echantillon_validation = max(1, int(echantillon))
+
+    def _doit_valider(self) -> bool:
+        mode = AuditorBase.mode_validation
+        if mode == "complet":
+            return True
+        if mode == "off":
+            return False
+        return next(AuditorBase._compteur_validation) % AuditorBase.echantillon_validation == 0
+
     def __init__(self, nom_agent: str = "AuditorBase"):
         self.nom_agent = nom_agent.lower()
         self.standards = StandardsAgents()
@@ -323,8 +537,11 @@ class AuditorBase:
             / "runtime_violations.jsonl"
         )
 
-        # 4. Vérification physique
-        self.verifier_integrite_systeme()
+        # 4. Vérification physique (une fois par agent et par processus :
+        #    valider_echange et les moteurs multi-instances recréent des auditors)
+        if self.nom_agent not in _INTEGRITE_VERIFIEE:
+            _INTEGRITE_VERIFIEE.add(self.nom_agent)
+            self.verifier_integrite_systeme()
 
     def get_config(self) -> Dict[str, Any]:
         """Retourne la config pour cet agent"""
@@ -369,8 +586,8 @@ class AuditorBase:
         )
 
         if path_value:
-            # 4. Construit le chemin absolu en utilisant ROOT_DIR importé en haut du fichier
-            return str(ROOT_DIR / path_value)
+            # 4. Construit le chemin absolu depuis ROOT_DIR (ou la mémoire redirigée)
+            return str(self.resoudre_chemin(path_value))
 
         print(
             f"AVERTISSEMENT AUDITOR: Type de chemin '{path_type}' non trouvé pour l'agent '{nom_agent}'."
@@ -419,7 +636,7 @@ class AuditorBase:
 
     def _persister_violation(self, type_violation: str, message: str, contexte: str):
         """
-        Écrit la violation dans un fichier JSONL partagé.
+        Dépose la violation pour le fichier JSONL partagé (écrit par lot, hors thread appelant).
         L'AgentAuditor pourra relire ce fichier pour son rapport global.
         """
         try:
@@ -435,9 +652,7 @@ class AuditorBase:
             if not self.runtime_log_path.parent.exists():
                 return  # On évite de créer des dossiers depuis la base si possible, ou on log silencieusement
 
-            # Mode 'append' pour ajouter la ligne sans écraser l'historique
-            with open(self.runtime_log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            ECRIVAIN_VIOLATIONS.deposer(self.runtime_log_path, entry)
 
         except Exception as e:
             print(f"⚠️ AUDITOR BASE: Impossible de persister la violation: {e}")
@@ -446,7 +661,11 @@ class AuditorBase:
         """
         Validation stricte du format de sortie.
         Enclenche maintenant une vérification PROFONDE (Deep Type Checking).
+        Selon `mode_validation`, l'appel peut être ignoré (off / hors échantillon).
         """
+        if not self._doit_valider():
+            return True
+
         valid = self._validation_generique(data, self.get_formats_sortie())
 
         if not valid:
@@ -498,47 +717,23 @@ class AuditorBase:
 
     def _valider_champs_profond(self, dataclass_instance: Any) -> bool:
         """
-        Vérifie récursivement que le contenu des champs correspond aux types déclarés.
+        Vérifie que le contenu des champs correspond aux types déclarés,
+        via le validateur compilé de la classe (registre `_VALIDATEURS`).
         """
         try:
-            type_hints = get_type_hints(dataclass_instance.__class__)
-
-            for field in fields(dataclass_instance):
-                nom_champ = field.name
-                valeur = getattr(dataclass_instance, nom_champ)
-                type_attendu = type_hints.get(nom_champ)
-
-                if valeur is None:
-                    continue
-
-                # Gestion des LISTES (Generic types comme List[Regle])
-                origin = get_origin(type_attendu)
-                if origin is list or origin is List:
-                    args = get_args(type_attendu)
-                    if not args:
-                        continue
-
-                    type_item_attendu = args[0]
-
-                    if isinstance(valeur, list) and len(valeur) > 0:
-                        premier_item = valeur[0]
-                        if is_dataclass(premier_item):
-                            nom_classe_item = premier_item.__class__.__name__
-                            nom_classe_attendue = type_item_attendu.__name__
-
-                            if nom_classe_item != nom_classe_attendue:
-                                msg = f"Champ '{nom_champ}' contient {nom_classe_item} au lieu de {nom_classe_attendue}"
-                                print(f"🚨 ALERTE TYPE PROFONDE : {msg}")
-
-                                # ✅ PERSISTANCE
-                                self._persister_violation(
-                                    "VIOLATION_CONTRAT_PROFOND",
-                                    msg,
-                                    f"Dataclass {dataclass_instance.__class__.__name__}",
-                                )
-                                return False
+            violation = validateur_pour(type(dataclass_instance))(dataclass_instance)
+            if violation is None:
+                return True
 
-            return True
+            print(f"🚨 ALERTE TYPE PROFONDE : {violation}")
+
+            # ✅ PERSISTANCE
+            self._persister_violation(
+                "VIOLATION_CONTRAT_PROFOND",
+                violation,
+                f"Dataclass {dataclass_instance.__class__.__name__}",
+            )
+            return False
 
         except Exception as e:
             print(f"⚠️ Erreur lors de la validation profonde : {e}")
@@ -612,7 +807,7 @@ class AuditorBase:
                 continue
 
             # Construction du chemin absolu
-            full_path = ROOT_DIR / val
+            full_path = self.resoudre_chemin(val)
 
             if not full_path.exists():
                 missing.append(f"{key} -> {full_path}")
@@ -627,12 +822,16 @@ class AuditorBase:
     def enregistrer_stat(self, nom_methode: str, donnees: Dict[str, Any]) -> None:
         """
         Enregistre une statistique d'exécution provenant de MetaAgent.
-        Sert de pont vers le système de logs ou de dashboarding.
+        Sert de pont vers le registre de métriques (histogrammes p50/p95/p99,
+        export Prometheus `/metrics`, rollups périodiques).
         Accepte silencieusement les données pour ne pas briser le flux.
         """
-        # TODO: Connecter à un writer asynchrone pour stats_execution.json
-        # Pour l'instant, on laisse passer pour éviter le crash dans META_agent
-        pass
+        registre_metriques().observer(
+            self.nom_agent,
+            nom_methode,
+            donnees.get("duree_ms", 0.0),
+            donnees.get("succes", True),
+        )
 
     def signal_gouvernance(self, message: str, niveau: str = "ALERTE") -> None:
         """
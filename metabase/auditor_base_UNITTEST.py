@@ -7,11 +7,17 @@ Objectif : Valider la résolution des chemins, la validation de types profonde e
 """
 
 import unittest
+import json
+import shutil
+import tempfile
 from dataclasses import dataclass, field
 from typing import List, Optional
 from pathlib import Path
+from unittest.mock import patch
 
-from agentique.base.auditor_base import AuditorBase
+from agentique.base.auditor_base import (
+    AuditorBase, ECRIVAIN_VIOLATIONS, _VALIDATEURS, validateur_pour,
+)
 from agentique.base.config_paths import ROOT_DIR
 
 
@@ -54,6 +60,11 @@ class MockAuditor(AuditorBase):
 class TestAuditorBase(unittest.TestCase):
     def setUp(self):
         self.auditor = MockAuditor()
+        # Violations écrites hors de l'arbre du dépôt
+        dossier = Path(tempfile.mkdtemp())
+        self.auditor.runtime_log_path = dossier / "test_logs.jsonl"
+        self.addCleanup(shutil.rmtree, dossier, ignore_errors=True)
+        self.addCleanup(ECRIVAIN_VIOLATIONS.vider)
         self.auditor_real = AuditorBase("semi")  # Pour tester les vrais chemins
 
     # =========================================================================
@@ -70,6 +81,19 @@ class TestAuditorBase(unittest.TestCase):
             self.assertIn(str(ROOT_DIR), path_logs)
             self.assertTrue(path_logs.endswith("logs"))
 
+    def test_redirection_memoire(self):
+        """Seuls les chemins `memoire/...` suivent la redirection (corpus de benchmark)."""
+        try:
+            AuditorBase.rediriger_memoire("/tmp/corpus_bench/memoire")
+            self.assertEqual(
+                self.auditor_real.get_path("historique", "memoire"),
+                str(Path("/tmp/corpus_bench/memoire/historique")),
+            )
+            self.assertIn(str(ROOT_DIR), self.auditor_real.get_path("logs"))
+        finally:
+            AuditorBase.rediriger_memoire(None)
+        self.assertIn(str(ROOT_DIR), self.auditor_real.get_path("historique", "memoire"))
+
     def test_chemin_inconnu(self):
         """Vérifie le comportement si le chemin n'existe pas dans la config."""
         path = self.auditor_real.get_path("chemin_inexistant_imaginaire")
@@ -133,6 +157,48 @@ class TestAuditorBase(unittest.TestCase):
         res = self.auditor.valider_utilisation_complete(objet_vide)
         self.assertTrue(res)
 
+    # =========================================================================
+    # 5. VALIDATEURS COMPILÉS, MODES ET VIOLATIONS PAR LOT
+    # =========================================================================
+
+    def test_validateur_compile_une_fois(self):
+        """Les type hints sont résolus au premier appel, puis le validateur vient du registre."""
+        _VALIDATEURS.pop(ItemComplexe, None)
+        with patch("agentique.base.auditor_base.get_type_hints", wraps=__import__("typing").get_type_hints) as hints:
+            for _ in range(5):
+                self.auditor._valider_champs_profond(ItemComplexe(titre="R", items=[ItemSimple("a", 1)]))
+        self.assertEqual(hints.call_count, 1)
+        self.assertIs(validateur_pour(ItemComplexe), _VALIDATEURS[ItemComplexe])
+
+    def test_modes_validation(self):
+        item_interdit = ItemSimple(nom="Non", valeur=0)
+        try:
+            AuditorBase.configurer_validation("off")
+            self.assertTrue(self.auditor.valider_format_sortie(item_interdit))
+
+            AuditorBase.configurer_validation("echantillon", echantillon=4)
+            resultats = [self.auditor.valider_format_sortie(item_interdit) for _ in range(8)]
+            self.assertEqual(resultats.count(False), 2)
+        finally:
+            AuditorBase.configurer_validation("complet")
+
+    def test_violations_ecrites_par_lot(self):
+        dossier = Path(tempfile.mkdtemp())
+        try:
+            self.auditor.runtime_log_path = dossier / "runtime_violations.jsonl"
+            intrus = ItemComplexe(titre="Root", items=[ItemIntrus()])
+            with patch("builtins.open", wraps=open) as ouverture:
+                for _ in range(10):
+                    self.auditor._valider_champs_profond(intrus)
+                ECRIVAIN_VIOLATIONS.vider()
+
+            lignes = (dossier / "runtime_violations.jsonl").read_text(encoding="utf-8").splitlines()
+            self.assertEqual(len(lignes), 10)
+            self.assertEqual(json.loads(lignes[0])["type"], "VIOLATION_CONTRAT_PROFOND")
+            self.assertLessEqual(ouverture.call_count, 2)
+        finally:
+            shutil.rmtree(dossier, ignore_errors=True)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CACHE_RESULTATS - Cache versionné des résultats de récupération (RAG)
+
+Deux tours successifs portant sur le même prompt (relance, reformulation à la casse
+près, rejeu) refont aujourd'hui toute la chaîne : encodage, FAISS, swap de résumés,
+règles symboliques et sémantiques, READMEs, scoring du Juge. Ce module permet de
+servir ces résultats instantanément SANS jamais servir un résultat périmé :
+
+1.  **Versions par magasin** (`VersionsMagasins`, singleton) : un compteur par source de
+    données ("vectoriel", "regles", "readme", "code"), incrémenté par les écrivains
+    (`MoteurVectoriel.ajouter_fragment`, sauvegarde de règles, ré-indexation du code).
+    Les magasins sans point d'écriture unique (READMEs déposés à la main) exposent une
+    **sonde** : une signature calculée à la lecture (ex: nombre + mtime max des fichiers).
+2.  **Cache LRU** (`CacheResultats`) : clé = (prompt normalisé, intention), entrée
+    étiquetée par l'instantané des versions des magasins dont elle dépend. Une entrée
+    dont l'étiquette diffère des versions courantes est évincée, jamais retournée.
+3.  **Jeton pris AVANT le calcul** : une écriture survenue pendant la recherche rend
+    l'entrée immédiatement périmée (pas de course lecture/écriture).
+
+Les valeurs sont copiées (deepcopy) à l'entrée et à la sortie : les appelants peuvent
+muter le résultat (ex: insertion du protocole d'alerte) sans corrompre le cache.
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from fnmatch import fnmatch
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+MAGASINS: Tuple[str, ...] = ("vectoriel", "regles", "readme", "code")
+
+Instantane = Tuple[Tuple[str, Any], ...]
+
+
+def normaliser_prompt(prompt: str) -> str:
+    """Casse et espaces neutralisés : "  Bonjour\\n SecondMind " == "bonjour secondmind"."""
+    return " ".join(str(prompt or "").split()).casefold()
+
+
+def cle_intention(intention: Any) -> Tuple[str, str, str]:
+    """(sujet, action, catégorie) d'un ResultatIntention (valeurs des Enums), ou vide."""
+    if intention is None:
+        return ("", "", "")
+    return tuple(
+        str(getattr(getattr(intention, champ, None), "value", getattr(intention, champ, "")) or "")
+        for champ in ("sujet", "action", "categorie")
+    )
+
+
+def signature_fichiers(dossier: Any, motif: str = "*", recursif: bool = False) -> Tuple[int, int]:
+    """
+    Signature (nombre, mtime max en ns) des fichiers de `dossier` correspondant à `motif`.
+    Sonde type pour les magasins alimentés hors du pipeline (dépôt manuel de fichiers).
+    """
+    if not dossier or not os.path.isdir(dossier):
+        return (0, 0)
+    nombre, mtime_max = 0, 0
+    a_visiter = [str(dossier)]
+    while a_visiter:
+        with os.scandir(a_visiter.pop()) as entrees:
+            for entree in entrees:
+                if entree.is_dir(follow_symlinks=False):
+                    if recursif:
+                        a_visiter.append(entree.path)
+                elif fnmatch(entree.name, motif):
+                    nombre += 1
+                    mtime_max = max(mtime_max, entree.stat().st_mtime_ns)
+    return (nombre, mtime_max)
+
+
+class VersionsMagasins:
+    """
+    Registre global (singleton) des versions des magasins de données.
+
+    Attributes:
+        _compteurs: Version courante par magasin (incrémentée à chaque écriture).
+        _sondes: Signature calculée à la lecture, pour les magasins sans écrivain unique.
+    """
+
+    _instance = None
+    _verrou_instance = threading.Lock()
+
+    def __new__(cls):
+        with cls._verrou_instance:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._verrou = threading.Lock()
+                instance._compteurs: Dict[str, int] = {m: 0 for m in MAGASINS}
+                instance._sondes: Dict[str, Callable[[], Hashable]] = {}
+                cls._instance = instance
+        return cls._instance
+
+    def incrementer(self, magasin: str) -> int:
+        """Signale une écriture dans `magasin` : toutes les entrées qui en dépendent sont périmées."""
+        with self._verrou:
+            self._compteurs[magasin] = self._compteurs.get(magasin, 0) + 1
+            return self._compteurs[magasin]
+
+    def enregistrer_sonde(self, magasin: str, sonde: Callable[[], Hashable]):
+        """Associe à `magasin` une signature recalculée à chaque lecture des versions."""
+        with self._verrou:
+            self._sondes[magasin] = sonde
+
+    def version(self, magasin: str) -> Any:
+        with self._verrou:
+            compteur = self._compteurs.get(magasin, 0)
+            sonde = self._sondes.get(magasin)
+        if sonde is None:
+            return compteur
+        try:
+            return (compteur, sonde())
+        except Exception:
+            return (compteur, time.monotonic())  # Sonde en échec : jamais de hit
+
+    def instantane(self, magasins: Iterable[str] = MAGASINS) -> Instantane:
+        return tuple((m, self.version(m)) for m in magasins)
+
+    def reinitialiser(self):
+        """Remet les compteurs à zéro et retire les sondes (tests)."""
+        with self._verrou:
+            self._compteurs = {m: 0 for m in MAGASINS}
+            self._sondes = {}
+
+
+def versions_magasins() -> VersionsMagasins:
+    """Accès au registre global."""
+    return VersionsMagasins()
+
+
+def signaler_ecriture(magasin: str) -> int:
+    """Raccourci pour les écrivains : `signaler_ecriture("regles")`."""
+    return versions_magasins().incrementer(magasin)
+
+
+class CacheResultats:
+    """
+    Cache LRU thread-safe, invalidé par versions de magasins.
+
+    Usage :
+        jeton = cache.jeton()
+        resultat = cache.obtenir(prompt, intention)
+        if resultat is None:
+            resultat = calcul_couteux()
+            cache.stocker(prompt, intention, resultat, jeton)
+
+    Attributes:
+        magasins: Magasins dont dépendent les résultats (clé de version).
+        taille_max: Nombre d'entrées conservées (LRU).
+        ttl_s: Durée de vie maximale d'une entrée (0 = illimitée, seules les versions comptent).
+    """
+
+    def __init__(
+        self,
+        nom: str,
+        magasins: Iterable[str] = MAGASINS,
+        taille_max: int = 256,
+        ttl_s: float = 0.0,
+        actif: bool = True,
+    ):
+        self.nom = nom
+        self.magasins = tuple(magasins)
+        self.taille_max = max(1, int(taille_max))
+        self.ttl_s = float(ttl_s or 0.0)
+        self.actif = actif
+        self._versions = versions_magasins()
+        self._verrou = threading.Lock()
+        self._entrees: "OrderedDict[Tuple, Tuple[Instantane, float, Any]]" = OrderedDict()
+        self._stats = {"hits": 0, "miss": 0, "perimes": 0}
+
+    @classmethod
+    def depuis_config(cls, nom: str, config: Optional[Dict], magasins: Iterable[str]) -> "CacheResultats":
+        """Construit le cache depuis la section YAML `cache_resultats` (actif, taille_max, ttl_s)."""
+        config = config or {}
+        return cls(
+            nom,
+            magasins=magasins,
+            taille_max=config.get("taille_max", 256),
+            ttl_s=config.get("ttl_s", 0.0),
+            actif=config.get("actif", True),
+        )
+
+    @staticmethod
+    def cle(prompt: str, intention: Any = None, discriminant: Hashable = None) -> Tuple:
+        """`discriminant` : entrée supplémentaire du calcul (ex: titres des candidats RAG)."""
+        return (normaliser_prompt(prompt), cle_intention(intention), discriminant)
+
+    def jeton(self) -> Instantane:
+        """Versions courantes, à prendre AVANT le calcul du résultat."""
+        return self._versions.instantane(self.magasins)
+
+    def obtenir(self, prompt: str, intention: Any = None, discriminant: Hashable = None) -> Optional[Any]:
+        """Copie du résultat en cache s'il est encore à jour, sinon None."""
+        if not self.actif:
+            return None
+        cle = self.cle(prompt, intention, discriminant)
+        courant = self.jeton()
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is None:
+                self._stats["miss"] += 1
+                return None
+            versions, horodatage, valeur = entree
+            if versions != courant or (self.ttl_s and time.monotonic() - horodatage > self.ttl_s):
+                del self._entrees[cle]
+                self._stats["perimes"] += 1
+                self._stats["miss"] += 1
+                return None
+            self._entrees.move_to_end(cle)
+            self._stats["hits"] += 1
+        return copy.deepcopy(valeur)
+
+    def stocker(
+        self,
+        prompt: str,
+        intention: Any,
+        valeur: Any,
+        jeton: Optional[Instantane] = None,
+        discriminant: Hashable = None,
+    ):
+        """Mémorise `valeur` sous les versions `jeton` (ou courantes si absent)."""
+        if not self.actif or valeur is None:
+            return
+        cle = self.cle(prompt, intention, discriminant)
+        entree = (jeton if jeton is not None else self.jeton(), time.monotonic(), copy.deepcopy(valeur))
+        with self._verrou:
+            self._entrees[cle] = entree
+            self._entrees.move_to_end(cle)
+            while len(self._entrees) > self.taille_max:
+                self._entrees.popitem(last=False)
+
+    def vider(self):
+        with self._verrou:
+            self._entrees.clear()
+
+    def statistiques(self) -> Dict[str, Any]:
+        with self._verrou:
+            stats = dict(self._stats, taille=len(self._entrees))
+        total = stats["hits"] + stats["miss"]
+        stats["taux_hit"] = round(stats["hits"] / total, 4) if total else 0.0
+        return stats
+
+
+__all__ = [
+    "MAGASINS",
+    "CacheResultats",
+    "VersionsMagasins",
+    "cle_intention",
+    "normaliser_prompt",
+    "signaler_ecriture",
+    "signature_fichiers",
+    "versions_magasins",
+]
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: Cache versionné des résultats RAG
+Cible : agentique/base/cache_resultats.py
+Objectif : Valider la normalisation des clés, l'invalidation par version de magasin
+(compteurs, sondes, jeton pris avant calcul), l'isolation des copies et la LRU.
+"""
+
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+from agentique.base.cache_resultats import (
+    CacheResultats,
+    VersionsMagasins,
+    signaler_ecriture,
+    signature_fichiers,
+    versions_magasins,
+)
+
+
+def _intention(sujet="Script", action="Coder", categorie="Analyser"):
+    return SimpleNamespace(
+        sujet=SimpleNamespace(value=sujet),
+        action=SimpleNamespace(value=action),
+        categorie=SimpleNamespace(value=categorie),
+    )
+
+
+class TestCacheResultats(unittest.TestCase):
+    def setUp(self):
+        versions_magasins().reinitialiser()
+        self.cache = CacheResultats("test", magasins=("vectoriel", "regles"))
+
+    def tearDown(self):
+        versions_magasins().reinitialiser()
+
+    def test_singleton(self):
+        self.assertIs(VersionsMagasins(), versions_magasins())
+
+    def test_hit_prompt_normalise_et_copie_isolee(self):
+        self.cache.stocker("Bonjour  SecondMind", _intention(), {"souvenirs": ["A"]})
+
+        resultat = self.cache.obtenir("  bonjour\nsecondmind ", _intention())
+        self.assertEqual(resultat, {"souvenirs": ["A"]})
+        resultat["souvenirs"].append("MUTATION")
+        self.assertEqual(self.cache.obtenir("bonjour secondmind", _intention()), {"souvenirs": ["A"]})
+
+        self.assertIsNone(self.cache.obtenir("bonjour secondmind", _intention(categorie="Coder")))
+        self.assertIsNone(self.cache.obtenir("bonjour secondmind", _intention(), discriminant=("M1",)))
+        self.assertEqual(self.cache.statistiques()["hits"], 2)
+
+    def test_ecriture_invalide_uniquement_les_magasins_dependants(self):
+        self.cache.stocker("q", None, "R1")
+        signaler_ecriture("code")  # Magasin non suivi par ce cache
+        self.assertEqual(self.cache.obtenir("q"), "R1")
+
+        signaler_ecriture("regles")
+        self.assertIsNone(self.cache.obtenir("q"))
+        self.assertEqual(self.cache.statistiques()["perimes"], 1)
+
+    def test_ecriture_pendant_calcul_jamais_servie(self):
+        jeton = self.cache.jeton()
+        signaler_ecriture("vectoriel")  # Ajout concurrent pendant la recherche
+        self.cache.stocker("q", None, "ANCIEN", jeton)
+        self.assertIsNone(self.cache.obtenir("q"))
+
+    def test_lru_et_desactivation(self):
+        cache = CacheResultats("lru", magasins=("vectoriel",), taille_max=2)
+        for prompt in ("a", "b"):
+            cache.stocker(prompt, None, prompt.upper())
+        cache.obtenir("a")  # "a" redevient récent
+        cache.stocker("c", None, "C")
+        self.assertIsNone(cache.obtenir("b"))
+        self.assertEqual(cache.obtenir("a"), "A")
+
+        inactif = CacheResultats.depuis_config("off", {"actif": False}, magasins=("vectoriel",))
+        inactif.stocker("a", None, "A")
+        self.assertIsNone(inactif.obtenir("a"))
+
+
+class TestSondes(unittest.TestCase):
+    def setUp(self):
+        versions_magasins().reinitialiser()
+        self.dossier = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        versions_magasins().reinitialiser()
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def test_readme_depose_a_la_main(self):
+        (self.dossier / "sous").mkdir()
+        versions_magasins().enregistrer_sonde(
+            "readme", lambda: signature_fichiers(self.dossier, "README_*.md", recursif=True)
+        )
+        cache = CacheResultats("readme", magasins=("readme",))
+        cache.stocker("q", None, "SANS_README")
+        self.assertEqual(cache.obtenir("q"), "SANS_README")
+
+        (self.dossier / "notes.txt").write_text("ignoré", encoding="utf-8")
+        self.assertEqual(cache.obtenir("q"), "SANS_README")
+
+        (self.dossier / "sous" / "README_agent.md").write_text("# Doc", encoding="utf-8")
+        self.assertIsNone(cache.obtenir("q"))
+        self.assertEqual(signature_fichiers(self.dossier / "absent"), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
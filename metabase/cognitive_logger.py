@@ -1,11 +1,229 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+"""
+COGNITIVE LOGGER - Journalisation des agents (console + JSONL par session)
+
+Le chemin chaud (`penser`) ne touche jamais le disque :
+1.  **Puits asynchrone** : `_log_to_handlers` dépose l'entrée dans une file bornée
+    (put_nowait). Un thread d'écriture unique sérialise, regroupe par fichier et écrit
+    par lot sur des handles gardés ouverts.
+2.  **Console** : Les handlers Python passent par un QueueHandler ; un QueueListener
+    partagé écrit sur la console hors du thread appelant.
+3.  **Rotation** : Par taille (`taille_max_octets`) et par âge (`rotation_s`).
+    L'ancien fichier est renommé `session_<id>.<horodatage>.jsonl`.
+4.  **Échantillonnage par niveau** : `echantillonnage={"INFO": 4}` garde 1 entrée INFO
+    sur 4. WARNING/ERROR ne sont jamais échantillonnés. File pleine = entrée comptée
+    comme perdue, jamais d'attente.
+"""
+
 import os
 import json
 import uuid
+import queue
+import atexit
+import itertools
+import threading
+import time
+import traceback
+import logging
+import logging.handlers
 from pathlib import Path
 from datetime import datetime
-import logging
+from typing import Dict, Optional
+
+from agentique.base.traceur import trace_courante_id
+
+NIVEAUX_NON_ECHANTILLONNES = {"WARNING", "ERROR", "CRITICAL"}
+
+
+class PuitsJournal:
+    """
+    Écrivain JSONL asynchrone partagé par tous les CognitiveLogger (singleton).
+
+    Attributes:
+        taille_max_octets (int): Taille déclenchant la rotation d'un fichier.
+        rotation_s (float): Âge maximal d'un fichier ouvert avant rotation.
+        echantillonnage (dict): Niveau -> N (garder 1 entrée sur N).
+        statistiques (dict): Compteurs écrites / echantillonnees / perdues / rotations.
+    """
+
+    _instance = None
+    _verrou_instance = threading.Lock()
+
+    def __new__(cls):
+        with cls._verrou_instance:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._initialiser()
+                cls._instance = instance
+        return cls._instance
+
+    def _initialiser(self):
+        self.taille_max_octets = 20 * 1024 * 1024
+        self.rotation_s = 24 * 3600.0
+        self.echantillonnage: Dict[str, int] = {}
+        self.taille_lot = 500
+        self.delai_lot_s = 0.2
+        self._compteurs: Dict[str, itertools.count] = {}
+        self._file: "queue.Queue" = queue.Queue(maxsize=20000)
+        self._handles: Dict[Path, list] = {}  # chemin -> [handle, ouvert_le, taille]
+        self._thread: Optional[threading.Thread] = None
+        self._verrou_demarrage = threading.Lock()
+        self.statistiques = {"ecrites": 0, "echantillonnees": 0, "perdues": 0, "rotations": 0}
+
+        # Console : un seul handler réel, alimenté par QueueHandler depuis les agents
+        self.file_console: "queue.Queue" = queue.Queue(-1)
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(logging.Formatter('[%(name)s] %(levelname)s: [%(message)s]'))
+        self._ecouteur_console = logging.handlers.QueueListener(
+            self.file_console, console_handler, respect_handler_level=True
+        )
+        self._ecouteur_console.start()
+        atexit.register(self.fermer)
+
+    def configurer(self, taille_max_octets: Optional[int] = None, rotation_s: Optional[float] = None,
+                   echantillonnage: Optional[Dict[str, int]] = None):
+        """Ajuste rotation et échantillonnage (ex: `echantillonnage={"INFO": 4}`)."""
+        if taille_max_octets:
+            self.taille_max_octets = taille_max_octets
+        if rotation_s:
+            self.rotation_s = rotation_s
+        if echantillonnage is not None:
+            self.echantillonnage = {
+                niveau.upper(): max(1, int(n)) for niveau, n in echantillonnage.items()
+                if niveau.upper() not in NIVEAUX_NON_ECHANTILLONNES
+            }
+            self._compteurs = {}
+
+    # =========================================================================
+    # ✍️ CHEMIN CHAUD (appelant)
+    # =========================================================================
+
+    def garder(self, niveau: str) -> bool:
+        """Décision d'échantillonnage déterministe : 1 entrée sur N pour ce niveau."""
+        n = self.echantillonnage.get(niveau)
+        if not n or n == 1:
+            return True
+        compteur = self._compteurs.get(niveau)
+        if compteur is None:
+            compteur = self._compteurs.setdefault(niveau, itertools.count())
+        if next(compteur) % n == 0:
+            return True
+        self.statistiques["echantillonnees"] += 1
+        return False
+
+    def deposer(self, chemin: Path, entree: dict):
+        """Dépose une entrée sans jamais bloquer (file pleine = entrée perdue et comptée)."""
+        if self._thread is None:
+            self._demarrer()
+        try:
+            self._file.put_nowait((chemin, entree))
+        except queue.Full:
+            self.statistiques["perdues"] += 1
+
+    def _demarrer(self):
+        with self._verrou_demarrage:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._boucle_ecriture, daemon=True, name="CognitiveLoggerEcriture"
+                )
+                self._thread.start()
+
+    def vider(self, timeout: float = 5.0) -> bool:
+        """Attend que tout ce qui est en file soit écrit (tests, arrêt)."""
+        if self._thread is None:
+            return True
+        fait = threading.Event()
+        self._file.put((None, fait))
+        return fait.wait(timeout)
+
+    def fermer(self):
+        self.vider()
+        try:
+            self._ecouteur_console.stop()
+        except Exception:
+            pass
+
+    # =========================================================================
+    # 💾 THREAD D'ÉCRITURE
+    # =========================================================================
+
+    def _boucle_ecriture(self):
+        while True:
+            lot = [self._file.get()]
+            echeance = time.monotonic() + self.delai_lot_s
+            while len(lot) < self.taille_lot:
+                reste = echeance - time.monotonic()
+                if reste <= 0:
+                    break
+                try:
+                    lot.append(self._file.get(timeout=reste))
+                except queue.Empty:
+                    break
+                if lot[-1][0] is None:
+                    break  # Demande de vidage : on écrit tout de suite
+            self._ecrire_lot(lot)
+
+    def _ecrire_lot(self, lot):
+        par_fichier: Dict[Path, list] = {}
+        signaux = []
+        for chemin, entree in lot:
+            if chemin is None:
+                signaux.append(entree)
+                continue
+            try:
+                ligne = json.dumps(entree, ensure_ascii=False, default=str) + "\n"
+            except Exception as e:
+                ligne = json.dumps({"type": "error", "message": f"Entrée non sérialisable: {e}"}) + "\n"
+            par_fichier.setdefault(chemin, []).append(ligne)
+
+        for chemin, lignes in par_fichier.items():
+            try:
+                etat = self._handle(chemin)
+                donnees = "".join(lignes)
+                etat[0].write(donnees)
+                etat[0].flush()
+                etat[2] += len(donnees.encode("utf-8"))
+                self.statistiques["ecrites"] += len(lignes)
+            except Exception as e:
+                print(f"[LOGGER ERROR] Impossible d'écrire dans {chemin}: {e}")
+                etat = self._handles.pop(chemin, None)
+                if etat is not None:
+                    try:
+                        etat[0].close()
+                    except Exception:
+                        pass  # Handle déjà inutilisable : on ne garde pas le descripteur
+
+        for signal in signaux:
+            signal.set()
+
+    def _handle(self, chemin: Path) -> list:
+        """Handle ouvert pour ce fichier, après rotation éventuelle (taille ou âge)."""
+        etat = self._handles.get(chemin)
+        if etat is not None:
+            if etat[2] < self.taille_max_octets and time.time() - etat[1] < self.rotation_s:
+                return etat
+            etat[0].close()
+            self._pivoter(chemin)
+        handle = open(chemin, "a", encoding="utf-8")
+        etat = self._handles[chemin] = [handle, time.time(), chemin.stat().st_size]
+        return etat
+
+    def _pivoter(self, chemin: Path):
+        horodatage = datetime.now().strftime("%Y%m%d-%H%M%S")
+        cible = chemin.with_name(f"{chemin.stem}.{horodatage}{chemin.suffix}")
+        n = 1
+        while cible.exists():
+            cible = chemin.with_name(f"{chemin.stem}.{horodatage}-{n}{chemin.suffix}")
+            n += 1
+        os.replace(chemin, cible)
+        self.statistiques["rotations"] += 1
+
+
+def puits_journal() -> PuitsJournal:
+    """Accès au puits global."""
+    return PuitsJournal()
 
 
 class CognitiveLogger:
@@ -57,33 +275,24 @@ class CognitiveLogger:
         self.std_logger.setLevel(logging.DEBUG)
         self.std_logger.propagate = False
         
+        # Le puits asynchrone porte le fichier JSONL (et la trace d'exception) :
+        # plus de FileHandler texte synchrone qui mélangeait du texte dans le .jsonl
+        self.puits = puits_journal()
+
         # Éviter la duplication des handlers
-        if not self.std_logger.handlers:
-            # Handler console
-            if self.console_output:
-                console_handler = logging.StreamHandler()
-                console_handler.setLevel(logging.INFO)
-                formatter = logging.Formatter('[%(name)s] %(levelname)s: [%(message)s]')
-                console_handler.setFormatter(formatter)
-                self.std_logger.addHandler(console_handler)
-            
-            # Handler fichier (seulement si le fichier de log existe)
-            if self.log_file and self.log_dir and self.log_dir.exists():
-                try:
-                    file_handler = logging.FileHandler(self.log_file, encoding='utf-8')
-                    file_handler.setLevel(logging.DEBUG)
-                    file_formatter = logging.Formatter('[%(asctime)s] [%(name)s] %(levelname)s: %(message)s')
-                    file_handler.setFormatter(file_formatter)
-                    self.std_logger.addHandler(file_handler)
-                except Exception as e:
-                    if self.console_output:
-                        print(f"⚠️ [{self.nom_agent}] Impossible de créer le handler fichier: {e}")
+        if not self.std_logger.handlers and self.console_output:
+            # Handler console (écrit par le QueueListener partagé, hors du thread appelant)
+            self.std_logger.addHandler(logging.handlers.QueueHandler(self.puits.file_console))
 
     def _log_to_handlers(self, level, console_msg, json_msg, exc_info=False):
         """
-        CORRECTION: Gestion propre des logs avec le logger standard Python
+        Console via le QueueListener partagé, JSONL via le puits asynchrone.
+        Aucune écriture disque dans le thread appelant.
         """
-        # Log vers la console et fichier via le logger standard
+        if not self.puits.garder(level):
+            return
+
+        # Log vers la console via le logger standard
         log_method = getattr(self.std_logger, level.lower(), self.std_logger.info)
         
         try:
@@ -96,17 +305,19 @@ class CognitiveLogger:
             if self.console_output:
                 print(f"[LOGGER ERROR] {console_msg}")
                 if exc_info:
-                    import traceback
                     traceback.print_exc()
 
-        # Log vers le fichier JSON (si disponible)
-        if self.log_file and self.log_dir and self.log_dir.exists():
-            try:
-                with open(self.log_file, "a", encoding="utf-8") as f:
-                    f.write(json.dumps(json_msg, ensure_ascii=False) + "\n")
-            except Exception as e:
-                if self.console_output:
-                    print(f"[LOGGER ERROR] Impossible d'écrire dans {self.log_file}: {e}")
+        # Corrélation : l'ID de la trace active suit le tour jusque dans les threads de fond
+        trace_id = trace_courante_id()
+        if trace_id:
+            json_msg["correlation_id"] = trace_id
+
+        if exc_info:
+            json_msg["traceback"] = traceback.format_exc()
+
+        # Log vers le fichier JSON (si disponible) : dépôt non bloquant
+        if self.log_file:
+            self.puits.deposer(self.log_file, json_msg)
 
     def log_interaction(self, role, message, context="main"):
         entry = {
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: CognitiveLogger (puits asynchrone)
+Cible : agentique/base/cognitive_logger.py
+Objectif : Valider l'écriture par lot hors thread appelant, la rotation et l'échantillonnage par niveau.
+"""
+
+import unittest
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from agentique.base.cognitive_logger import CognitiveLogger, puits_journal
+
+
+class TestPuitsJournal(unittest.TestCase):
+    def setUp(self):
+        self.dossier = Path(tempfile.mkdtemp())
+        self.puits = puits_journal()
+        self.puits.configurer(taille_max_octets=20 * 1024 * 1024, rotation_s=24 * 3600, echantillonnage={})
+        auditor = MagicMock()
+        auditor.get_path.return_value = str(self.dossier)
+        self.logger = CognitiveLogger(nom_agent="Test", auditor=auditor, console_output=False)
+
+    def tearDown(self):
+        self.puits.vider()
+        self.puits.configurer(taille_max_octets=20 * 1024 * 1024, echantillonnage={})
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def _lignes(self):
+        self.puits.vider()
+        return [
+            json.loads(l)
+            for f in sorted(self.dossier.glob("session_*.jsonl"))
+            for l in f.read_text(encoding="utf-8").splitlines()
+        ]
+
+    def test_ecriture_asynchrone_jsonl(self):
+        for i in range(50):
+            self.logger.log_thought(f"pensée {i}")
+        self.logger.log_error("boom")
+
+        lignes = self._lignes()
+        self.assertEqual(len(lignes), 51)
+        self.assertEqual(lignes[0]["content"], "pensée 0")
+        self.assertEqual(lignes[-1]["type"], "error")
+        # Plus de lignes texte du FileHandler mêlées au JSONL
+        self.assertTrue(all("timestamp" in l for l in lignes))
+
+    def test_echantillonnage_par_niveau(self):
+        self.puits.configurer(echantillonnage={"INFO": 4, "ERROR": 10})
+        for i in range(40):
+            self.logger.info(f"info {i}")
+        for i in range(3):
+            self.logger.log_error(f"erreur {i}")
+
+        types = [l["type"] for l in self._lignes()]
+        self.assertEqual(types.count("info"), 10)
+        self.assertEqual(types.count("error"), 3)  # Jamais échantillonné
+
+    def test_rotation_par_taille(self):
+        self.puits.configurer(taille_max_octets=2000)
+        for i in range(5):
+            for _ in range(10):
+                self.logger.info("x" * 100)
+            self.puits.vider()
+
+        fichiers = list(self.dossier.glob("session_*.jsonl"))
+        self.assertGreater(len(fichiers), 1)
+        self.assertEqual(len(self._lignes()), 50)
+
+    def test_handle_ferme_sur_erreur_ecriture(self):
+        """Un handle en erreur est fermé avant d'être retiré (pas de descripteur orphelin)."""
+        chemin = self.dossier / "session_erreur.jsonl"
+        handle = MagicMock()
+        handle.write.side_effect = OSError("disque plein")
+        self.puits._handles[chemin] = [handle, time.time(), 0]
+
+        self.puits._ecrire_lot([(chemin, {"type": "info"})])
+
+        handle.close.assert_called_once()
+        self.assertNotIn(chemin, self.puits._handles)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -257,6 +257,7 @@ class ResultatIntention:
     sujet: Sujet
     action: Action
     categorie: Categorie
+    confiance: Dict[str, float] = field(default_factory=dict)  # Probabilité calibrée par axe
 
     def __post_init__(self):
         if not self.prompt:
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DEMARRAGE - Chemin de démarrage rapide (composants paresseux, cache de configuration, profil)
+
+Le backend doit accepter sa première requête en quelques secondes, alors que les
+composants lourds (torch, sentence-transformers, faiss, whoosh, whisper) en prennent
+des dizaines :
+1.  **Composants paresseux** : `@composant_paresseux` transforme une méthode fabrique en
+    attribut construit au premier accès (import du module compris), puis mis en cache
+    dans l'instance. Les accès suivants ne coûtent plus rien (descripteur non-data).
+2.  **Pré-chauffage parallèle** : `prechauffer(instance, etapes)` construit en arrière-plan,
+    étape par étape, les composants indépendants d'une même étape en parallèle.
+3.  **Cache de configuration** : `charger_yaml(chemin)` ne parse chaque YAML qu'une fois
+    (clé : chemin + mtime + taille) et retourne une copie (les agents modifient leur config).
+4.  **Profil de démarrage** : Chaque import et chaque construction est chronométré
+    (`PROFIL_DEMARRAGE.rapport_texte()`, route `/api/demarrage`), à la manière de
+    `python -X importtime` mais par composant.
+"""
+
+import copy
+import importlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import yaml
+
+
+# =============================================================================
+# ⏱️ PROFIL DE DÉMARRAGE
+# =============================================================================
+
+
+class ProfilDemarrage:
+    """
+    Chronologie des étapes de démarrage (imports, constructions, pré-chauffage).
+
+    Attributes:
+        origine (float): Instant de référence (import de ce module).
+        etapes (list): (nom, debut_s, duree_ms, thread, statut), dans l'ordre de fin.
+    """
+
+    def __init__(self):
+        self.origine = time.perf_counter()
+        self.etapes: List[Tuple[str, float, float, str, str]] = []
+        self._verrou = threading.Lock()
+        self.pret_le: Optional[float] = None
+
+    @contextmanager
+    def etape(self, nom: str):
+        debut = time.perf_counter()
+        statut = "ok"
+        try:
+            yield
+        except Exception:
+            statut = "erreur"
+            raise
+        finally:
+            duree_ms = (time.perf_counter() - debut) * 1000
+            with self._verrou:
+                self.etapes.append(
+                    (nom, debut - self.origine, duree_ms, threading.current_thread().name, statut)
+                )
+
+    def marquer_pret(self):
+        """Instant où le serveur accepte les requêtes."""
+        self.pret_le = time.perf_counter() - self.origine
+
+    def rapport(self) -> Dict[str, Any]:
+        with self._verrou:
+            etapes = list(self.etapes)
+        return {
+            "pret_apres_s": round(self.pret_le, 3) if self.pret_le is not None else None,
+            "etapes": [
+                {
+                    "nom": nom,
+                    "debut_s": round(debut, 3),
+                    "duree_ms": round(duree, 1),
+                    "thread": thread,
+                    "statut": statut,
+                }
+                for nom, debut, duree, thread, statut in sorted(etapes, key=lambda e: e[1])
+            ],
+        }
+
+    def rapport_texte(self, limite: int = 30) -> str:
+        """Tableau trié par durée décroissante (les étapes imbriquées sont incluses dans leur parent)."""
+        with self._verrou:
+            etapes = sorted(self.etapes, key=lambda e: e[2], reverse=True)[:limite]
+        lignes = [f"{'durée (ms)':>11} | {'début (s)':>9} | {'thread':<22} | étape"]
+        for nom, debut, duree, thread, statut in etapes:
+            suffixe = " ❌" if statut != "ok" else ""
+            lignes.append(f"{duree:>11.1f} | {debut:>9.2f} | {thread[:22]:<22} | {nom}{suffixe}")
+        if self.pret_le is not None:
+            lignes.append(f"🚀 Serveur prêt après {self.pret_le:.2f}s")
+        return "\n".join(lignes)
+
+
+PROFIL_DEMARRAGE = ProfilDemarrage()
+
+
+def importer(module: str, attribut: Optional[str] = None) -> Any:
+    """Import chronométré (premier import seulement ; ensuite servi par sys.modules)."""
+    with PROFIL_DEMARRAGE.etape(f"import {module}"):
+        mod = importlib.import_module(module)
+    return getattr(mod, attribut) if attribut else mod
+
+
+# =============================================================================
+# 📄 CACHE DE CONFIGURATION
+# =============================================================================
+
+_CACHE_YAML: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+_verrou_yaml = threading.Lock()
+
+
+def charger_yaml(chemin: Union[str, Path]) -> Any:
+    """
+    `yaml.safe_load` mis en cache par (chemin, mtime, taille).
+    Retourne une copie profonde : chaque agent peut modifier sa config sans effet de bord.
+    """
+    chemin = str(chemin)
+    try:
+        st = os.stat(chemin)
+        signature = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        signature = None  # Laisse open() lever l'erreur habituelle
+
+    if signature is not None:
+        with _verrou_yaml:
+            entree = _CACHE_YAML.get(chemin)
+        if entree is not None and entree[0] == signature:
+            return copy.deepcopy(entree[1])
+
+    with open(chemin, "r", encoding="utf-8") as f:
+        donnees = yaml.safe_load(f)
+
+    if signature is not None:
+        with _verrou_yaml:
+            _CACHE_YAML[chemin] = (signature, donnees)
+        return copy.deepcopy(donnees)
+    return donnees
+
+
+# =============================================================================
+# 💤 COMPOSANTS PARESSEUX
+# =============================================================================
+
+
+class ComposantParesseux:
+    """
+    Descripteur : la fabrique est appelée au premier accès, le résultat remplace
+    le descripteur dans `instance.__dict__`. Une affectation directe (tests, injection)
+    court-circuite la fabrique.
+    """
+
+    def __init__(self, fabrique: Callable[[Any], Any]):
+        self.fabrique = fabrique
+        self.nom = fabrique.__name__
+        self.__doc__ = fabrique.__doc__
+        self._verrou = threading.RLock()
+
+    def __set_name__(self, owner, nom):
+        self.nom = nom
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        with self._verrou:
+            if self.nom in instance.__dict__:  # Construit par un autre thread entre-temps
+                return instance.__dict__[self.nom]
+            with PROFIL_DEMARRAGE.etape(f"{type(instance).__name__}.{self.nom}"):
+                valeur = self.fabrique(instance)
+            instance.__dict__[self.nom] = valeur
+            return valeur
+
+
+def composant_paresseux(fabrique: Callable[[Any], Any]) -> ComposantParesseux:
+    """Décorateur : `@composant_paresseux def agent_x(self): return AgentX()`."""
+    return ComposantParesseux(fabrique)
+
+
+def est_charge(instance: Any, nom: str) -> bool:
+    """Vrai si le composant a déjà été construit (ou injecté)."""
+    return nom in vars(instance)
+
+
+def prechauffer(
+    instance: Any,
+    etapes: Sequence[Sequence[str]],
+    au_terme: Optional[Callable[[], None]] = None,
+    max_workers: int = 4,
+    journal: Optional[Callable[[str], None]] = None,
+) -> threading.Thread:
+    """
+    Construit les composants en arrière-plan.
+    Les composants d'une même étape sont indépendants (construits en parallèle) ;
+    les étapes s'enchaînent dans l'ordre donné. `au_terme` est appelé à la fin.
+    """
+    journal = journal or print
+
+    def construire(nom: str):
+        try:
+            getattr(instance, nom)
+        except Exception as e:
+            journal(f"⚠️ Pré-chauffage '{nom}' échoué : {e}")
+
+    def executer():
+        with PROFIL_DEMARRAGE.etape("prechauffage"):
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Prechauffage") as pool:
+                for etape in etapes:
+                    list(pool.map(construire, etape))
+            if au_terme:
+                try:
+                    au_terme()
+                except Exception as e:
+                    journal(f"⚠️ Pré-chauffage : étape finale échouée : {e}")
+
+    thread = threading.Thread(target=executer, daemon=True, name="Prechauffage")
+    thread.start()
+    return thread
+
+
+__all__ = [
+    "PROFIL_DEMARRAGE", "ProfilDemarrage", "importer", "charger_yaml",
+    "ComposantParesseux", "composant_paresseux", "est_charge", "prechauffer",
+]
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: Démarrage rapide
+Cible : agentique/base/demarrage.py
+Objectif : Valider les composants paresseux, le pré-chauffage par étapes, le cache YAML et le profil.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from agentique.base.demarrage import (
+    PROFIL_DEMARRAGE, charger_yaml, composant_paresseux, est_charge, prechauffer,
+)
+
+
+class Orchestrateur:
+    """Mini-graphe : b dépend de a ; c est indépendant."""
+
+    def __init__(self):
+        self.constructions = []
+        self._verrou = threading.Lock()
+
+    def _noter(self, nom):
+        with self._verrou:
+            self.constructions.append(nom)
+
+    @composant_paresseux
+    def a(self):
+        time.sleep(0.05)
+        self._noter("a")
+        return "A"
+
+    @composant_paresseux
+    def b(self):
+        self._noter("b")
+        return self.a + "B"
+
+    @composant_paresseux
+    def c(self):
+        self._noter("c")
+        return "C"
+
+
+class TestComposantsParesseux(unittest.TestCase):
+    def test_construit_au_premier_acces_une_seule_fois(self):
+        o = Orchestrateur()
+        self.assertFalse(est_charge(o, "a"))
+
+        threads = [threading.Thread(target=lambda: o.b) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(o.b, "AB")
+        self.assertEqual(sorted(o.constructions), ["a", "b"])
+        self.assertFalse(est_charge(o, "c"))
+
+    def test_injection_directe_court_circuite_la_fabrique(self):
+        o = Orchestrateur()
+        o.a = "MOCK"
+        self.assertEqual(o.b, "MOCKB")
+        self.assertNotIn("a", o.constructions)
+
+    def test_prechauffage_par_etapes(self):
+        o = Orchestrateur()
+        fin = threading.Event()
+
+        thread = prechauffer(o, [("a", "c"), ("b",)], au_terme=fin.set)
+        thread.join(5)
+
+        self.assertTrue(fin.is_set())
+        self.assertEqual(o.constructions[-1], "b")
+        noms = [e["nom"] for e in PROFIL_DEMARRAGE.rapport()["etapes"]]
+        self.assertIn("Orchestrateur.a", noms)
+        self.assertIn("Orchestrateur.a", PROFIL_DEMARRAGE.rapport_texte())
+
+
+class TestChargerYaml(unittest.TestCase):
+    def setUp(self):
+        self.dossier = Path(tempfile.mkdtemp())
+        self.chemin = self.dossier / "config.yaml"
+        self.chemin.write_text("configuration:\n  types: [a, b]\n", encoding="utf-8")
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def test_parse_une_fois_et_retourne_une_copie(self):
+        with patch("agentique.base.demarrage.yaml.safe_load", wraps=__import__("yaml").safe_load) as parse:
+            premiere = charger_yaml(self.chemin)
+            premiere["configuration"]["types"].remove("a")  # Un agent modifie sa config
+            seconde = charger_yaml(self.chemin)
+
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(seconde["configuration"]["types"], ["a", "b"])
+
+    def test_invalide_si_le_fichier_change(self):
+        charger_yaml(self.chemin)
+        self.chemin.write_text("configuration:\n  types: [z]\n", encoding="utf-8")
+        st = os.stat(self.chemin)
+        os.utime(self.chemin, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        self.assertEqual(charger_yaml(self.chemin)["configuration"]["types"], ["z"])
+
+
+if __name__ == "__main__":
+    unittest.main()
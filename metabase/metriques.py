@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+METRIQUES - Registre de métriques d'exécution (alimenté par l'auto-instrumentation MetaAgent)
+
+Chaque appel de méthode publique d'un agent est chronométré par
+`MetaAgent._creer_wrapper_stats`, puis transmis à `AuditorBase.enregistrer_stat`,
+qui le range ici.
+
+Conception "coût minimal sur le chemin chaud" :
+1.  **Shards par thread** : chaque thread écrit dans SES propres compteurs (threading.local),
+    sans verrou. Seule la lecture (export) fusionne les shards.
+2.  **Histogrammes à buckets fixes** : une observation = une recherche dichotomique
+    + trois incréments. Quantiles p50/p95/p99 estimés par interpolation dans le bucket.
+3.  **Exports** : texte Prometheus (route `/metrics` du backend) et rollups périodiques
+    en JSONL (deltas par intervalle) pour l'analyse a posteriori.
+"""
+
+import bisect
+import json
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+# Bornes supérieures des buckets de latence (ms). Le dernier bucket (+Inf) est implicite.
+BORNES_LATENCE_MS: Tuple[float, ...] = (
+    0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500,
+    1000, 2500, 5000, 10000, 30000, 60000,
+)
+
+Cle = Tuple[str, str]  # (agent, methode)
+
+
+class _Serie:
+    """Compteurs d'une paire (agent, méthode) dans UN shard."""
+
+    __slots__ = ("succes", "erreurs", "somme_ms", "buckets")
+
+    def __init__(self):
+        self.succes = 0
+        self.erreurs = 0
+        self.somme_ms = 0.0
+        self.buckets = [0] * (len(BORNES_LATENCE_MS) + 1)
+
+    def fusionner(self, autre: "_Serie"):
+        self.succes += autre.succes
+        self.erreurs += autre.erreurs
+        self.somme_ms += autre.somme_ms
+        for i, n in enumerate(autre.buckets):
+            self.buckets[i] += n
+
+
+class RegistreMetriques:
+    """
+    Registre global (singleton) des latences et compteurs par agent.méthode.
+
+    Attributes:
+        _shards: Liste des (thread, shard) vivants, fusionnés à la lecture.
+        _retires: Cumul des shards de threads terminés (aucune mesure perdue).
+    """
+
+    _instance = None
+    _verrou_instance = threading.Lock()
+
+    def __new__(cls):
+        with cls._verrou_instance:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._local = threading.local()
+                instance._verrou = threading.Lock()  # Enregistrement des shards + lecture
+                instance._shards: List[Tuple[threading.Thread, Dict[Cle, _Serie]]] = []
+                instance._retires: Dict[Cle, _Serie] = {}
+                instance._thread_rollup = None
+                instance._arret_rollup = threading.Event()
+                instance._dernier_rollup: Dict[Cle, _Serie] = {}
+                cls._instance = instance
+        return cls._instance
+
+    # =========================================================================
+    # ✍️ ÉCRITURE (chemin chaud, sans verrou)
+    # =========================================================================
+
+    def observer(self, agent: str, methode: str, duree_ms: float, succes: bool = True):
+        """Enregistre un appel. Ne prend un verrou qu'au tout premier appel d'un thread."""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._nouveau_shard()
+
+        serie = shard.get((agent, methode))
+        if serie is None:
+            serie = shard[(agent, methode)] = _Serie()
+
+        if succes:
+            serie.succes += 1
+        else:
+            serie.erreurs += 1
+        serie.somme_ms += duree_ms
+        serie.buckets[bisect.bisect_left(BORNES_LATENCE_MS, duree_ms)] += 1
+
+    def _nouveau_shard(self) -> Dict[Cle, _Serie]:
+        shard: Dict[Cle, _Serie] = {}
+        self._local.shard = shard
+        with self._verrou:
+            self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    # =========================================================================
+    # 📖 LECTURE (fusion des shards)
+    # =========================================================================
+
+    def instantane(self) -> Dict[Cle, _Serie]:
+        """Fusion de tous les shards. Les shards des threads terminés sont repliés dans `_retires`."""
+        total: Dict[Cle, _Serie] = {}
+        with self._verrou:
+            vivants = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    vivants.append((thread, shard))
+                else:
+                    self._fusionner_dans(self._retires, shard)
+            self._shards = vivants
+
+            self._fusionner_dans(total, self._retires)
+            for _, shard in vivants:
+                # Copie défensive : le thread propriétaire peut ajouter une clé pendant la lecture
+                self._fusionner_dans(total, dict(shard))
+        return total
+
+    @staticmethod
+    def _fusionner_dans(cible: Dict[Cle, _Serie], source: Dict[Cle, _Serie]):
+        for cle, serie in source.items():
+            if cle not in cible:
+                cible[cle] = _Serie()
+            cible[cle].fusionner(serie)
+
+    @staticmethod
+    def quantile(buckets: List[int], q: float) -> float:
+        """Estimation d'un quantile (ms) par interpolation linéaire dans le bucket concerné."""
+        total = sum(buckets)
+        if total == 0:
+            return 0.0
+        rang = q * total
+        cumul = 0
+        for i, n in enumerate(buckets):
+            if n and cumul + n >= rang:
+                borne_basse = BORNES_LATENCE_MS[i - 1] if i > 0 else 0.0
+                if i >= len(BORNES_LATENCE_MS):
+                    return float(BORNES_LATENCE_MS[-1])  # Au-delà de la dernière borne
+                borne_haute = BORNES_LATENCE_MS[i]
+                return borne_basse + (borne_haute - borne_basse) * ((rang - cumul) / n)
+            cumul += n
+        return float(BORNES_LATENCE_MS[-1])
+
+    def resume(self, series: Optional[Dict[Cle, _Serie]] = None) -> List[Dict[str, Any]]:
+        """Une ligne par agent.méthode : appels, erreurs, moyenne, p50/p95/p99 (trié par p95 décroissant)."""
+        series = self.instantane() if series is None else series
+        lignes = []
+        for (agent, methode), s in series.items():
+            appels = s.succes + s.erreurs
+            if not appels:
+                continue
+            lignes.append({
+                "agent": agent,
+                "methode": methode,
+                "appels": appels,
+                "erreurs": s.erreurs,
+                "moyenne_ms": round(s.somme_ms / appels, 3),
+                "p50_ms": round(self.quantile(s.buckets, 0.50), 3),
+                "p95_ms": round(self.quantile(s.buckets, 0.95), 3),
+                "p99_ms": round(self.quantile(s.buckets, 0.99), 3),
+            })
+        lignes.sort(key=lambda l: l["p95_ms"], reverse=True)
+        return lignes
+
+    def exporter_prometheus(self) -> str:
+        """Format texte Prometheus (0.0.4) : compteur d'appels + histogramme de latence."""
+        series = self.instantane()
+        lignes = [
+            "# HELP secondmind_appels_total Appels de méthodes d'agents (auto-instrumentation).",
+            "# TYPE secondmind_appels_total counter",
+        ]
+        for (agent, methode), s in sorted(series.items()):
+            etiquettes = f'agent="{_echapper(agent)}",methode="{_echapper(methode)}"'
+            lignes.append(f'secondmind_appels_total{{{etiquettes},statut="succes"}} {s.succes}')
+            lignes.append(f'secondmind_appels_total{{{etiquettes},statut="erreur"}} {s.erreurs}')
+
+        lignes += [
+            "# HELP secondmind_duree_ms Durée des appels de méthodes d'agents (ms).",
+            "# TYPE secondmind_duree_ms histogram",
+        ]
+        for (agent, methode), s in sorted(series.items()):
+            etiquettes = f'agent="{_echapper(agent)}",methode="{_echapper(methode)}"'
+            cumul = 0
+            for borne, n in zip(BORNES_LATENCE_MS, s.buckets):
+                cumul += n
+                lignes.append(f'secondmind_duree_ms_bucket{{{etiquettes},le="{borne:g}"}} {cumul}')
+            cumul += s.buckets[-1]
+            lignes.append(f'secondmind_duree_ms_bucket{{{etiquettes},le="+Inf"}} {cumul}')
+            lignes.append(f"secondmind_duree_ms_sum{{{etiquettes}}} {s.somme_ms:.3f}")
+            lignes.append(f"secondmind_duree_ms_count{{{etiquettes}}} {cumul}")
+        return "\n".join(lignes) + "\n"
+
+    # =========================================================================
+    # 💾 ROLLUPS PÉRIODIQUES
+    # =========================================================================
+
+    def demarrer_rollups(self, dossier: Path, intervalle_s: float = 60.0):
+        """Lance (une seule fois) le thread qui écrit les deltas par intervalle dans `metriques_AAAA-MM-JJ.jsonl`."""
+        if self._thread_rollup and self._thread_rollup.is_alive():
+            return
+        dossier = Path(dossier)
+        dossier.mkdir(parents=True, exist_ok=True)
+        self._arret_rollup.clear()
+        self._thread_rollup = threading.Thread(
+            target=self._boucle_rollup, args=(dossier, intervalle_s), daemon=True, name="MetriquesRollup"
+        )
+        self._thread_rollup.start()
+
+    def arreter_rollups(self):
+        self._arret_rollup.set()
+
+    def _boucle_rollup(self, dossier: Path, intervalle_s: float):
+        while not self._arret_rollup.wait(intervalle_s):
+            try:
+                self.ecrire_rollup(dossier, intervalle_s)
+            except Exception as e:
+                print(f"⚠️ [Metriques] Rollup échoué : {e}")
+
+    def ecrire_rollup(self, dossier: Path, intervalle_s: float = 0.0) -> int:
+        """Écrit le delta depuis le rollup précédent (une ligne par agent.méthode active)."""
+        courant = self.instantane()
+        delta: Dict[Cle, _Serie] = {}
+        for cle, s in courant.items():
+            precedent = self._dernier_rollup.get(cle)
+            d = _Serie()
+            d.fusionner(s)
+            if precedent:
+                d.succes -= precedent.succes
+                d.erreurs -= precedent.erreurs
+                d.somme_ms -= precedent.somme_ms
+                d.buckets = [a - b for a, b in zip(d.buckets, precedent.buckets)]
+            if d.succes + d.erreurs:
+                delta[cle] = d
+        self._dernier_rollup = courant
+
+        if not delta:
+            return 0
+        horodatage = datetime.now()
+        chemin = Path(dossier) / f"metriques_{horodatage.strftime('%Y-%m-%d')}.jsonl"
+        with open(chemin, "a", encoding="utf-8") as f:
+            for ligne in self.resume(delta):
+                ligne["timestamp"] = horodatage.isoformat()
+                ligne["intervalle_s"] = intervalle_s
+                f.write(json.dumps(ligne, ensure_ascii=False) + "\n")
+        return len(delta)
+
+    def reinitialiser(self):
+        """Remise à zéro (tests / benchmarks)."""
+        with self._verrou:
+            for _, shard in self._shards:
+                shard.clear()
+            self._retires = {}
+            self._dernier_rollup = {}
+
+
+def _echapper(valeur: str) -> str:
+    return str(valeur).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def registre_metriques() -> RegistreMetriques:
+    """Accès au registre global."""
+    return RegistreMetriques()
+
+
+__all__ = ["RegistreMetriques", "registre_metriques", "BORNES_LATENCE_MS"]
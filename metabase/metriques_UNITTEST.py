@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: Registre de Métriques
+Cible : agentique/base/metriques.py
+Objectif : Valider les shards par thread, les quantiles, l'export Prometheus et les rollups.
+"""
+
+import unittest
+import json
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+from agentique.base.metriques import RegistreMetriques, registre_metriques
+
+
+class TestRegistreMetriques(unittest.TestCase):
+    def setUp(self):
+        self.registre = registre_metriques()
+        self.registre.reinitialiser()
+
+    def _serie(self, agent="memoire", methode="rechercher"):
+        return self.registre.instantane()[(agent, methode)]
+
+    def test_singleton(self):
+        self.assertIs(RegistreMetriques(), self.registre)
+
+    def test_threads_concurrents_aucune_perte(self):
+        """Chaque thread écrit dans son shard ; la fusion (y compris threads terminés) est exacte."""
+
+        def travail():
+            for i in range(1000):
+                self.registre.observer("memoire", "rechercher", 3.0, succes=(i % 10 != 0))
+
+        threads = [threading.Thread(target=travail) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        serie = self._serie()
+        self.assertEqual(serie.succes + serie.erreurs, 8000)
+        self.assertEqual(serie.erreurs, 800)
+        self.assertAlmostEqual(serie.somme_ms, 24000.0)
+
+    def test_quantiles(self):
+        """90 appels rapides (~1ms) + 10 lents (~400ms) : p50 rapide, p95/p99 dans le bucket lent."""
+        for _ in range(90):
+            self.registre.observer("juge", "evaluer", 0.8)
+        for _ in range(10):
+            self.registre.observer("juge", "evaluer", 400.0)
+
+        ligne = self.registre.resume()[0]
+        self.assertEqual(ligne["appels"], 100)
+        self.assertLessEqual(ligne["p50_ms"], 1.0)
+        self.assertTrue(250 <= ligne["p95_ms"] <= 500)
+        self.assertTrue(250 <= ligne["p99_ms"] <= 500)
+
+    def test_export_prometheus(self):
+        self.registre.observer("parole", "generer", 12.0)
+        self.registre.observer("parole", "generer", 70000.0, succes=False)
+
+        texte = self.registre.exporter_prometheus()
+
+        self.assertIn('secondmind_appels_total{agent="parole",methode="generer",statut="erreur"} 1', texte)
+        self.assertIn('secondmind_duree_ms_bucket{agent="parole",methode="generer",le="25"} 1', texte)
+        self.assertIn('secondmind_duree_ms_bucket{agent="parole",methode="generer",le="+Inf"} 2', texte)
+        self.assertIn('secondmind_duree_ms_count{agent="parole",methode="generer"} 2', texte)
+
+    def test_rollup_ecrit_des_deltas(self):
+        dossier = Path(tempfile.mkdtemp())
+        try:
+            self.registre.observer("contexte", "fournir", 5.0)
+            self.assertEqual(self.registre.ecrire_rollup(dossier), 1)
+            self.assertEqual(self.registre.ecrire_rollup(dossier), 0)  # Rien de neuf
+            self.registre.observer("contexte", "fournir", 5.0)
+            self.registre.ecrire_rollup(dossier)
+
+            fichier = next(dossier.glob("metriques_*.jsonl"))
+            lignes = [json.loads(l) for l in fichier.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual([l["appels"] for l in lignes], [1, 1])
+        finally:
+            shutil.rmtree(dossier, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
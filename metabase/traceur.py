@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TRACEUR - Arbre de spans par tour (`penser`), propagé entre agents et threads
+
+Un tour de `penser` ouvre une trace dont l'identifiant est le correlation_id du
+CognitiveLogger. Chaque appel de méthode publique d'agent (auto-instrumentation
+MetaAgent) ouvre un span enfant du span courant : IntentionDetector, AgentRecherche,
+AgentContexte, AgentParole, AgentJuge... forment ainsi un arbre sans code dédié.
+
+1.  **Contexte** : Le span courant vit dans une ContextVar. `propager(fn)` capture le
+    contexte pour les threads (post-traitement, pools) : la trace continue en arrière-plan.
+2.  **Coût nul hors trace** : sans trace active, `span()` retourne un span neutre
+    (une lecture de ContextVar).
+3.  **Journal compact** : Les spans terminés sont écrits par lot (thread unique,
+    handle ouvert) dans `traces_AAAA-MM-JJ.jsonl`, une ligne courte par span.
+4.  **Anneau RAM** : Les N dernières traces sont gardées en mémoire pour la vue
+    waterfall du backend (`/api/traces`, `trace_viewer.html`).
+"""
+
+import contextvars
+import json
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+_span_courant: contextvars.ContextVar = contextvars.ContextVar("span_courant", default=None)
+
+
+class Span:
+    """Intervalle chronométré d'une trace (context manager)."""
+
+    __slots__ = (
+        "trace_id", "span_id", "parent_id", "nom", "debut", "fin",
+        "attributs", "marqueurs", "statut", "thread", "_jeton", "_parent",
+    )
+
+    def __init__(self, trace_id: str, nom: str, parent: Optional["Span"] = None, **attributs):
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:8]
+        self.parent_id = parent.span_id if parent else None
+        self.nom = nom
+        self.debut = time.time()
+        self.fin: Optional[float] = None
+        self.attributs = attributs
+        self.marqueurs: List[tuple] = []
+        self.statut = "ok"
+        self.thread = threading.current_thread().name
+        self._jeton = None
+        self._parent = parent
+
+    def __enter__(self):
+        self._jeton = _span_courant.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and exc_type is not GeneratorExit:
+            self.statut = "erreur"
+            self.attributs["erreur"] = f"{exc_type.__name__}: {exc}"[:200]
+        self.terminer()
+        try:
+            _span_courant.reset(self._jeton)
+        except ValueError:
+            # Générateur repris dans un autre contexte : on restaure le parent à la main
+            _span_courant.set(self._parent)
+        return False
+
+    def marquer(self, label: str):
+        """Jalon ponctuel (ex: TTFT) positionné sur la frise du span."""
+        self.marqueurs.append((label, time.time()))
+
+    def definir(self, **attributs):
+        self.attributs.update(attributs)
+
+    def terminer(self):
+        if self.fin is None:
+            self.fin = time.time()
+            TRACEUR.enregistrer(self)
+
+    @property
+    def duree_ms(self) -> float:
+        return ((self.fin or time.time()) - self.debut) * 1000
+
+    def vers_dict(self) -> Dict[str, Any]:
+        """Format compact du journal (clés courtes)."""
+        d = {
+            "t": self.trace_id,
+            "s": self.span_id,
+            "p": self.parent_id,
+            "n": self.nom,
+            "d": round(self.debut, 4),
+            "ms": round(self.duree_ms, 2),
+            "th": self.thread,
+        }
+        if self.statut != "ok":
+            d["st"] = self.statut
+        if self.attributs:
+            d["a"] = self.attributs
+        if self.marqueurs:
+            d["m"] = [[label, round((ts - self.debut) * 1000, 2)] for label, ts in self.marqueurs]
+        return d
+
+
+class _SpanNeutre:
+    """Span sans effet (aucune trace active)."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def marquer(self, label: str):
+        pass
+
+    def definir(self, **attributs):
+        pass
+
+
+SPAN_NEUTRE = _SpanNeutre()
+
+
+class Traceur:
+    """
+    Collecteur des spans terminés : anneau RAM des dernières traces + écriture par lot.
+
+    Attributes:
+        capacite (int): Nombre de traces gardées en mémoire.
+        dossier (Path): Dossier du journal compact (None = RAM uniquement).
+    """
+
+    def __init__(self, capacite: int = 200):
+        self.capacite = capacite
+        self.dossier: Optional[Path] = None
+        self._traces: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        self._verrou = threading.Lock()
+        self._file: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def configurer(self, dossier: Path, capacite: Optional[int] = None):
+        """Active le journal disque (appelé au démarrage du backend)."""
+        self.dossier = Path(dossier)
+        self.dossier.mkdir(parents=True, exist_ok=True)
+        if capacite:
+            self.capacite = capacite
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._boucle_ecriture, daemon=True, name="TraceurEcriture"
+            )
+            self._thread.start()
+
+    def enregistrer(self, span: Span):
+        donnees = span.vers_dict()
+        with self._verrou:
+            spans = self._traces.get(span.trace_id)
+            if spans is None:
+                spans = self._traces[span.trace_id] = []
+                while len(self._traces) > self.capacite:
+                    self._traces.popitem(last=False)
+            spans.append(donnees)
+        if self.dossier is not None:
+            self._file.put(donnees)
+
+    # =========================================================================
+    # 📖 LECTURE (Vue waterfall)
+    # =========================================================================
+
+    def lister_traces(self, limite: int = 50) -> List[Dict[str, Any]]:
+        """Résumé des dernières traces (plus récente en premier)."""
+        with self._verrou:
+            traces = list(self._traces.items())[-limite:]
+        resume = []
+        for trace_id, spans in reversed(traces):
+            racine = next((s for s in spans if s["p"] is None), spans[0])
+            debut = min(s["d"] for s in spans)
+            fin = max(s["d"] + s["ms"] / 1000 for s in spans)
+            resume.append({
+                "trace_id": trace_id,
+                "nom": racine["n"],
+                "debut": datetime.fromtimestamp(debut).isoformat(),
+                "duree_ms": round((fin - debut) * 1000, 2),
+                "nb_spans": len(spans),
+                "ttft_ms": next(
+                    (m[1] for s in spans for m in s.get("m", []) if "TTFT" in m[0]), None
+                ),
+            })
+        return resume
+
+    def obtenir_trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        """Spans d'une trace triés par début (RAM, sinon journal du jour)."""
+        with self._verrou:
+            spans = list(self._traces.get(trace_id, []))
+        if not spans and self.dossier is not None:
+            spans = self._lire_journal(trace_id)
+        return sorted(spans, key=lambda s: s["d"])
+
+    def _lire_journal(self, trace_id: str) -> List[Dict[str, Any]]:
+        spans = []
+        motif = f'"t": "{trace_id}"'
+        for fichier in sorted(self.dossier.glob("traces_*.jsonl"), reverse=True)[:2]:
+            with open(fichier, "r", encoding="utf-8") as f:
+                spans.extend(json.loads(l) for l in f if motif in l)
+            if spans:
+                break
+        return spans
+
+    # =========================================================================
+    # 💾 ÉCRITURE PAR LOT
+    # =========================================================================
+
+    def _boucle_ecriture(self):
+        handle, jour_courant = None, None
+        while True:
+            lot = [self._file.get()]
+            time.sleep(0.05)  # Fenêtre de regroupement
+            while True:
+                try:
+                    lot.append(self._file.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                jour = datetime.now().strftime("%Y-%m-%d")
+                if jour != jour_courant:
+                    if handle:
+                        handle.close()
+                    handle = open(self.dossier / f"traces_{jour}.jsonl", "a", encoding="utf-8")
+                    jour_courant = jour
+                handle.write("".join(json.dumps(s, ensure_ascii=False) + "\n" for s in lot))
+                handle.flush()
+            except Exception as e:
+                print(f"⚠️ [Traceur] Écriture échouée : {e}")
+
+
+TRACEUR = Traceur()
+
+
+# =============================================================================
+# 🔌 API
+# =============================================================================
+
+def demarrer_trace(trace_id: Optional[str] = None, nom: str = "tour", **attributs) -> Span:
+    """Span racine d'une nouvelle trace (à utiliser avec `with`)."""
+    return Span(trace_id or uuid.uuid4().hex[:8], nom, None, **attributs)
+
+
+def span(nom: str, **attributs):
+    """Span enfant du span courant ; neutre si aucune trace n'est active."""
+    parent = _span_courant.get()
+    if parent is None:
+        return SPAN_NEUTRE
+    return Span(parent.trace_id, nom, parent, **attributs)
+
+
+def span_courant():
+    return _span_courant.get() or SPAN_NEUTRE
+
+
+def trace_courante_id() -> Optional[str]:
+    parent = _span_courant.get()
+    return parent.trace_id if parent else None
+
+
+def propager(fn):
+    """Capture le contexte courant (trace incluse) pour l'exécuter dans un autre thread."""
+    contexte = contextvars.copy_context()
+
+    def executer(*args, **kwargs):
+        return contexte.run(fn, *args, **kwargs)
+
+    return executer
+
+
+__all__ = [
+    "Span", "Traceur", "TRACEUR", "demarrer_trace", "span", "span_courant",
+    "trace_courante_id", "propager",
+]
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Unitaire: Traceur (spans par tour)
+Cible : agentique/base/traceur.py
+Objectif : Valider l'arbre de spans, le span neutre hors trace, la propagation entre threads et le résumé TTFT.
+"""
+
+import unittest
+import json
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from agentique.base.traceur import (
+    TRACEUR, SPAN_NEUTRE, demarrer_trace, span, span_courant, trace_courante_id, propager,
+)
+
+
+class TestTraceur(unittest.TestCase):
+    def setUp(self):
+        TRACEUR._traces.clear()
+
+    def test_spans_imbriques(self):
+        """Chaque span enfant pointe vers son parent ; le contexte est restauré à la sortie."""
+        with demarrer_trace("t1", "AgentSemi.penser") as racine:
+            with span("IntentionDetector.predire") as enfant:
+                with span("MoteurVectoriel.encoder") as petit_enfant:
+                    self.assertEqual(trace_courante_id(), "t1")
+            self.assertIs(span_courant(), racine)
+
+        spans = {s["n"]: s for s in TRACEUR.obtenir_trace("t1")}
+        self.assertIsNone(spans["AgentSemi.penser"]["p"])
+        self.assertEqual(spans["IntentionDetector.predire"]["p"], racine.span_id)
+        self.assertEqual(spans["MoteurVectoriel.encoder"]["p"], enfant.span_id)
+        self.assertEqual(petit_enfant.trace_id, "t1")
+        self.assertIsNone(trace_courante_id())
+
+    def test_span_neutre_hors_trace(self):
+        self.assertIs(span("AgentJuge.evaluer"), SPAN_NEUTRE)
+        with span("AgentJuge.evaluer") as s:
+            s.marquer("rien")
+        self.assertEqual(TRACEUR.lister_traces(), [])
+
+    def test_erreur_marque_le_span(self):
+        with self.assertRaises(ValueError):
+            with demarrer_trace("t2", "tour"):
+                raise ValueError("boom")
+        self.assertEqual(TRACEUR.obtenir_trace("t2")[0]["st"], "erreur")
+
+    def test_propagation_thread(self):
+        """Le post-traitement lancé dans un thread reste rattaché à la trace du tour."""
+        with demarrer_trace("t3", "AgentSemi.penser") as racine:
+            def post_traitement():
+                with span("AgentMemoire.sauvegarder"):
+                    pass
+
+            t = threading.Thread(target=propager(post_traitement))
+            t.start()
+            t.join()
+
+        enfant = next(s for s in TRACEUR.obtenir_trace("t3") if s["n"] == "AgentMemoire.sauvegarder")
+        self.assertEqual(enfant["p"], racine.span_id)
+        self.assertNotEqual(enfant["th"], threading.current_thread().name)
+
+    def test_resume_ttft_et_journal(self):
+        dossier = Path(tempfile.mkdtemp())
+        try:
+            TRACEUR.configurer(dossier)
+            with demarrer_trace("t4", "AgentSemi.penser"):
+                with span("MoteurLLM.generer_stream"):
+                    span_courant().marquer("⚡ TTFT: 0.01s")
+
+            resume = TRACEUR.lister_traces()[0]
+            self.assertEqual(resume["trace_id"], "t4")
+            self.assertEqual(resume["nb_spans"], 2)
+            self.assertIsNotNone(resume["ttft_ms"])
+
+            # Relecture depuis le journal une fois la trace sortie de l'anneau RAM
+            time.sleep(0.3)
+            TRACEUR._traces.clear()
+            self.assertEqual(len(TRACEUR.obtenir_trace("t4")), 2)
+            ligne = json.loads(next(dossier.glob("traces_*.jsonl")).read_text(encoding="utf-8").splitlines()[0])
+            self.assertEqual(ligne["t"], "t4")
+        finally:
+            TRACEUR.dossier = None
+            shutil.rmtree(dossier, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()